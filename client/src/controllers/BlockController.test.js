@@ -102,6 +102,94 @@ describe('BlockController', () => {
     expect(events['w-block:ready']).toHaveLength(1);
   });
 
+  it('should fetch the block definition once if given a URL', async () => {
+    const data = { _args: ['...'], _type: 'wagtail.blocks.StreamBlock' };
+    const initialData = [{ type: 'paragraph_block', value: '...' }];
+    const url = '/admin/block-definitions/en/0123456789abcdef.json';
+
+    global.fetch = jest.fn(() =>
+      Promise.resolve({ ok: true, json: () => Promise.resolve(data) }),
+    );
+
+    await setup(
+      `<div
+        id="first-element"
+        data-controller="w-block"
+        data-w-block-arguments-value='${JSON.stringify([initialData, null])}'
+        data-w-block-url-value="${url}"
+        >
+      </div>
+      <div
+        id="second-element"
+        data-controller="w-block"
+        data-w-block-arguments-value='${JSON.stringify([[], null])}'
+        data-w-block-url-value="${url}"
+        >
+      </div>`,
+    );
+
+    await new Promise(process.nextTick);
+
+    expect(errors).toHaveLength(0);
+    expect(global.fetch).toHaveBeenCalledTimes(1);
+    expect(global.fetch).toHaveBeenCalledWith(url, {
+      credentials: 'same-origin',
+    });
+    expect(unpack).toHaveBeenCalledWith(data);
+    expect(render).toHaveBeenCalledWith(
+      document.getElementById('first-element'),
+      'first-element',
+      initialData,
+      null,
+    );
+    expect(render).toHaveBeenCalledWith(
+      document.getElementById('second-element'),
+      'second-element',
+      [],
+      null,
+    );
+    expect(events['w-block:ready']).toHaveLength(2);
+  });
+
+  it('should show an error and prevent submit if the block definition cannot be fetched', async () => {
+    const url = '/admin/block-definitions/en/fedcba9876543210.json';
+
+    global.fetch = jest.fn(() =>
+      Promise.resolve({ ok: false, status: 404, json: () => Promise.reject() }),
+    );
+
+    await setup(
+      `<form>
+        <div
+          id="my-element"
+          data-controller="w-block"
+          data-w-block-arguments-value='${JSON.stringify([[], null])}'
+          data-w-block-url-value="${url}"
+          >
+        </div>
+      </form>`,
+    );
+
+    await new Promise(process.nextTick);
+
+    expect(unpack).not.toHaveBeenCalled();
+    expect(events['w-block:ready']).toHaveLength(0);
+    expect(errors).toHaveLength(1);
+    expect(errors).toHaveProperty(
+      '0.error.message',
+      `Unable to load block definition from ${url} (404).`,
+    );
+    expect(
+      document.querySelector('#my-element .error-message').textContent,
+    ).toEqual(
+      'This field could not be loaded. Reload the page before saving any changes.',
+    );
+
+    const event = new Event('submit', { cancelable: true });
+    document.querySelector('form').dispatchEvent(event);
+    expect(event.defaultPrevented).toBe(true);
+  });
+
   it('should throw an error if used on an element without an id', async () => {
     await setup('<div data-controller="w-block"></div>');
 
@@ -1,4 +1,5 @@
 import { Controller } from '@hotwired/stimulus';
+import { gettext } from '../utils/gettext';
 
 declare global {
   interface Window {
@@ -27,17 +28,52 @@ declare global {
  *  data-w-block-arguments-value='[[{ type: "paragraph_block", value: "..."}], {messages:["An error..."]}]'
  * >
  * </div>
+ *
+ * @example - with the block definition fetched from a URL
+ * <div
+ *  id="some-id"
+ *  data-controller="w-block"
+ *  data-w-block-url-value="/admin/block-definitions/en/0123456789abcdef.json"
+ *  data-w-block-arguments-value='[[{ type: "paragraph_block", value: "..."}], null]'
+ * >
+ * </div>
+ */
+/**
+ * Requests for block definitions, shared between all the controlled elements that
+ * use the same definition.
  */
+const definitionRequests = new Map<string, Promise<object>>();
+
+const fetchDefinition = (url: string) => {
+  let request = definitionRequests.get(url);
+  if (!request) {
+    request = fetch(url, { credentials: 'same-origin' }).then((response) => {
+      if (!response.ok) {
+        throw new Error(
+          `Unable to load block definition from ${url} (${response.status}).`,
+        );
+      }
+      return response.json();
+    });
+    request.catch(() => definitionRequests.delete(url));
+    definitionRequests.set(url, request);
+  }
+  return request;
+};
+
 export class BlockController extends Controller<HTMLElement> {
   static values = {
     arguments: { type: Array, default: [] },
     data: { type: Object, default: {} },
+    url: { type: String, default: '' },
   };
 
   /** Array of arguments to pass to the render method of the block [initial value, errors]. */
   declare argumentsValue: Array<string>;
   /** Block definition to be passed to `telepath.unpack`, used to obtain a JavaScript representation of the block. */
   declare dataValue: object;
+  /** URL to fetch the block definition from, used in place of the data value if set. */
+  declare urlValue: string;
 
   connect() {
     const telepath = window.telepath;
@@ -53,11 +89,42 @@ export class BlockController extends Controller<HTMLElement> {
       throw new Error('Controlled element needs an id attribute.');
     }
 
-    const output = telepath.unpack(this.dataValue);
-    output.render(element, id, ...this.argumentsValue);
+    if (this.urlValue) {
+      fetchDefinition(this.urlValue)
+        .then((data) => this.render(data))
+        .catch((error) => this.showError(error));
+    } else {
+      this.render(this.dataValue);
+    }
+  }
+
+  render(data: object) {
+    const output = window.telepath.unpack(data);
+    output.render(this.element, this.element.id, ...this.argumentsValue);
     this.dispatch('ready', { detail: { ...output }, cancelable: false });
   }
 
+  /**
+   * Show that the block definition could not be loaded, and stop the form from
+   * being submitted, as it would be submitted without the content of this field.
+   */
+  showError(error: Error) {
+    const message = document.createElement('p');
+    message.classList.add('error-message');
+    message.textContent = gettext(
+      'This field could not be loaded. Reload the page before saving any changes.',
+    );
+    this.element.replaceChildren(message);
+
+    this.element
+      .closest('form')
+      ?.addEventListener('submit', (event) => event.preventDefault());
+
+    this.application.handleError(error, 'Unable to load block definition', {
+      element: this.element,
+    });
+  }
+
   static afterLoad() {
     /**
      * Provide a backwards compatible version of the original window global function.
@@ -1,12 +1,27 @@
 import logging
 import uuid
+from collections import Counter, defaultdict
 
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
+from django.db import connection, transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from modelcluster.fields import ParentalManyToManyField
 from modelcluster.models import get_all_child_relations
 
-from wagtail.log_actions import log
-from wagtail.models.copying import _copy, _copy_m2m_relations
+from wagtail.log_actions import get_active_log_context, log
+from wagtail.models.copying import (
+    _bulk_create_child_objects,
+    _bulk_create_multi_table,
+    _copy,
+    _copy_m2m_relations,
+    _get_m2m_fields_to_copy,
+    _get_m2m_through_objects,
+)
 from wagtail.models.i18n import TranslatableMixin
+from wagtail.search import index
 from wagtail.signals import page_published
 
 logger = logging.getLogger("wagtail")
@@ -31,6 +46,13 @@ class CopyPagePermissionError(PermissionDenied):
 class CopyPageAction:
     """
     Copies pages and page trees.
+
+    When copying a page tree with ``bulk=True``, the descendants of the page are
+    copied ``batch_size`` pages at a time, with the rows of each model inserted in
+    a single query per batch. ``pre_save`` and ``post_save`` signals are not sent
+    for the copied descendants (but ``page_published`` is), and view restrictions
+    are only copied from the page the copy is started from. Bulk copying is only
+    used on databases that can return the IDs of rows inserted in bulk.
     """
 
     def __init__(
@@ -46,6 +68,8 @@ class CopyPageAction:
         process_child_object=None,
         log_action="wagtail.copy",
         reset_translation_key=True,
+        bulk=False,
+        batch_size=500,
     ):
         # Note: These four parameters don't apply to any copied children
         self.page = page
@@ -60,6 +84,8 @@ class CopyPageAction:
         self.process_child_object = process_child_object
         self.log_action = log_action
         self.reset_translation_key = reset_translation_key
+        self.bulk = bulk and connection.features.can_return_rows_from_bulk_insert
+        self.batch_size = batch_size
         self._uuid_mapping = {}
 
     def generate_translation_key(self, old_uuid):
@@ -107,15 +133,14 @@ class CopyPageAction:
                         "You do not have permission to publish a page at the destination"
                     )
 
-    def _copy_page(
-        self, page, to=None, update_attrs=None, exclude_fields=None, _mpnode_attrs=None
-    ):
-        specific_page = page.specific
-        exclude_fields = (
+    def _get_exclude_fields(self, specific_page, exclude_fields=None):
+        return (
             specific_page.default_exclude_fields_in_copy
             + specific_page.exclude_fields_in_copy
             + (exclude_fields or [])
         )
+
+    def _get_base_update_attrs(self, update_attrs=None):
         if self.keep_live:
             base_update_attrs = {
                 "alias_of": None,
@@ -140,10 +165,13 @@ class CopyPageAction:
         if update_attrs:
             base_update_attrs.update(update_attrs)
 
+        return base_update_attrs
+
+    def _copy_object(self, specific_page, exclude_fields, base_update_attrs):
         page_copy, child_object_map = _copy(
             specific_page, exclude_fields=exclude_fields, update_attrs=base_update_attrs
         )
-        # Save copied child objects and run process_child_object on them if we need to
+        # Run process_child_object on copied child objects if we need to
         for (child_relation, old_pk), child_object in child_object_map.items():
             if self.process_child_object:
                 self.process_child_object(
@@ -157,6 +185,77 @@ class CopyPageAction:
                     child_object.translation_key
                 )
 
+        return page_copy, child_object_map
+
+    def _update_revision_content(
+        self, revision_content, specific_page, page_copy, child_object_map
+    ):
+        # Update ID fields in content
+        revision_content["pk"] = page_copy.pk
+
+        for child_relation in get_all_child_relations(specific_page):
+            accessor_name = child_relation.get_accessor_name()
+            try:
+                child_objects = revision_content[accessor_name]
+            except KeyError:
+                # KeyErrors are possible if the revision was created
+                # before this child relation was added to the database
+                continue
+
+            for child_object in child_objects:
+                child_object[child_relation.field.name] = page_copy.pk
+                # Remap primary key to copied versions
+                # If the primary key is not recognised (eg, the child object has been deleted from the database)
+                # set the primary key to None
+                copied_child_object = child_object_map.get(
+                    (child_relation, child_object["pk"])
+                )
+                child_object["pk"] = (
+                    copied_child_object.pk if copied_child_object else None
+                )
+                if self.reset_translation_key and "translation_key" in child_object:
+                    child_object["translation_key"] = self.generate_translation_key(
+                        child_object["translation_key"]
+                    )
+
+        for exclude_field in specific_page.exclude_fields_in_copy:
+            if exclude_field in revision_content and hasattr(page_copy, exclude_field):
+                revision_content[exclude_field] = getattr(
+                    page_copy, exclude_field, None
+                )
+
+        return revision_content
+
+    def _get_log_data(self, page, page_copy, source, destination):
+        return {
+            "page": {
+                "id": page_copy.id,
+                "title": page_copy.get_admin_display_title(),
+                "locale": {
+                    "id": page_copy.locale_id,
+                    "language_code": page_copy.locale.language_code,
+                },
+            },
+            "source": source,
+            "destination": destination,
+            "keep_live": page_copy.live and self.keep_live,
+            "source_locale": {
+                "id": page.locale_id,
+                "language_code": page.locale.language_code,
+            },
+        }
+
+    def _copy_page(
+        self, page, to=None, update_attrs=None, exclude_fields=None, _mpnode_attrs=None
+    ):
+        specific_page = page.specific
+        exclude_fields = self._get_exclude_fields(specific_page, exclude_fields)
+        base_update_attrs = self._get_base_update_attrs(update_attrs)
+
+        page_copy, child_object_map = self._copy_object(
+            specific_page, exclude_fields, base_update_attrs
+        )
+
         # Save the new page
         if _mpnode_attrs:
             # We've got a tree position already reserved. Perform a quick save
@@ -187,49 +286,9 @@ class CopyPageAction:
                 revision.approved_go_live_at = None
                 revision.object_id = page_copy.id
 
-                # Update ID fields in content
-                revision_content = revision.content
-                revision_content["pk"] = page_copy.pk
-
-                for child_relation in get_all_child_relations(specific_page):
-                    accessor_name = child_relation.get_accessor_name()
-                    try:
-                        child_objects = revision_content[accessor_name]
-                    except KeyError:
-                        # KeyErrors are possible if the revision was created
-                        # before this child relation was added to the database
-                        continue
-
-                    for child_object in child_objects:
-                        child_object[child_relation.field.name] = page_copy.pk
-                        # Remap primary key to copied versions
-                        # If the primary key is not recognised (eg, the child object has been deleted from the database)
-                        # set the primary key to None
-                        copied_child_object = child_object_map.get(
-                            (child_relation, child_object["pk"])
-                        )
-                        child_object["pk"] = (
-                            copied_child_object.pk if copied_child_object else None
-                        )
-                        if (
-                            self.reset_translation_key
-                            and "translation_key" in child_object
-                        ):
-                            child_object[
-                                "translation_key"
-                            ] = self.generate_translation_key(
-                                child_object["translation_key"]
-                            )
-
-                for exclude_field in specific_page.exclude_fields_in_copy:
-                    if exclude_field in revision_content and hasattr(
-                        page_copy, exclude_field
-                    ):
-                        revision_content[exclude_field] = getattr(
-                            page_copy, exclude_field, None
-                        )
-
-                revision.content = revision_content
+                revision.content = self._update_revision_content(
+                    revision.content, specific_page, page_copy, child_object_map
+                )
 
                 # Save
                 revision.save()
@@ -285,33 +344,22 @@ class CopyPageAction:
                 instance=page_copy,
                 action=self.log_action,
                 user=self.user,
-                data={
-                    "page": {
-                        "id": page_copy.id,
-                        "title": page_copy.get_admin_display_title(),
-                        "locale": {
-                            "id": page_copy.locale_id,
-                            "language_code": page_copy.locale.language_code,
-                        },
-                    },
-                    "source": {
+                data=self._get_log_data(
+                    page,
+                    page_copy,
+                    source={
                         "id": parent.id,
                         "title": parent.specific_deferred.get_admin_display_title(),
                     }
                     if parent
                     else None,
-                    "destination": {
+                    destination={
                         "id": to.id,
                         "title": to.specific_deferred.get_admin_display_title(),
                     }
                     if to
                     else None,
-                    "keep_live": page_copy.live and self.keep_live,
-                    "source_locale": {
-                        "id": page.locale_id,
-                        "language_code": page.locale.language_code,
-                    },
-                },
+                ),
             )
             if page_copy.live and self.keep_live:
                 # Log the publish if the use chose to keep the copied page live
@@ -328,7 +376,16 @@ class CopyPageAction:
         # Copy child pages
         from wagtail.models import Page, PageViewRestriction
 
-        if self.recursive:
+        if self.recursive and self.bulk:
+            # Only the page the copy was started from gets here, as its
+            # descendants are all copied in bulk
+            numchild = self._bulk_copy_descendants(page, page_copy)
+
+            if numchild > 0:
+                page_copy.numchild = numchild
+                page_copy.save(clean=False, update_fields=["numchild"])
+
+        elif self.recursive:
             numchild = 0
 
             for child_page in page.get_children().specific().iterator():
@@ -365,9 +422,371 @@ class CopyPageAction:
 
         return page_copy
 
+    def _bulk_copy_descendants(self, page, page_copy):
+        """
+        Copies all descendants of ``page`` to below ``page_copy``, and returns the
+        number of children of ``page_copy``.
+        """
+        from wagtail.models import Locale, Page, Site
+
+        # Work out the tree position of every copy up front, with the children
+        # of each page numbered in order, in the same way as a recursive copy
+        new_paths = {page.path: page_copy.path}
+        numchild = Counter()
+        page_ids = []
+        for page_id, path in (
+            page.get_descendants().order_by("path").values_list("pk", "path")
+        ).iterator():
+            parent_path = path[: -Page.steplen]
+            new_paths[path] = Page._get_path(
+                new_paths[parent_path],
+                len(path) // Page.steplen + page_copy.depth - page.depth,
+                numchild[parent_path],
+            )
+            numchild[parent_path] += 1
+            page_ids.append(page_id)
+
+        # The URL path of the copy of each page with children, and its source and
+        # destination as recorded in the log entries of the copies of its children
+        parent_url_paths = {page.path: page_copy.url_path}
+        parent_log_data = {
+            page.path: (
+                {
+                    "id": page.id,
+                    "title": page.specific_deferred.get_admin_display_title(),
+                },
+                {
+                    "id": page_copy.id,
+                    "title": page_copy.get_admin_display_title(),
+                },
+            )
+        }
+        locales = Locale.objects.in_bulk()
+
+        for start in range(0, len(page_ids), self.batch_size):
+            batch_ids = page_ids[start : start + self.batch_size]
+            pages_by_id = {
+                child_page.pk: child_page
+                for child_page in Page.objects.filter(pk__in=batch_ids).specific()
+            }
+            pages = [pages_by_id.get(page_id) for page_id in batch_ids]
+            if any(
+                child_page is None or child_page.path not in new_paths
+                for child_page in pages
+            ):
+                raise CopyPageIntegrityError(
+                    "The page tree was changed while it was being copied"
+                )
+
+            for child_page in pages:
+                child_page.locale = locales[child_page.locale_id]
+
+            self._bulk_copy_pages(
+                pages, new_paths, numchild, parent_url_paths, parent_log_data
+            )
+
+        if not self.reset_translation_key:
+            # Copies that keep the translation key of a site root are site roots
+            Site.clear_site_root_paths_cache()
+
+        return numchild[page.path]
+
+    def _bulk_copy_pages(
+        self, pages, new_paths, numchild, parent_url_paths, parent_log_data
+    ):
+        """
+        Copies a batch of pages, in tree order, to the positions in ``new_paths``.
+        """
+        from wagtail.models import Page, PageLogEntry, Revision
+
+        # Load the child objects of all pages, and the objects they are related to
+        # with many to many relations, with one query per relation
+        exclude_fields = {}
+        m2m_fields = {}
+        pages_by_class = defaultdict(list)
+        for page in pages:
+            pages_by_class[type(page)].append(page)
+
+        for page_class, class_pages in pages_by_class.items():
+            exclude_fields[page_class] = self._get_exclude_fields(class_pages[0])
+            for child_relation in get_all_child_relations(page_class):
+                accessor_name = child_relation.get_accessor_name()
+                if accessor_name in exclude_fields[page_class]:
+                    continue
+
+                child_objects = defaultdict(list)
+                for (
+                    child_object
+                ) in child_relation.related_model._default_manager.filter(
+                    **{f"{child_relation.field.name}__in": class_pages}
+                ):
+                    child_objects[
+                        getattr(child_object, child_relation.field.attname)
+                    ].append(child_object)
+
+                # Store the child objects on the pages, without saving them
+                for page in class_pages:
+                    getattr(page, accessor_name).set(child_objects[page.pk])
+
+            m2m_fields[page_class] = _get_m2m_fields_to_copy(
+                page_class, exclude_fields[page_class]
+            )
+            prefetch_related_objects(
+                class_pages, *(field.name for field in m2m_fields[page_class])
+            )
+
+        # Copy the pages and their child objects
+        page_copies = []
+        child_object_maps = []
+        for page in pages:
+            page_copy, child_object_map = self._copy_object(
+                page, exclude_fields[type(page)], self._get_base_update_attrs()
+            )
+
+            page_copy.path = new_paths[page.path]
+            page_copy.depth = len(page_copy.path) // Page.steplen
+            page_copy.numchild = numchild[page.path]
+            page_copy.url_path = (
+                parent_url_paths[page.path[: -Page.steplen]] + page_copy.slug + "/"
+            )
+            page_copy.locale = page.locale
+            if page_copy.numchild:
+                parent_url_paths[page.path] = page_copy.url_path
+
+            # Child relations that aren't copied are left empty, rather than
+            # looked up when the copy is serialized
+            for child_relation in get_all_child_relations(page):
+                accessor_name = child_relation.get_accessor_name()
+                if accessor_name in exclude_fields[type(page)]:
+                    getattr(page_copy, accessor_name).set([])
+
+            page_copies.append(page_copy)
+            child_object_maps.append(child_object_map)
+
+        _bulk_create_multi_table(Page, page_copies, batch_size=self.batch_size)
+
+        child_objects = []
+        through_objects = defaultdict(list)
+        for page, page_copy in zip(pages, page_copies):
+            for child_relation in get_all_child_relations(page):
+                accessor_name = child_relation.get_accessor_name()
+                if accessor_name not in exclude_fields[type(page)]:
+                    child_objects.extend(getattr(page_copy, accessor_name).all())
+
+            for field in m2m_fields[type(page)]:
+                values = list(getattr(page, field.name).all())
+                through_objects[field.remote_field.through].extend(
+                    _get_m2m_through_objects(field, page_copy.pk, values)
+                )
+                if isinstance(field, ParentalManyToManyField):
+                    setattr(page_copy, field.name, values)
+
+        _bulk_create_child_objects(child_objects, batch_size=self.batch_size)
+        for through, through_model_objects in through_objects.items():
+            through._default_manager.bulk_create(
+                through_model_objects, batch_size=self.batch_size
+            )
+
+        # Log the creation of the pages, as saving them would
+        log_entries = [
+            self._make_log_entry(
+                page_copy,
+                "wagtail.create",
+                user_id=page_copy.owner_id,
+                content_changed=True,
+            )
+            for page_copy in page_copies
+        ]
+
+        # Copy revisions
+        copied_latest_revisions = {}
+        if self.copy_revisions:
+            revisions = defaultdict(list)
+            for revision in Revision.page_revisions.filter(
+                object_id__in=[str(page.pk) for page in pages]
+            ).order_by("pk"):
+                revisions[revision.object_id].append(revision)
+
+            copied_revisions = []
+            for page, page_copy, child_object_map in zip(
+                pages, page_copies, child_object_maps
+            ):
+                for revision in revisions[str(page.pk)]:
+                    if revision.pk == page.latest_revision_id:
+                        copied_latest_revisions[page_copy.pk] = revision
+                    revision.pk = None
+                    revision._state.adding = True
+                    revision.approved_go_live_at = None
+                    revision.object_id = str(page_copy.pk)
+                    revision.content = self._update_revision_content(
+                        revision.content, page, page_copy, child_object_map
+                    )
+                    copied_revisions.append(revision)
+
+            Revision.objects.bulk_create(copied_revisions, batch_size=self.batch_size)
+
+        # Create a new revision of each page, as Page.save_revision would
+        new_revisions = []
+        for page_copy in page_copies:
+            latest_revision = copied_latest_revisions.get(page_copy.pk)
+            if page_copy.has_unpublished_changes and latest_revision:
+                latest_revision_as_object = page_copy.with_content_json(
+                    latest_revision.content
+                )
+            else:
+                latest_revision_as_object = page_copy
+
+            new_revisions.append(
+                Revision(
+                    content_type=ContentType.objects.get_for_model(
+                        page_copy, for_concrete_model=False
+                    ),
+                    base_content_type=page_copy.get_base_content_type(),
+                    object_id=str(page_copy.pk),
+                    created_at=timezone.now(),
+                    user=self.user,
+                    content=latest_revision_as_object.serializable_data(),
+                    object_str=str(latest_revision_as_object),
+                )
+            )
+            page_copy.draft_title = latest_revision_as_object.title
+
+        Revision.objects.bulk_create(new_revisions, batch_size=self.batch_size)
+
+        update_fields = ["latest_revision", "latest_revision_created_at", "draft_title"]
+        if self.keep_live:
+            update_fields += [
+                "live_revision",
+                "last_published_at",
+                "first_published_at",
+            ]
+
+        for page_copy, revision in zip(page_copies, new_revisions):
+            page_copy.latest_revision = revision
+            page_copy.latest_revision_created_at = revision.created_at
+            if self.keep_live:
+                page_copy.live_revision = revision
+                page_copy.last_published_at = revision.created_at
+                page_copy.first_published_at = revision.created_at
+
+        Page.objects.bulk_update(page_copies, update_fields, batch_size=self.batch_size)
+
+        # Record the source and destination of pages with children, for the log
+        # entries of the copies of their children
+        for page, page_copy in zip(pages, page_copies):
+            if page_copy.numchild:
+                parent_log_data[page.path] = (
+                    {"id": page.id, "title": page.get_admin_display_title()},
+                    {"id": page_copy.id, "title": page_copy.get_admin_display_title()},
+                )
+
+        if self.log_action:
+            for page, page_copy, revision in zip(pages, page_copies, new_revisions):
+                source, destination = parent_log_data[page.path[: -Page.steplen]]
+                log_entries.append(
+                    self._make_log_entry(
+                        page_copy,
+                        self.log_action,
+                        data=self._get_log_data(page, page_copy, source, destination),
+                    )
+                )
+                if page_copy.live and self.keep_live:
+                    # Log the publish if the use chose to keep the copied page live
+                    log_entries.append(
+                        self._make_log_entry(
+                            page_copy, "wagtail.publish", revision=revision
+                        )
+                    )
+
+        PageLogEntry.objects.bulk_create(log_entries, batch_size=self.batch_size)
+
+        self._bulk_update_indexes(page_copies)
+
+        for page, page_copy, revision in zip(pages, page_copies, new_revisions):
+            if page_copy.live:
+                page_published.send(
+                    sender=page_copy.specific_class,
+                    instance=page_copy,
+                    revision=revision,
+                )
+
+            logger.info(
+                'Page copied: "%s" id=%d from=%d',
+                page_copy.title,
+                page_copy.id,
+                page.id,
+            )
+
+    def _make_log_entry(self, page_copy, action, user_id=None, **kwargs):
+        from wagtail.models import PageLogEntry
+
+        log_context = get_active_log_context()
+        if user_id is None:
+            user = self.user or log_context.user
+            user_id = user.pk if user is not None else None
+
+        return PageLogEntry(
+            content_type=ContentType.objects.get_for_model(
+                page_copy, for_concrete_model=False
+            ),
+            label=page_copy.get_admin_display_title(),
+            action=action,
+            timestamp=timezone.now(),
+            user_id=user_id,
+            uuid=log_context.uuid,
+            page_id=page_copy.pk,
+            **kwargs,
+        )
+
+    def _bulk_update_indexes(self, page_copies):
+        """
+        Updates the reference index and search backends for newly copied pages,
+        as the signal handlers for saving them would.
+        """
+        from wagtail.models import PendingReferenceIndexUpdate, ReferenceIndex
+        from wagtail.search.models import PendingIndexUpdate
+        from wagtail.search.signal_handlers import index_queue_enabled
+        from wagtail.signal_handlers import reference_index_auto_update_disabled
+
+        if not getattr(reference_index_auto_update_disabled, "value", False):
+            indexed_copies = [
+                page_copy
+                for page_copy in page_copies
+                if ReferenceIndex.is_indexed(type(page_copy))
+            ]
+            if getattr(settings, "WAGTAIL_REFERENCE_INDEX_DEFERRED", False):
+                PendingReferenceIndexUpdate.enqueue_objects(indexed_copies)
+            else:
+                ReferenceIndex.create_for_new_objects(
+                    indexed_copies, batch_size=self.batch_size
+                )
+
+        indexed_copies = [
+            page_copy
+            for page_copy in page_copies
+            if index.class_is_indexed(type(page_copy))
+            and getattr(type(page_copy), "search_auto_update", True)
+        ]
+        if index_queue_enabled():
+            PendingIndexUpdate.enqueue_objects(
+                indexed_copies, PendingIndexUpdate.UPDATE
+            )
+        else:
+            index.insert_or_update_objects(indexed_copies)
+
     def execute(self, skip_permission_checks=False):
         self.check(skip_permission_checks=skip_permission_checks)
 
+        if self.recursive and self.bulk:
+            # Don't leave a partial copy of the tree if any batch fails
+            with transaction.atomic():
+                return self._copy_page(
+                    self.page,
+                    to=self.to,
+                    update_attrs=self.update_attrs,
+                    exclude_fields=self.exclude_fields,
+                )
+
         return self._copy_page(
             self.page,
             to=self.to,
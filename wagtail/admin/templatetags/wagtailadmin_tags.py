@@ -57,6 +57,7 @@ from wagtail.models import (
     Locale,
     Page,
     PageViewRestriction,
+    ReferenceIndex,
 )
 from wagtail.telepath import JSContext
 from wagtail.users.utils import get_gravatar_url
@@ -209,6 +210,16 @@ def admin_url_name(obj, action):
     return obj.snippet_viewset.get_url_name(action)
 
 
+@register.simple_tag
+def reference_index_has_pending_updates():
+    """
+    Usage: {% reference_index_has_pending_updates as has_pending_updates %}
+    Sets the variable 'has_pending_updates' to True if the reference index has
+    updates that have not been processed yet, so usage counts may be incomplete.
+    """
+    return ReferenceIndex.has_pending_updates()
+
+
 @register.simple_tag
 def latest_str(obj):
     """
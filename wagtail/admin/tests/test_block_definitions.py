@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail import blocks
+from wagtail.blocks.base import BlockWidget
+from wagtail.blocks.definition_cache import (
+    clear_block_definition_cache,
+    get_shared_cache_key,
+)
+from wagtail.test.testapp.models import AddedStreamFieldWithoutDefaultPage
+from wagtail.test.utils import WagtailTestUtils
+
+
+@override_settings(WAGTAILADMIN_BLOCK_DEFINITION_URLS=True)
+class TestBlockDefinitionView(WagtailTestUtils, TestCase):
+    def setUp(self):
+        clear_block_definition_cache()
+        cache.clear()
+        self.login()
+
+        self.widget = BlockWidget(blocks.StreamBlock([("heading", blocks.CharBlock())]))
+        self.url = reverse(
+            "wagtailadmin_block_definition",
+            args=("en", self.widget.block_hash),
+        )
+
+    def test_get(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content.decode(), self.widget.block_json)
+        self.assertEqual(response["ETag"], f'"{self.widget.block_hash}"')
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("no-cache", response["Cache-Control"])
+
+    def test_not_modified(self):
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=f'"{self.widget.block_hash}"'
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], f'"{self.widget.block_hash}"')
+
+    def test_get_from_shared_cache(self):
+        # As in a process that hasn't rendered the widget itself
+        clear_block_definition_cache()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), self.widget.block_json)
+
+    def test_get_stream_field_definition(self):
+        widget = (
+            AddedStreamFieldWithoutDefaultPage._meta.get_field("body")
+            .formfield()
+            .widget
+        )
+        definition_hash = widget.block_hash
+        # As in a process that has neither rendered the widget nor got the
+        # definition from the shared cache
+        clear_block_definition_cache()
+        cache.delete(get_shared_cache_key(definition_hash))
+
+        response = self.client.get(
+            reverse("wagtailadmin_block_definition", args=("en", definition_hash))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), widget.block_json)
+
+    def test_get_stream_field_definition_after_eviction(self):
+        widget = (
+            AddedStreamFieldWithoutDefaultPage._meta.get_field("body")
+            .formfield()
+            .widget
+        )
+        definition_hash = widget.block_hash
+        clear_block_definition_cache()
+        cache.delete(get_shared_cache_key(definition_hash))
+        url = reverse("wagtailadmin_block_definition", args=("en", definition_hash))
+
+        # The definitions packed for every StreamField don't fit in the bounded
+        # cache, but can still be found each time
+        with mock.patch("wagtail.blocks.definition_cache.MAX_DEFINITIONS", 1):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            BlockWidget(blocks.StreamBlock([("other", blocks.CharBlock())])).block_json
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_unknown_hash(self):
+        response = self.client.get(
+            reverse("wagtailadmin_block_definition", args=("en", "0" * 32))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_language(self):
+        response = self.client.get(
+            reverse(
+                "wagtailadmin_block_definition", args=("xx", self.widget.block_hash)
+            )
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_admin_access(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
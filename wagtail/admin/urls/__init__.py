@@ -17,7 +17,14 @@ from wagtail.admin.urls import pages as wagtailadmin_pages_urls
 from wagtail.admin.urls import password_reset as wagtailadmin_password_reset_urls
 from wagtail.admin.urls import reports as wagtailadmin_reports_urls
 from wagtail.admin.urls import workflows as wagtailadmin_workflows_urls
-from wagtail.admin.views import account, chooser, dismissibles, home, tags
+from wagtail.admin.views import (
+    account,
+    block_definitions,
+    chooser,
+    dismissibles,
+    home,
+    tags,
+)
 from wagtail.admin.views.bulk_action import index as bulk_actions
 from wagtail.admin.views.pages import listing
 from wagtail.utils.urlpatterns import decorate_urlpatterns
@@ -181,3 +188,14 @@ urlpatterns = decorate_urlpatterns(urlpatterns, display_custom_404)
 
 # Decorate all views with cache settings to prevent caching
 urlpatterns = decorate_urlpatterns(urlpatterns, never_cache)
+
+
+# Block definitions are served with long-lived cache headers, as their URLs change
+# whenever the definitions do. This must come before the default view.
+urlpatterns = [
+    path(
+        "block-definitions/<str:language>/<str:definition_hash>.json",
+        require_admin_access(block_definitions.block_definition),
+        name="wagtailadmin_block_definition",
+    ),
+] + urlpatterns
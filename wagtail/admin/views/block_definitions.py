@@ -0,0 +1,27 @@
+from django.http import Http404, HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from wagtail.blocks.definition_cache import get_block_definition_json
+
+
+def block_definition(request, language, definition_hash):
+    """
+    Serve the telepath definition of a StreamField's blocks, as packed for the
+    editor by ``BlockWidget``. The URL includes a hash of the definition, so the
+    response never changes and can be cached for as long as the client likes.
+    """
+    if not translation.check_for_language(language):
+        raise Http404
+
+    etag = f'"{definition_hash}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        definition_json = get_block_definition_json(definition_hash, language)
+        if definition_json is None:
+            raise Http404
+        response = HttpResponse(definition_json, content_type="application/json")
+
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=31536000, immutable=True)
+    return response
@@ -22,6 +22,7 @@ class TitleColumn(tables.TitleColumn):
 
 class UsageView(PermissionCheckedMixin, BaseObjectMixin, BaseListingView):
     paginate_by = 20
+    results_template_name = "wagtailadmin/generic/usage_results.html"
     page_title = gettext_lazy("Usage")
     index_url_name = None
     edit_url_name = None
@@ -93,7 +94,7 @@ class UsageView(PermissionCheckedMixin, BaseObjectMixin, BaseListingView):
         return buttons
 
     def get_queryset(self):
-        return ReferenceIndex.get_references_to(self.object).group_by_source_object()
+        return ReferenceIndex.get_grouped_references_to(self.object)
 
     @cached_property
     def columns(self):
@@ -81,7 +81,7 @@ def delete(request, page_id):
                     return redirect(next_url)
                 return redirect("wagtailadmin_explore", parent_id)
 
-    usage = ReferenceIndex.get_references_to(page).group_by_source_object()
+    usage = ReferenceIndex.get_grouped_references_to(page)
     descendant_count = page.get_descendant_count()
     return TemplateResponse(
         request,
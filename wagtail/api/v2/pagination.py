@@ -4,6 +4,8 @@ from django.conf import settings
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
+from wagtail.search.backends.base import BaseSearchResults
+
 from .utils import BadRequestError
 
 
@@ -29,11 +31,29 @@ class WagtailPagination(BasePagination):
         if limit_max and limit > limit_max:
             raise BadRequestError("limit cannot be higher than %d" % limit_max)
 
+        self.view = view
+        self.total_count = queryset.count()
+        self.page = None
+
+        if isinstance(queryset, BaseSearchResults) and "offset" not in request.GET:
+            # Search results are paginated with cursors, which can be passed back
+            # to fetch the next page without the search backend having to skip
+            # over all of the preceding results
+            try:
+                self.page = queryset.after(request.GET.get("cursor"))[:limit]
+            except ValueError:
+                raise BadRequestError("cursor is not valid")
+
+            return self.page
+
+        if "cursor" in request.GET:
+            raise BadRequestError(
+                "cursor can only be used when searching, and not with offset"
+            )
+
         start = offset
         stop = offset + limit
 
-        self.view = view
-        self.total_count = queryset.count()
         return queryset[start:stop]
 
     def get_paginated_response(self, data):
@@ -45,6 +65,11 @@ class WagtailPagination(BasePagination):
                         [
                             ("total_count", self.total_count),
                         ]
+                        + (
+                            [("next_cursor", self.page.next_cursor)]
+                            if self.page is not None
+                            else []
+                        )
                     ),
                 ),
                 ("items", data),
@@ -1283,6 +1283,40 @@ class TestPageListingSearch(WagtailTestUtils, TransactionTestCase):
         self.assertEqual(response["Content-type"], "application/json")
         self.assertEqual(content["meta"]["total_count"], 0)
 
+    def test_search_with_cursor(self):
+        response = self.get_response(search="blog", limit=2)
+        content = json.loads(response.content.decode("UTF-8"))
+        page_id_list = self.get_page_id_list(content)
+        self.assertEqual(len(page_id_list), 2)
+
+        cursor = content["meta"]["next_cursor"]
+        self.assertIsNotNone(cursor)
+
+        response = self.get_response(search="blog", limit=2, cursor=cursor)
+        content = json.loads(response.content.decode("UTF-8"))
+        page_id_list += self.get_page_id_list(content)
+
+        # Check that the two pages contain the blog index and three blog pages
+        self.assertEqual(set(page_id_list), {5, 16, 18, 19})
+        self.assertEqual(len(page_id_list), 4)
+
+    def test_search_with_invalid_cursor_gives_error(self):
+        response = self.get_response(search="blog", cursor="invalid")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "cursor is not valid"})
+
+    def test_cursor_without_search_gives_error(self):
+        response = self.get_response(cursor="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content,
+            {"message": "cursor can only be used when searching, and not with offset"},
+        )
+
 
 class TestPageDetail(TestCase):
     fixtures = ["demosite.json"]
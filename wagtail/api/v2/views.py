@@ -46,6 +46,7 @@ class BaseAPIViewSet(GenericViewSet):
         [
             "limit",
             "offset",
+            "cursor",
             "fields",
             "order",
             "search",
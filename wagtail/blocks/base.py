@@ -3,13 +3,18 @@ import itertools
 import json
 import re
 import warnings
+from contextlib import contextmanager
 from functools import lru_cache
 from importlib import import_module
 
+from asgiref.local import Local
 from django import forms
+from django.conf import settings
 from django.core import checks
 from django.core.exceptions import ImproperlyConfigured
 from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import translation
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.html import format_html
@@ -17,8 +22,11 @@ from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
 
 from wagtail.admin.staticfiles import versioned_static
+from wagtail.blocks.definition_cache import (
+    block_definition_urls_enabled,
+    get_block_definition,
+)
 from wagtail.coreutils import accepts_kwarg
-from wagtail.telepath import JSContext
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
 
 __all__ = [
@@ -201,6 +209,19 @@ class Block(metaclass=BaseBlock):
         """
         return [self.to_python(value) for value in values]
 
+    @cached_property
+    def _chooser_id_collector(self):
+        """
+        A function ``collect(raw_value, ids)`` that adds the IDs of the objects selected by any
+        chooser blocks within a raw (JSON-ish) value of this block to ``ids``, a dict mapping model
+        classes to sets of IDs - or None if this block does not contain any chooser blocks.
+
+        This is compiled once per block definition, so that finding the IDs in a large stream only
+        visits the parts of the stream that can contain chooser blocks. See
+        `prefetch_chooser_objects`.
+        """
+        return None
+
     def get_prep_value(self, value):
         """
         The reverse of to_python; convert the python value into JSON-serialisable form.
@@ -555,6 +576,78 @@ class DeclarativeSubBlocksMetaclass(BaseBlock):
         return new_class
 
 
+_prefetched_chooser_objects = Local()
+
+
+@contextmanager
+def prefetch_chooser_objects(block, values):
+    """
+    A context manager that fetches all of the objects selected by chooser blocks anywhere within
+    ``values``, a list of raw (JSON-ish) values of ``block``, with a single query per model.
+    Within the context, chooser blocks look up objects from this set rather than querying the
+    database themselves, so that converting the values with ``block.bulk_to_python`` does not
+    need a separate query for each chooser block definition or level of nesting.
+
+    Objects that were not prefetched (for example, because a custom block stores its IDs in an
+    unrecognised format) are still fetched by the chooser block as normal. Nested calls reuse
+    the objects fetched by the outermost one.
+    """
+    with prefetch_chooser_objects_for_blocks([(block, values)]):
+        yield
+
+
+@contextmanager
+def prefetch_chooser_objects_for_blocks(blocks_and_values):
+    """
+    Like `prefetch_chooser_objects`, but for raw values of several block definitions at once,
+    given as a list of ``(block, values)`` tuples. This allows values of different blocks (for
+    example, the StreamFields of different page types) to share a single query per model.
+    """
+    collectors_and_values = [
+        (block._chooser_id_collector, values)
+        for block, values in blocks_and_values
+        if block._chooser_id_collector is not None
+    ]
+    if not collectors_and_values or getattr(_prefetched_chooser_objects, "value", None):
+        yield
+        return
+
+    ids_by_model = collections.defaultdict(set)
+    for collector, values in collectors_and_values:
+        for value in values:
+            collector(value, ids_by_model)
+
+    # For each model, record the IDs that were looked up, the objects found, and the
+    # IDs of the objects already handed out to a block (so that blocks selecting the
+    # same object receive distinct instances)
+    _prefetched_chooser_objects.value = {
+        model: (ids, model.objects.in_bulk(ids), set())
+        for model, ids in ids_by_model.items()
+    }
+    try:
+        yield
+    finally:
+        del _prefetched_chooser_objects.value
+
+
+def get_chooser_objects(model, ids):
+    """
+    Return a tuple of ``(objects, seen_ids)``, where ``objects`` is a dict mapping the given IDs
+    to the instances of ``model`` that exist, as for ``in_bulk``, and ``seen_ids`` is the set of
+    IDs whose instances have already been returned to other blocks. Objects prefetched by
+    `prefetch_chooser_objects` are used where available.
+    """
+    prefetched = getattr(_prefetched_chooser_objects, "value", None)
+    if not prefetched or model not in prefetched:
+        return model.objects.in_bulk(ids), set()
+
+    prefetched_ids, objects, seen_ids = prefetched[model]
+    missing_ids = [id for id in ids if id not in prefetched_ids]
+    if missing_ids:
+        objects = {**objects, **model.objects.in_bulk(missing_ids)}
+    return objects, seen_ids
+
+
 # ========================
 # django.forms integration
 # ========================
@@ -568,14 +661,18 @@ class BlockWidget(forms.Widget):
         self.block_def = block_def
         self._js_context = None
         self._block_json = None
+        self._block_hash = None
 
     def _build_block_json(self):
         try:
-            self._js_context = JSContext()
-            self._block_json = json.dumps(self._js_context.pack(self.block_def))
+            definition = get_block_definition(self.block_def)
         except Exception as e:  # noqa: BLE001
             raise ValueError("Error while serializing block definition: %s" % e) from e
 
+        self._js_context = definition.js_context
+        self._block_json = definition.json
+        self._block_hash = definition.hash
+
     @property
     def js_context(self):
         if self._js_context is None:
@@ -590,6 +687,27 @@ class BlockWidget(forms.Widget):
 
         return self._block_json
 
+    @property
+    def block_hash(self):
+        if self._block_hash is None:
+            self._build_block_json()
+
+        return self._block_hash
+
+    @property
+    def block_url(self):
+        """
+        The URL that the block definition is served from, for the client to fetch
+        in place of the definition being included in the HTML of the form.
+        """
+        return reverse(
+            "wagtailadmin_block_definition",
+            kwargs={
+                "language": translation.get_language() or settings.LANGUAGE_CODE,
+                "definition_hash": self.block_hash,
+            },
+        )
+
     def id_for_label(self, prefix):
         # Delegate the job of choosing a label ID to the top-level block.
         # (In practice, the top-level block will typically be a StreamBlock, which returns None.)
@@ -605,6 +723,17 @@ class BlockWidget(forms.Widget):
         else:
             error_json = json.dumps(None)
 
+        if block_definition_urls_enabled():
+            return format_html(
+                """
+                <div id="{id}" data-block data-controller="w-block" data-w-block-url-value="{block_url}" data-w-block-arguments-value="[{value_json},{error_json}]"></div>
+            """,
+                id=name,
+                block_url=self.block_url,
+                value_json=value_json,
+                error_json=error_json,
+            )
+
         return format_html(
             """
                 <div id="{id}" data-block data-controller="w-block" data-w-block-data-value="{block_json}" data-w-block-arguments-value="[{value_json},{error_json}]"></div>
@@ -0,0 +1,232 @@
+"""
+A per-process cache of the telepath definitions that ``BlockWidget`` packs for the
+StreamField editor, so that the definition of a block is packed and serialised once
+per language, rather than on every render of a form.
+
+Definitions are keyed by a hash of the deconstructed form of the block, and are
+identified to clients by a hash of their JSON, which is part of the URL they are
+served from when ``WAGTAILADMIN_BLOCK_DEFINITION_URLS`` is set.
+"""
+
+import functools
+import inspect
+import json
+import threading
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import translation
+from django.utils.functional import Promise
+
+from wagtail.blocks.definition_lookup import BlockDefinitionLookupBuilder
+from wagtail.coreutils import safe_md5
+from wagtail.telepath import JSContext
+
+BLOCK_DEFINITION_CACHE_KEY_PREFIX = "wagtail_block_definition"
+
+# The number of definitions kept in each process
+MAX_DEFINITIONS = 100
+
+
+class BlockDefinition:
+    """
+    The packed telepath definition of a block, along with the ``JSContext`` it was
+    packed with (which holds the media the definition needs).
+    """
+
+    def __init__(self, js_context, definition_json):
+        self.js_context = js_context
+        self.json = definition_json
+        self.hash = safe_md5(
+            definition_json.encode(), usedforsecurity=False
+        ).hexdigest()
+
+
+class UncacheableDefinition(Exception):
+    pass
+
+
+def _encode_key_value(value):
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if (
+        inspect.isfunction(value)
+        or inspect.ismethod(value)
+        or isinstance(value, functools.partial)
+    ):
+        # Functions (such as the choices of a ChoiceBlock, or the default of a
+        # block) may give a different definition each time they are called
+        raise UncacheableDefinition
+    return repr(value)
+
+
+class DefinitionKeyBuilder(BlockDefinitionLookupBuilder):
+    """
+    Collects the deconstructed forms of a block and its descendants, along with
+    the class and meta options of each of them. Blocks with equal deconstructed
+    forms may still differ in these, which affect their packed definitions.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.block_options = []
+
+    def add_block(self, block):
+        meta = block.meta
+        self.block_options.append(
+            (
+                type(block),
+                block.name,
+                {
+                    attr: getattr(meta, attr)
+                    for attr in dir(meta)
+                    if not attr.startswith("_")
+                },
+            )
+        )
+        return super().add_block(block)
+
+
+def get_definition_key(block):
+    """
+    Return a key identifying the packed definition of ``block`` in the active
+    language, or raise ``UncacheableDefinition`` if it can't be cached.
+    """
+    builder = DefinitionKeyBuilder()
+    index = builder.add_block(block)
+    data = json.dumps(
+        [
+            translation.get_language(),
+            index,
+            builder.get_lookup_as_dict(),
+            builder.block_options,
+        ],
+        default=_encode_key_value,
+        sort_keys=True,
+    )
+    return safe_md5(data.encode(), usedforsecurity=False).hexdigest()
+
+
+def pack_block_definition(block):
+    js_context = JSContext()
+    return BlockDefinition(js_context, json.dumps(js_context.pack(block)))
+
+
+_definitions = OrderedDict()
+_definitions_by_hash = {}
+_definitions_lock = threading.Lock()
+
+# The JSON of the definitions of every StreamField, keyed by their hashes, for the
+# languages they have been packed in. These are kept apart from the bounded cache
+# above, so that they can always be found once packed.
+_stream_field_definitions = {}
+_packed_languages = set()
+
+
+def block_definition_urls_enabled():
+    return getattr(settings, "WAGTAILADMIN_BLOCK_DEFINITION_URLS", False)
+
+
+def get_shared_cache_key(definition_hash):
+    return f"{BLOCK_DEFINITION_CACHE_KEY_PREFIX}:{definition_hash}"
+
+
+def get_block_definition(block):
+    """
+    Return the ``BlockDefinition`` of ``block`` in the active language, packing it
+    only if it is not already in the cache.
+    """
+    try:
+        key = get_definition_key(block)
+    except UncacheableDefinition:
+        return pack_block_definition(block)
+
+    with _definitions_lock:
+        definition = _definitions.get(key)
+        if definition is not None:
+            _definitions.move_to_end(key)
+            return definition
+
+    definition = pack_block_definition(block)
+
+    with _definitions_lock:
+        _definitions[key] = definition
+        _definitions_by_hash[definition.hash] = definition
+        while len(_definitions) > MAX_DEFINITIONS:
+            _key, evicted = _definitions.popitem(last=False)
+            if _definitions_by_hash.get(evicted.hash) is evicted:
+                del _definitions_by_hash[evicted.hash]
+
+    if block_definition_urls_enabled():
+        # Other processes may be asked for the definition by its URL
+        cache.set(get_shared_cache_key(definition.hash), definition.json, None)
+
+    return definition
+
+
+def pack_stream_field_definitions():
+    """
+    Pack the definitions of the blocks of every StreamField in the active
+    language, and return their JSON keyed by their hashes.
+    """
+    from wagtail.fields import StreamField
+
+    definitions = {}
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, StreamField):
+                try:
+                    definition = pack_block_definition(field.stream_block)
+                except Exception:  # noqa: BLE001
+                    # The editor can't have been given a definition that can't
+                    # be packed, so there's nothing to find
+                    continue
+                definitions[definition.hash] = definition.json
+    return definitions
+
+
+def get_block_definition_json(definition_hash, language):
+    """
+    Return the JSON of the block definition with the given hash, in
+    ``language``, or ``None`` if it is not known to this process or the cache.
+    """
+    with _definitions_lock:
+        definition = _definitions_by_hash.get(definition_hash)
+    if definition is not None:
+        return definition.json
+
+    definition_json = cache.get(get_shared_cache_key(definition_hash))
+    if definition_json is not None:
+        return definition_json
+
+    # The definition may have been packed by another process for the form of a
+    # model's StreamField. These are packed once per language in each process.
+    if language not in _packed_languages:
+        with translation.override(language):
+            definitions = pack_stream_field_definitions()
+        with _definitions_lock:
+            _stream_field_definitions.update(definitions)
+            _packed_languages.add(language)
+
+    return _stream_field_definitions.get(definition_hash)
+
+
+def clear_block_definition_cache():
+    with _definitions_lock:
+        _definitions.clear()
+        _definitions_by_hash.clear()
+        _stream_field_definitions.clear()
+        _packed_languages.clear()
+
+
+@receiver(setting_changed)
+def reset_block_definition_cache(**kwargs):
+    # Packed definitions may depend on any number of settings (such as the rich
+    # text editors in use) that aren't part of the deconstructed blocks
+    clear_block_definition_cache()
@@ -22,7 +22,7 @@ from wagtail.rich_text import (
 )
 from wagtail.telepath import Adapter, register
 
-from .base import Block
+from .base import Block, get_chooser_objects
 
 try:
     from django.utils.choices import CallableChoiceIterator
@@ -820,8 +820,7 @@ class ChooserBlock(FieldBlock):
         The instances must be returned in the same order as the values and keep None values.
         If the same ID appears multiple times, a distinct object instance is created for each one.
         """
-        objects = self.model_class.objects.in_bulk(values)
-        seen_ids = set()
+        objects, seen_ids = get_chooser_objects(self.model_class, values)
         result = []
 
         for id in values:
@@ -835,6 +834,18 @@ class ChooserBlock(FieldBlock):
 
         return result
 
+    @cached_property
+    def _chooser_id_collector(self):
+        if type(self).bulk_to_python is not ChooserBlock.bulk_to_python:
+            # Objects are looked up in a custom way, so cannot be prefetched
+            return None
+
+        def collect(value, ids):
+            if isinstance(value, (int, str)):
+                ids[self.model_class].add(value)
+
+        return collect
+
     def get_prep_value(self, value):
         # the native value (a model instance or None) should serialise to a PK or None
         if value is None:
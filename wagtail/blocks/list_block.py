@@ -325,6 +325,22 @@ class ListBlock(Block):
 
         return result
 
+    @cached_property
+    def _chooser_id_collector(self):
+        child_collector = self.child_block._chooser_id_collector
+        if child_collector is None:
+            return None
+
+        def collect(value, ids):
+            if isinstance(value, list):
+                for item in value:
+                    if self._item_is_in_block_format(item):
+                        child_collector(item["value"], ids)
+                    else:
+                        child_collector(item, ids)
+
+        return collect
+
     def get_prep_value(self, value):
         # value is expected to be a ListValue, but if it's been assigned through external code it might
         # be a plain list; normalise it to a ListValue
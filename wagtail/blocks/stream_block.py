@@ -23,6 +23,7 @@ from .base import (
     get_error_json_data,
     get_error_list_json_data,
     get_help_icon,
+    prefetch_chooser_objects,
 )
 
 __all__ = [
@@ -293,6 +294,7 @@ class BaseStreamBlock(Block):
         # 2) a 'block map' of each stream, telling us the type and id of each block and the index we
         #    need to look up in the corresponding child_outputs list to obtain its final value
 
+        values = list(values)
         child_inputs = defaultdict(list)
         block_maps = []
 
@@ -313,11 +315,15 @@ class BaseStreamBlock(Block):
             block_maps.append(block_map)
 
         # run each list in child_inputs through the relevant block's bulk_to_python
-        # to obtain child_outputs
-        child_outputs = {
-            block_type: self.child_blocks[block_type].bulk_to_python(child_input_list)
-            for block_type, child_input_list in child_inputs.items()
-        }
+        # to obtain child_outputs, fetching the objects for all chooser blocks in the
+        # streams up front
+        with prefetch_chooser_objects(self, values):
+            child_outputs = {
+                block_type: self.child_blocks[block_type].bulk_to_python(
+                    child_input_list
+                )
+                for block_type, child_input_list in child_inputs.items()
+            }
 
         # for each stream, go through the block map, picking out the appropriately-indexed
         # value from the relevant list in child_outputs
@@ -333,6 +339,26 @@ class BaseStreamBlock(Block):
             for block_map in block_maps
         ]
 
+    @cached_property
+    def _chooser_id_collector(self):
+        collectors = {
+            name: child_block._chooser_id_collector
+            for name, child_block in self.child_blocks.items()
+            if child_block._chooser_id_collector is not None
+        }
+        if not collectors:
+            return None
+
+        def collect(value, ids):
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        collector = collectors.get(item.get("type"))
+                        if collector is not None:
+                            collector(item.get("value"), ids)
+
+        return collect
+
     def get_prep_value(self, value):
         if not value:
             # Falsy values (including None, empty string, empty list, and
@@ -713,7 +739,8 @@ class StreamValue(MutableSequence):
             if self._bound_blocks[i] is None and raw_item["type"] == type_name
         )
         # pass the raw block values to bulk_to_python as a list
-        converted_values = child_block.bulk_to_python(raw_values.values())
+        with prefetch_chooser_objects(child_block, raw_values.values()):
+            converted_values = child_block.bulk_to_python(raw_values.values())
 
         # reunite the converted values with their stream indexes, along with the block ID
         # if one exists
@@ -722,6 +749,54 @@ class StreamValue(MutableSequence):
                 child_block, value, id=self._raw_data[i].get("id")
             )
 
+    def _get_unconverted_raw_data(self):
+        """
+        Return the raw data of the items in this stream that have not been converted to
+        native values yet.
+        """
+        return [
+            self._raw_data[i]
+            for i, bound_block in enumerate(self._bound_blocks)
+            if bound_block is None
+        ]
+
+    def _prefetch_all_blocks(self):
+        """
+        Populate _bound_blocks with all items in this stream that exist in _raw_data but do not
+        already exist in _bound_blocks.
+
+        This groups the items by block type in a single pass over the stream, and fetches the
+        objects for all chooser blocks in those items (at any level of nesting) up front, with a
+        single query per model.
+        """
+        raw_values_by_type = defaultdict(dict)
+        for i, bound_block in enumerate(self._bound_blocks):
+            if bound_block is None:
+                raw_item = self._raw_data[i]
+                raw_values_by_type[raw_item["type"]][i] = raw_item["value"]
+
+        if not raw_values_by_type:
+            return
+
+        with prefetch_chooser_objects(
+            self.stream_block, [self._get_unconverted_raw_data()]
+        ):
+            for type_name, raw_values in raw_values_by_type.items():
+                child_block = self.stream_block.child_blocks[type_name]
+                converted_values = child_block.bulk_to_python(raw_values.values())
+                for i, value in zip(raw_values.keys(), converted_values):
+                    self._bound_blocks[i] = StreamValue.StreamChild(
+                        child_block, value, id=self._raw_data[i].get("id")
+                    )
+
+    def __iter__(self):
+        # Iterating over the stream is likely to access every block, so convert them all
+        # at once rather than one block type at a time
+        if any(bound_block is None for bound_block in self._bound_blocks):
+            self._prefetch_all_blocks()
+
+        return super().__iter__()
+
     def get_prep_value(self):
         prep_value = []
 
@@ -237,6 +237,24 @@ class BaseStructBlock(Block):
         """Return a Structvalue representation of the sub-blocks in this block"""
         return self.meta.value_class(self, block_items)
 
+    @cached_property
+    def _chooser_id_collector(self):
+        collectors = [
+            (name, child_block._chooser_id_collector)
+            for name, child_block in self.child_blocks.items()
+            if child_block._chooser_id_collector is not None
+        ]
+        if not collectors:
+            return None
+
+        def collect(value, ids):
+            if isinstance(value, dict):
+                for name, collector in collectors:
+                    if name in value:
+                        collector(value[name], ids)
+
+        return collect
+
     def get_prep_value(self, value):
         """Recursively call get_prep_value on children and return as a plain dict"""
         return {
@@ -25,10 +25,11 @@ class AzureBaseBackend(BaseBackend):
         self._custom_headers = params.pop("CUSTOM_HEADERS", None)
 
     def purge_batch(self, urls):
-        self._purge_content([self._get_path(url) for url in urls])
+        if not self._purge_content([self._get_path(url) for url in urls]):
+            return list(urls)
 
     def purge(self, url):
-        self.purge_batch([url])
+        return not self.purge_batch([url])
 
     def _get_default_credentials(self):
         try:
@@ -117,6 +118,9 @@ class AzureBaseBackend(BaseBackend):
                     type(self).__name__,
                     exception.response,
                 )
+            return False
+
+        return True
 
 
 class AzureFrontDoorBackend(AzureBaseBackend):
@@ -9,17 +9,42 @@ __all__ = ["BaseBackend"]
 
 
 class BaseBackend:
+    # Whether the backend can purge by the cache tags sent in the ``Surrogate-Key``
+    # and ``Cache-Tag`` headers. The URLs of the pages tagged with them are purged
+    # instead for backends that can't
+    supports_tags = False
+
     def __init__(self, params):
         # If unspecified, invalidate all hosts
         self.hostnames = params.get("HOSTNAMES", ["*"])
 
     def purge(self, url) -> None:
+        """
+        Purge ``url`` from the cache. May return ``False`` if the URL couldn't be
+        purged, so that the purge can be retried.
+        """
         raise NotImplementedError
 
     def purge_batch(self, urls) -> None:
+        """
+        Purge each of ``urls`` from the cache. May return a list of the URLs that
+        couldn't be purged, so that the purges can be retried.
+        """
         # Fallback for backends that do not support batch purging
+        failed_urls = []
         for url in urls:
-            self.purge(url)
+            if self.purge(url) is False:
+                failed_urls.append(url)
+
+        return failed_urls
+
+    def purge_tags(self, tags):
+        """
+        Purge every response tagged with any of ``tags`` from the cache, on backends
+        that set ``supports_tags``. May return a list of the tags that couldn't be
+        purged.
+        """
+        raise NotImplementedError
 
     def invalidates_hostname(self, hostname) -> bool:
         """
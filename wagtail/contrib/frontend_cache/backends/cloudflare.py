@@ -1,8 +1,10 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.core.exceptions import ImproperlyConfigured
 
+from ..utils import get_max_workers
 from .base import BaseBackend
 
 logger = logging.getLogger("wagtail.frontendcache")
@@ -13,6 +15,7 @@ __all__ = ["CloudflareBackend"]
 
 class CloudflareBackend(BaseBackend):
     CHUNK_SIZE = 30
+    supports_tags = True
 
     def __init__(self, params):
         super().__init__(params)
@@ -47,6 +50,12 @@ class CloudflareBackend(BaseBackend):
             )
 
     def _purge_urls(self, urls):
+        return self._purge({"files": urls}, urls)
+
+    def _purge_tags(self, tags):
+        return self._purge({"tags": tags}, tags)
+
+    def _purge(self, data, items):
         try:
             purge_url = (
                 "https://api.cloudflare.com/client/v4/zones/{}/purge_cache".format(
@@ -62,8 +71,6 @@ class CloudflareBackend(BaseBackend):
                 headers["X-Auth-Email"] = self.cloudflare_email
                 headers["X-Auth-Key"] = self.cloudflare_api_key
 
-            data = {"files": urls}
-
             response = requests.delete(
                 purge_url,
                 json=data,
@@ -76,39 +83,66 @@ class CloudflareBackend(BaseBackend):
                 if response.status_code != 200:
                     response.raise_for_status()
                 else:
-                    for url in urls:
+                    for item in items:
                         logger.error(
                             "Couldn't purge '%s' from Cloudflare. Unexpected JSON parse error.",
-                            url,
+                            item,
                         )
+                    return False
 
         except requests.exceptions.HTTPError as e:
-            for url in urls:
+            for item in items:
                 logging.exception(
                     "Couldn't purge '%s' from Cloudflare. HTTPError: %d",
-                    url,
+                    item,
                     e.response.status_code,
                 )
-            return
+            return False
 
         if response_json["success"] is False:
             error_messages = ", ".join(
                 [str(err["message"]) for err in response_json["errors"]]
             )
-            for url in urls:
+            for item in items:
                 logger.error(
                     "Couldn't purge '%s' from Cloudflare. Cloudflare errors '%s'",
-                    url,
+                    item,
                     error_messages,
                 )
-            return
+            return False
+
+        return True
+
+    def _purge_in_chunks(self, purge_chunk, items):
+        items = list(items)
+        chunks = [
+            items[i : i + self.CHUNK_SIZE]
+            for i in range(0, len(items), self.CHUNK_SIZE)
+        ]
+
+        # Send the chunks concurrently
+        max_workers = min(len(chunks), get_max_workers())
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers) as executor:
+                results = list(executor.map(purge_chunk, chunks))
+        else:
+            results = [purge_chunk(chunk) for chunk in chunks]
+
+        failed_items = []
+        for chunk, purged in zip(chunks, results):
+            if purged is False:
+                failed_items.extend(chunk)
+
+        return failed_items
 
     def purge_batch(self, urls):
         # Break the batched URLs in to chunks to fit within Cloudflare's maximum size for
         # the purge_cache call (https://api.cloudflare.com/#zone-purge-files-by-url)
-        for i in range(0, len(urls), self.CHUNK_SIZE):
-            chunk = urls[i : i + self.CHUNK_SIZE]
-            self._purge_urls(chunk)
+        return self._purge_in_chunks(self._purge_urls, urls)
 
     def purge(self, url):
-        self._purge_urls([url])
+        return self._purge_urls([url])
+
+    def purge_tags(self, tags):
+        # Cloudflare limits the number of tags per purge_cache call in the same way
+        return self._purge_in_chunks(self._purge_tags, tags)
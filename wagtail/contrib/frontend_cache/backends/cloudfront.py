@@ -45,7 +45,7 @@ class CloudfrontBackend(BaseBackend):
                 self.hostnames = list(self.cloudfront_distribution_id.keys())
 
     def purge_batch(self, urls):
-        paths_by_distribution_id = defaultdict(set)
+        paths_by_distribution_id = defaultdict(lambda: defaultdict(list))
 
         for url in urls:
             url_parsed = urlparse(url)
@@ -69,13 +69,18 @@ class CloudfrontBackend(BaseBackend):
                 distribution_id = self.cloudfront_distribution_id
 
             if distribution_id:
-                paths_by_distribution_id[distribution_id].add(url_parsed.path)
+                paths_by_distribution_id[distribution_id][url_parsed.path].append(url)
 
-        for distribution_id, paths in paths_by_distribution_id.items():
-            self._create_invalidation(distribution_id, paths)
+        failed_urls = []
+        for distribution_id, urls_by_path in paths_by_distribution_id.items():
+            if not self._create_invalidation(distribution_id, set(urls_by_path)):
+                for urls in urls_by_path.values():
+                    failed_urls.extend(urls)
+
+        return failed_urls
 
     def purge(self, url):
-        self.purge_batch([url])
+        return not self.purge_batch([url])
 
     def _create_invalidation(self, distribution_id, paths):
         import botocore
@@ -97,3 +102,6 @@ class CloudfrontBackend(BaseBackend):
                     e.response["Error"]["Code"],
                     e.response["Error"]["Message"],
                 )
+            return False
+
+        return True
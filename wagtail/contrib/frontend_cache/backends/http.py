@@ -1,10 +1,15 @@
 import logging
-from urllib.error import HTTPError, URLError
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlsplit, urlunsplit
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from wagtail import __version__
 
+from ..utils import get_max_workers
 from .base import BaseBackend
 
 logger = logging.getLogger("wagtail.frontendcache")
@@ -19,11 +24,35 @@ class PurgeRequest(Request):
 
 
 class HTTPBackend(BaseBackend):
+    supports_tags = True
+
+    # A session shared by all instances, so that keep-alive connections to the
+    # cache are reused between purges
+    _session = None
+    _session_lock = threading.Lock()
+
     def __init__(self, params):
         super().__init__(params)
         location_url_parsed = urlsplit(params.pop("LOCATION"))
         self.cache_scheme = location_url_parsed.scheme
         self.cache_netloc = location_url_parsed.netloc
+        self.timeout = params.pop("TIMEOUT", 10)
+        self.tags_header = params.pop("TAGS_HEADER", "Surrogate-Key")
+
+    @classmethod
+    def get_session(cls):
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    # Keep a connection open for each request that can be sent
+                    # concurrently by purge_batch
+                    adapter = HTTPAdapter(pool_maxsize=get_max_workers())
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+
+        return cls._session
 
     def purge(self, url):
         url_parsed = urlsplit(url)
@@ -33,8 +62,9 @@ class HTTPBackend(BaseBackend):
         if url_parsed.port:
             host += ":" + str(url_parsed.port)
 
-        request = PurgeRequest(
-            url=urlunsplit(
+        return self._send_purge_request(
+            url,
+            urlunsplit(
                 [
                     self.cache_scheme,
                     self.cache_netloc,
@@ -43,22 +73,61 @@ class HTTPBackend(BaseBackend):
                     url_parsed.fragment,
                 ]
             ),
-            headers={
-                "Host": host,
-                "User-Agent": "Wagtail-frontendcache/" + __version__,
-            },
+            {"Host": host},
+        )
+
+    def purge_tags(self, tags):
+        tags = list(tags)
+
+        # All the tags are sent in a single request to the root of the cache, which
+        # must be configured to purge the responses tagged with any of them
+        purged = self._send_purge_request(
+            " ".join(tags),
+            urlunsplit([self.cache_scheme, self.cache_netloc, "/", "", ""]),
+            {self.tags_header: " ".join(tags)},
         )
 
+        return [] if purged else tags
+
+    def _send_purge_request(self, description, url, headers):
         try:
-            urlopen(request)
-        except HTTPError as e:
+            response = self.get_session().request(
+                "PURGE",
+                url,
+                headers={
+                    **headers,
+                    "User-Agent": "Wagtail-frontendcache/" + __version__,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
             logger.error(
                 "Couldn't purge '%s' from HTTP cache. HTTPError: %d %s",
-                url,
-                e.code,
-                e.reason,
+                description,
+                e.response.status_code,
+                e.response.reason,
             )
-        except URLError as e:
+            return False
+        except requests.exceptions.RequestException as e:
             logger.error(
-                "Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason
+                "Couldn't purge '%s' from HTTP cache. %s: %s",
+                description,
+                type(e).__name__,
+                e,
             )
+            return False
+
+        return True
+
+    def purge_batch(self, urls):
+        urls = list(urls)
+        max_workers = min(len(urls), get_max_workers())
+        if max_workers <= 1:
+            return super().purge_batch(urls)
+
+        # Send the purge requests concurrently
+        with ThreadPoolExecutor(max_workers) as executor:
+            results = list(executor.map(self.purge, urls))
+
+        return [url for url, purged in zip(urls, results) if purged is False]
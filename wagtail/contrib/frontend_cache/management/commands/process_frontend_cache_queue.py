@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.frontend_cache.models import PendingPurge
+
+
+class Command(BaseCommand):
+    """Command to purge the URLs queued while WAGTAILFRONTENDCACHE_DEFERRED or WAGTAILFRONTENDCACHE_RETRY_FAILED_PURGES is set."""
+
+    help = (
+        "Purges the queued URLs that are due to be purged from the frontend cache, "
+        "optionally polling the queue until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of queued purges to claim at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue for new purges instead of exiting once none are due",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Number of seconds to wait between polls of the queue when none are due, when using --loop (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        num_processed = 0
+
+        while True:
+            processed = PendingPurge.process_pending(limit=options["batch_size"])
+            num_processed += processed
+
+            if not processed:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully processed {num_processed} purge(s)")
+            )
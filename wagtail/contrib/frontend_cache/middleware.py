@@ -0,0 +1,21 @@
+from django.utils.deprecation import MiddlewareMixin
+
+from wagtail.contrib.frontend_cache.utils import get_page_cache_tags
+
+
+class CacheTagMiddleware(MiddlewareMixin):
+    """
+    Adds ``Surrogate-Key`` and ``Cache-Tag`` headers to the responses of pages
+    served by Wagtail, listing the cache tags of the page and of the objects it
+    references, so that they can be purged by tag when those objects change.
+    """
+
+    def process_response(self, request, response):
+        page = getattr(request, "_frontend_cache_page", None)
+        if page is None or response.has_header("Surrogate-Key"):
+            return response
+
+        tags = get_page_cache_tags(page)
+        response["Surrogate-Key"] = " ".join(tags)
+        response["Cache-Tag"] = ",".join(tags)
+        return response
@@ -0,0 +1,156 @@
+import datetime
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+logger = logging.getLogger("wagtail.frontendcache")
+
+
+class PendingPurge(models.Model):
+    """
+    A URL waiting to be purged from the cache of a frontend cache backend, either
+    because ``WAGTAILFRONTENDCACHE_DEFERRED`` is set, or because purging it failed
+    and ``WAGTAILFRONTENDCACHE_RETRY_FAILED_PURGES`` is set.
+
+    Entries are processed, and removed, by the ``process_frontend_cache_queue``
+    management command. Failed purges are retried after a delay that doubles with
+    each attempt, until ``WAGTAILFRONTENDCACHE_MAX_ATTEMPTS`` is reached.
+    """
+
+    # The delay before the first retry of a failed purge, in seconds
+    RETRY_DELAY = 60
+
+    # The maximum delay between retries, in seconds
+    MAX_RETRY_DELAY = 60 * 60
+
+    backend_name = models.CharField(max_length=255)
+    url = models.TextField()
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        verbose_name = _("pending frontend cache purge")
+        verbose_name_plural = _("pending frontend cache purges")
+
+    def __str__(self):
+        return f"Pending purge of {self.url} from {self.backend_name}"
+
+    @classmethod
+    def get_retry_delay(cls, attempts):
+        return datetime.timedelta(
+            seconds=min(cls.RETRY_DELAY * 2 ** (attempts - 1), cls.MAX_RETRY_DELAY)
+        )
+
+    @classmethod
+    def enqueue(cls, urls_by_backend, attempts=0):
+        """
+        Queue the URLs in ``urls_by_backend``, a dict mapping backend names to lists
+        of URLs, to be purged. If ``attempts`` is given, the purges have already
+        failed that many times, and are retried after a delay.
+        """
+        next_attempt_at = timezone.now()
+        if attempts:
+            next_attempt_at += cls.get_retry_delay(attempts)
+
+        cls.objects.bulk_create(
+            [
+                cls(
+                    backend_name=backend_name,
+                    url=url,
+                    attempts=attempts,
+                    next_attempt_at=next_attempt_at,
+                )
+                for backend_name, urls in urls_by_backend.items()
+                for url in set(urls)
+            ]
+        )
+
+    @classmethod
+    def process_pending(cls, limit=None):
+        """
+        Purge the URLs that are due to be purged, processing at most ``limit``
+        entries if given, and return the number of entries processed. The URLs of
+        each backend are sent to it as a single batch, and the backends purge
+        concurrently.
+
+        Entries claimed by another process at the same time are skipped, on
+        databases that support ``SELECT ... FOR UPDATE SKIP LOCKED``. Entries that
+        fail to purge are kept to be retried later.
+        """
+        from wagtail.contrib.frontend_cache.utils import (
+            _purge_with_backends,
+            get_backends,
+        )
+
+        max_attempts = getattr(settings, "WAGTAILFRONTENDCACHE_MAX_ATTEMPTS", 5)
+        now = timezone.now()
+
+        with transaction.atomic():
+            entries = (
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "pk")
+            )
+            if limit is not None:
+                entries = entries[:limit]
+            entries = list(entries)
+
+            if not entries:
+                return 0
+
+            backends = get_backends()
+            urls_by_backend = defaultdict(set)
+            for entry in entries:
+                if entry.backend_name in backends:
+                    urls_by_backend[entry.backend_name].add(entry.url)
+                else:
+                    logger.warning(
+                        "Discarding purge of '%s' for unknown frontend cache backend '%s'",
+                        entry.url,
+                        entry.backend_name,
+                    )
+
+            failed_urls_by_backend = _purge_with_backends(
+                backends,
+                {
+                    backend_name: sorted(urls)
+                    for backend_name, urls in urls_by_backend.items()
+                },
+            )
+            failed_urls = {
+                (backend_name, url)
+                for backend_name, urls in failed_urls_by_backend.items()
+                for url in urls
+            }
+
+            done = []
+            retry = []
+            for entry in entries:
+                if (entry.backend_name, entry.url) not in failed_urls:
+                    done.append(entry.pk)
+                    continue
+
+                entry.attempts += 1
+                if entry.attempts >= max_attempts:
+                    logger.error(
+                        "Giving up purging '%s' from frontend cache backend '%s' after %d attempts",
+                        entry.url,
+                        entry.backend_name,
+                        entry.attempts,
+                    )
+                    done.append(entry.pk)
+                else:
+                    entry.next_attempt_at = now + cls.get_retry_delay(entry.attempts)
+                    retry.append(entry)
+
+            cls.objects.filter(pk__in=done).delete()
+            cls.objects.bulk_update(retry, ["attempts", "next_attempt_at"])
+
+        return len(entries)
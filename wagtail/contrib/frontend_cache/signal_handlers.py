@@ -1,15 +1,57 @@
 from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 
-from wagtail.contrib.frontend_cache.utils import purge_page_from_cache
-from wagtail.signals import page_published, page_unpublished
+from wagtail.contrib.frontend_cache.utils import (
+    get_cache_tag,
+    purge_pages_on_commit,
+    purge_tags_on_commit,
+)
+from wagtail.signals import page_published, page_unpublished, published, unpublished
 
 
 def page_published_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    purge_pages_on_commit([instance])
 
 
 def page_unpublished_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    purge_pages_on_commit([instance])
+
+
+def purge_tags_for_object(instance):
+    from django.contrib.sessions.base_session import AbstractBaseSession
+
+    model = type(instance)
+    if getattr(model, "wagtail_reference_index_ignore", False) or issubclass(
+        model, AbstractBaseSession
+    ):
+        return
+
+    purge_tags_on_commit([get_cache_tag(instance)])
+
+
+def object_published_signal_handler(instance, **kwargs):
+    if getattr(settings, "WAGTAILFRONTENDCACHE_CACHE_TAGS", False):
+        purge_tags_for_object(instance)
+
+
+def object_saved_signal_handler(instance, raw=False, **kwargs):
+    from wagtail.models import DraftStateMixin
+
+    if not getattr(settings, "WAGTAILFRONTENDCACHE_CACHE_TAGS", False) or raw:
+        return
+
+    # Saving a draft doesn't change the live object, so objects with draft
+    # states are only purged when they are published or unpublished
+    if isinstance(instance, DraftStateMixin):
+        return
+
+    purge_tags_for_object(instance)
+
+
+def object_deleted_signal_handler(instance, **kwargs):
+    if getattr(settings, "WAGTAILFRONTENDCACHE_CACHE_TAGS", False):
+        purge_tags_for_object(instance)
 
 
 def register_signal_handlers():
@@ -21,3 +63,10 @@ def register_signal_handlers():
     for model in indexed_models:
         page_published.connect(page_published_signal_handler, sender=model)
         page_unpublished.connect(page_unpublished_signal_handler, sender=model)
+
+    # Purge the cache tags of any object that is changed, as it may be referenced
+    # by pages (see WAGTAILFRONTENDCACHE_CACHE_TAGS)
+    published.connect(object_published_signal_handler)
+    unpublished.connect(object_published_signal_handler)
+    post_save.connect(object_saved_signal_handler)
+    post_delete.connect(object_deleted_signal_handler)
@@ -1,12 +1,17 @@
+import datetime
+from io import StringIO
 from unittest import mock
-from urllib.error import HTTPError, URLError
 
 import requests
 from azure.mgmt.cdn import CdnManagementClient
 from azure.mgmt.frontdoor import FrontDoorManagementClient
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase
 from django.test.utils import override_settings
+from django.utils import timezone
 
 from wagtail.contrib.frontend_cache.backends import (
     AzureCdnBackend,
@@ -16,9 +21,16 @@ from wagtail.contrib.frontend_cache.backends import (
     CloudfrontBackend,
     HTTPBackend,
 )
-from wagtail.contrib.frontend_cache.utils import get_backends
-from wagtail.models import Page
-from wagtail.test.testapp.models import EventIndex
+from wagtail.contrib.frontend_cache.models import PendingPurge
+from wagtail.contrib.frontend_cache.utils import (
+    get_backends,
+    get_cache_tag,
+    get_page_cache_tags,
+    purge_tags_from_cache,
+)
+from wagtail.images import get_image_model
+from wagtail.models import Page, ReferenceIndex
+from wagtail.test.testapp.models import EventIndex, EventPage
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
 
 from .utils import (
@@ -27,6 +39,7 @@ from .utils import (
     purge_pages_from_cache,
     purge_url_from_cache,
     purge_urls_from_cache,
+    purge_urls_on_commit,
 )
 
 
@@ -264,38 +277,40 @@ class TestBackendConfiguration(SimpleTestCase):
         self.assertEqual(call_args[1], ["/home/events/christmas/?test=1", "/blog/"])
 
     def test_http(self):
-        """Test that `HTTPBackend.purge` works when urlopen succeeds"""
-        self._test_http_with_side_effect(urlopen_side_effect=None)
+        """Test that `HTTPBackend.purge` works when the request succeeds"""
+        self.assertIs(self._test_http_with_side_effect(request_side_effect=None), True)
 
     def test_http_httperror(self):
         """Test that `HTTPBackend.purge` can handle `HTTPError`"""
-        http_error = HTTPError(
-            url="http://localhost:8000/home/events/christmas/",
-            code=500,
-            msg="Internal Server Error",
-            hdrs={},
-            fp=None,
-        )
+        response = requests.Response()
+        response.status_code = 500
+        response.reason = "Internal Server Error"
+        http_error = requests.exceptions.HTTPError(response=response)
         with self.assertLogs(level="ERROR") as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=http_error)
+            purged = self._test_http_with_side_effect(request_side_effect=http_error)
 
+        self.assertIs(purged, False)
         self.assertIn(
             "Couldn't purge 'http://www.wagtail.org/home/events/christmas/' from HTTP cache. HTTPError: 500 Internal Server Error",
             log_output.output[0],
         )
 
-    def test_http_urlerror(self):
-        """Test that `HTTPBackend.purge` can handle `URLError`"""
-        url_error = URLError(reason="just for tests")
+    def test_http_connectionerror(self):
+        """Test that `HTTPBackend.purge` can handle `ConnectionError`"""
+        connection_error = requests.exceptions.ConnectionError("just for tests")
         with self.assertLogs(level="ERROR") as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=url_error)
+            purged = self._test_http_with_side_effect(
+                request_side_effect=connection_error
+            )
+
+        self.assertIs(purged, False)
         self.assertIn(
-            "Couldn't purge 'http://www.wagtail.org/home/events/christmas/' from HTTP cache. URLError: just for tests",
+            "Couldn't purge 'http://www.wagtail.org/home/events/christmas/' from HTTP cache. ConnectionError: just for tests",
             log_output.output[0],
         )
 
-    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
-    def _test_http_with_side_effect(self, urlopen_mock, urlopen_side_effect):
+    @mock.patch.object(HTTPBackend, "get_session")
+    def _test_http_with_side_effect(self, get_session_mock, request_side_effect):
         # given a backends configuration with one HTTP backend
         backends = get_backends(
             backend_settings={
@@ -307,19 +322,50 @@ class TestBackendConfiguration(SimpleTestCase):
         )
         self.assertEqual(set(backends.keys()), {"varnish"})
         self.assertIsInstance(backends["varnish"], HTTPBackend)
-        # and mocked urlopen that may or may not raise network-related exception
-        urlopen_mock.side_effect = urlopen_side_effect
+        # and a mocked session whose requests may or may not raise network-related exception
+        request_mock = get_session_mock.return_value.request
+        request_mock.side_effect = request_side_effect
 
         # when making a purge request
-        backends.get("varnish").purge("http://www.wagtail.org/home/events/christmas/")
+        purged = backends.get("varnish").purge(
+            "http://www.wagtail.org/home/events/christmas/"
+        )
 
         # then no exception is raised
-        # and mocked urlopen is called with a proper purge request
-        self.assertEqual(urlopen_mock.call_count, 1)
-        (purge_request,), _call_kwargs = urlopen_mock.call_args
-        self.assertEqual(
-            purge_request.full_url, "http://localhost:8000/home/events/christmas/"
-        )
+        # and the mocked session is sent a proper purge request
+        self.assertEqual(request_mock.call_count, 1)
+        (method, url), call_kwargs = request_mock.call_args
+        self.assertEqual(method, "PURGE")
+        self.assertEqual(url, "http://localhost:8000/home/events/christmas/")
+        self.assertEqual(call_kwargs["headers"]["Host"], "www.wagtail.org")
+        self.assertEqual(call_kwargs["timeout"], 10)
+
+        return purged
+
+    @mock.patch.object(HTTPBackend, "get_session")
+    def test_http_purge_batch(self, get_session_mock):
+        backend = HTTPBackend({"LOCATION": "http://localhost:8000"})
+        response = requests.Response()
+        response.status_code = 404
+        response.reason = "Not Found"
+
+        def request(method, url, **kwargs):
+            if url.endswith("/missing/"):
+                raise requests.exceptions.HTTPError(response=response)
+            return mock.Mock()
+
+        get_session_mock.return_value.request.side_effect = request
+        urls = [f"http://localhost/page-{i}/" for i in range(20)]
+
+        with self.assertLogs(level="ERROR"):
+            failed_urls = backend.purge_batch(urls + ["http://localhost/missing/"])
+
+        # Every URL is purged, and those that couldn't be are returned
+        self.assertEqual(get_session_mock.return_value.request.call_count, 21)
+        self.assertEqual(failed_urls, ["http://localhost/missing/"])
+
+    def test_http_session_is_shared(self):
+        self.assertIs(HTTPBackend.get_session(), HTTPBackend.get_session())
 
     def test_cloudfront_validate_distribution_id(self):
         with self.assertRaises(ImproperlyConfigured):
@@ -418,6 +464,7 @@ class TestBackendConfiguration(SimpleTestCase):
 
 
 PURGED_URLS = set()
+PURGED_TAGS = set()
 
 
 class MockBackend(BaseBackend):
@@ -425,6 +472,21 @@ class MockBackend(BaseBackend):
         PURGED_URLS.add(url)
 
 
+class MockTagsBackend(MockBackend):
+    supports_tags = True
+
+    def purge_tags(self, tags):
+        PURGED_TAGS.update(tags)
+
+
+class FailingMockBackend(BaseBackend):
+    def purge(self, url):
+        if "fail" in url:
+            return False
+
+        PURGED_URLS.add(url)
+
+
 class MockCloudflareBackend(CloudflareBackend):
     def _purge_urls(self, urls):
         if len(urls) > self.CHUNK_SIZE:
@@ -544,14 +606,32 @@ class TestCachePurgingSignals(TestCase):
 
     def test_purge_on_publish(self):
         page = EventIndex.objects.get(url_path="/home/events/")
-        page.save_revision().publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
         self.assertEqual(
             PURGED_URLS, {"http://localhost/events/", "http://localhost/events/past/"}
         )
 
     def test_purge_on_unpublish(self):
         page = EventIndex.objects.get(url_path="/home/events/")
-        page.unpublish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.unpublish()
+        self.assertEqual(
+            PURGED_URLS, {"http://localhost/events/", "http://localhost/events/past/"}
+        )
+
+    def test_purge_after_commit(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+        with self.captureOnCommitCallbacks() as callbacks:
+            page.save_revision().publish()
+            page.save_revision().publish()
+
+            # Nothing is purged until the transaction is committed
+            self.assertEqual(PURGED_URLS, set())
+
+        for callback in callbacks:
+            callback()
+
         self.assertEqual(
             PURGED_URLS, {"http://localhost/events/", "http://localhost/events/past/"}
         )
@@ -560,7 +640,8 @@ class TestCachePurgingSignals(TestCase):
         root = Page.objects.get(url_path="/")
         page = EventIndex(title="new top-level page")
         root.add_child(instance=page)
-        page.save_revision().publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
         self.assertEqual(PURGED_URLS, set())
 
     @override_settings(
@@ -570,7 +651,8 @@ class TestCachePurgingSignals(TestCase):
     )
     def test_purge_on_publish_in_multilang_env(self):
         page = EventIndex.objects.get(url_path="/home/events/")
-        page.save_revision().publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
 
         self.assertEqual(
             PURGED_URLS,
@@ -592,7 +674,8 @@ class TestCachePurgingSignals(TestCase):
     )
     def test_purge_on_publish_with_i18n_enabled(self):
         page = EventIndex.objects.get(url_path="/home/events/")
-        page.save_revision().publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
 
         self.assertEqual(
             PURGED_URLS,
@@ -612,7 +695,8 @@ class TestCachePurgingSignals(TestCase):
     def test_purge_on_publish_without_i18n_enabled(self):
         # It should ignore WAGTAIL_CONTENT_LANGUAGES as WAGTAIL_I18N_ENABLED isn't set
         page = EventIndex.objects.get(url_path="/home/events/")
-        page.save_revision().publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
         self.assertEqual(
             PURGED_URLS,
             {"http://localhost/en/events/", "http://localhost/en/events/past/"},
@@ -702,3 +786,400 @@ class TestPurgeBatchClass(TestCase):
             "Couldn't purge 'http://localhost/events/' from Cloudflare. HTTPError: 500",
             log_output.output[0],
         )
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBackend",
+        },
+    }
+)
+class TestPurgeOnCommit(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_URLS.clear()
+
+    @mock.patch("wagtail.contrib.frontend_cache.utils.purge_urls_from_cache")
+    def test_urls_purged_once_after_commit(self, purge_urls_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_on_commit(["http://localhost/foo", "http://localhost/bar"])
+            PurgeBatch(["http://localhost/foo"]).purge_on_commit()
+
+            purge_urls_mock.assert_not_called()
+
+        # The URLs added during the transaction are purged together, once each
+        purge_urls_mock.assert_called_once_with(
+            {"http://localhost/foo", "http://localhost/bar"}
+        )
+
+    @mock.patch("wagtail.contrib.frontend_cache.utils.purge_urls_from_cache")
+    def test_urls_not_purged_on_rollback(self, purge_urls_mock):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    purge_urls_on_commit(["http://localhost/foo"])
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        purge_urls_mock.assert_not_called()
+
+        # The URLs are discarded, rather than purged with those of the next
+        # committed transaction
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_on_commit(["http://localhost/bar"])
+
+        purge_urls_mock.assert_called_once_with({"http://localhost/bar"})
+
+    @mock.patch("wagtail.contrib.frontend_cache.utils.purge_urls_from_cache")
+    def test_urls_purged_after_savepoint_rollback(self, purge_urls_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    purge_urls_on_commit(["http://localhost/foo"])
+                    raise ValueError
+            except ValueError:
+                pass
+
+            purge_urls_on_commit(["http://localhost/bar"])
+
+        purge_urls_mock.assert_called_once_with({"http://localhost/bar"})
+
+    @mock.patch("wagtail.contrib.frontend_cache.utils.purge_urls_from_cache")
+    def test_urls_purged_once_from_committed_savepoints(self, purge_urls_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_on_commit(["http://localhost/foo"])
+            with transaction.atomic():
+                purge_urls_on_commit(["http://localhost/foo", "http://localhost/bar"])
+
+        purge_urls_mock.assert_called_once_with(
+            {"http://localhost/foo", "http://localhost/bar"}
+        )
+
+    @override_settings(WAGTAILFRONTENDCACHE_DEFERRED=True)
+    def test_deferred(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        # The URLs are queued rather than purged
+        self.assertEqual(PURGED_URLS, set())
+        self.assertEqual(
+            set(PendingPurge.objects.values_list("backend_name", "url")),
+            {
+                ("varnish", "http://localhost/events/"),
+                ("varnish", "http://localhost/events/past/"),
+            },
+        )
+
+        stdout = StringIO()
+        call_command("process_frontend_cache_queue", stdout=stdout)
+
+        self.assertEqual(
+            PURGED_URLS, {"http://localhost/events/", "http://localhost/events/past/"}
+        )
+        self.assertFalse(PendingPurge.objects.exists())
+        self.assertIn("Successfully processed 2 purge(s)", stdout.getvalue())
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.FailingMockBackend",
+        },
+        "cloudflare": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockCloudflareBackend",
+            "ZONEID": "zone",
+            "BEARER_TOKEN": "token",
+        },
+    },
+    WAGTAILFRONTENDCACHE_RETRY_FAILED_PURGES=True,
+    WAGTAILFRONTENDCACHE_MAX_ATTEMPTS=3,
+)
+class TestRetryFailedPurges(TestCase):
+    def setUp(self):
+        PURGED_URLS.clear()
+
+    def make_due(self):
+        PendingPurge.objects.update(next_attempt_at=timezone.now())
+
+    def test_failed_purges_are_queued(self):
+        purge_urls_from_cache(["http://localhost/foo", "http://localhost/fail"])
+
+        # Both backends purge the URLs they can
+        self.assertEqual(PURGED_URLS, {"http://localhost/foo", "http://localhost/fail"})
+
+        # Only the URL that failed is queued, for the backend that failed
+        pending_purge = PendingPurge.objects.get()
+        self.assertEqual(pending_purge.backend_name, "varnish")
+        self.assertEqual(pending_purge.url, "http://localhost/fail")
+        self.assertEqual(pending_purge.attempts, 1)
+        self.assertGreater(
+            pending_purge.next_attempt_at,
+            timezone.now() + datetime.timedelta(seconds=50),
+        )
+
+    @override_settings(WAGTAILFRONTENDCACHE_RETRY_FAILED_PURGES=False)
+    def test_failed_purges_not_queued_by_default(self):
+        purge_urls_from_cache(["http://localhost/fail"])
+        self.assertFalse(PendingPurge.objects.exists())
+
+    def test_failed_purges_not_queued_with_backend_settings(self):
+        purge_urls_from_cache(
+            ["http://localhost/fail"],
+            backend_settings={
+                "varnish": {
+                    "BACKEND": "wagtail.contrib.frontend_cache.tests.FailingMockBackend",
+                },
+            },
+        )
+        self.assertFalse(PendingPurge.objects.exists())
+
+    def test_retry_with_backoff(self):
+        purge_urls_from_cache(["http://localhost/fail"])
+
+        # The purge isn't retried until it is due
+        self.assertEqual(PendingPurge.process_pending(), 0)
+
+        self.make_due()
+        self.assertEqual(PendingPurge.process_pending(), 1)
+
+        # The delay doubles on each failed attempt
+        pending_purge = PendingPurge.objects.get()
+        self.assertEqual(pending_purge.attempts, 2)
+        self.assertGreater(
+            pending_purge.next_attempt_at,
+            timezone.now() + datetime.timedelta(seconds=110),
+        )
+
+        # The purge is given up once WAGTAILFRONTENDCACHE_MAX_ATTEMPTS is reached
+        self.make_due()
+        with self.assertLogs("wagtail.frontendcache", level="ERROR") as log_output:
+            self.assertEqual(PendingPurge.process_pending(), 1)
+
+        self.assertFalse(PendingPurge.objects.exists())
+        self.assertIn(
+            "Giving up purging 'http://localhost/fail' from frontend cache backend 'varnish' after 3 attempts",
+            log_output.output[0],
+        )
+
+    def test_retry_succeeds(self):
+        PendingPurge.enqueue({"cloudflare": ["http://localhost/foo"]}, attempts=1)
+        self.make_due()
+
+        self.assertEqual(PendingPurge.process_pending(limit=10), 1)
+        self.assertEqual(PURGED_URLS, {"http://localhost/foo"})
+        self.assertFalse(PendingPurge.objects.exists())
+
+    def test_unknown_backend_is_discarded(self):
+        PendingPurge.enqueue({"removed": ["http://localhost/foo"]})
+
+        with self.assertLogs("wagtail.frontendcache", level="WARNING"):
+            self.assertEqual(PendingPurge.process_pending(), 1)
+
+        self.assertEqual(PURGED_URLS, set())
+        self.assertFalse(PendingPurge.objects.exists())
+
+    def test_backend_exception_is_retried(self):
+        with mock.patch.object(
+            MockCloudflareBackend, "purge_batch", side_effect=Exception("Oops")
+        ):
+            with self.assertLogs("wagtail.frontendcache", level="ERROR"):
+                purge_urls_from_cache(["http://localhost/foo"])
+
+        # The other backend is unaffected
+        self.assertEqual(PURGED_URLS, {"http://localhost/foo"})
+        self.assertEqual(
+            list(PendingPurge.objects.values_list("backend_name", "url")),
+            [("cloudflare", "http://localhost/foo")],
+        )
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockTagsBackend",
+        },
+        "cloudfront": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_CACHE_TAGS=True,
+)
+class TestCacheTags(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_URLS.clear()
+        PURGED_TAGS.clear()
+
+        self.image = get_image_model().objects.get(id=1)
+        self.page = EventPage.objects.get(url_path="/home/events/christmas/")
+        self.other_page = EventPage.objects.get(url_path="/home/events/final-event/")
+        ReferenceIndex.create_or_update_for_object(self.page)
+        ReferenceIndex.create_or_update_for_object(self.other_page)
+
+    def test_get_cache_tag(self):
+        self.assertEqual(get_cache_tag(self.image), "wagtailimages.image:1")
+
+        # Pages are tagged by their base model
+        self.assertEqual(get_cache_tag(self.page), f"wagtailcore.page:{self.page.id}")
+
+    def test_get_page_cache_tags(self):
+        self.assertEqual(
+            get_page_cache_tags(self.page),
+            [
+                f"wagtailcore.page:{self.page.id}",
+                "wagtailimages.image:1",
+                "tests.advert:1",
+            ],
+        )
+
+    def test_get_page_cache_tags_from_page_type(self):
+        with mock.patch.object(
+            EventPage, "get_cache_tags", create=True, return_value=["custom"]
+        ):
+            tags = get_page_cache_tags(self.page)
+
+        self.assertEqual(
+            tags,
+            [
+                f"wagtailcore.page:{self.page.id}",
+                "wagtailimages.image:1",
+                "tests.advert:1",
+                "custom",
+            ],
+        )
+
+    @override_settings(
+        MIDDLEWARE=settings.MIDDLEWARE
+        + ("wagtail.contrib.frontend_cache.middleware.CacheTagMiddleware",)
+    )
+    def test_middleware(self):
+        response = self.client.get("/events/christmas/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Surrogate-Key"],
+            f"wagtailcore.page:{self.page.id} wagtailimages.image:1 tests.advert:1",
+        )
+        self.assertEqual(
+            response["Cache-Tag"],
+            f"wagtailcore.page:{self.page.id},wagtailimages.image:1,tests.advert:1",
+        )
+
+    @override_settings(
+        MIDDLEWARE=settings.MIDDLEWARE
+        + ("wagtail.contrib.frontend_cache.middleware.CacheTagMiddleware",)
+    )
+    def test_middleware_ignores_other_views(self):
+        response = self.client.get("/admin/login/")
+
+        self.assertNotIn("Surrogate-Key", response)
+        self.assertNotIn("Cache-Tag", response)
+
+    def test_purge_tags_from_cache(self):
+        purge_tags_from_cache(["wagtailimages.image:1"])
+
+        # Backends that support tags purge them
+        self.assertEqual(PURGED_TAGS, {"wagtailimages.image:1"})
+
+        # Others purge the URLs of the live pages that reference the tagged objects
+        self.assertEqual(
+            PURGED_URLS,
+            {
+                "http://localhost/events/christmas/",
+                "http://localhost/events/final-event/",
+            },
+        )
+
+    def test_purge_page_tags_from_cache(self):
+        purge_tags_from_cache([get_cache_tag(self.page), "unknown.model:1"])
+
+        self.assertEqual(PURGED_TAGS, {get_cache_tag(self.page), "unknown.model:1"})
+        self.assertEqual(PURGED_URLS, {"http://localhost/events/christmas/"})
+
+    def test_purge_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.title = "New title"
+            self.image.save()
+            self.image.save()
+
+        self.assertEqual(PURGED_TAGS, {"wagtailimages.image:1"})
+
+    def test_purge_on_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.delete()
+
+        self.assertEqual(PURGED_TAGS, {"wagtailimages.image:1"})
+
+    def test_no_purge_for_unreferenced_object(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            get_image_model().objects.get(id=2).save()
+
+        self.assertEqual(PURGED_TAGS, set())
+        self.assertEqual(PURGED_URLS, set())
+
+    @override_settings(WAGTAILFRONTENDCACHE_CACHE_TAGS=False)
+    def test_no_purge_when_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.save()
+
+        self.assertEqual(PURGED_TAGS, set())
+
+    def test_purge_on_publish(self):
+        # The final event page references the Christmas page in its body
+        self.other_page.body = (
+            f'<p><a linktype="page" id="{self.page.id}">Christmas</a></p>'
+        )
+        self.other_page.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.save_revision().publish()
+
+        self.assertEqual(PURGED_TAGS, {get_cache_tag(self.page)})
+
+    def test_no_purge_on_draft_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page.save_revision()
+
+        self.assertEqual(PURGED_TAGS, set())
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.cloudflare.requests.delete")
+    def test_cloudflare_purge_tags(self, requests_delete_mock):
+        requests_delete_mock.return_value.json.return_value = {"success": True}
+        backend = CloudflareBackend({"ZONEID": "zone", "BEARER_TOKEN": "token"})
+
+        tags = [f"wagtailimages.image:{i}" for i in range(40)]
+        self.assertEqual(backend.purge_tags(tags), [])
+
+        # The tags are sent in chunks
+        self.assertEqual(requests_delete_mock.call_count, 2)
+        self.assertCountEqual(
+            [
+                call.kwargs["json"]["tags"]
+                for call in requests_delete_mock.call_args_list
+            ],
+            [tags[:30], tags[30:]],
+        )
+
+    @mock.patch.object(HTTPBackend, "get_session")
+    def test_http_purge_tags(self, get_session_mock):
+        backend = HTTPBackend(
+            {"LOCATION": "http://localhost:8000", "TAGS_HEADER": "xkey"}
+        )
+        request_mock = get_session_mock.return_value.request
+
+        self.assertEqual(
+            backend.purge_tags(["wagtailimages.image:1", "wagtailcore.page:2"]), []
+        )
+
+        (method, url), call_kwargs = request_mock.call_args
+        self.assertEqual(method, "PURGE")
+        self.assertEqual(url, "http://localhost:8000/")
+        self.assertEqual(
+            call_kwargs["headers"]["xkey"], "wagtailimages.image:1 wagtailcore.page:2"
+        )
@@ -1,10 +1,14 @@
 import logging
 import re
+import weakref
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import local
 from urllib.parse import urlsplit, urlunsplit
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.utils.module_loading import import_string
 
 from wagtail.coreutils import get_content_languages
@@ -63,16 +67,15 @@ def purge_url_from_cache(url, backend_settings=None, backends=None):
     purge_urls_from_cache([url], backend_settings=backend_settings, backends=backends)
 
 
-def purge_urls_from_cache(urls, backend_settings=None, backends=None):
-    if not urls:
-        return
+def get_max_workers():
+    """
+    Return the maximum number of purge requests to send concurrently, set by the
+    ``WAGTAILFRONTENDCACHE_MAX_WORKERS`` setting.
+    """
+    return getattr(settings, "WAGTAILFRONTENDCACHE_MAX_WORKERS", 8)
 
-    backends = get_backends(backend_settings, backends)
-
-    # If no backends are configured, there's nothing to do
-    if not backends:
-        return
 
+def _get_urls_for_languages(urls):
     # Convert each url to urls one for each managed language (WAGTAILFRONTENDCACHE_LANGUAGES setting).
     # The managed languages are common to all the defined backends.
     # This depends on settings.USE_I18N
@@ -109,11 +112,21 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
 
         urls = new_urls
 
+    return urls
+
+
+def _get_urls_by_backend(urls, backends):
+    """
+    Return a dict mapping the name of each backend to the list of URLs that it
+    should purge, based on the hostnames that it invalidates.
+    """
     urls_by_hostname = defaultdict(list)
 
     for url in urls:
         urls_by_hostname[urlsplit(url).netloc].append(url)
 
+    urls_by_backend = defaultdict(list)
+
     for hostname, urls in urls_by_hostname.items():
         backends_for_hostname = {
             backend_name: backend
@@ -125,11 +138,156 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
             logger.info("Unable to find purge backend for %s", hostname)
             continue
 
-        for backend_name, backend in backends_for_hostname.items():
+        for backend_name in backends_for_hostname:
             for url in urls:
                 logger.info("[%s] Purging URL: %s", backend_name, url)
 
-            backend.purge_batch(urls)
+            urls_by_backend[backend_name].extend(urls)
+
+    return urls_by_backend
+
+
+def _purge_with_backends(backends, items_by_backend, method_name="purge_batch"):
+    """
+    Send each backend its URLs (or tags, with ``method_name="purge_tags"``) to
+    purge, with the backends purging concurrently. Returns a dict mapping the name
+    of each backend that couldn't purge some of its items to the list of those items.
+    """
+
+    def purge(backend_name, items):
+        try:
+            failed_items = getattr(backends[backend_name], method_name)(items)
+        except Exception:
+            logger.exception(
+                "Couldn't purge %d item(s) with frontend cache backend '%s'",
+                len(items),
+                backend_name,
+            )
+            failed_items = items
+
+        return backend_name, list(failed_items or [])
+
+    if len(items_by_backend) > 1:
+        with ThreadPoolExecutor(
+            min(len(items_by_backend), get_max_workers())
+        ) as executor:
+            results = list(executor.map(purge, *zip(*items_by_backend.items())))
+    else:
+        results = [purge(*item) for item in items_by_backend.items()]
+
+    return {backend_name: items for backend_name, items in results if items}
+
+
+def purge_urls_from_cache(urls, backend_settings=None, backends=None):
+    if not urls:
+        return
+
+    backends = get_backends(backend_settings, backends)
+
+    # If no backends are configured, there's nothing to do
+    if not backends:
+        return
+
+    urls_by_backend = _get_urls_by_backend(_get_urls_for_languages(urls), backends)
+    failed_urls_by_backend = _purge_with_backends(backends, urls_by_backend)
+
+    # Backends configured by the WAGTAILFRONTENDCACHE setting can be looked up
+    # again later, so the URLs they couldn't purge can be retried
+    if (
+        failed_urls_by_backend
+        and backend_settings is None
+        and getattr(settings, "WAGTAILFRONTENDCACHE_RETRY_FAILED_PURGES", False)
+    ):
+        from wagtail.contrib.frontend_cache.models import PendingPurge
+
+        PendingPurge.enqueue(failed_urls_by_backend, attempts=1)
+
+
+class _PendingItems:
+    """
+    The items added to an ``_OnCommitBatch`` in one savepoint (or the outermost
+    block) of a transaction, registered as an on-commit callback.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.items = set()
+
+    def __call__(self):
+        self.batch.run()
+
+
+class _OnCommitBatch(local):
+    """
+    Collects the items (URLs or tags) passed to ``add`` during a database
+    transaction, and calls ``callback`` with all of them once the transaction has
+    been committed, so that each is only purged once. Items added in a transaction
+    or savepoint that is rolled back are discarded along with it.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        # The pending items of each savepoint of the current transaction, keyed by
+        # the IDs of the savepoints they were added in. Each set of items is only
+        # held by its on-commit callback, so that it is dropped along with the
+        # callback if its savepoint is rolled back.
+        self.pending = weakref.WeakValueDictionary()
+
+    def add(self, items):
+        key = tuple(transaction.get_connection().savepoint_ids)
+        pending = self.pending.get(key)
+        if pending is None:
+            pending = _PendingItems(self)
+            self.pending[key] = pending
+            transaction.on_commit(pending)
+        pending.items.update(items)
+
+    def run(self):
+        # The callbacks of all of the savepoints that weren't rolled back are run
+        # together once the transaction is committed, so the first of them purges
+        # the items of all of them
+        items = set()
+        for pending in list(self.pending.values()):
+            items.update(pending.items)
+            pending.items.clear()
+        self.pending.clear()
+
+        if items:
+            self.callback(items)
+
+
+def purge_urls_on_commit(urls):
+    """
+    Purge the given URLs from the cache once the current database transaction has
+    been committed, or immediately if there is no transaction. URLs added during
+    the same transaction are purged together, and only once each.
+
+    If ``WAGTAILFRONTENDCACHE_DEFERRED`` is set, the URLs are instead queued to be
+    purged by the ``process_frontend_cache_queue`` management command, as part of
+    the current transaction.
+    """
+    urls = set(urls)
+    if not urls:
+        return
+
+    if getattr(settings, "WAGTAILFRONTENDCACHE_DEFERRED", False):
+        backends = get_backends()
+        if backends:
+            from wagtail.contrib.frontend_cache.models import PendingPurge
+
+            PendingPurge.enqueue(
+                _get_urls_by_backend(_get_urls_for_languages(urls), backends)
+            )
+        return
+
+    _urls_on_commit.add(urls)
+
+
+def _purge_urls(urls):
+    purge_urls_from_cache(urls)
+
+
+_urls_on_commit = _OnCommitBatch(_purge_urls)
 
 
 def _get_page_cached_urls(page):
@@ -153,6 +311,199 @@ def purge_pages_from_cache(pages, backend_settings=None, backends=None):
         purge_urls_from_cache(urls, backend_settings, backends)
 
 
+def purge_pages_on_commit(pages):
+    """
+    Purge the URLs of the given pages from the cache once the current database
+    transaction has been committed. See ``purge_urls_on_commit``.
+    """
+    urls = []
+    for page in pages:
+        urls.extend(_get_page_cached_urls(page))
+
+    purge_urls_on_commit(urls)
+
+
+def _get_cache_tag(content_type, object_id):
+    return f"{content_type.app_label}.{content_type.model}:{object_id}"
+
+
+def get_cache_tag(obj):
+    """
+    Return the cache tag of a model instance, such as ``wagtailimages.image:1``.
+    Instances of models that inherit from another concrete model, such as pages,
+    are tagged by their base model, as in the reference index.
+    """
+    from wagtail.models import ReferenceIndex
+
+    return _get_cache_tag(ReferenceIndex._get_base_content_type(obj), obj.pk)
+
+
+def get_page_cache_tags(page):
+    """
+    Return the cache tags of a page response: the tag of the page itself, and
+    the tags of the objects that it references, from the reference index. Page
+    types can add more by defining a ``get_cache_tags`` method.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from wagtail.models import ReferenceIndex
+
+    tags = [get_cache_tag(page)]
+    references = (
+        ReferenceIndex.get_references_for_object(page)
+        .values_list("to_content_type_id", "to_object_id")
+        .distinct()
+        .order_by("to_content_type_id", "to_object_id")
+    )
+    for content_type_id, object_id in references:
+        tag = _get_cache_tag(ContentType.objects.get_for_id(content_type_id), object_id)
+        if tag not in tags:
+            tags.append(tag)
+
+    get_cache_tags = getattr(page.specific_deferred, "get_cache_tags", None)
+    if get_cache_tags is not None:
+        tags.extend(tag for tag in get_cache_tags() if tag not in tags)
+
+    return tags
+
+
+def _get_references_filter(tags):
+    """
+    Return a filter on ``ReferenceIndex`` for the references to the objects with
+    the given cache tags, or None if none of the tags are for known models.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from django.db.models import Q
+
+    references_filter = None
+    for tag in tags:
+        label, _, object_id = tag.partition(":")
+        app_label, _, model_name = label.partition(".")
+        try:
+            content_type = ContentType.objects.get_by_natural_key(app_label, model_name)
+        except ContentType.DoesNotExist:
+            continue
+
+        tag_filter = Q(to_content_type=content_type, to_object_id=object_id)
+        references_filter = (
+            tag_filter if references_filter is None else references_filter | tag_filter
+        )
+
+    return references_filter
+
+
+def _get_referenced_tags(tags):
+    """
+    Return the tags in ``tags`` of the objects that are referenced by another
+    object, and may therefore be among the tags of a page.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from wagtail.models import ReferenceIndex
+
+    references_filter = _get_references_filter(tags)
+    if references_filter is None:
+        return set()
+
+    return {
+        _get_cache_tag(ContentType.objects.get_for_id(content_type_id), object_id)
+        for content_type_id, object_id in ReferenceIndex.objects.filter(
+            references_filter
+        )
+        .values_list("to_content_type_id", "to_object_id")
+        .distinct()
+    }
+
+
+def _get_urls_for_tags(tags):
+    """
+    Return the URLs of the live pages that are tagged with any of ``tags``, for
+    backends that can't purge by tag.
+    """
+    from wagtail.models import Page, ReferenceIndex
+
+    page_tag_prefix = _get_cache_tag(ReferenceIndex._get_base_content_type(Page), "")
+    page_ids = {
+        tag[len(page_tag_prefix) :] for tag in tags if tag.startswith(page_tag_prefix)
+    }
+
+    references_filter = _get_references_filter(tags)
+    if references_filter is not None:
+        page_ids.update(
+            ReferenceIndex.objects.filter(
+                references_filter,
+                base_content_type=ReferenceIndex._get_base_content_type(Page),
+            ).values_list("object_id", flat=True)
+        )
+
+    urls = []
+    for page in Page.objects.live().filter(pk__in=page_ids).specific():
+        urls.extend(_get_page_cached_urls(page))
+
+    return urls
+
+
+def purge_tags_from_cache(tags, backend_settings=None, backends=None):
+    """
+    Purge the responses tagged with any of the given cache tags. Backends that
+    don't support tags purge the URLs of the live pages with those tags instead.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return
+
+    backends = get_backends(backend_settings, backends)
+
+    # If no backends are configured, there's nothing to do
+    if not backends:
+        return
+
+    tag_backends = {
+        backend_name: backend
+        for backend_name, backend in backends.items()
+        if backend.supports_tags
+    }
+    url_backends = {
+        backend_name: backend
+        for backend_name, backend in backends.items()
+        if not backend.supports_tags
+    }
+
+    for backend_name in tag_backends:
+        for tag in tags:
+            logger.info("[%s] Purging tag: %s", backend_name, tag)
+
+    _purge_with_backends(
+        tag_backends,
+        {backend_name: tags for backend_name in tag_backends},
+        method_name="purge_tags",
+    )
+
+    if url_backends:
+        urls = _get_urls_for_tags(tags)
+        if urls:
+            purge_urls_from_cache(urls, backend_settings, list(url_backends))
+
+
+def purge_tags_on_commit(tags):
+    """
+    Purge the given cache tags once the current database transaction has been
+    committed, or immediately if there is no transaction, in the same way as
+    ``purge_urls_on_commit``. Only the tags of objects that are referenced by
+    another object are purged.
+    """
+    tags = set(tags)
+    if tags:
+        _tags_on_commit.add(tags)
+
+
+def _purge_referenced_tags(tags):
+    purge_tags_from_cache(_get_referenced_tags(tags))
+
+
+_tags_on_commit = _OnCommitBatch(_purge_referenced_tags)
+
+
 class PurgeBatch:
     """Represents a list of URLs to be purged in a single request"""
 
@@ -207,3 +558,11 @@ class PurgeBatch:
           will only be sent to these backends
         """
         purge_urls_from_cache(self.urls, backend_settings, backends)
+
+    def purge_on_commit(self):
+        """
+        Purges all the URLs in this batch once the current database transaction
+        has been committed, together with any other URLs purged on commit in the
+        same transaction (see ``purge_urls_on_commit``)
+        """
+        purge_urls_on_commit(self.urls)
@@ -0,0 +1,7 @@
+from wagtail import hooks
+
+
+@hooks.register("before_serve_page")
+def record_served_page(page, request, serve_args, serve_kwargs):
+    # Used by CacheTagMiddleware to tag the response with the page's cache tags
+    request._frontend_cache_page = page
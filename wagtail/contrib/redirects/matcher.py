@@ -0,0 +1,189 @@
+"""
+An in-process table of the redirects of each site, used by ``RedirectMiddleware``
+when ``WAGTAILREDIRECTS_LOCAL_CACHE`` is set, so that requests for paths without a
+redirect (the vast majority of 404s) are answered without querying the database.
+"""
+
+import bisect
+import hashlib
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+REDIRECTS_VERSION_CACHE_KEY = "wagtail_redirects_version"
+
+
+def get_redirects_version():
+    """
+    Return the current version of the redirects, which is changed by
+    ``invalidate_redirect_matchers`` whenever a redirect is added, changed or
+    deleted. Each process rebuilds its matchers once it sees a new version.
+    """
+    version = cache.get(REDIRECTS_VERSION_CACHE_KEY)
+    if version is None:
+        # Start from a time-based value rather than 1, so that a version key lost
+        # from the cache can never match a version that matchers were built with
+        version = time.time_ns()
+        cache.add(REDIRECTS_VERSION_CACHE_KEY, version, None)
+        version = cache.get(REDIRECTS_VERSION_CACHE_KEY, version)
+    return version
+
+
+def invalidate_redirect_matchers():
+    try:
+        cache.incr(REDIRECTS_VERSION_CACHE_KEY)
+    except ValueError:
+        # The version key is not set (or has been evicted); a fresh time-based
+        # version will be picked up on the next lookup
+        pass
+
+
+def hash_path(path):
+    """
+    Return a signed 64-bit hash of ``path``, as stored in a ``RedirectMatcher``.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(path.encode(), digest_size=8).digest(), "big", signed=True
+    )
+
+
+class BloomFilter:
+    """
+    A Bloom filter of 64-bit hashes, for ruling out most paths without a redirect
+    in a few operations. With the default of 10 bits per item, fewer than 1% of
+    paths without a redirect get past it.
+    """
+
+    BITS_PER_ITEM = 10
+    NUM_HASHES = 7
+
+    def __init__(self, hashes):
+        self.size = max(len(hashes) * self.BITS_PER_ITEM, 8)
+        self.bits = bytearray(self.size // 8 + 1)
+        for item_hash in hashes:
+            for position in self.get_positions(item_hash):
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+    def get_positions(self, item_hash):
+        # Derive the positions from the two halves of the hash (Kirsch-Mitzenmacher)
+        h1 = item_hash & 0xFFFFFFFF
+        h2 = (item_hash >> 32) | 1
+        for i in range(self.NUM_HASHES):
+            yield (h1 + i * h2) % self.size
+
+    def __contains__(self, item_hash):
+        for position in self.get_positions(item_hash):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RedirectMatcher:
+    """
+    The redirects that apply to a site, compiled into a sorted array of the hashes
+    of their ``old_path`` values and a parallel array of their IDs, which take 16
+    bytes per redirect, plus a Bloom filter for ruling out paths without a redirect.
+
+    A match only gives the ID of the redirect that probably applies to the path;
+    the caller must check that the ``old_path`` of the redirect fetched with it is
+    the path looked up, in case of a collision of hashes.
+    """
+
+    def __init__(self, redirects, site_id=None):
+        """
+        ``redirects`` is an iterable of ``(id, old_path, site_id)`` tuples. Where
+        several redirects have the same path, the one for ``site_id`` wins.
+        """
+        ids_by_hash = {}
+        preferred = set()
+        for redirect_id, old_path, redirect_site_id in redirects:
+            path_hash = hash_path(old_path)
+            if path_hash in preferred:
+                continue
+            ids_by_hash[path_hash] = redirect_id
+            if redirect_site_id == site_id:
+                preferred.add(path_hash)
+
+        hashes = sorted(ids_by_hash)
+        self.hashes = array("q", hashes)
+        self.ids = array("q", (ids_by_hash[path_hash] for path_hash in hashes))
+        self.bloom_filter = BloomFilter(hashes)
+
+    @classmethod
+    def build_for_site(cls, site):
+        from wagtail.contrib.redirects.models import Redirect
+
+        site_id = site.pk if site else None
+        return cls(
+            Redirect.get_for_site(site)
+            .order_by("pk")
+            .values_list("pk", "old_path", "site_id")
+            .iterator(chunk_size=10000),
+            site_id=site_id,
+        )
+
+    def get_redirect_id(self, path):
+        """
+        Return the ID of the redirect for ``path``, or ``None`` if there is none.
+        """
+        path_hash = hash_path(path)
+        if path_hash not in self.bloom_filter:
+            return None
+
+        index = bisect.bisect_left(self.hashes, path_hash)
+        if index < len(self.hashes) and self.hashes[index] == path_hash:
+            return self.ids[index]
+        return None
+
+    def __len__(self):
+        return len(self.hashes)
+
+
+# Maps site IDs to (version, matcher) tuples
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def is_enabled():
+    return getattr(settings, "WAGTAILREDIRECTS_LOCAL_CACHE", False)
+
+
+def get_redirect_matcher(site):
+    """
+    Return the ``RedirectMatcher`` of ``site`` (or of all redirects, if ``site``
+    is ``None``), building it if the redirects have changed since it was built.
+    """
+    site_id = site.pk if site else None
+    version = get_redirects_version()
+
+    try:
+        matcher_version, matcher = _matchers[site_id]
+    except KeyError:
+        matcher_version = matcher = None
+
+    if matcher_version != version:
+        with _matchers_lock:
+            matcher_version, matcher = _matchers.get(site_id, (None, None))
+            if matcher_version != version:
+                # The version was read before loading the redirects, so changes
+                # made while they load cause another rebuild on the next lookup
+                matcher = RedirectMatcher.build_for_site(site)
+                _matchers[site_id] = (version, matcher)
+
+    return matcher
+
+
+def clear_redirect_matchers():
+    with _matchers_lock:
+        _matchers.clear()
+
+
+@receiver(setting_changed)
+def reset_redirect_matchers(**kwargs):
+    if kwargs["setting"] == "WAGTAILREDIRECTS_LOCAL_CACHE":
+        clear_redirect_matchers()
@@ -4,7 +4,7 @@ from django import http
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import matcher, models
 from wagtail.models import Site
 
 
@@ -15,6 +15,17 @@ def _get_redirect(request, path):
         return None
 
     site = Site.find_for_request(request)
+    if matcher.is_enabled():
+        redirect_id = matcher.get_redirect_matcher(site).get_redirect_id(path)
+        if redirect_id is None:
+            return None
+
+        redirect = models.Redirect.objects.filter(pk=redirect_id).first()
+        if redirect is not None and redirect.old_path == path:
+            return redirect
+        # The redirect has been changed since the matcher was built, or the
+        # hash of its path collides with that of another path
+
     try:
         return models.Redirect.get_for_site(site).get(old_path=path)
     except models.Redirect.MultipleObjectsReturned:
@@ -3,12 +3,14 @@ from collections.abc import Iterable
 
 from django.apps import apps
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
 
 from wagtail.contrib.frontend_cache.utils import PurgeBatch
 from wagtail.coreutils import BatchCreator, get_dummy_request
 from wagtail.models import Page, Site
 
+from . import matcher
 from .models import Redirect
 
 logger = logging.getLogger(__name__)
@@ -30,6 +32,9 @@ class BatchRedirectCreator(BatchCreator):
         Redirect.objects.filter(automatically_created=True).filter(clashes_q).delete()
 
     def post_process(self):
+        # Redirects created with bulk_create() don't send post_save signals
+        redirect_changed_signal_handler()
+
         if not apps.is_installed("wagtail.contrib.frontend_cache"):
             return
 
@@ -43,6 +48,13 @@ class BatchRedirectCreator(BatchCreator):
         batch.purge()
 
 
+def redirect_changed_signal_handler(**kwargs):
+    if matcher.is_enabled():
+        # Wait for the change to be committed, so that other processes can't
+        # rebuild their matchers from the redirects as they were before it
+        transaction.on_commit(matcher.invalidate_redirect_matchers)
+
+
 def autocreate_redirects_on_slug_change(
     instance_before: Page, instance: Page, **kwargs
 ):
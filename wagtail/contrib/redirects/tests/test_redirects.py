@@ -2,13 +2,15 @@ from io import BytesIO
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
-from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from openpyxl.reader.excel import load_workbook
 
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.contrib.frontend_cache.tests import PURGED_URLS
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import matcher, models
+from wagtail.contrib.redirects.middleware import get_redirect
 from wagtail.log_actions import registry as log_registry
 from wagtail.models import Page, Site
 from wagtail.test.routablepage.models import RoutablePageTest
@@ -282,11 +284,12 @@ class TestRedirects(TestCase):
         contact_page = Page.objects.get(url_path="/home/contact-us/")
 
         # test redirect with a VALID route path
-        models.Redirect.add_redirect(
-            old_path="/old-path-one",
-            redirect_to=routable_page,
-            page_route_path="/render-method-test-custom-template/",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.add_redirect(
+                old_path="/old-path-one",
+                redirect_to=routable_page,
+                page_route_path="/render-method-test-custom-template/",
+            )
         response = self.client.get("/old-path-one/", HTTP_HOST="test.example.com")
         self.assertRedirects(
             response,
@@ -296,11 +299,12 @@ class TestRedirects(TestCase):
         )
 
         # test redirect with an INVALID route path
-        models.Redirect.add_redirect(
-            old_path="/old-path-two",
-            redirect_to=routable_page,
-            page_route_path="/invalid-route/",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.add_redirect(
+                old_path="/old-path-two",
+                redirect_to=routable_page,
+                page_route_path="/invalid-route/",
+            )
         response = self.client.get("/old-path-two/", HTTP_HOST="test.example.com")
         # we should still make it to the correct page
         self.assertRedirects(
@@ -308,11 +312,12 @@ class TestRedirects(TestCase):
         )
 
         # test redirect with route path for a non-routable page
-        models.Redirect.add_redirect(
-            old_path="/old-path-three",
-            redirect_to=contact_page,
-            page_route_path="/route-to-nowhere/",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.add_redirect(
+                old_path="/old-path-three",
+                redirect_to=contact_page,
+                page_route_path="/route-to-nowhere/",
+            )
         response = self.client.get("/old-path-three/", HTTP_HOST="test.example.com")
         # we should still make it to the correct page
         self.assertRedirects(
@@ -597,6 +602,140 @@ class TestRedirects(TestCase):
         self.assertIs(redirect.is_permanent, True)
 
 
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WAGTAILREDIRECTS_LOCAL_CACHE=True,
+)
+class TestRedirectsWithLocalCache(TestRedirects):
+    """
+    Runs the tests of RedirectMiddleware with the in-process redirect matchers
+    enabled.
+    """
+
+    def setUp(self):
+        cache.clear()
+        matcher.clear_redirect_matchers()
+        self.addCleanup(matcher.clear_redirect_matchers)
+
+    def get_redirect(self, path, **kwargs):
+        request = RequestFactory().get(path, **kwargs)
+        return get_redirect(request, models.Redirect.normalise_path(path))
+
+    def test_missing_path_does_not_query_database(self):
+        models.Redirect.objects.create(old_path="/redirectme", redirect_link="/to")
+        # Build the matcher
+        self.assertIsNotNone(self.get_redirect("/redirectme"))
+
+        with self.assertNumQueries(0):
+            for i in range(100):
+                self.assertIsNone(self.get_redirect(f"/missing-{i}"))
+
+    def test_matcher_rebuilt_when_redirects_change(self):
+        self.assertIsNone(self.get_redirect("/redirectme"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = models.Redirect.objects.create(
+                old_path="/redirectme", redirect_link="/to"
+            )
+        self.assertEqual(self.get_redirect("/redirectme"), redirect)
+
+        redirect.old_path = "/redirectme-too"
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect.save()
+        self.assertIsNone(self.get_redirect("/redirectme"))
+        self.assertEqual(self.get_redirect("/redirectme-too"), redirect)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect.delete()
+        self.assertIsNone(self.get_redirect("/redirectme-too"))
+
+    def test_version_changed_on_commit(self):
+        version = matcher.get_redirects_version()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            models.Redirect.objects.create(old_path="/redirectme", redirect_link="/to")
+
+        # Other processes must not rebuild their matchers before the new redirect
+        # is committed
+        self.assertEqual(matcher.get_redirects_version(), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(matcher.get_redirects_version(), version)
+
+    @override_settings(WAGTAILREDIRECTS_AUTO_CREATE=True)
+    def test_matcher_rebuilt_for_automatically_created_redirects(self):
+        christmas_page = Page.objects.get(url_path="/home/events/christmas/").specific
+        self.assertIsNone(self.get_redirect("/events/christmas/"))
+
+        christmas_page.slug = "xmas"
+        with self.captureOnCommitCallbacks(execute=True):
+            christmas_page.save(log_action="wagtail.publish", clean=False)
+
+        redirect = self.get_redirect("/events/christmas/")
+        self.assertEqual(redirect.redirect_page.pk, christmas_page.pk)
+
+    def test_stale_matcher(self):
+        redirect = models.Redirect.objects.create(
+            old_path="/redirectme", redirect_link="/to"
+        )
+        self.assertEqual(self.get_redirect("/redirectme"), redirect)
+
+        # Change the redirect without invalidating the matcher
+        models.Redirect.objects.filter(pk=redirect.pk).update(old_path="/elsewhere")
+
+        # The redirect found by the matcher is checked against the path
+        self.assertIsNone(self.get_redirect("/redirectme"))
+
+
+class TestRedirectMatcher(TestCase):
+    def test_get_redirect_id(self):
+        redirect_matcher = matcher.RedirectMatcher(
+            [(i, f"/old-{i}", None) for i in range(1, 1001)]
+        )
+
+        self.assertEqual(len(redirect_matcher), 1000)
+        for i in range(1, 1001):
+            self.assertEqual(redirect_matcher.get_redirect_id(f"/old-{i}"), i)
+        self.assertIsNone(redirect_matcher.get_redirect_id("/old-1001"))
+        self.assertIsNone(redirect_matcher.get_redirect_id("/old-1/"))
+
+    def test_empty(self):
+        redirect_matcher = matcher.RedirectMatcher([])
+
+        self.assertEqual(len(redirect_matcher), 0)
+        self.assertIsNone(redirect_matcher.get_redirect_id("/"))
+
+    def test_site_specific_redirect_preferred(self):
+        for redirects in [
+            [(1, "/xmas", None), (2, "/xmas", 5)],
+            [(1, "/xmas", 5), (2, "/xmas", None)],
+        ]:
+            with self.subTest(redirects=redirects):
+                self.assertEqual(
+                    matcher.RedirectMatcher(redirects, site_id=5).get_redirect_id(
+                        "/xmas"
+                    ),
+                    next(pk for pk, path, site_id in redirects if site_id == 5),
+                )
+                self.assertEqual(
+                    matcher.RedirectMatcher(redirects).get_redirect_id("/xmas"),
+                    next(pk for pk, path, site_id in redirects if site_id is None),
+                )
+
+    def test_bloom_filter(self):
+        hashes = [matcher.hash_path(f"/old-{i}") for i in range(10000)]
+        bloom_filter = matcher.BloomFilter(hashes)
+
+        for path_hash in hashes:
+            self.assertIn(path_hash, bloom_filter)
+
+        false_positives = sum(
+            matcher.hash_path(f"/missing-{i}") in bloom_filter for i in range(10000)
+        )
+        self.assertLess(false_positives, 300)
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 )
@@ -6,3 +6,30 @@ class WagtailSitemapsAppConfig(AppConfig):
     name = "wagtail.contrib.sitemaps"
     label = "wagtailsitemaps"
     verbose_name = _("Wagtail sitemaps")
+    default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+
+        from wagtail.models import Page
+        from wagtail.signals import (
+            page_published,
+            page_slug_changed,
+            page_unpublished,
+            post_page_move,
+        )
+
+        from .signal_handlers import (
+            page_deleted_signal_handler,
+            page_published_signal_handler,
+            page_slug_changed_signal_handler,
+            post_page_move_signal_handler,
+        )
+
+        # Mark the sitemap shards of changed pages for regeneration, when
+        # WAGTAILSITEMAPS_PREGENERATED is set
+        page_published.connect(page_published_signal_handler)
+        page_unpublished.connect(page_published_signal_handler)
+        page_slug_changed.connect(page_slug_changed_signal_handler)
+        post_page_move.connect(post_page_move_signal_handler)
+        post_delete.connect(page_deleted_signal_handler, sender=Page)
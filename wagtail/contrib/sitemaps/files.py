@@ -0,0 +1,211 @@
+"""
+Pre-generated sitemap files, written to storage by the ``update_sitemap_files``
+management command and served by the ``pregenerated_sitemap`` view, so that
+serving a sitemap doesn't involve querying every page of the site.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+# The maximum number of URLs in a sitemap file, set by the sitemaps protocol
+MAX_URLS_PER_FILE = 50000
+
+
+def get_pages_per_shard():
+    return getattr(settings, "WAGTAILSITEMAPS_PAGES_PER_SHARD", 50000)
+
+
+def get_sitemap_storage():
+    return storages[getattr(settings, "WAGTAILSITEMAPS_STORAGE", "default")]
+
+
+def get_sitemap_file_name(site, shard=None, part=None):
+    """
+    Return the name in storage of the sitemap index of ``site``, or of the given
+    part of one of its shards.
+    """
+    directory = getattr(settings, "WAGTAILSITEMAPS_DIRECTORY", "sitemaps")
+    if shard is None:
+        return f"{directory}/{site.pk}/sitemap.xml"
+    return f"{directory}/{site.pk}/sitemap-{shard}-{part}.xml"
+
+
+def get_site_ids_for_url_path(url_path):
+    """
+    Return the IDs of the sites whose pages include the page with ``url_path``.
+    """
+    from wagtail.models import Site
+
+    return {
+        root_path.site_id
+        for root_path in Site.get_site_root_paths()
+        if url_path.startswith(root_path.root_path)
+    }
+
+
+def mark_pages_for_update(page_ids, site_ids):
+    """
+    Mark the shards holding the given pages, in each of the given sites, as
+    needing their files to be regenerated.
+    """
+    from wagtail.contrib.sitemaps.models import SitemapShard
+
+    pages_per_shard = get_pages_per_shard()
+    numbers = {page_id // pages_per_shard for page_id in page_ids}
+    if not numbers or not site_ids:
+        return
+
+    SitemapShard.objects.bulk_create(
+        [
+            SitemapShard(site_id=site_id, number=number, needs_update=True)
+            for site_id in site_ids
+            for number in numbers
+        ],
+        update_conflicts=True,
+        unique_fields=["site", "number"],
+        update_fields=["needs_update"],
+    )
+
+
+def get_shard_pages(site, number):
+    pages_per_shard = get_pages_per_shard()
+    return (
+        site.root_page.get_descendants(inclusive=True)
+        .live()
+        .public()
+        .filter(id__gte=number * pages_per_shard, id__lt=(number + 1) * pages_per_shard)
+        .order_by("path")
+        .defer_streamfields()
+        .specific()
+    )
+
+
+def get_shard_urls(site, number):
+    urls = []
+    for page in get_shard_pages(site, number).iterator():
+        urls.extend(page.get_sitemap_urls())
+    return urls
+
+
+def write_file(storage, name, content):
+    # Storages save under a new name rather than overwrite existing files
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content.encode()))
+
+
+def update_shard(shard, storage):
+    """
+    Regenerate the files of ``shard``, and record how many there are and the
+    most recent modification time of their URLs on it.
+    """
+    urls = get_shard_urls(shard.site, shard.number)
+    parts = [
+        urls[i : i + MAX_URLS_PER_FILE] for i in range(0, len(urls), MAX_URLS_PER_FILE)
+    ]
+
+    for part, part_urls in enumerate(parts, start=1):
+        write_file(
+            storage,
+            get_sitemap_file_name(shard.site, shard.number, part),
+            render_to_string("sitemap.xml", {"urlset": part_urls}),
+        )
+
+    # Remove the files of parts that no longer have any URLs
+    for part in range(len(parts) + 1, shard.file_count + 1):
+        storage.delete(get_sitemap_file_name(shard.site, shard.number, part))
+
+    last_modified = [
+        url["lastmod"]
+        for url in urls
+        if isinstance(url.get("lastmod"), datetime.datetime)
+    ]
+    shard.file_count = len(parts)
+    shard.last_modified = max(last_modified) if last_modified else None
+
+
+def write_index(site, storage):
+    from wagtail.contrib.sitemaps.models import SitemapShard
+
+    items = [
+        SitemapIndexItem(
+            site.root_url
+            + reverse(
+                "wagtailsitemaps_pregenerated",
+                kwargs={"shard": shard.number, "part": part},
+            ),
+            shard.last_modified,
+        )
+        for shard in SitemapShard.objects.filter(site=site, file_count__gt=0).order_by(
+            "number"
+        )
+        for part in range(1, shard.file_count + 1)
+    ]
+
+    write_file(
+        storage,
+        get_sitemap_file_name(site),
+        render_to_string("sitemap_index.xml", {"sitemaps": items}),
+    )
+
+
+def update_sitemap_files(sites=None, update_all=False):
+    """
+    Regenerate the files of the shards that need updating, and the index of each
+    site with updated shards. If ``update_all`` is set, the files of every shard
+    are regenerated. Returns the number of shards updated.
+    """
+    from wagtail.contrib.sitemaps.models import SitemapShard
+    from wagtail.models import Site
+
+    if sites is None:
+        sites = Site.objects.select_related("root_page").order_by("pk")
+
+    storage = get_sitemap_storage()
+    pages_per_shard = get_pages_per_shard()
+    shard_count = 0
+
+    for site in sites:
+        if update_all:
+            max_id = site.root_page.get_descendants(inclusive=True).aggregate(
+                max_id=Max("id")
+            )["max_id"]
+            mark_pages_for_update(
+                range(0, max_id + 1, pages_per_shard), site_ids=[site.pk]
+            )
+            SitemapShard.objects.filter(site=site).update(needs_update=True)
+
+        shards = list(
+            SitemapShard.objects.filter(site=site, needs_update=True).order_by("number")
+        )
+        if not shards:
+            continue
+
+        for shard in shards:
+            shard.site = site
+            # The flag is cleared before the files are written, so that pages
+            # changed while they are being written mark the shard for the next
+            # update. It is set again if the files can't be written.
+            shard_qs = SitemapShard.objects.filter(pk=shard.pk)
+            shard_qs.update(needs_update=False)
+            try:
+                update_shard(shard, storage)
+            except Exception:
+                shard_qs.update(needs_update=True)
+                raise
+            shard.save(update_fields=["file_count", "last_modified"])
+
+        SitemapShard.objects.filter(
+            site=site, file_count=0, needs_update=False
+        ).delete()
+        write_index(site, storage)
+        shard_count += len(shards)
+
+    return shard_count
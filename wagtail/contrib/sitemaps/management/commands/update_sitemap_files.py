@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.sitemaps.files import update_sitemap_files
+
+
+class Command(BaseCommand):
+    """Command to regenerate the sitemap files served by the pregenerated_sitemap view."""
+
+    help = (
+        "Regenerates the sitemap files of the shards with changed pages, "
+        "optionally polling for changes until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate the files of every shard, such as when generating the sitemaps for the first time",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for changed shards instead of exiting once they are updated",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Number of seconds to wait between polls for changed shards when using --loop (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        num_updated = update_sitemap_files(update_all=options["all"])
+
+        while options["loop"]:
+            time.sleep(options["interval"])
+            num_updated += update_sitemap_files()
+
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully updated {num_updated} shard(s)")
+            )
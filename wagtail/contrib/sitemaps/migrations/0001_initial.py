@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-19 01:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("wagtailcore", "0095_pendingreferenceindexupdate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapShard",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                ("needs_update", models.BooleanField(db_index=True, default=True)),
+                ("file_count", models.PositiveIntegerField(default=0)),
+                ("last_modified", models.DateTimeField(null=True)),
+                (
+                    "site",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.site",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "sitemap shard",
+                "verbose_name_plural": "sitemap shards",
+                "unique_together": {("site", "number")},
+            },
+        ),
+    ]
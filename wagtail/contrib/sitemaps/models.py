@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SitemapShard(models.Model):
+    """
+    A shard of the pre-generated sitemap files of a site, holding the pages whose
+    IDs fall in the range ``[number * size, (number + 1) * size)``, where ``size``
+    is ``WAGTAILSITEMAPS_PAGES_PER_SHARD``. Sharding by page ID means that a
+    change to a page only affects the shard that it belongs to.
+
+    Shards are marked with ``needs_update`` when their pages are published,
+    unpublished or moved, and their files are regenerated by the
+    ``update_sitemap_files`` management command.
+    """
+
+    site = models.ForeignKey(
+        "wagtailcore.Site", on_delete=models.CASCADE, related_name="+"
+    )
+    number = models.PositiveIntegerField()
+    needs_update = models.BooleanField(default=True, db_index=True)
+
+    # The number of files the shard was written to, each holding at most
+    # MAX_URLS_PER_FILE URLs. Zero if the shard has no pages in the sitemap
+    file_count = models.PositiveIntegerField(default=0)
+
+    # The most recent lastmod of the URLs in the shard, listed in the index
+    last_modified = models.DateTimeField(null=True)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        verbose_name = _("sitemap shard")
+        verbose_name_plural = _("sitemap shards")
+        unique_together = [("site", "number")]
+
+    def __str__(self):
+        return f"Sitemap shard {self.number} of {self.site}"
@@ -0,0 +1,48 @@
+from django.conf import settings
+
+from wagtail.contrib.sitemaps.files import (
+    get_site_ids_for_url_path,
+    mark_pages_for_update,
+)
+
+
+def is_enabled():
+    return getattr(settings, "WAGTAILSITEMAPS_PREGENERATED", False)
+
+
+def page_published_signal_handler(instance, **kwargs):
+    if is_enabled():
+        mark_pages_for_update(
+            [instance.pk], get_site_ids_for_url_path(instance.url_path)
+        )
+
+
+def page_deleted_signal_handler(instance, **kwargs):
+    if is_enabled() and instance.live:
+        mark_pages_for_update(
+            [instance.pk], get_site_ids_for_url_path(instance.url_path)
+        )
+
+
+def page_slug_changed_signal_handler(instance, **kwargs):
+    # The URLs of the descendants of the page change with it
+    if is_enabled():
+        mark_pages_for_update(
+            instance.get_descendants(inclusive=True)
+            .live()
+            .values_list("pk", flat=True),
+            get_site_ids_for_url_path(instance.url_path),
+        )
+
+
+def post_page_move_signal_handler(instance, url_path_before, url_path_after, **kwargs):
+    # The page and its descendants may have moved to a different site, or have
+    # new URLs within the same site
+    if is_enabled() and url_path_before != url_path_after:
+        mark_pages_for_update(
+            instance.get_descendants(inclusive=True)
+            .live()
+            .values_list("pk", flat=True),
+            get_site_ids_for_url_path(url_path_before)
+            | get_site_ids_for_url_path(url_path_after),
+        )
@@ -1,14 +1,21 @@
 import datetime
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.management import call_command
 from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
 from wagtail.models import Page, PageViewRestriction, Site
 from wagtail.test.testapp.models import EventIndex, SimplePage
 
+from .files import get_sitemap_file_name, get_sitemap_storage
+from .models import SitemapShard
 from .sitemap_generator import Sitemap
 
 
@@ -124,7 +131,7 @@ class TestSitemapGenerator(TestCase):
         # pre-seed find_for_request cache, so that it's not counted towards the query count
         Site.find_for_request(request)
 
-        with self.assertNumQueries(14):
+        with self.assertNumQueries(12):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -158,7 +165,7 @@ class TestSitemapGenerator(TestCase):
         # pre-seed find_for_request cache, so that it's not counted towards the query count
         Site.find_for_request(request)
 
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(14):
             urls = [
                 url["location"]
                 for url in sitemap.get_urls(1, django_site, req_protocol)
@@ -284,3 +291,260 @@ class TestSitemapView(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/xml")
+
+
+class TestPregeneratedSitemaps(TestCase):
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_dir)
+
+        settings_override = override_settings(
+            STORAGES={
+                **settings.STORAGES,
+                "sitemaps": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": self.storage_dir},
+                },
+            },
+            WAGTAILSITEMAPS_STORAGE="sitemaps",
+            WAGTAILSITEMAPS_PREGENERATED=True,
+            WAGTAILSITEMAPS_PAGES_PER_SHARD=4,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.site = Site.objects.get(is_default_site=True)
+        self.home_page = Page.objects.get(id=2)
+        self.pages = [
+            self.home_page.add_child(
+                instance=SimplePage(
+                    title=f"Page {i}", slug=f"page-{i}", content="hello", live=True
+                )
+            )
+            for i in range(6)
+        ]
+
+    def get_file(self, shard=None, part=None):
+        storage = get_sitemap_storage()
+        with storage.open(get_sitemap_file_name(self.site, shard, part)) as f:
+            return f.read().decode()
+
+    def get_shard_number(self, page):
+        return page.pk // 4
+
+    def update_sitemap_files(self, *args):
+        out = StringIO()
+        call_command("update_sitemap_files", *args, stdout=out)
+        return out.getvalue()
+
+    def test_update_all(self):
+        output = self.update_sitemap_files("--all")
+
+        numbers = sorted({self.get_shard_number(page) for page in self.pages})
+        self.assertIn(f"Successfully updated {len(numbers)} shard(s)", output)
+        self.assertFalse(SitemapShard.objects.filter(needs_update=True).exists())
+
+        index = self.get_file()
+        for number in numbers:
+            self.assertIn(
+                f"<loc>http://localhost/pregenerated/sitemap-{number}-1.xml</loc>",
+                index,
+            )
+
+        for page in self.pages:
+            self.assertIn(
+                f"<loc>http://localhost/page-{self.pages.index(page)}/</loc>",
+                self.get_file(self.get_shard_number(page), 1),
+            )
+
+    def test_publish_updates_shard(self):
+        self.update_sitemap_files("--all")
+        new_page = self.home_page.add_child(
+            instance=SimplePage(
+                title="New page", slug="new-page", content="hello", live=False
+            )
+        )
+        self.assertFalse(SitemapShard.objects.filter(needs_update=True).exists())
+
+        new_page.save_revision().publish()
+
+        self.assertEqual(
+            list(
+                SitemapShard.objects.filter(needs_update=True).values_list(
+                    "number", flat=True
+                )
+            ),
+            [self.get_shard_number(new_page)],
+        )
+        output = self.update_sitemap_files()
+        self.assertIn("Successfully updated 1 shard(s)", output)
+        self.assertIn(
+            "<loc>http://localhost/new-page/</loc>",
+            self.get_file(self.get_shard_number(new_page), 1),
+        )
+        self.assertIn(
+            f"sitemap-{self.get_shard_number(new_page)}-1.xml", self.get_file()
+        )
+
+    def test_unpublish_updates_shard(self):
+        self.update_sitemap_files("--all")
+        page = self.pages[0]
+
+        page.unpublish()
+
+        self.assertEqual(
+            list(
+                SitemapShard.objects.filter(needs_update=True).values_list(
+                    "number", flat=True
+                )
+            ),
+            [self.get_shard_number(page)],
+        )
+        self.update_sitemap_files()
+        self.assertNotIn(
+            "<loc>http://localhost/page-0/</loc>",
+            self.get_file(self.get_shard_number(page), 1),
+        )
+
+    def test_empty_shard_is_removed(self):
+        self.update_sitemap_files("--all")
+        last_page = self.pages[-1]
+        for page in self.pages:
+            if self.get_shard_number(page) == self.get_shard_number(last_page):
+                page.unpublish()
+
+        self.update_sitemap_files()
+
+        self.assertFalse(
+            SitemapShard.objects.filter(
+                number=self.get_shard_number(last_page)
+            ).exists()
+        )
+        self.assertNotIn(
+            f"sitemap-{self.get_shard_number(last_page)}-1.xml", self.get_file()
+        )
+        self.assertFalse(
+            get_sitemap_storage().exists(
+                get_sitemap_file_name(self.site, self.get_shard_number(last_page), 1)
+            )
+        )
+
+    def test_move_updates_shards(self):
+        self.update_sitemap_files("--all")
+        page = self.pages[-1]
+
+        page.move(self.pages[0], pos="last-child")
+
+        self.assertTrue(
+            SitemapShard.objects.filter(
+                number=self.get_shard_number(page), needs_update=True
+            ).exists()
+        )
+        self.update_sitemap_files()
+        self.assertIn(
+            "<loc>http://localhost/page-0/page-5/</loc>",
+            self.get_file(self.get_shard_number(page), 1),
+        )
+
+    def test_slug_change_updates_shard(self):
+        self.update_sitemap_files("--all")
+        page = self.pages[-1]
+
+        page.slug = "renamed-page"
+        page.save_revision().publish()
+
+        self.assertTrue(
+            SitemapShard.objects.filter(
+                number=self.get_shard_number(page), needs_update=True
+            ).exists()
+        )
+        self.update_sitemap_files()
+        self.assertIn(
+            "<loc>http://localhost/renamed-page/</loc>",
+            self.get_file(self.get_shard_number(page), 1),
+        )
+
+    def test_failed_update_keeps_shards_marked(self):
+        self.update_sitemap_files("--all")
+        self.pages[0].unpublish()
+        self.pages[-1].unpublish()
+        numbers = {
+            self.get_shard_number(self.pages[0]),
+            self.get_shard_number(self.pages[-1]),
+        }
+
+        with mock.patch(
+            "wagtail.contrib.sitemaps.files.update_shard",
+            side_effect=OSError("Storage unavailable"),
+        ):
+            with self.assertRaises(OSError):
+                self.update_sitemap_files()
+
+        self.assertEqual(
+            set(
+                SitemapShard.objects.filter(needs_update=True).values_list(
+                    "number", flat=True
+                )
+            ),
+            numbers,
+        )
+
+        self.update_sitemap_files()
+        self.assertFalse(SitemapShard.objects.filter(needs_update=True).exists())
+
+    def test_changes_not_tracked_when_disabled(self):
+        with override_settings(WAGTAILSITEMAPS_PREGENERATED=False):
+            self.pages[0].unpublish()
+
+        self.assertFalse(SitemapShard.objects.exists())
+
+    def test_serve_index(self):
+        self.update_sitemap_files("--all")
+
+        response = self.client.get("/pregenerated/sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn(
+            f"http://localhost/pregenerated/sitemap-{self.get_shard_number(self.pages[0])}-1.xml",
+            b"".join(response.streaming_content).decode(),
+        )
+
+    def test_serve_shard(self):
+        self.update_sitemap_files("--all")
+
+        number = self.get_shard_number(self.pages[1])
+
+        response = self.client.get(f"/pregenerated/sitemap-{number}-1.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "<loc>http://localhost/page-1/</loc>",
+            b"".join(response.streaming_content).decode(),
+        )
+
+    def test_serve_not_modified(self):
+        self.update_sitemap_files("--all")
+        response = self.client.get("/pregenerated/sitemap.xml")
+        response.close()
+
+        response = self.client.get(
+            "/pregenerated/sitemap.xml", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            "/pregenerated/sitemap.xml",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_serve_missing_file(self):
+        response = self.client.get("/pregenerated/sitemap.xml")
+        self.assertEqual(response.status_code, 404)
+
+        self.update_sitemap_files("--all")
+        response = self.client.get("/pregenerated/sitemap-100-1.xml")
+        self.assertEqual(response.status_code, 404)
@@ -1,6 +1,9 @@
 import inspect
 
 from django.contrib.sitemaps import views as sitemap_views
+from django.http import FileResponse, Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 from .sitemap_generator import Sitemap
 
@@ -26,3 +29,36 @@ def prepare_sitemaps(request, sitemaps):
         else:
             initialised_sitemaps[name] = sitemap_cls
     return initialised_sitemaps
+
+
+def pregenerated_sitemap(request, shard=None, part=None):
+    """
+    Serve the pre-generated sitemap index of the current site, or one of its
+    sitemap files if ``shard`` and ``part`` are given, from storage.
+    """
+    from wagtail.models import Site
+
+    from .files import get_sitemap_file_name, get_sitemap_storage
+
+    site = Site.find_for_request(request)
+    if site is None:
+        site = Site.objects.get(is_default_site=True)
+
+    storage = get_sitemap_storage()
+    name = get_sitemap_file_name(site, shard, part)
+    if not storage.exists(name):
+        raise Http404
+
+    # Like a static file server, identify the version of the file by its
+    # modification time and size
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    etag = f'"{last_modified:x}-{storage.size(name):x}"'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(storage.open(name), content_type="application/xml")
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["X-Robots-Tag"] = "noindex, noodp, noarchive"
+    return response
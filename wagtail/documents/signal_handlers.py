@@ -1,7 +1,8 @@
 from django.db import transaction
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 
 from wagtail.documents import get_document_model
+from wagtail.rich_text.cache import clear_rich_text_cache_for_object
 
 
 def post_delete_file_cleanup(instance, **kwargs):
@@ -9,6 +10,14 @@ def post_delete_file_cleanup(instance, **kwargs):
     transaction.on_commit(lambda: instance.file.delete(False))
 
 
+def clear_rich_text_cache_signal_handler(instance, **kwargs):
+    clear_rich_text_cache_for_object(instance)
+
+
 def register_signal_handlers():
     Document = get_document_model()
     post_delete.connect(post_delete_file_cleanup, sender=Document)
+
+    # Links and embeds of the document in rich text change with it
+    post_save.connect(clear_rich_text_cache_signal_handler, sender=Document)
+    post_delete.connect(clear_rich_text_cache_signal_handler, sender=Document)
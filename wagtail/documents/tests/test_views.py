@@ -72,6 +72,7 @@ class TestServeView(TestCase):
         mock_doc.filename = self.document.filename
         mock_doc.content_type = self.document.content_type
         mock_doc.content_disposition = self.document.content_disposition
+        mock_doc.file_hash = self.document.file_hash
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
@@ -105,6 +106,7 @@ class TestServeView(TestCase):
         mock_doc.filename = self.pdf_document.filename
         mock_doc.content_type = self.pdf_document.content_type
         mock_doc.content_disposition = self.pdf_document.content_disposition
+        mock_doc.file_hash = self.pdf_document.file_hash
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
@@ -167,12 +169,213 @@ class TestServeView(TestCase):
     def test_has_etag_header(self):
         self.assertEqual(self.get()["ETag"], '"123456"')
 
+    def test_etag_fetched_with_document(self):
+        # The document, and its collection and view restrictions for the privacy
+        # check, with no separate query for the file hash
+        with self.assertNumQueries(3):
+            self.get()
+
+    def test_if_none_match(self):
+        response = self.client.get(
+            reverse(
+                "wagtaildocs_serve", args=(self.document.id, self.document.filename)
+            ),
+            HTTP_IF_NONE_MATCH='"123456"',
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"123456"')
+
+    def test_if_none_match_with_changed_file(self):
+        response = self.client.get(
+            reverse(
+                "wagtaildocs_serve", args=(self.document.id, self.document.filename)
+            ),
+            HTTP_IF_NONE_MATCH='"654321"',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.response = response
+
+    def test_if_none_match_with_incorrect_filename(self):
+        response = self.client.get(
+            reverse("wagtaildocs_serve", args=(self.document.id, "incorrectfilename")),
+            HTTP_IF_NONE_MATCH='"123456"',
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_accept_ranges_header(self):
+        self.assertEqual(self.get()["Accept-Ranges"], "bytes")
+
     def clear_sendfile_cache(self):
         from wagtail.utils.sendfile import _get_sendfile
 
         _get_sendfile.clear()
 
 
+@override_settings(WAGTAILDOCS_SERVE_METHOD=None)
+class TestServeViewRangeRequests(TestCase):
+    content = b"A boring example document"
+
+    def setUp(self):
+        self.document = models.Document(title="Test document", file_hash="123456")
+        self.document.file.save("serve_view_ranges.doc", ContentFile(self.content))
+
+    def tearDown(self):
+        # delete the FieldFile directly because the TestCase does not commit
+        # transactions to trigger transaction.on_commit() in the signal handler
+        self.document.file.delete()
+
+    def get(self, range_header, **headers):
+        response = self.client.get(
+            reverse(
+                "wagtaildocs_serve", args=(self.document.id, self.document.filename)
+            ),
+            HTTP_RANGE=range_header,
+            **headers,
+        )
+        content = (
+            b"".join(response.streaming_content)
+            if response.streaming
+            else response.content
+        )
+        return response, content
+
+    def test_single_range(self):
+        response, content = self.get("bytes=2-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"boring")
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+        self.assertEqual(response["Content-Length"], "6")
+        self.assertEqual(response["Content-Type"], "application/msword")
+        self.assertEqual(response["ETag"], '"123456"')
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="{self.document.filename}"',
+        )
+
+    def test_open_ended_range(self):
+        response, content = self.get("bytes=17-")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"document")
+        self.assertEqual(response["Content-Range"], "bytes 17-24/25")
+
+    def test_suffix_range(self):
+        response, content = self.get("bytes=-8")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"document")
+        self.assertEqual(response["Content-Range"], "bytes 17-24/25")
+
+    def test_multiple_ranges(self):
+        response, content = self.get("bytes=0-0, 17-")
+
+        self.assertEqual(response.status_code, 206)
+        content_type, boundary = response["Content-Type"].split("; boundary=")
+        self.assertEqual(content_type, "multipart/byteranges")
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertEqual(
+            content,
+            (
+                f"--{boundary}\r\n"
+                "Content-Type: application/msword\r\n"
+                "Content-Range: bytes 0-0/25\r\n\r\n"
+                "A\r\n"
+                f"--{boundary}\r\n"
+                "Content-Type: application/msword\r\n"
+                "Content-Range: bytes 17-24/25\r\n\r\n"
+                "document\r\n"
+                f"--{boundary}--\r\n"
+            ).encode(),
+        )
+
+    def test_overlapping_ranges_are_merged(self):
+        response, content = self.get("bytes=2-5,4-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"boring")
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+
+    def test_unsatisfiable_range(self):
+        response, content = self.get("bytes=100-200")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */25")
+
+    def test_invalid_range_is_ignored(self):
+        response, content = self.get("bytes=7-2")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, self.content)
+
+    def test_if_range_with_matching_etag(self):
+        response, content = self.get("bytes=2-7", HTTP_IF_RANGE='"123456"')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"boring")
+
+    def test_if_range_with_changed_etag(self):
+        response, content = self.get("bytes=2-7", HTTP_IF_RANGE='"654321"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, self.content)
+
+    def test_if_range_with_weak_etag(self):
+        response, content = self.get("bytes=2-7", HTTP_IF_RANGE='W/"123456"')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_range_with_date(self):
+        last_modified = self.client.get(
+            reverse(
+                "wagtaildocs_serve", args=(self.document.id, self.document.filename)
+            )
+        )
+        last_modified.close()
+
+        response, content = self.get(
+            "bytes=2-7", HTTP_IF_RANGE=last_modified["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 206)
+
+        response, content = self.get(
+            "bytes=2-7", HTTP_IF_RANGE="Thu, 01 Jan 2015 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @mock.patch("wagtail.documents.views.serve.hooks")
+    @mock.patch("wagtail.documents.views.serve.get_object_or_404")
+    def test_non_local_filesystem(self, mock_get_object_or_404, mock_hooks):
+        # Create a mock document with no local file to hit the correct code path
+        mock_doc = mock.Mock()
+        mock_doc.filename = self.document.filename
+        mock_doc.content_type = self.document.content_type
+        mock_doc.content_disposition = self.document.content_disposition
+        mock_doc.file_hash = self.document.file_hash
+        mock_doc.file = ContentFile(self.content)
+        mock_doc.file.path = None
+        mock_doc.file.url = None
+        mock_get_object_or_404.return_value = mock_doc
+
+        # Bypass 'before_serve_document' hooks
+        mock_hooks.get_hooks.return_value = []
+
+        response, content = self.get("bytes=2-7")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, b"boring")
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+        self.assertEqual(response["ETag"], '"123456"')
+
+        response, content = self.get("bytes=0-0,-8")
+        self.assertEqual(response.status_code, 206)
+        self.assertIn(b"Content-Range: bytes 17-24/25\r\n\r\ndocument", content)
+
+        response, content = self.get("bytes=2-7", HTTP_IF_RANGE='"654321"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(content, self.content)
+
+
 @override_settings(WAGTAILDOCS_SERVE_METHOD="redirect")
 class TestServeViewWithRedirect(TestCase):
     def setUp(self):
@@ -385,6 +588,7 @@ class TestServeWithUnicodeFilename(TestCase):
         # Create a mock document to hit the correct code path.
         mock_doc = mock.Mock()
         mock_doc.filename = "TÈST.doc"
+        mock_doc.file_hash = ""
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
@@ -5,8 +5,8 @@ from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.http import url_has_allowed_host_and_scheme
-from django.views.decorators.http import etag
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag, url_has_allowed_host_and_scheme
 
 from wagtail import hooks
 from wagtail.documents import get_document_model
@@ -15,20 +15,10 @@ from wagtail.forms import PasswordViewRestrictionForm
 from wagtail.models import CollectionViewRestriction
 from wagtail.utils import sendfile_streaming_backend
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
+from wagtail.utils.range_requests import get_range_response
 from wagtail.utils.sendfile import sendfile
 
 
-def document_etag(request, document_id, document_filename):
-    Document = get_document_model()
-    if hasattr(Document, "file_hash"):
-        return (
-            Document.objects.filter(id=document_id)
-            .values_list("file_hash", flat=True)
-            .first()
-        )
-
-
-@etag(document_etag)
 def serve(request, document_id, document_filename):
     Document = get_document_model()
     doc = get_object_or_404(Document, id=document_id)
@@ -44,6 +34,25 @@ def serve(request, document_id, document_filename):
         if isinstance(result, HttpResponse):
             return result
 
+    # Respect the If-None-Match header, using the file hash fetched along with the
+    # document rather than querying for it separately
+    file_hash = getattr(doc, "file_hash", None)
+    etag = quote_etag(file_hash) if file_hash else None
+    if etag:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+            return response
+
+    response = _serve_document(request, doc, etag)
+    if etag:
+        response.headers.setdefault("ETag", etag)
+    return response
+
+
+def _serve_document(request, doc, etag):
+    Document = get_document_model()
+
     # Send document_served signal
     document_served.send(sender=Document, instance=doc, request=request)
 
@@ -85,6 +94,7 @@ def serve(request, document_id, document_filename):
             "attachment": (doc.content_disposition != "inline"),
             "attachment_filename": doc.filename,
             "mimetype": doc.content_type,
+            "etag": etag,
         }
         if not hasattr(settings, "SENDFILE_BACKEND"):
             # Fallback to streaming backend if user hasn't specified SENDFILE_BACKEND
@@ -97,16 +107,23 @@ def serve(request, document_id, document_filename):
         # (e.g. storages.backends.s3boto.S3BotoStorage) AND the developer has not allowed
         # redirecting to the file url directly.
         # Fall back on pre-sendfile behaviour of reading the file content and serving it
-        # as a FileResponse
-        response = FileResponse(doc.file, doc.content_type)
+        # as a FileResponse, or the requested parts of it to range requests
+
+        # FIXME: storage backends are not guaranteed to implement 'size'
+        size = doc.file.size
+
+        response = get_range_response(
+            request, doc.file.open("rb"), size, doc.content_type, etag=etag
+        )
+        if response is None:
+            response = FileResponse(doc.file, doc.content_type)
+            response["Content-Length"] = size
+            response["Accept-Ranges"] = "bytes"
 
         # set filename and filename* to handle non-ascii characters in filename
         # see https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Content-Disposition
         response["Content-Disposition"] = doc.content_disposition
 
-        # FIXME: storage backends are not guaranteed to implement 'size'
-        response["Content-Length"] = doc.file.size
-
         return response
 
 
@@ -1,5 +1,6 @@
 import json
 
+from django.core.exceptions import FieldDoesNotExist
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxLengthValidator
 from django.db import models
@@ -7,6 +8,7 @@ from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 
 from wagtail.blocks import Block, BlockField, StreamBlock, StreamValue
+from wagtail.blocks.base import prefetch_chooser_objects_for_blocks
 from wagtail.blocks.definition_lookup import (
     BlockDefinitionLookup,
     BlockDefinitionLookupBuilder,
@@ -282,3 +284,42 @@ class StreamField(models.Field):
         # Add Creator descriptor to allow the field to be set from a list or a
         # JSON string.
         setattr(cls, self.name, Creator(self))
+
+
+def prefetch_stream_blocks(instances, *field_names):
+    """
+    Convert the values of the named StreamFields on all of the given model instances,
+    fetching the objects selected by chooser blocks in all of them with a single query
+    per model, rather than one query per instance and chooser block type.
+
+    Instances that do not have a StreamField of the given name (such as pages of a
+    different type in a list of specific pages), or where the field has been deferred,
+    are skipped.
+    """
+    stream_values = []
+    for instance in instances:
+        if not isinstance(instance, models.Model):
+            continue
+
+        for field_name in field_names:
+            try:
+                field = instance._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                continue
+
+            if not isinstance(field, StreamField):
+                continue
+
+            # Look in __dict__ to avoid fetching deferred fields
+            value = instance.__dict__.get(field.attname)
+            if isinstance(value, StreamValue):
+                stream_values.append(value)
+
+    with prefetch_chooser_objects_for_blocks(
+        [
+            (value.stream_block, [value._get_unconverted_raw_data()])
+            for value in stream_values
+        ]
+    ):
+        for value in stream_values:
+            value._prefetch_all_blocks()
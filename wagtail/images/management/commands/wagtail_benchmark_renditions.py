@@ -0,0 +1,130 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # The resource module is only available on Unix platforms
+    resource = None
+
+
+DEFAULT_FILTER_SPECS = [
+    "width-{160,320,480,640,800,1024,1280,1600,1920,2560}",
+    "fill-400x400",
+    "fill-1200x630",
+]
+
+
+def get_peak_rss():
+    """
+    Return the peak resident set size of this process so far, in megabytes,
+    or None if it cannot be determined on this platform.
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, but in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak_rss / (1024 * 1024)
+    return peak_rss / 1024
+
+
+class Command(BaseCommand):
+    """Command to measure the time and memory taken to generate image renditions, without saving them."""
+
+    help = (
+        "Generates renditions for the given images in memory, and reports the wall "
+        "time and peak memory usage for each image."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "image_ids",
+            nargs="*",
+            type=int,
+            help="IDs of the images to benchmark (default: the most recently uploaded images)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of images to benchmark when no IDs are given (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            dest="filter_specs",
+            help="Filter spec to generate; may be given multiple times and may use brace-expansion (default: a typical set of srcset widths)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of worker threads (default: the WAGTAILIMAGES_RENDITION_WORKERS setting)",
+        )
+        parser.add_argument(
+            "--no-pyramid",
+            action="store_false",
+            dest="use_pyramid",
+            help="Decode the original image separately for each rendition",
+        )
+
+    def handle(self, *args, **options):
+        Image = get_image_model()
+
+        if options["image_ids"]:
+            images = Image.objects.filter(id__in=options["image_ids"]).order_by("id")
+        else:
+            images = Image.objects.order_by("-created_at")[: options["limit"]]
+
+        filter_specs = Filter.expand_spec(
+            options["filter_specs"] or DEFAULT_FILTER_SPECS
+        )
+        filters = [Filter(spec) for spec in dict.fromkeys(filter_specs)]
+
+        self.stdout.write(
+            self.style.HTTP_INFO(
+                f"Generating {len(filters)} rendition(s) per image"
+                + ("" if options["use_pyramid"] else " without a shared pyramid")
+            )
+        )
+
+        total_time = 0
+        num_images = 0
+        for image in images:
+            with image.open_file() as file:
+                original_image_bytes = file.read()
+
+            start_time = time.perf_counter()
+            image._generate_rendition_instances(
+                filters,
+                original_image_bytes,
+                max_workers=options["workers"],
+                use_pyramid=options["use_pyramid"],
+            )
+            elapsed = time.perf_counter() - start_time
+
+            total_time += elapsed
+            num_images += 1
+
+            peak_rss = get_peak_rss()
+            self.stdout.write(
+                f"Image {image.id} ({image.width}x{image.height}): "
+                f"{elapsed * 1000:.1f}ms"
+                + ("" if peak_rss is None else f", peak RSS {peak_rss:.1f}MB")
+            )
+
+        if num_images:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Benchmarked {num_images} image(s) in {total_time:.2f}s "
+                    f"({total_time * 1000 / num_images:.1f}ms per image)"
+                )
+            )
+        else:
+            self.stdout.write(self.style.WARNING("No images found."))
@@ -0,0 +1,156 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from wagtail.images.models import Filter, PendingRendition
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command to generate renditions queued while WAGTAILIMAGES_RENDITION_QUEUE_ENABLED is set."""
+
+    help = (
+        "Generates queued image renditions, optionally polling the queue until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of queued renditions to claim at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=3,
+            help="Number of times to try generating a rendition before giving up on it (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue for new renditions instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Number of seconds to wait between polls of an empty queue when using --loop (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        num_processed = 0
+
+        while True:
+            processed = self.process_batch(
+                options["batch_size"], options["max_attempts"]
+            )
+            num_processed += processed
+
+            if not processed:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully processed {num_processed} rendition(s)")
+        )
+
+    def process_batch(self, batch_size, max_attempts):
+        entries = self.claim_batch(batch_size, max_attempts)
+        if not entries:
+            return 0
+
+        # Renditions are generated outside of the transaction that claimed them, so
+        # that the entries aren't locked while images are being processed
+        entries_by_image = defaultdict(list)
+        for entry in entries:
+            entries_by_image[(entry.content_type, entry.object_id)].append(entry)
+
+        for (content_type, object_id), image_entries in entries_by_image.items():
+            self.process_image_entries(
+                content_type, object_id, image_entries, max_attempts
+            )
+
+        return len(entries)
+
+    def claim_batch(self, batch_size, max_attempts):
+        now = timezone.now()
+        claim_expiry = now - timedelta(seconds=PendingRendition.CLAIM_TIMEOUT)
+
+        with transaction.atomic():
+            # Use SKIP LOCKED (where supported) so that several workers can claim
+            # entries from the queue concurrently without claiming the same ones
+            entries = list(
+                PendingRendition.objects.filter(
+                    Q(claimed_at__isnull=True) | Q(claimed_at__lt=claim_expiry)
+                )
+                .select_for_update(skip_locked=True)
+                .select_related("content_type")
+                .order_by("created_at", "pk")[:batch_size]
+            )
+
+            # Entries that are still here after the maximum number of attempts were
+            # claimed by a worker that stopped before finishing them
+            exhausted = [entry for entry in entries if entry.attempts >= max_attempts]
+            if exhausted:
+                self.give_up(exhausted)
+                entries = [entry for entry in entries if entry not in exhausted]
+
+            for entry in entries:
+                entry.attempts += 1
+                entry.claimed_at = now
+            PendingRendition.objects.bulk_update(entries, ["attempts", "claimed_at"])
+
+        return entries
+
+    def give_up(self, entries):
+        for entry in entries:
+            logger.error(
+                "Giving up generating rendition %s for image %s after %d attempts",
+                entry.filter_spec,
+                entry.object_id,
+                entry.attempts,
+            )
+        # Remove the entries, so that the renditions can be queued again when next
+        # requested
+        PendingRendition.objects.filter(pk__in=[e.pk for e in entries]).delete()
+
+    def process_image_entries(self, content_type, object_id, entries, max_attempts):
+        model = content_type.model_class()
+        image = model._default_manager.filter(pk=object_id).first() if model else None
+
+        if image is None:
+            # The image has been deleted since the renditions were requested
+            PendingRendition.objects.filter(pk__in=[e.pk for e in entries]).delete()
+            return
+
+        filter_specs = dict.fromkeys(entry.filter_spec for entry in entries)
+        try:
+            with transaction.atomic():
+                image.get_renditions(
+                    *[Filter(spec) for spec in filter_specs], defer=False
+                )
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Error generating renditions for image %s", object_id)
+            self.stderr.write(
+                self.style.ERROR(f"Failed to generate renditions for image {object_id}")
+            )
+            if entries[0].attempts >= max_attempts:
+                self.give_up(entries)
+                return
+
+            # Release the claim, so that the entries are retried in a later batch
+            for entry in entries:
+                entry.claimed_at = None
+                entry.last_error = str(e)
+            PendingRendition.objects.bulk_update(entries, ["claimed_at", "last_error"])
+        else:
+            PendingRendition.objects.filter(pk__in=[e.pk for e in entries]).delete()
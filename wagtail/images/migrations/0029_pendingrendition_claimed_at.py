@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailimages', '0028_pendingrendition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingrendition',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
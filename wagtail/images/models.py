@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import concurrent.futures
+import copy
 import hashlib
 import itertools
 import logging
@@ -17,6 +18,7 @@ from typing import Any
 import willow
 from django.apps import apps
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core import checks
 from django.core.cache import DEFAULT_CACHE_ALIAS, InvalidCacheBackendError, caches
 from django.core.cache.backends.base import BaseCache
@@ -25,13 +27,15 @@ from django.core.files import File
 from django.core.files.storage import InvalidStorageError, default_storage, storages
 from django.db import models
 from django.db.models import Q
+from django.db.models.query import ModelIterable
 from django.forms.utils import flatatt
-from django.urls import reverse
+from django.urls import NoReverseMatch, reverse
 from django.utils.functional import cached_property, classproperty
 from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from taggit.managers import TaggableManager
+from willow.plugins.pillow import PillowImage
 
 from wagtail import hooks
 from wagtail.coreutils import string_to_ascii
@@ -46,6 +50,12 @@ from wagtail.images.image_operations import (
     TransformOperation,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_cache import (
+    RenditionLookupBatch,
+    get_local_cache_key,
+    get_local_rendition_cache,
+    increment_stats,
+)
 from wagtail.models import CollectionMember, ReferenceIndex
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
@@ -99,6 +109,22 @@ class ImageQuerySet(SearchableQuerySetMixin, models.QuerySet):
             )
         )
 
+    def _fetch_all(self):
+        link_results = self._result_cache is None
+        super()._fetch_all()
+        if link_results and self._iterable_class is ModelIterable:
+            # Let images fetched together look up their renditions in the shared
+            # cache together (see RenditionLookupBatch)
+            images = [
+                image
+                for image in self._result_cache
+                if isinstance(image, AbstractImage)
+            ]
+            if len(images) > 1:
+                batch = RenditionLookupBatch(images)
+                for image in images:
+                    image._rendition_lookup_batch = batch
+
 
 def get_upload_to(instance, filename):
     """
@@ -500,12 +526,19 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         except AttributeError:
             pass
 
-    def get_rendition(self, filter: Filter | str) -> AbstractRendition:
+    def get_rendition(
+        self, filter: Filter | str, *, defer: bool | None = None
+    ) -> AbstractRendition:
         """
         Returns a ``Rendition`` instance with a ``file`` field value (an
         image) reflecting the supplied ``filter`` value and focal point values
         from this object.
 
+        If ``defer`` is ``True`` (defaulting to the value of the
+        ``WAGTAILIMAGES_RENDITION_QUEUE_ENABLED`` setting), a rendition that does
+        not exist yet is queued for generation, and an unsaved placeholder
+        rendition is returned instead (see ``get_placeholder_rendition()``).
+
         Note: If using custom image models, an instance of the custom rendition
         model will be returned.
         """
@@ -517,14 +550,16 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         try:
             rendition = self.find_existing_rendition(filter)
         except Rendition.DoesNotExist:
-            rendition = self.create_rendition(filter)
+            if self._should_defer_renditions(defer):
+                rendition = self.defer_renditions(filter)[filter]
+                if rendition.is_placeholder:
+                    return rendition
+            else:
+                rendition = self.create_rendition(filter)
             # Reuse this rendition if requested again from this object
             self._add_to_prefetched_renditions(rendition)
 
-        cache_key = Rendition.construct_cache_key(
-            self, filter.get_cache_key(self), filter.spec
-        )
-        Rendition.cache_backend.set(cache_key, rendition)
+        self._cache_renditions({filter: rendition})
 
         return rendition
 
@@ -568,15 +603,21 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         )
         return rendition
 
-    def get_renditions(self, *filters: Filter | str) -> dict[str, AbstractRendition]:
+    def get_renditions(
+        self, *filters: Filter | str, defer: bool | None = None
+    ) -> dict[str, AbstractRendition]:
         """
         Returns a ``dict`` of ``Rendition`` instances with image files reflecting
         the supplied ``filters``, keyed by filter spec patterns.
 
+        If ``defer`` is ``True`` (defaulting to the value of the
+        ``WAGTAILIMAGES_RENDITION_QUEUE_ENABLED`` setting), renditions that do not
+        exist yet are queued for generation, and unsaved placeholder renditions are
+        returned in their place.
+
         Note: If using custom image models, instances of the custom rendition
         model will be returned.
         """
-        Rendition = self.get_rendition_model()
         # We don’t support providing mixed Filter and string arguments in the same call.
         if isinstance(filters[0], str):
             filters = [Filter(spec) for spec in dict.fromkeys(filters).keys()]
@@ -586,25 +627,75 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         # Create any renditions not found in prefetched values, cache or database
         not_found = [f for f in filters if f not in renditions]
-        for filter, rendition in self.create_renditions(*not_found).items():
-            self._add_to_prefetched_renditions(rendition)
-            renditions[filter] = rendition
+        if not_found and self._should_defer_renditions(defer):
+            new_renditions = self.defer_renditions(*not_found)
+        else:
+            new_renditions = self.create_renditions(*not_found)
+
+        placeholders = {}
+        for filter, rendition in new_renditions.items():
+            if rendition.is_placeholder:
+                placeholders[filter] = rendition
+            else:
+                self._add_to_prefetched_renditions(rendition)
+                renditions[filter] = rendition
 
         # Update the cache
-        cache_additions = {
-            Rendition.construct_cache_key(
-                self, filter.get_cache_key(self), filter.spec
-            ): rendition
-            for filter, rendition in renditions.items()
-            # prevent writing of cached data back to the cache
-            if not getattr(rendition, "_from_cache", False)
-        }
-        if cache_additions:
-            Rendition.cache_backend.set_many(cache_additions)
+        self._cache_renditions(renditions)
+
+        renditions.update(placeholders)
 
         # Make sure key insertion order matches the input order.
         return {filter.spec: renditions[filter] for filter in filters}
 
+    def _should_defer_renditions(self, defer: bool | None) -> bool:
+        if defer is None:
+            return getattr(settings, "WAGTAILIMAGES_RENDITION_QUEUE_ENABLED", False)
+        return defer
+
+    def defer_renditions(self, *filters: Filter) -> dict[Filter, AbstractRendition]:
+        """
+        Queues renditions for the supplied ``filters`` to be generated by the
+        ``wagtail_process_rendition_queue`` management command, and returns
+        placeholder renditions for them, keyed by the relevant ``Filter`` instance.
+
+        If placeholder URLs cannot be generated (because the ``wagtailimages_serve``
+        URL pattern is not configured), the renditions are created immediately.
+        """
+        try:
+            placeholders = {
+                filter: self.get_placeholder_rendition(filter) for filter in filters
+            }
+        except NoReverseMatch:
+            return self.create_renditions(*filters)
+
+        PendingRendition.enqueue(self, filters)
+        return placeholders
+
+    def get_placeholder_rendition(self, filter: Filter) -> AbstractRendition:
+        """
+        Returns an unsaved ``Rendition`` instance for the supplied ``filter``, with
+        the dimensions the final rendition will have, and a ``url`` pointing to the
+        dynamic image serve view, which generates the rendition on request if it
+        has not been generated by then.
+        """
+        from wagtail.images.views.serve import generate_image_url
+        from wagtail.rich_text.cache import skip_rich_text_cache
+
+        size = filter.get_transform(self).size
+        rendition = self.get_rendition_model()(
+            image=self,
+            filter_spec=filter.spec,
+            focal_point_key=filter.get_cache_key(self),
+            width=size[0],
+            height=size[1],
+        )
+        rendition.placeholder_url = generate_image_url(self, filter.spec)
+
+        # The placeholder URL must not outlive the rendition being generated
+        skip_rich_text_cache()
+        return rendition
+
     def find_existing_renditions(
         self, *filters: Filter
     ) -> dict[Filter, AbstractRendition]:
@@ -617,7 +708,6 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         from the return value. If none of the requested renditions have been
         created before, the return value will be an empty dict.
         """
-        Rendition = self.get_rendition_model()
         filters_by_spec: dict[str, Filter] = {f.spec: f for f in filters}
         found: dict[Filter, AbstractRendition] = {}
 
@@ -654,17 +744,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
             # Renditions are not prefetched, so attempt to find suitable
             # items in the cache or database
 
-            # Query the cache first
-            cache_keys = [
-                Rendition.construct_cache_key(self, filter.get_cache_key(self), spec)
-                for spec, filter in filters_by_spec.items()
-            ]
-            for rendition in Rendition.cache_backend.get_many(cache_keys).values():
-                filter = filters_by_spec[rendition.filter_spec]
-                # The retrieved rendition needs to be associated with the current image instance, so that any
-                # locally-set properties such as contextual_alt_text are respected
-                rendition.image = self
-                found[filter] = rendition
+            # Query the caches first
+            found.update(self._find_cached_renditions(*filters_by_spec.values()))
 
             # For items not found in the cache, look in the database
             not_found = [f for f in filters if f not in found]
@@ -680,6 +761,135 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
                     found[filter] = rendition
         return found
 
+    def _find_cached_renditions(
+        self, *filters: Filter
+    ) -> dict[Filter, AbstractRendition]:
+        """
+        Look up the renditions for the given filters in the in-process rendition
+        cache (if enabled), and then in the ``renditions`` cache.
+        """
+        Rendition = self.get_rendition_model()
+        found: dict[Filter, AbstractRendition] = {}
+        focal_point_keys = {filter: filter.get_cache_key(self) for filter in filters}
+
+        local_cache = get_local_rendition_cache()
+        if local_cache is not None:
+            for filter, focal_point_key in focal_point_keys.items():
+                rendition = local_cache.get(
+                    get_local_cache_key(self, focal_point_key, filter.spec)
+                )
+                if rendition is not None:
+                    found[filter] = rendition
+            increment_stats(
+                local_hits=len(found), local_misses=len(filters) - len(found)
+            )
+
+        cache_keys = {
+            Rendition.construct_cache_key(self, focal_point_key, filter.spec): filter
+            for filter, focal_point_key in focal_point_keys.items()
+            if filter not in found
+        }
+
+        # Use the results of a query made for another image in the same batch
+        batch = getattr(self, "_rendition_lookup_batch", None)
+        if batch is not None:
+            for cache_key in list(cache_keys):
+                if cache_key in batch.results:
+                    rendition = batch.results[cache_key]
+                    filter = cache_keys.pop(cache_key)
+                    if rendition is not None:
+                        found[filter] = copy.copy(rendition)
+                    increment_stats(batch_hits=1)
+
+        if cache_keys:
+            lookup_keys = list(cache_keys)
+            if batch is not None:
+                # Look up the same filters for the other images in the batch
+                batch_keys = self._get_batch_cache_keys(batch, cache_keys.values())
+                lookup_keys.extend(batch_keys)
+
+            results = Rendition.cache_backend.get_many(lookup_keys)
+            increment_stats(
+                shared_queries=1,
+                shared_hits=len(results),
+                shared_misses=len(lookup_keys) - len(results),
+            )
+
+            if batch is not None:
+                for cache_key in batch_keys:
+                    batch.results[cache_key] = results.get(cache_key)
+
+            for cache_key, filter in cache_keys.items():
+                if cache_key in results:
+                    found[filter] = results[cache_key]
+                    if local_cache is not None:
+                        local_cache.set(
+                            get_local_cache_key(
+                                self, focal_point_keys[filter], filter.spec
+                            ),
+                            results[cache_key],
+                        )
+
+        for rendition in found.values():
+            # The retrieved rendition needs to be associated with the current image instance, so that any
+            # locally-set properties such as contextual_alt_text are respected
+            rendition.image = self
+            # prevent writing of cached data back to the cache
+            rendition._from_cache = True
+
+        return found
+
+    def _get_batch_cache_keys(
+        self, batch: RenditionLookupBatch, filters: Iterable[Filter]
+    ) -> list[str]:
+        """
+        Return the ``renditions`` cache keys for the given filters for the other
+        images in ``batch``, that have not already been looked up.
+        """
+        Rendition = self.get_rendition_model()
+        cache_keys = []
+        for image in batch.images:
+            if (
+                image is self
+                or image._get_prefetched_renditions() is not None
+                or image.get_deferred_fields()
+            ):
+                continue
+
+            for filter in filters:
+                cache_key = Rendition.construct_cache_key(
+                    image, filter.get_cache_key(image), filter.spec
+                )
+                if cache_key not in batch.results:
+                    cache_keys.append(cache_key)
+        return cache_keys
+
+    def _cache_renditions(self, renditions: dict[Filter, AbstractRendition]) -> None:
+        """
+        Add the given renditions to the ``renditions`` cache, and to the in-process
+        rendition cache if enabled, unless they were retrieved from a cache.
+        """
+        Rendition = self.get_rendition_model()
+        local_cache = get_local_rendition_cache()
+        cache_additions = {}
+        for filter, rendition in renditions.items():
+            if getattr(rendition, "_from_cache", False):
+                continue
+
+            focal_point_key = filter.get_cache_key(self)
+            cache_additions[
+                Rendition.construct_cache_key(self, focal_point_key, filter.spec)
+            ] = rendition
+            if local_cache is not None:
+                local_cache.set(
+                    get_local_cache_key(self, focal_point_key, filter.spec), rendition
+                )
+
+        if len(cache_additions) == 1:
+            Rendition.cache_backend.set(*cache_additions.popitem())
+        elif cache_additions:
+            Rendition.cache_backend.set_many(cache_additions)
+
     def create_renditions(self, *filters: Filter) -> dict[Filter, AbstractRendition]:
         """
         Creates multiple ``Rendition`` instances with image files reflecting the supplied
@@ -712,18 +922,7 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         with self.open_file() as file:
             original_image_bytes = file.read()
 
-        to_create = []
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            for future in concurrent.futures.as_completed(
-                executor.submit(
-                    self.generate_rendition_instance,
-                    filter,
-                    BytesIO(original_image_bytes),
-                )
-                for filter in filters
-            ):
-                to_create.append(future.result())
+        to_create = self._generate_rendition_instances(filters, original_image_bytes)
 
         # Rendition generation can take a while. So, if other processes have created
         # identical renditions in the meantime, we should find them to avoid clashes.
@@ -764,24 +963,84 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         return return_value
 
+    def _generate_rendition_instances(
+        self,
+        filters: Iterable[Filter],
+        original_image_bytes: bytes,
+        *,
+        max_workers: int | None = None,
+        use_pyramid: bool = True,
+    ) -> list[AbstractRendition]:
+        """
+        Generate **unsaved** ``Rendition`` instances for all of the supplied
+        ``filters`` from the original image contents, using a pool of
+        ``WAGTAILIMAGES_RENDITION_WORKERS`` threads.
+
+        Where possible, the original image is decoded and oriented only once,
+        and each rendition is derived from the smallest suitable copy in a
+        ``SourceImagePyramid``, rather than from a fresh decode of the original.
+        """
+        pyramid = None
+        if use_pyramid and any(filter.can_run_from_pyramid() for filter in filters):
+            pyramid = SourceImagePyramid.from_bytes(original_image_bytes)
+            if pyramid is not None:
+                pyramid.prepare(
+                    [
+                        filter.get_transform(self, pyramid.size)
+                        for filter in filters
+                        if filter.can_run_from_pyramid()
+                    ]
+                )
+
+        if max_workers is None:
+            max_workers = getattr(settings, "WAGTAILIMAGES_RENDITION_WORKERS", 3)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [
+                future.result()
+                for future in concurrent.futures.as_completed(
+                    executor.submit(
+                        self.generate_rendition_instance,
+                        filter,
+                        BytesIO(original_image_bytes),
+                        pyramid=pyramid if filter.can_run_from_pyramid() else None,
+                    )
+                    for filter in filters
+                )
+            ]
+
     def generate_rendition_instance(
-        self, filter: Filter, source: BytesIO
+        self,
+        filter: Filter,
+        source: BytesIO,
+        *,
+        pyramid: SourceImagePyramid | None = None,
     ) -> AbstractRendition:
         """
         Use the supplied ``source`` image to create and return an
         **unsaved** ``Rendition`` instance, with a ``file`` value reflecting
         the supplied ``filter`` value and focal point values from this object.
+
+        If a ``pyramid`` is supplied, the rendition is generated from its
+        already-decoded copies of the source image instead.
         """
+        file_kwargs = {"source": File(source, name=self.file.name)}
+        if pyramid is not None:
+            file_kwargs["pyramid"] = pyramid
+
         return self.get_rendition_model()(
             image=self,
             filter_spec=filter.spec,
             focal_point_key=filter.get_cache_key(self),
-            file=self.generate_rendition_file(
-                filter, source=File(source, name=self.file.name)
-            ),
+            file=self.generate_rendition_file(filter, **file_kwargs),
         )
 
-    def generate_rendition_file(self, filter: Filter, *, source: File = None) -> File:
+    def generate_rendition_file(
+        self,
+        filter: Filter,
+        *,
+        source: File = None,
+        pyramid: SourceImagePyramid | None = None,
+    ) -> File:
         """
         Generates an in-memory image matching the supplied ``filter`` value
         and focal point value from this object, wraps it in a ``File`` object
@@ -793,6 +1052,11 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         ``source`` keyword can be used to provide a reference to the in-memory
         ``File``, bypassing the need to reload the image contents from storage.
 
+        If the image has already been decoded into a ``SourceImagePyramid`` (as
+        ``AbstractImage.create_renditions()`` does when generating several
+        renditions at once), it can be provided with the ``pyramid`` keyword to
+        avoid decoding the image again.
+
         NOTE: The responsibility of generating the new image from the original
         falls to the supplied ``filter`` object. If you want to do anything
         custom with rendition images (for example, to preserve metadata from
@@ -811,11 +1075,11 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         start_time = time.time()
 
         try:
-            generated_image = filter.run(
-                self,
-                SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE),
-                source=source,
-            )
+            output = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+            if pyramid is not None:
+                generated_image = filter.run_from_pyramid(self, output, pyramid)
+            else:
+                generated_image = filter.run(self, output, source=source)
 
             logger.debug(
                 "Generated '%s' rendition for image %d in %.1fms",
@@ -902,6 +1166,92 @@ class Image(AbstractImage):
         ]
 
 
+class SourceImagePyramid:
+    """
+    An original image, decoded and auto-oriented once, along with a series of
+    copies of it that are each half the size of the last.
+
+    Used by ``AbstractImage.create_renditions()`` so that several renditions of
+    the same image can be generated without decoding the original for each one,
+    and so that small renditions are resized from a small copy of the image.
+    """
+
+    # Animated and vector images are always rendered from the original file
+    unsupported_formats = ["gif", "svg"]
+
+    def __init__(self, willow_image, original_format: str):
+        self.original_format = original_format
+        self.size = willow_image.get_size()
+        self.levels = [willow_image]
+
+    @classmethod
+    def from_bytes(cls, original_image_bytes: bytes) -> SourceImagePyramid | None:
+        """
+        Decode and orient the supplied image contents, returning ``None`` if the
+        image cannot be processed this way.
+        """
+        willow_image = willow.Image.open(BytesIO(original_image_bytes))
+        original_format = willow_image.format_name
+        if original_format in cls.unsupported_formats:
+            return None
+
+        willow_image = willow_image.auto_orient()
+        if not isinstance(willow_image, PillowImage):
+            return None
+
+        return cls(willow_image, original_format)
+
+    def _get_scale(self, level_size):
+        return level_size[0] / self.size[0], level_size[1] / self.size[1]
+
+    def _covers(self, level_size, transform: ImageTransform) -> bool:
+        # Whether the cropped area at this size has at least as many pixels in
+        # each direction as the output, so that it only ever needs downscaling
+        rect = transform.get_rect()
+        scale_x, scale_y = self._get_scale(level_size)
+        return (
+            rect.width * scale_x >= transform.size[0]
+            and rect.height * scale_y >= transform.size[1]
+        )
+
+    def prepare(self, transforms: Iterable[ImageTransform]):
+        """
+        Build the downscaled copies needed for the supplied transforms. This should
+        be called before the pyramid is shared between threads.
+        """
+        for transform in transforms:
+            while True:
+                width, height = self.levels[-1].get_size()
+                if width < 2 or height < 2:
+                    break
+
+                next_size = ((width + 1) // 2, (height + 1) // 2)
+                if not self._covers(next_size, transform):
+                    break
+
+                self.levels.append(self.levels[-1].resize(next_size))
+
+    def get_source(self, transform: ImageTransform) -> tuple[Any, Rect]:
+        """
+        Return the smallest copy of the image that can be used for the supplied
+        transform, along with the area to crop from that copy.
+        """
+        willow_image = self.levels[0]
+        for level in reversed(self.levels[1:]):
+            if self._covers(level.get_size(), transform):
+                willow_image = level
+                break
+
+        scale_x, scale_y = self._get_scale(willow_image.get_size())
+        rect = transform.get_rect()
+        return willow_image, Rect(
+            rect.left * scale_x,
+            rect.top * scale_y,
+            rect.right * scale_x,
+            rect.bottom * scale_y,
+        ).round()
+
+
 class Filter:
     """
     Represents one or more operations that can be applied to an Image to produce a rendition
@@ -1025,103 +1375,128 @@ class Filter:
             willow = willow.crop(transform.get_rect().round())
             willow = willow.resize(transform.size)
 
-            # Apply filters
-            env = {
-                "original-format": original_format,
+            return self._run_filter_operations(image, output, willow, original_format)
+
+    def can_run_from_pyramid(self) -> bool:
+        """
+        Whether renditions for this filter can be generated with ``run_from_pyramid()``.
+        Subclasses that override ``run()`` are always run with ``run()`` instead.
+        """
+        return type(self).run is Filter.run
+
+    def run_from_pyramid(
+        self, image: AbstractImage, output: BytesIO, pyramid: SourceImagePyramid
+    ):
+        """
+        Equivalent to ``run()``, but crops and resizes from the smallest copy of the
+        already decoded and oriented image in ``pyramid`` that still has enough pixels
+        for the requested output size.
+        """
+        transform = self.get_transform(image, pyramid.size)
+        willow, rect = pyramid.get_source(transform)
+        willow = willow.crop(rect)
+        willow = willow.resize(transform.size)
+
+        return self._run_filter_operations(
+            image, output, willow, pyramid.original_format
+        )
+
+    def _run_filter_operations(self, image, output, willow, original_format):
+        # Apply filters
+        env = {
+            "original-format": original_format,
+        }
+        for operation in self.filter_operations:
+            willow = operation.run(willow, image, env) or willow
+
+        # Find the output format to use
+        if "output-format" in env:
+            # Developer specified an output format
+            output_format = env["output-format"]
+        else:
+            # Convert avif, bmp and webp to png, and heic to jpg, by default
+            default_conversions = {
+                "avif": "png",
+                "bmp": "png",
+                "webp": "png",
+                "heic": "jpeg",
             }
-            for operation in self.filter_operations:
-                willow = operation.run(willow, image, env) or willow
 
-            # Find the output format to use
-            if "output-format" in env:
-                # Developer specified an output format
-                output_format = env["output-format"]
-            else:
-                # Convert avif, bmp and webp to png, and heic to jpg, by default
-                default_conversions = {
-                    "avif": "png",
-                    "bmp": "png",
-                    "webp": "png",
-                    "heic": "jpeg",
-                }
-
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions["gif"] = "png"
-
-                # Allow the user to override the conversions
-                conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
-                default_conversions.update(conversion)
-
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format
-                )
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions["gif"] = "png"
 
-            if output_format == "jpeg":
-                # Allow changing of JPEG compression quality
-                if "jpeg-quality" in env:
-                    quality = env["jpeg-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
+            # Allow the user to override the conversions
+            conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
+            default_conversions.update(conversion)
 
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(original_format, original_format)
 
-                return willow.save_as_jpeg(
-                    output, quality=quality, progressive=True, optimize=True
-                )
-            elif output_format == "png":
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == "gif":
-                return willow.save_as_gif(output)
-            elif output_format == "webp":
-                # Allow changing of WebP compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_webp(output, lossless=True)
-                elif "webp-quality" in env:
-                    quality = env["webp-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+        if output_format == "jpeg":
+            # Allow changing of JPEG compression quality
+            if "jpeg-quality" in env:
+                quality = env["jpeg-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 85)
 
-                return willow.save_as_webp(output, quality=quality)
-            elif output_format == "avif":
-                # Allow changing of AVIF compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_avif(output, lossless=True)
-                elif "avif-quality" in env:
-                    quality = env["avif-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
-                return willow.save_as_avif(output, quality=quality)
-            elif output_format == "heic":
-                # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
-                # so there is little value in outputting it - for that reason, we make it work if someone
-                # explicitly requests it, but these settings are not documented.
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_heic(output, lossless=True)
-                elif "heic-quality" in env:
-                    quality = env["heic-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
-                return willow.save_as_heic(output, quality=quality)
-            elif output_format == "svg":
-                return willow.save_as_svg(output)
-            elif output_format == "ico":
-                return willow.save_as_ico(output)
-            raise UnknownOutputImageFormatError(
-                f"Unknown output image format '{output_format}'"
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
+
+            return willow.save_as_jpeg(
+                output, quality=quality, progressive=True, optimize=True
             )
+        elif output_format == "png":
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == "gif":
+            return willow.save_as_gif(output)
+        elif output_format == "webp":
+            # Allow changing of WebP compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_webp(output, lossless=True)
+            elif "webp-quality" in env:
+                quality = env["webp-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+
+            return willow.save_as_webp(output, quality=quality)
+        elif output_format == "avif":
+            # Allow changing of AVIF compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_avif(output, lossless=True)
+            elif "avif-quality" in env:
+                quality = env["avif-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 80)
+            return willow.save_as_avif(output, quality=quality)
+        elif output_format == "heic":
+            # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
+            # so there is little value in outputting it - for that reason, we make it work if someone
+            # explicitly requests it, but these settings are not documented.
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_heic(output, lossless=True)
+            elif "heic-quality" in env:
+                quality = env["heic-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
+            return willow.save_as_heic(output, quality=quality)
+        elif output_format == "svg":
+            return willow.save_as_svg(output)
+        elif output_format == "ico":
+            return willow.save_as_ico(output)
+        raise UnknownOutputImageFormatError(
+            f"Unknown output image format '{output_format}'"
+        )
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -1281,10 +1656,19 @@ class AbstractRendition(ImageFileMixin, models.Model):
 
     wagtail_reference_index_ignore = True
 
+    # Set on the unsaved renditions returned by AbstractImage.get_placeholder_rendition()
+    placeholder_url = None
+
     @property
     def url(self):
+        if self.placeholder_url:
+            return self.placeholder_url
         return self.file.url
 
+    @property
+    def is_placeholder(self):
+        return self.placeholder_url is not None
+
     @property
     def alt(self):
         # 'decorative' and 'contextual_alt_text' exist only for ImageBlock
@@ -1422,6 +1806,12 @@ class AbstractRendition(ImageFileMixin, models.Model):
     def purge_from_cache(self):
         self.cache_backend.delete(self.get_cache_key())
 
+        local_cache = get_local_rendition_cache()
+        if local_cache is not None:
+            local_cache.delete(
+                get_local_cache_key(self.image, self.focal_point_key, self.filter_spec)
+            )
+
     class Meta:
         abstract = True
 
@@ -1433,3 +1823,71 @@ class Rendition(AbstractRendition):
 
     class Meta:
         unique_together = (("image", "filter_spec", "focal_point_key"),)
+
+
+class PendingRendition(models.Model):
+    """
+    A rendition that has been requested while ``WAGTAILIMAGES_RENDITION_QUEUE_ENABLED``
+    is set, but not generated yet. Entries are processed, and removed, by the
+    ``wagtail_process_rendition_queue`` management command.
+
+    Entries are claimed by setting ``claimed_at``, so that the renditions can be
+    generated without holding locks on them. A claim that is older than
+    ``CLAIM_TIMEOUT`` is assumed to have been abandoned by a worker that stopped,
+    and the entry may be claimed again.
+    """
+
+    # The number of seconds after which an entry that is still claimed may be
+    # claimed again
+    CLAIM_TIMEOUT = 10 * 60
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(max_length=255)
+    filter_spec = models.CharField(max_length=255)
+    focal_point_key = models.CharField(max_length=16, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [
+            ("content_type", "object_id", "filter_spec", "focal_point_key")
+        ]
+
+    def __str__(self):
+        return f"{self.filter_spec} rendition of image {self.object_id}"
+
+    @classmethod
+    def enqueue(cls, image: AbstractImage, filters: Iterable[Filter]):
+        """
+        Add the renditions of ``image`` for the given ``filters`` to the queue.
+        Renditions that are already queued are skipped, first via the renditions
+        cache so that concurrent requests avoid the database, and then via the
+        unique constraint on the queue table.
+        """
+        Rendition = image.get_rendition_model()
+        content_type = ContentType.objects.get_for_model(image)
+
+        to_create = []
+        for filter in filters:
+            focal_point_key = filter.get_cache_key(image)
+            cache_key = "wagtail-pending-rendition-" + "-".join(
+                [str(image.pk), image.file_hash, focal_point_key, filter.spec]
+            )
+            if not Rendition.cache_backend.add(cache_key, True, 60):
+                continue
+
+            to_create.append(
+                cls(
+                    content_type=content_type,
+                    object_id=str(image.pk),
+                    filter_spec=filter.spec,
+                    focal_point_key=focal_point_key,
+                )
+            )
+
+        if to_create:
+            cls.objects.bulk_create(to_create, ignore_conflicts=True)
@@ -0,0 +1,167 @@
+"""
+An in-process tier in front of the ``renditions`` cache, and helpers for looking up
+the renditions of several images with a single cache query.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# The names of the counters returned by get_rendition_cache_stats()
+STAT_NAMES = (
+    "local_hits",
+    "local_misses",
+    "batch_hits",
+    "shared_hits",
+    "shared_misses",
+    "shared_queries",
+)
+
+
+class LocalRenditionCache:
+    """
+    A bounded, thread-safe LRU cache of renditions, keyed by
+    ``(image_id, file_hash, focal_point_key, filter_spec)``.
+
+    Renditions are stored without their image, and a copy is returned on each
+    lookup, so that the instances handed out to different requests are independent.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires_at, rendition = self._entries[key]
+            except KeyError:
+                return None
+
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return copy.copy(rendition)
+
+    def set(self, key, rendition):
+        rendition = copy.copy(rendition)
+        rendition._state.fields_cache.pop("image", None)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, rendition)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+_stats = dict.fromkeys(STAT_NAMES, 0)
+_stats_lock = threading.Lock()
+
+
+def get_local_rendition_cache():
+    """
+    Return the in-process rendition cache, or ``None`` if it is disabled because
+    ``WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE`` is not set.
+    """
+    global _local_cache
+
+    if _local_cache is None:
+        max_size = getattr(settings, "WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE", 0)
+        if not max_size:
+            return None
+
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LocalRenditionCache(
+                    max_size,
+                    getattr(
+                        settings, "WAGTAILIMAGES_RENDITION_LOCAL_CACHE_TIMEOUT", 60
+                    ),
+                )
+
+    return _local_cache
+
+
+def get_local_cache_key(image, focal_point_key, filter_spec):
+    return (image.id, image.file_hash, focal_point_key, filter_spec)
+
+
+def increment_stats(**counts):
+    with _stats_lock:
+        for name, count in counts.items():
+            _stats[name] += count
+
+
+def get_rendition_cache_stats():
+    """
+    Return a dict of the number of rendition lookups served by each tier of the
+    rendition cache in this process since it started (or since the stats were
+    last reset):
+
+    - ``local_hits`` / ``local_misses``: lookups in the in-process cache
+    - ``batch_hits``: lookups served by an earlier batched query to the shared
+      cache, made for another image fetched by the same queryset
+    - ``shared_hits`` / ``shared_misses``: renditions found, or not found, in the
+      shared ``renditions`` cache
+    - ``shared_queries``: the number of ``get_many`` calls to the shared cache
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_rendition_cache_stats():
+    with _stats_lock:
+        for name in STAT_NAMES:
+            _stats[name] = 0
+
+
+class RenditionLookupBatch:
+    """
+    Shared by all of the images fetched by a single ``ImageQuerySet`` (including
+    those fetched for chooser blocks and ``prefetch_related``). When one of the images
+    looks up a rendition in the shared cache, the same filter is looked up for all of
+    the other images in the batch within the same ``get_many`` call, on the basis that
+    images listed together are usually rendered in the same way. This means that, for
+    example, rendering ``{% image item.image fill-300x200 %}`` for each item of a
+    listing only makes a single query to the shared cache.
+    """
+
+    def __init__(self, images):
+        self.images = images
+        # Maps shared cache keys to the rendition found, or None if it was not found
+        self.results = {}
+
+
+@receiver(setting_changed)
+def reset_local_rendition_cache(**kwargs):
+    global _local_cache
+
+    if kwargs["setting"] in (
+        "WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE",
+        "WAGTAILIMAGES_RENDITION_LOCAL_CACHE_TIMEOUT",
+    ):
+        _local_cache = None
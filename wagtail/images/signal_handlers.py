@@ -1,8 +1,9 @@
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 
 from wagtail.images import get_image_model
+from wagtail.rich_text.cache import clear_rich_text_cache_for_object
 
 
 def post_delete_file_cleanup(instance, **kwargs):
@@ -24,6 +25,10 @@ def pre_save_image_feature_detection(instance, **kwargs):
                 instance.set_focal_point(instance.get_suggested_focal_point())
 
 
+def clear_rich_text_cache_signal_handler(instance, **kwargs):
+    clear_rich_text_cache_for_object(instance)
+
+
 def register_signal_handlers():
     Image = get_image_model()
     Rendition = Image.get_rendition_model()
@@ -32,3 +37,7 @@ def register_signal_handlers():
     post_delete.connect(post_delete_file_cleanup, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Rendition)
     post_delete.connect(post_delete_purge_rendition_cache, sender=Rendition)
+
+    # Links and embeds of the image in rich text change with it
+    post_save.connect(clear_rich_text_cache_signal_handler, sender=Image)
+    post_delete.connect(clear_rich_text_cache_signal_handler, sender=Image)
@@ -28,6 +28,7 @@ from wagtail.models import (
     Collection,
     GroupCollectionPermission,
     Page,
+    PendingReferenceIndexUpdate,
     UploadedFile,
     get_root_collection_id,
 )
@@ -1513,6 +1514,43 @@ class TestUsage(WagtailTestUtils, TestCase):
         self.assertContains(response, '<table class="listing">')
         self.assertContains(response, "<td>Event page</td>", html=True)
 
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=True)
+    def test_usage_page_with_pending_reference_index_updates(self):
+        home_page = Page.objects.get(id=2)
+        home_page.add_child(
+            instance=EventPage(
+                title="Christmas",
+                slug="christmas",
+                feed_image=self.image,
+                date_from=datetime.date.today(),
+                audience="private",
+                location="Test",
+                cost="Test",
+            )
+        )
+        message = "Recent changes are still being indexed"
+
+        # The references of the new page are read from the page itself
+        response = self.client.get(
+            reverse("wagtailimages:image_usage", args=[self.image.id])
+        )
+        self.assertContains(response, "Christmas")
+        self.assertContains(response, message)
+
+        response = self.client.get(
+            reverse("wagtailimages:delete", args=[self.image.id])
+        )
+        self.assertContains(response, "This image is referenced 1 time")
+        self.assertContains(response, message)
+        self.assertTrue(PendingReferenceIndexUpdate.objects.exists())
+
+        PendingReferenceIndexUpdate.process_pending()
+        response = self.client.get(
+            reverse("wagtailimages:image_usage", args=[self.image.id])
+        )
+        self.assertContains(response, "Christmas")
+        self.assertNotContains(response, message)
+
     def test_usage_page_no_usage(self):
         response = self.client.get(
             reverse("wagtailimages:image_usage", args=[self.image.id])
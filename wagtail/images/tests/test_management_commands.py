@@ -1,11 +1,16 @@
 import re
 import warnings
+from datetime import timedelta
 from io import StringIO
+from unittest import mock
 
 from django.core import management
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
+from ..management.commands.wagtail_process_rendition_queue import Command
 from ..management.commands.wagtail_update_image_renditions import progress_bar
+from ..models import PendingRendition, SourceImageIOError
 from .utils import Image, get_test_image_file
 
 # note .utils.Image already does get_image_model()
@@ -138,3 +143,166 @@ class TestUpdateImageRenditions(TestCase):
         self.assertIn(
             f"Successfully processed {total_renditions} rendition(s)\n", output_string
         )
+
+
+class TestBenchmarkRenditions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(filename="test_image.png", colour="white"),
+        )
+
+    def run_command(self, *args, **options):
+        output = StringIO()
+        management.call_command(
+            "wagtail_benchmark_renditions", *args, stdout=output, **options
+        )
+        return output.getvalue()
+
+    def test_benchmark(self):
+        output = self.run_command(str(self.image.id), "--filter=width-{100,200}")
+        self.assertIn("Generating 2 rendition(s) per image", output)
+        self.assertIn(f"Image {self.image.id} (640x480): ", output)
+        self.assertIn("Benchmarked 1 image(s)", output)
+
+        # Renditions are not saved
+        self.assertFalse(Rendition.objects.exists())
+
+    def test_benchmark_without_pyramid(self):
+        output = self.run_command("--no-pyramid", "--workers=1")
+        self.assertIn("without a shared pyramid", output)
+        self.assertIn("Benchmarked 1 image(s)", output)
+
+    def test_no_images(self):
+        output = self.run_command("0")
+        self.assertIn("No images found.", output)
+
+
+@override_settings(WAGTAILIMAGES_RENDITION_QUEUE_ENABLED=True)
+class TestProcessRenditionQueue(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(filename="test_image.png", colour="white"),
+        )
+
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command(
+            "wagtail_process_rendition_queue", stdout=output, stderr=output, **options
+        )
+        return output.getvalue()
+
+    def test_process_queue(self):
+        self.image.get_renditions("width-100", "width-200")
+        self.assertEqual(PendingRendition.objects.count(), 2)
+
+        output = self.run_command(batch_size=1)
+
+        self.assertIn("Successfully processed 2 rendition(s)", output)
+        self.assertFalse(PendingRendition.objects.exists())
+        self.assertEqual(
+            set(self.image.renditions.values_list("filter_spec", flat=True)),
+            {"width-100", "width-200"},
+        )
+
+        renditions = self.image.get_renditions("width-100", "width-200")
+        self.assertFalse(any(r.is_placeholder for r in renditions.values()))
+
+    def test_deleted_image(self):
+        image = Image.objects.create(
+            title="Deleted image",
+            file=get_test_image_file(filename="deleted_image.png"),
+        )
+        image.get_rendition("width-100")
+        image.delete()
+
+        self.run_command()
+        self.assertFalse(PendingRendition.objects.exists())
+
+    def test_failed_rendition(self):
+        self.image.get_rendition("width-100")
+        with mock.patch.object(
+            Image, "get_renditions", side_effect=SourceImageIOError("Missing file")
+        ) as get_renditions, self.assertLogs(
+            "wagtail.images.management.commands.wagtail_process_rendition_queue"
+        ) as logs:
+            output = self.run_command(max_attempts=2)
+
+        self.assertEqual(get_renditions.call_count, 2)
+        self.assertIn(
+            f"Failed to generate renditions for image {self.image.id}", output
+        )
+        self.assertIn(
+            f"Giving up generating rendition width-100 for image {self.image.id} after 2 attempts",
+            logs.output[-1],
+        )
+        self.assertFalse(PendingRendition.objects.exists())
+
+        # The rendition can be queued again, once the cache used to skip queueing
+        # renditions that were requested recently has expired
+        Rendition.cache_backend.clear()
+        rendition = self.image.get_rendition("width-100")
+        self.assertTrue(rendition.is_placeholder)
+        self.assertTrue(PendingRendition.objects.exists())
+
+    def test_failed_rendition_released_for_retry(self):
+        self.image.get_rendition("width-100")
+        with mock.patch.object(
+            Image, "get_renditions", side_effect=SourceImageIOError("Missing file")
+        ):
+            # Claim and process a single batch, as the command would retry the
+            # entry until it runs out of attempts
+            self.assertEqual(
+                Command(stdout=StringIO(), stderr=StringIO()).process_batch(
+                    batch_size=50, max_attempts=3
+                ),
+                1,
+            )
+
+        entry = PendingRendition.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertIsNone(entry.claimed_at)
+        self.assertEqual(entry.last_error, "Missing file")
+
+    def test_claimed_entries_skipped(self):
+        self.image.get_rendition("width-100")
+        PendingRendition.objects.update(claimed_at=timezone.now())
+
+        output = self.run_command()
+
+        self.assertIn("Successfully processed 0 rendition(s)", output)
+        self.assertTrue(PendingRendition.objects.exists())
+
+    def test_abandoned_claim(self):
+        self.image.get_rendition("width-100")
+        PendingRendition.objects.update(
+            attempts=1,
+            claimed_at=timezone.now()
+            - timedelta(seconds=PendingRendition.CLAIM_TIMEOUT + 1),
+        )
+
+        output = self.run_command()
+
+        self.assertIn("Successfully processed 1 rendition(s)", output)
+        self.assertFalse(PendingRendition.objects.exists())
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-100").exists())
+
+    def test_abandoned_claim_after_max_attempts(self):
+        self.image.get_rendition("width-100")
+        PendingRendition.objects.update(
+            attempts=3,
+            claimed_at=timezone.now()
+            - timedelta(seconds=PendingRendition.CLAIM_TIMEOUT + 1),
+        )
+
+        with self.assertLogs(
+            "wagtail.images.management.commands.wagtail_process_rendition_queue"
+        ) as logs:
+            self.run_command(max_attempts=3)
+
+        self.assertIn("after 3 attempts", logs.output[0])
+        self.assertFalse(PendingRendition.objects.exists())
+        self.assertFalse(self.image.renditions.exists())
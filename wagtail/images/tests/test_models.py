@@ -1,4 +1,6 @@
+import concurrent.futures
 import unittest
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
@@ -14,13 +16,21 @@ from willow.image import Image as WillowImage
 
 from wagtail.images.models import (
     Filter,
+    PendingRendition,
     Picture,
     Rendition,
     ResponsiveImage,
     SourceImageIOError,
+    SourceImagePyramid,
     get_rendition_storage,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_cache import (
+    get_local_cache_key,
+    get_local_rendition_cache,
+    get_rendition_cache_stats,
+    reset_rendition_cache_stats,
+)
 from wagtail.models import Collection, GroupCollectionPermission, Page, ReferenceIndex
 from wagtail.test.testapp.models import (
     EventPage,
@@ -764,6 +774,59 @@ class TestRenditions(TestCase):
         # But, we should see equality on the keys
         self.assertEqual(third_result.keys(), result.keys())
 
+    def test_create_renditions_decodes_source_once(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with mock.patch.object(
+            SourceImagePyramid, "from_bytes", wraps=SourceImagePyramid.from_bytes
+        ) as from_bytes, mock.patch.object(
+            Filter, "run", side_effect=AssertionError("Filter.run() called")
+        ):
+            result = self.image.create_renditions(*filter_list)
+
+        from_bytes.assert_called_once()
+        self.assertEqual(
+            {
+                filter.spec: (rendition.width, rendition.height)
+                for filter, rendition in result.items()
+            },
+            {"height-66": (88, 66), "width-100": (100, 75), "width-400": (400, 300)},
+        )
+
+    def test_create_renditions_with_crops_from_pyramid(self):
+        filter_list = [Filter(spec) for spec in ("fill-50x50", "fill-300x100-c100")]
+        result = self.image.create_renditions(*filter_list)
+        self.assertEqual(
+            {
+                filter.spec: (rendition.width, rendition.height)
+                for filter, rendition in result.items()
+            },
+            {"fill-50x50": (50, 50), "fill-300x100-c100": (300, 100)},
+        )
+
+    def test_create_renditions_with_custom_filter_run(self):
+        class CustomFilter(Filter):
+            def run(self, *args, **kwargs):
+                return super().run(*args, **kwargs)
+
+        filter_list = [CustomFilter(spec) for spec in self.SPECS]
+        with mock.patch.object(
+            CustomFilter, "run_from_pyramid", side_effect=AssertionError
+        ):
+            result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(len(result), 3)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_WORKERS=1)
+    def test_create_renditions_worker_count(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with mock.patch(
+            "wagtail.images.models.concurrent.futures.ThreadPoolExecutor",
+            wraps=concurrent.futures.ThreadPoolExecutor,
+        ) as executor:
+            self.image.create_renditions(*filter_list)
+
+        executor.assert_called_once_with(max_workers=1)
+
     def test_alt_attribute(self):
         rendition = self.image.get_rendition("width-400")
         self.assertEqual(rendition.alt, "Test image")
@@ -913,6 +976,94 @@ class TestRenditions(TestCase):
         )
 
 
+@override_settings(
+    WAGTAILIMAGES_RENDITION_QUEUE_ENABLED=True,
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+)
+class TestRenditionQueue(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    def tearDown(self):
+        caches["default"].clear()
+
+    def test_get_rendition_returns_placeholder(self):
+        rendition = self.image.get_rendition("fill-100x50")
+
+        self.assertTrue(rendition.is_placeholder)
+        self.assertIsNone(rendition.pk)
+        self.assertEqual((rendition.width, rendition.height), (100, 50))
+        self.assertTrue(rendition.url.startswith("/images/"))
+        self.assertIn(f"/{self.image.id}/fill-100x50/", rendition.url)
+        self.assertFalse(self.image.renditions.exists())
+
+        entry = PendingRendition.objects.get()
+        self.assertEqual(entry.object_id, str(self.image.id))
+        self.assertEqual(entry.filter_spec, "fill-100x50")
+
+    def test_get_rendition_returns_existing_rendition(self):
+        existing = self.image.get_rendition("width-100", defer=False)
+        rendition = self.image.get_rendition("width-100")
+
+        self.assertFalse(rendition.is_placeholder)
+        self.assertEqual(rendition, existing)
+        self.assertFalse(PendingRendition.objects.exists())
+
+    def test_requests_are_deduplicated(self):
+        self.image.get_rendition("width-100")
+        # The second request is skipped via the cache, without any queries
+        with self.assertNumQueries(1):
+            # Only the lookup for existing renditions is required
+            self.image.get_rendition("width-100")
+        self.assertEqual(PendingRendition.objects.count(), 1)
+
+        # Even if the cache entry is lost, only a single entry is queued
+        caches["default"].clear()
+        self.image.get_rendition("width-100")
+        self.assertEqual(PendingRendition.objects.count(), 1)
+
+    def test_get_renditions(self):
+        existing = self.image.get_rendition("width-100", defer=False)
+        renditions = self.image.get_renditions("width-100", "width-200", "width-300")
+
+        self.assertEqual(list(renditions), ["width-100", "width-200", "width-300"])
+        self.assertEqual(renditions["width-100"], existing)
+        self.assertTrue(renditions["width-200"].is_placeholder)
+        self.assertEqual(renditions["width-300"].width, 300)
+        self.assertEqual(
+            set(PendingRendition.objects.values_list("filter_spec", flat=True)),
+            {"width-200", "width-300"},
+        )
+
+    def test_placeholders_are_not_cached(self):
+        self.image.get_rendition("width-100")
+        rendition = self.image.get_rendition("width-100", defer=False)
+        self.assertFalse(rendition.is_placeholder)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_QUEUE_ENABLED=False)
+    def test_defer_argument(self):
+        rendition = self.image.get_rendition("width-100", defer=True)
+        self.assertTrue(rendition.is_placeholder)
+
+    @override_settings(ROOT_URLCONF="wagtail.test.urls_multilang")
+    def test_renditions_are_created_without_serve_view(self):
+        rendition = self.image.get_rendition("width-100")
+        self.assertFalse(rendition.is_placeholder)
+        self.assertFalse(PendingRendition.objects.exists())
+
+    def test_placeholder_url_serves_rendition(self):
+        rendition = self.image.get_rendition("width-100")
+        response = self.client.get(rendition.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-100").exists())
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 )
@@ -971,6 +1122,134 @@ class TestPrefetchRenditions(TestCase):
         self.assertListEqual(self.large_renditions, large_renditions)
 
 
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "renditions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+)
+class TestRenditionCacheTiers(TestCase):
+    def setUp(self):
+        Rendition.cache_backend.clear()
+        self.images = [
+            Image.objects.create(title=f"Test image {i}", file=get_test_image_file())
+            for i in range(3)
+        ]
+        self.renditions = [image.get_rendition("width-100") for image in self.images]
+        reset_rendition_cache_stats()
+
+    def test_images_fetched_together_share_cache_lookups(self):
+        images = list(Image.objects.filter(pk__in=[image.pk for image in self.images]))
+
+        with mock.patch.object(
+            Rendition.cache_backend,
+            "get_many",
+            wraps=Rendition.cache_backend.get_many,
+        ) as get_many, self.assertNumQueries(0):
+            renditions = [image.get_rendition("width-100") for image in images]
+
+        get_many.assert_called_once()
+        self.assertEqual(len(get_many.call_args.args[0]), 3)
+        self.assertEqual(
+            sorted(rendition.pk for rendition in renditions),
+            sorted(rendition.pk for rendition in self.renditions),
+        )
+        for image, rendition in zip(images, renditions):
+            self.assertIs(rendition.image, image)
+
+        stats = get_rendition_cache_stats()
+        self.assertEqual(stats["shared_queries"], 1)
+        self.assertEqual(stats["shared_hits"], 3)
+        self.assertEqual(stats["batch_hits"], 2)
+
+    def test_batch_misses_are_looked_up_in_database(self):
+        images = list(Image.objects.filter(pk__in=[image.pk for image in self.images]))
+
+        renditions = [image.get_rendition("width-200") for image in images]
+
+        stats = get_rendition_cache_stats()
+        self.assertEqual(stats["shared_queries"], 1)
+        self.assertEqual(stats["shared_misses"], 3)
+        self.assertEqual(stats["batch_hits"], 2)
+        self.assertTrue(all(rendition.pk for rendition in renditions))
+
+    def test_local_cache_disabled_by_default(self):
+        self.assertIsNone(get_local_rendition_cache())
+
+    @override_settings(WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE=10)
+    def test_local_cache(self):
+        image = Image.objects.get(pk=self.images[0].pk)
+        rendition = image.get_rendition("width-100")
+        self.assertEqual(get_rendition_cache_stats()["local_misses"], 1)
+
+        image = Image.objects.get(pk=self.images[0].pk)
+        with mock.patch.object(
+            Rendition.cache_backend, "get_many"
+        ) as get_many, self.assertNumQueries(0):
+            local_rendition = image.get_rendition("width-100")
+
+        get_many.assert_not_called()
+        self.assertEqual(local_rendition, rendition)
+        self.assertIsNot(local_rendition, rendition)
+        self.assertIs(local_rendition.image, image)
+        self.assertEqual(get_rendition_cache_stats()["local_hits"], 1)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE=10)
+    def test_local_cache_is_keyed_by_file_hash(self):
+        image = Image.objects.get(pk=self.images[0].pk)
+        image.get_rendition("width-100")
+
+        image.file_hash = "changed"
+        local_cache = get_local_rendition_cache()
+        self.assertIsNone(
+            local_cache.get(
+                get_local_cache_key(image, "", "width-100"),
+            )
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE=10)
+    def test_purge_from_cache(self):
+        image = Image.objects.get(pk=self.images[0].pk)
+        rendition = image.get_rendition("width-100")
+        local_cache = get_local_rendition_cache()
+        self.assertEqual(len(local_cache), 1)
+
+        rendition.purge_from_cache()
+
+        self.assertEqual(len(local_cache), 0)
+        self.assertIsNone(Rendition.cache_backend.get(rendition.get_cache_key()))
+
+    @override_settings(
+        WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE=2,
+        WAGTAILIMAGES_RENDITION_LOCAL_CACHE_TIMEOUT=60,
+    )
+    def test_local_cache_is_bounded(self):
+        local_cache = get_local_rendition_cache()
+        for image, rendition in zip(self.images, self.renditions):
+            local_cache.set(
+                get_local_cache_key(image, "", rendition.filter_spec), rendition
+            )
+
+        self.assertEqual(len(local_cache), 2)
+        self.assertIsNone(
+            local_cache.get(get_local_cache_key(self.images[0], "", "width-100"))
+        )
+        self.assertIsNotNone(
+            local_cache.get(get_local_cache_key(self.images[2], "", "width-100"))
+        )
+
+    @override_settings(
+        WAGTAILIMAGES_RENDITION_LOCAL_CACHE_SIZE=10,
+        WAGTAILIMAGES_RENDITION_LOCAL_CACHE_TIMEOUT=-1,
+    )
+    def test_local_cache_entries_expire(self):
+        local_cache = get_local_rendition_cache()
+        key = get_local_cache_key(self.images[0], "", "width-100")
+        local_cache.set(key, self.renditions[0])
+
+        self.assertIsNone(local_cache.get(key))
+
+
 class TestUsageCount(TestCase):
     fixtures = ["test.json"]
 
@@ -1017,6 +1296,64 @@ class TestGetUsage(TestCase):
         self.assertIsInstance(self.image.get_usage()[0][1][0], ReferenceIndex)
 
 
+class TestSourceImagePyramid(TestCase):
+    def get_pyramid(self, size=(640, 480)):
+        image_file = get_test_image_file(size=size)
+        return SourceImagePyramid.from_bytes(image_file.file.getvalue())
+
+    def get_transform(self, spec, size=(640, 480)):
+        image = Image(width=size[0], height=size[1])
+        return Filter(spec).get_transform(image, size)
+
+    def test_from_bytes(self):
+        pyramid = self.get_pyramid()
+        self.assertEqual(pyramid.original_format, "png")
+        self.assertEqual(pyramid.size, (640, 480))
+        self.assertEqual(len(pyramid.levels), 1)
+
+    def test_from_bytes_unsupported_format(self):
+        image_file = get_test_image_file_svg()
+        self.assertIsNone(SourceImagePyramid.from_bytes(image_file.file.getvalue()))
+
+    def test_prepare(self):
+        pyramid = self.get_pyramid()
+        pyramid.prepare([self.get_transform("width-100")])
+        # The smallest copy must still be at least as wide as the output
+        self.assertEqual(
+            [level.get_size() for level in pyramid.levels],
+            [(640, 480), (320, 240), (160, 120)],
+        )
+
+    def test_prepare_for_upscaling(self):
+        pyramid = self.get_pyramid()
+        pyramid.prepare([self.get_transform("fill-800x800")])
+        self.assertEqual(len(pyramid.levels), 1)
+
+    def test_get_source(self):
+        pyramid = self.get_pyramid()
+        pyramid.prepare(
+            [self.get_transform("width-100"), self.get_transform("width-400")]
+        )
+
+        willow_image, rect = pyramid.get_source(self.get_transform("width-400"))
+        self.assertEqual(willow_image.get_size(), (640, 480))
+        self.assertEqual(rect, Rect(0, 0, 640, 480))
+
+        willow_image, rect = pyramid.get_source(self.get_transform("width-100"))
+        self.assertEqual(willow_image.get_size(), (160, 120))
+        self.assertEqual(rect, Rect(0, 0, 160, 120))
+
+    def test_get_source_scales_crop(self):
+        pyramid = self.get_pyramid()
+        transform = self.get_transform("fill-50x50")
+        pyramid.prepare([transform])
+
+        willow_image, rect = pyramid.get_source(transform)
+        self.assertEqual(willow_image.get_size(), (80, 60))
+        # The centred 480x480 crop, scaled to the 80x60 copy
+        self.assertEqual(rect, Rect(10, 0, 70, 60))
+
+
 class TestGetWillowImage(TestCase):
     fixtures = ["test.json"]
 
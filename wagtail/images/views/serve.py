@@ -46,7 +46,7 @@ class ServeView(View):
 
         # Get/generate the rendition
         try:
-            rendition = image.get_rendition(filter_spec)
+            rendition = image.get_rendition(filter_spec, defer=False)
         except SourceImageIOError:
             return HttpResponse(
                 "Source image file not found", content_type="text/plain", status=410
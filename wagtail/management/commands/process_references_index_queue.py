@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.models import PendingReferenceIndexUpdate
+
+
+class Command(BaseCommand):
+    """Command to index the references of objects saved while WAGTAIL_REFERENCE_INDEX_DEFERRED is set."""
+
+    help = (
+        "Indexes the references of objects with pending reference index updates, "
+        "optionally polling the queue until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of queued objects to claim at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue for new updates instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Number of seconds to wait between polls of an empty queue when using --loop (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        num_processed = 0
+
+        while True:
+            processed = PendingReferenceIndexUpdate.process_pending(
+                limit=options["batch_size"]
+            )
+            num_processed += processed
+
+            if not processed:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully processed {num_processed} object(s)")
+            )
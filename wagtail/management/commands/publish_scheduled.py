@@ -1,8 +1,17 @@
+import logging
+import math
+import time
+
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
 from django.utils import dateparse, timezone
 
 from wagtail.models import DraftStateMixin, Page, Revision
+from wagtail.search.signal_handlers import batch_search_index_updates
+
+logger = logging.getLogger("wagtail")
 
 
 def revision_date_expired(r):
@@ -16,6 +25,11 @@ def revision_date_expired(r):
         return False
 
 
+def get_percentile(sorted_values, percentile):
+    index = max(math.ceil(len(sorted_values) * percentile / 100) - 1, 0)
+    return sorted_values[index]
+
+
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
@@ -25,8 +39,93 @@ class Command(BaseCommand):
             default=False,
             help="Dry run -- don't change anything.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of objects to publish or unpublish in each transaction (default: %(default)s)",
+        )
+
+    def process_in_batches(self, queryset, date_field, process):
+        """
+        Call ``process`` on each object of ``queryset`` in order of ``date_field``,
+        claiming ``batch_size`` objects at a time with ``SELECT ... FOR UPDATE SKIP
+        LOCKED``, so that several instances of the command can run at once. Each
+        batch is processed in one transaction, so that frontend cache purges and
+        search index updates are made once per batch.
+
+        An object that fails to be processed is logged and skipped, leaving the
+        rest of its batch to be processed.
+        """
+        last_claimed = None
+        while True:
+            batch_queryset = queryset.select_for_update(skip_locked=True).order_by(
+                date_field, "pk"
+            )
+            if last_claimed is not None:
+                # Continue after the last object claimed, so that objects that
+                # failed to be processed are not claimed again
+                last_date, last_pk = last_claimed
+                batch_queryset = batch_queryset.filter(
+                    Q(**{f"{date_field}__gt": last_date})
+                    | Q(**{date_field: last_date, "pk__gt": last_pk})
+                )
+
+            with batch_search_index_updates(), transaction.atomic():
+                batch = list(batch_queryset[: self.batch_size])
+                if not batch:
+                    break
+
+                # Processing an object may clear its date (as publishing a
+                # revision does), so the position is recorded first
+                last_claimed = (getattr(batch[-1], date_field), batch[-1].pk)
+
+                for obj in batch:
+                    scheduled_at = getattr(obj, date_field)
+                    try:
+                        with transaction.atomic():
+                            process(obj)
+                    except Exception:
+                        logger.exception(
+                            "Failed to process scheduled %s: %r",
+                            queryset.model._meta.verbose_name,
+                            obj,
+                        )
+                        self.failure_count += 1
+                    else:
+                        self.delays.append(
+                            (timezone.now() - scheduled_at).total_seconds()
+                        )
+
+            if len(batch) < self.batch_size:
+                # There were no more objects to claim
+                break
+
+    def write_summary(self, unpublished_count, published_count, duration):
+        summary = (
+            f"Unpublished {unpublished_count} expired object(s) and published "
+            f"{published_count} revision(s) in {duration:.2f}s"
+        )
+        if self.delays:
+            delays = sorted(self.delays)
+            summary += (
+                "; delay after the scheduled time: "
+                f"median {get_percentile(delays, 50):.2f}s, "
+                f"95th percentile {get_percentile(delays, 95):.2f}s, "
+                f"max {delays[-1]:.2f}s"
+            )
+
+        logger.info(summary)
+        if self.verbosity > 1:
+            self.stdout.write(summary)
 
     def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        self.batch_size = options["batch_size"]
+        self.delays = []
+        self.failure_count = 0
+        start_time = time.monotonic()
+
         dryrun = False
         if options["dryrun"]:
             self.stdout.write("Will do a dry run.")
@@ -80,12 +179,14 @@ class Command(BaseCommand):
         else:
             # Unpublish the expired objects
             for queryset in expired_objects:
-                # Cast to list to make sure the query is fully evaluated
-                # before unpublishing anything
-                for obj in list(queryset):
-                    obj.unpublish(
+                self.process_in_batches(
+                    queryset,
+                    "expire_at",
+                    lambda obj: obj.unpublish(
                         set_expired=True, log_action="wagtail.unpublish.scheduled"
-                    )
+                    ),
+                )
+            unpublished_count = len(self.delays)
 
         # 2. get all revisions that need to be published
         revs_for_publishing = Revision.objects.filter(
@@ -111,7 +212,20 @@ class Command(BaseCommand):
             else:
                 self.stdout.write("No objects to go live.")
         else:
-            for rp in revs_for_publishing:
-                # just run publish for the revision -- since the approved go
-                # live datetime is before now it will make the object live
-                rp.publish(log_action="wagtail.publish.scheduled")
+            # just run publish for each revision -- since the approved go
+            # live datetime is before now it will make the object live
+            self.process_in_batches(
+                revs_for_publishing,
+                "approved_go_live_at",
+                lambda rp: rp.publish(log_action="wagtail.publish.scheduled"),
+            )
+            published_count = len(self.delays) - unpublished_count
+
+            self.write_summary(
+                unpublished_count, published_count, time.monotonic() - start_time
+            )
+            if self.failure_count:
+                raise CommandError(
+                    f"{self.failure_count} scheduled object(s) could not be "
+                    "published or unpublished, see the logs for details"
+                )
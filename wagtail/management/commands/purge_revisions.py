@@ -1,10 +1,14 @@
+import time
+
+from django.apps import apps
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import Q
-from django.db.models.deletion import ProtectedError
+from django.db import models, transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.deletion import ProtectedError, RestrictedError
 from django.utils import timezone
 
-from wagtail.models import Revision, WorkflowState
+from wagtail.models import DraftStateMixin, Revision, WorkflowState
 
 
 class Command(BaseCommand):
@@ -26,20 +30,43 @@ class Command(BaseCommand):
             action="store_true",
             help="Only delete revisions of non-page models",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of revisions to delete in each transaction (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            help="Stop deleting revisions once this number of seconds has passed",
+        )
 
     def handle(self, *args, **options):
         days = options.get("days")
         pages = options.get("pages")
         non_pages = options.get("non_pages")
+        max_runtime = options.get("max_runtime")
 
+        start_time = time.monotonic()
         revisions_deleted, protected_error_count = purge_revisions(
-            days=days, pages=pages, non_pages=non_pages
+            days=days,
+            pages=pages,
+            non_pages=non_pages,
+            batch_size=options["batch_size"],
+            max_runtime=max_runtime,
         )
+        duration = time.monotonic() - start_time
 
         if revisions_deleted:
             self.stdout.write(
                 self.style.SUCCESS(
-                    "Successfully deleted %s revisions" % revisions_deleted
+                    "Successfully deleted %s revisions in %.2fs (%d revisions per second)"
+                    % (
+                        revisions_deleted,
+                        duration,
+                        revisions_deleted / max(duration, 0.001),
+                    )
                 )
             )
             self.stdout.write(
@@ -51,8 +78,13 @@ class Command(BaseCommand):
         else:
             self.stdout.write("No revisions deleted")
 
+        if max_runtime is not None and duration >= max_runtime:
+            self.stdout.write(
+                "Stopped after reaching the maximum runtime. Run the command again to delete the remaining revisions."
+            )
+
 
-def purge_revisions(days=None, pages=True, non_pages=True):
+def get_purgeable_revisions(days=None, pages=True, non_pages=True):
     if pages == non_pages:
         # If both are True or both are False, purge revisions of pages and non-pages
         objects = Revision.objects.all()
@@ -66,6 +98,29 @@ def purge_revisions(days=None, pages=True, non_pages=True):
         approved_go_live_at__isnull=False
     )
 
+    # exclude the latest revision of each object
+    latest_revision_id = (
+        Revision.objects.filter(
+            base_content_type_id=OuterRef("base_content_type_id"),
+            object_id=OuterRef("object_id"),
+        )
+        .order_by("-created_at", "-id")
+        .values("id")[:1]
+    )
+    purgeable_revisions = purgeable_revisions.exclude(pk=Subquery(latest_revision_id))
+
+    # and exclude the live revision of each object
+    for model in apps.get_models():
+        if (
+            issubclass(model, DraftStateMixin)
+            and model._meta.get_field("live_revision").model is model
+        ):
+            purgeable_revisions = purgeable_revisions.exclude(
+                pk__in=model._base_manager.filter(live_revision__isnull=False).values(
+                    "live_revision_id"
+                )
+            )
+
     if getattr(settings, "WAGTAIL_WORKFLOW_ENABLED", True):
         purgeable_revisions = purgeable_revisions.exclude(
             # and exclude revisions linked to an in progress or needs changes workflow state
@@ -78,16 +133,116 @@ def purge_revisions(days=None, pages=True, non_pages=True):
         # only include revisions which were created before the cut off date
         purgeable_revisions = purgeable_revisions.filter(created_at__lt=purgeable_until)
 
+    return purgeable_revisions
+
+
+def get_protected_revision_ids(revision_ids):
+    """
+    Return the IDs of the given revisions that are referenced by a foreign key
+    with ``on_delete=PROTECT`` or ``on_delete=RESTRICT``, and so can't be deleted.
+    """
+    protected_ids = set()
+    for relation in Revision._meta.related_objects:
+        if relation.on_delete not in (models.PROTECT, models.RESTRICT):
+            continue
+
+        protected_ids.update(
+            relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": revision_ids}
+            ).values_list(relation.field.attname, flat=True)
+        )
+    return protected_ids
+
+
+def move_comments_to_next_revisions(revision_ids):
+    """
+    Move the comments created on the given revisions to the next revision of
+    their object that isn't being deleted, as ``Revision.delete`` does.
+    """
+    revisions = Revision.objects.filter(
+        pk__in=revision_ids, created_comments__isnull=False
+    ).distinct()
+
+    for revision in revisions:
+        next_revision = (
+            Revision.objects.filter(
+                Q(created_at__gt=revision.created_at)
+                | Q(created_at=revision.created_at, pk__gt=revision.pk),
+                base_content_type_id=revision.base_content_type_id,
+                object_id=revision.object_id,
+            )
+            .exclude(pk__in=revision_ids)
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if next_revision:
+            revision.created_comments.update(revision_created=next_revision)
+
+
+def delete_revisions(revision_ids):
+    """
+    Delete the revisions with the given IDs, skipping any that are protected from
+    deletion. Returns the number of revisions deleted and the number skipped.
+    """
+    protected_ids = get_protected_revision_ids(revision_ids)
+    revision_ids = [
+        revision_id for revision_id in revision_ids if revision_id not in protected_ids
+    ]
+    if not revision_ids:
+        return 0, len(protected_ids)
+
+    try:
+        with transaction.atomic():
+            move_comments_to_next_revisions(revision_ids)
+            Revision.objects.filter(pk__in=revision_ids).delete()
+        return len(revision_ids), len(protected_ids)
+    except (ProtectedError, RestrictedError):
+        # A revision is protected indirectly, through an object that would be
+        # deleted along with it, so fall back to deleting them one by one
+        pass
+
+    deleted_count = 0
+    protected_count = len(protected_ids)
+    for revision in Revision.objects.filter(pk__in=revision_ids):
+        try:
+            with transaction.atomic():
+                revision.delete()
+            deleted_count += 1
+        except (ProtectedError, RestrictedError):
+            protected_count += 1
+
+    return deleted_count, protected_count
+
+
+def purge_revisions(
+    days=None, pages=True, non_pages=True, batch_size=1000, max_runtime=None
+):
+    """
+    Delete the revisions that can be purged, in batches of ``batch_size`` in
+    order of their IDs, stopping once ``max_runtime`` seconds have passed (if
+    given). Returns the number of revisions deleted and the number that were
+    skipped because they are protected from deletion.
+    """
+    purgeable_revisions = get_purgeable_revisions(
+        days=days, pages=pages, non_pages=non_pages
+    ).order_by("pk")
+
+    start_time = time.monotonic()
     deleted_revisions_count = 0
     protected_error_count = 0
+    last_pk = None
 
-    for revision in purgeable_revisions.iterator():
-        # don't delete the latest revision
-        if not revision.is_latest_revision():
-            try:
-                revision.delete()
-                deleted_revisions_count += 1
-            except ProtectedError:
-                protected_error_count += 1
+    while max_runtime is None or time.monotonic() - start_time < max_runtime:
+        batch = purgeable_revisions
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        revision_ids = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not revision_ids:
+            break
+
+        deleted_count, protected_count = delete_revisions(revision_ids)
+        deleted_revisions_count += deleted_count
+        protected_error_count += protected_count
+        last_pk = revision_ids[-1]
 
     return deleted_revisions_count, protected_error_count
@@ -1,11 +1,47 @@
+import time
+
 from django.apps import apps
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from modelcluster.models import ClusterableModel, get_all_child_relations
 
+from wagtail.management.utils import get_process_pool, map_chunks, queryset_chunks
 from wagtail.models import ReferenceIndex
-from wagtail.signal_handlers import disable_reference_index_auto_update
 
 DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_BATCH_SIZE = 5000
+
+
+def get_indexed_queryset(model):
+    """
+    Return a queryset of all instances of ``model`` to be indexed, ordered by
+    primary key, with child relations prefetched so that extracting their
+    references does not need a query per object.
+    """
+    qs = model._default_manager.order_by("pk")
+    if issubclass(model, ClusterableModel):
+        qs = qs.prefetch_related(
+            *(
+                child_relation.get_accessor_name()
+                for child_relation in get_all_child_relations(model)
+            )
+        )
+    return qs
+
+
+def extract_references(model_label, pks):
+    """
+    Return the reference records for the instances of the given model with the
+    given primary keys. Runs in a worker process when ``--processes`` is used.
+    """
+    model = apps.get_model(model_label)
+    return ReferenceIndex._get_records_for_objects(
+        get_indexed_queryset(model).filter(pk__in=pks)
+    )
 
 
 class Command(BaseCommand):
@@ -27,44 +63,262 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--batch-size",
+            action="store",
+            dest="batch_size",
+            default=DEFAULT_BATCH_SIZE,
+            type=int,
+            help="Set the maximum number of references to be inserted in a single query",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL_NAME",
+            help=(
+                "Only rebuild the references of the given model. "
+                "Can be given multiple times"
+            ),
+        )
+        parser.add_argument(
+            "--resume-from",
+            action="store",
+            dest="resume_from",
+            metavar="APP_LABEL.MODEL_NAME:PK",
+            help="Resume an interrupted rebuild from the object after the given one",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store",
+            dest="processes",
+            default=1,
+            type=int,
+            help="Set the number of worker processes used to extract references",
+        )
 
     def handle(self, **options):
         self.verbosity = options["verbosity"]
 
         chunk_size = options.get("chunk_size")
+        self.batch_size = options.get("batch_size")
+        processes = options.get("processes")
+        models = self.get_models(options.get("models"))
+
+        resume_model, resume_pk = None, None
+        if options.get("resume_from"):
+            resume_model, resume_pk = self.parse_resume_from(
+                options["resume_from"], models
+            )
+            # Skip the models that were rebuilt before the interruption
+            models = models[models.index(resume_model) :]
+
+        # Inserting references without looking for existing ones first relies
+        # on the database skipping any that are already present
+        self.fast_insert = connection.features.supports_ignore_conflicts
+
+        executor = get_process_pool(processes)
+        self.processes = processes
+
         object_count = 0
+        reference_count = 0
 
         self.write("Rebuilding reference index")
 
-        with transaction.atomic():
-            with disable_reference_index_auto_update():
-                # Use `_raw_delete` to avoid loading instances into memory
-                all_references = ReferenceIndex.objects.all()
-                all_references._raw_delete(using=all_references.db)
+        if not options.get("models"):
+            self.remove_unindexed_models(models)
 
-            for model in apps.get_models():
-                if not ReferenceIndex.is_indexed(model):
-                    continue
+        start_time = time.monotonic()
 
+        try:
+            for model in models:
                 self.write(str(model))
 
+                model_start_time = time.monotonic()
+                model_object_count = 0
+                model_reference_count = 0
+
+                after_pk = resume_pk if model is resume_model else None
+
                 # Add items (chunk_size at a time)
-                for chunk in self.print_iter_progress(
-                    self.queryset_chunks(model.objects.all().order_by("pk"), chunk_size)
+                for (
+                    chunk_object_count,
+                    chunk_reference_count,
+                    last_pk,
+                ) in self.print_iter_progress(
+                    self.index_model(model, chunk_size, after_pk, executor)
                 ):
-                    for instance in chunk:
-                        ReferenceIndex.create_or_update_for_object(instance)
+                    model_object_count += chunk_object_count
+                    model_reference_count += chunk_reference_count
+
+                    if self.verbosity > 1:
+                        self.print_newline()
+                        self.write(
+                            "%d objects indexed, resume with --resume-from %s:%s"
+                            % (model_object_count, model._meta.label, last_pk)
+                        )
 
-                    object_count += len(chunk)
+                self.remove_deleted_objects(model)
 
                 self.print_newline()
+                self.print_throughput(
+                    model_object_count, model_reference_count, model_start_time
+                )
+
+                object_count += model_object_count
+                reference_count += model_reference_count
+
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
         self.write("Indexed %d objects" % object_count)
+        self.print_throughput(object_count, reference_count, start_time)
         self.print_newline()
 
+    def get_models(self, model_labels=None):
+        """
+        Return the list of indexed models to rebuild, in a stable order.
+        """
+        if not model_labels:
+            return [
+                model for model in apps.get_models() if ReferenceIndex.is_indexed(model)
+            ]
+
+        models = []
+        for label in model_labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError("Unknown model: %s" % label)
+
+            if not ReferenceIndex.is_indexed(model):
+                raise CommandError("Model %s is not indexed" % label)
+
+            models.append(model)
+
+        # Follow the order of apps.get_models() so that --resume-from is consistent
+        ordering = {model: i for i, model in enumerate(apps.get_models())}
+        return sorted(set(models), key=ordering.__getitem__)
+
+    def parse_resume_from(self, value, models):
+        label, separator, pk = value.rpartition(":")
+        if not separator:
+            raise CommandError(
+                "--resume-from must be in the format APP_LABEL.MODEL_NAME:PK"
+            )
+
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise CommandError("Unknown model: %s" % label)
+
+        if model not in models:
+            raise CommandError("Model %s is not being rebuilt" % label)
+
+        try:
+            pk = model._meta.pk.to_python(pk)
+        except ValidationError:
+            raise CommandError("Invalid primary key for %s: %s" % (label, pk))
+
+        return model, pk
+
+    def get_references(self, model):
+        return ReferenceIndex.objects.filter(
+            content_type=ContentType.objects.get_for_model(
+                model, for_concrete_model=False
+            )
+        )
+
+    def remove_unindexed_models(self, models):
+        """
+        Remove the references of models that are no longer indexed.
+        """
+        content_types = ContentType.objects.get_for_models(
+            *models, for_concrete_models=False
+        )
+        # Use `_raw_delete` to avoid loading instances into memory
+        references = ReferenceIndex.objects.exclude(
+            content_type__in=content_types.values()
+        )
+        references._raw_delete(using=references.db)
+
+    def remove_deleted_objects(self, model):
+        """
+        Remove the references of instances of ``model`` that no longer exist.
+        """
+        references = self.get_references(model).exclude(
+            object_id__in=model._default_manager.annotate(
+                pk_string=Cast("pk", output_field=CharField())
+            ).values("pk_string")
+        )
+        references._raw_delete(using=references.db)
+
+    def index_model(self, model, chunk_size, after_pk=None, executor=None):
+        """
+        Index all instances of ``model``, a chunk at a time. Yields a tuple of
+        ``(object_count, reference_count, last_pk)`` for each chunk.
+        """
+        if executor is None:
+            for chunk in queryset_chunks(
+                get_indexed_queryset(model), chunk_size, after_pk
+            ):
+                if self.fast_insert:
+                    records = ReferenceIndex._get_records_for_objects(chunk)
+                    self.replace_records(model, chunk, records)
+                    reference_count = len(records)
+                else:
+                    with transaction.atomic():
+                        for instance in chunk:
+                            ReferenceIndex.create_or_update_for_object(instance)
+                    reference_count = 0
+
+                yield len(chunk), reference_count, chunk[-1].pk
+
+        else:
+            pk_chunks = queryset_chunks(
+                model._default_manager.order_by("pk").values_list("pk", flat=True),
+                chunk_size,
+                after_pk,
+            )
+
+            # Keep a bounded number of chunks in flight, so that the references
+            # are written as they are extracted rather than held in memory
+            for pks, records in map_chunks(
+                executor,
+                extract_references,
+                pk_chunks,
+                model._meta.label,
+                max_pending=self.processes * 2,
+            ):
+                self.replace_records(model, pks, records)
+                yield len(pks), len(records), pks[-1]
+
+    def replace_records(self, model, objects, records):
+        """
+        Replace the references of the given instances of ``model`` (or primary
+        keys) with ``records``. This is done in a single transaction, so that the
+        references of each object are always available while the index is rebuilt.
+        """
+        object_ids = [str(getattr(obj, "pk", obj)) for obj in objects]
+        with transaction.atomic():
+            references = self.get_references(model).filter(object_id__in=object_ids)
+            references._raw_delete(using=references.db)
+            ReferenceIndex._bulk_create_records(records, batch_size=self.batch_size)
+
     def print_newline(self):
         self.write("")
 
+    def print_throughput(self, object_count, reference_count, start_time):
+        elapsed = time.monotonic() - start_time
+        message = "%d objects" % object_count
+        if self.fast_insert:
+            message += ", %d references" % reference_count
+        message += " in %.1fs" % elapsed
+        if elapsed > 0:
+            message += " (%.1f objects/s)" % (object_count / elapsed)
+        self.write(message)
+
     def print_iter_progress(self, iterable):
         """
         Print a progress meter while iterating over an iterable. Use it as part
@@ -87,20 +341,3 @@ class Command(BaseCommand):
                 self.write(" ", ending="")
 
             self.stdout.flush()
-
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
-    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
-        """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
-        """
-        i = 0
-        while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
-            if not items:
-                break
-            yield items
-            i += 1
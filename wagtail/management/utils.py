@@ -0,0 +1,73 @@
+"""
+Helpers for management commands that process every instance of a model in chunks,
+optionally in several worker processes (such as ``update_index`` and
+``rebuild_references_index``).
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import CommandError
+from django.db import connections
+
+
+def queryset_chunks(qs, chunk_size, after_pk=None):
+    """
+    Yield a queryset ordered by primary key in chunks of at most ``chunk_size``,
+    starting after ``after_pk`` if given. The chunk yielded will be a list, not
+    a queryset.
+
+    Each chunk is fetched by filtering on the last primary key of the previous
+    chunk, rather than with an offset, so that fetching later chunks of a large
+    table is no slower than fetching the first, and objects created or deleted
+    while iterating don't cause others to be skipped or yielded twice.
+    """
+    while True:
+        chunk_qs = qs if after_pk is None else qs.filter(pk__gt=after_pk)
+        items = list(chunk_qs[:chunk_size])
+        if not items:
+            break
+        yield items
+        # Chunks of a values_list("pk", flat=True) queryset are primary keys
+        after_pk = getattr(items[-1], "pk", items[-1])
+
+
+def get_process_pool(processes):
+    """
+    Return a ``ProcessPoolExecutor`` with ``processes`` worker processes, or
+    ``None`` if only one process is to be used. Raises ``CommandError`` if worker
+    processes can't be forked on this platform.
+    """
+    if processes <= 1:
+        return None
+
+    try:
+        mp_context = multiprocessing.get_context("fork")
+    except ValueError:
+        raise CommandError(
+            "--processes is not supported on this platform, as it "
+            "requires the 'fork' start method"
+        )
+
+    # Worker processes must not share the database connection of this one
+    connections.close_all()
+    return ProcessPoolExecutor(processes, mp_context=mp_context)
+
+
+def map_chunks(executor, fn, chunks, *args, max_pending):
+    """
+    Call ``fn(*args, chunk)`` in ``executor`` for each of ``chunks``, and yield a
+    tuple of ``(chunk, result)`` for each of them, in order.
+
+    At most ``max_pending`` chunks are in flight at a time, so that the results
+    can be handled as they are produced rather than held in memory.
+    """
+    pending = []
+    for chunk in chunks:
+        pending.append((chunk, executor.submit(fn, *args, chunk)))
+        if len(pending) >= max_pending:
+            chunk, future = pending.pop(0)
+            yield chunk, future.result()
+
+    for chunk, future in pending:
+        yield chunk, future.result()
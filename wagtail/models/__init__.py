@@ -26,6 +26,7 @@ from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core import checks
+from django.core.cache import cache
 from django.core.exceptions import (
     FieldDoesNotExist,
     ImproperlyConfigured,
@@ -95,7 +96,12 @@ from wagtail.signals import (
     workflow_rejected,
     workflow_submitted,
 )
-from wagtail.url_routing import RouteResult
+from wagtail.url_routing import (
+    RouteResult,
+    ServePathBuilder,
+    clear_route_cache,
+    get_route_cache_key,
+)
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
 from wagtail.utils.timestamps import ensure_utc
 
@@ -126,8 +132,8 @@ from .media import (  # noqa: F401
     UploadedFile,
     get_root_collection_id,
 )
-from .reference_index import ReferenceIndex  # noqa: F401
-from .sites import Site, SiteManager, SiteRootPath  # noqa: F401
+from .reference_index import PendingReferenceIndexUpdate, ReferenceIndex  # noqa: F401
+from .sites import Site, SiteManager, SiteRootPath, SiteRootPaths  # noqa: F401
 from .specific import SpecificMixin
 from .view_restrictions import BaseViewRestriction
 
@@ -1407,11 +1413,18 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                     path_components = [
                         component for component in path.split("/") if component
                     ]
-                    request._wagtail_route_for_request = (
-                        site.root_page.localized.specific.route(
-                            request, path_components
+                    if getattr(settings, "WAGTAIL_ROUTE_CACHE_ENABLED", False):
+                        request._wagtail_route_for_request = (
+                            Page._route_for_site_with_cache(
+                                request, site, path_components
+                            )
+                        )
+                    else:
+                        request._wagtail_route_for_request = (
+                            site.root_page.localized.specific.route(
+                                request, path_components
+                            )
                         )
-                    )
                 else:
                     request._wagtail_route_for_request = None
             except Http404:
@@ -1420,6 +1433,90 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         return request._wagtail_route_for_request
 
+    @staticmethod
+    def _route_for_site_with_cache(
+        request: HttpRequest, site: Site, path_components: list[str]
+    ) -> RouteResult:
+        """
+        Route the request using ``_route_by_url_path``, caching the matched page for
+        the site and path so that subsequent requests for the same path are routed
+        without querying the database. Routes that are handed to a custom ``route()``
+        method are never cached, as their result may depend on the request.
+        """
+        if getattr(settings, "WAGTAIL_I18N_ENABLED", False):
+            language_code = translation.get_language()
+        else:
+            language_code = None
+
+        cache_key = get_route_cache_key(site.pk, language_code, path_components)
+        page = cache.get(cache_key)
+        if page is not None:
+            return RouteResult(page)
+
+        route_result, cacheable = site.root_page.localized.specific._route_by_url_path(
+            request, path_components
+        )
+        if cacheable:
+            cache.set(
+                cache_key,
+                route_result.page,
+                getattr(settings, "WAGTAIL_ROUTE_CACHE_TIMEOUT", 3600),
+            )
+        return route_result
+
+    def _route_by_url_path(self, request, path_components):
+        """
+        Equivalent to ``self.route(request, path_components)`` for pages that use the
+        default ``route()`` implementation, but fetches every page along the path with
+        a single query against ``url_path`` rather than one query per path component.
+
+        Routing is handed over to ``route()`` on the first page in the chain whose class
+        overrides it (such as pages using ``RoutablePageMixin``).
+
+        Returns a ``(route_result, cacheable)`` tuple, where ``cacheable`` is ``False``
+        if the result came from a custom ``route()`` method.
+        """
+        url_paths = [self.url_path]
+        for component in path_components:
+            url_paths.append(url_paths[-1] + component + "/")
+
+        pages_by_url_path = {
+            page.url_path: page
+            for page in Page.objects.filter(
+                path__startswith=self.path,
+                depth__gt=self.depth,
+                depth__lte=self.depth + len(path_components),
+                url_path__in=url_paths[1:],
+            )
+        }
+
+        page = self
+        for depth, url_path in enumerate(url_paths):
+            if depth:
+                try:
+                    child = pages_by_url_path[url_path]
+                except KeyError:
+                    raise Http404
+                # Cache the parent page on the child, as route() does
+                setattr(child, "_cached_parent_obj", page)
+                page = child
+
+            specific_class = page.specific_class
+            if specific_class is not None and specific_class.route is not Page.route:
+                return page.specific.route(request, path_components[depth:]), False
+
+        if page.live:
+            return RouteResult(page.specific), True
+        else:
+            raise Http404
+
+    @staticmethod
+    def clear_route_cache():
+        """
+        Invalidate all routes cached when ``WAGTAIL_ROUTE_CACHE_ENABLED`` is set.
+        """
+        clear_route_cache()
+
     @staticmethod
     def find_for_request(request: HttpRequest, path: str) -> Page | None:
         """
@@ -1478,6 +1575,9 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             # a page without a parent is the tree root, which always has a url_path of '/'
             self.url_path = "/"
 
+        # Discard any URL details stored by get_urls_for_pages()
+        self.__dict__.pop("_wagtail_cached_url_parts", None)
+
         return self.url_path
 
     @staticmethod
@@ -2120,10 +2220,12 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         """
         Returns a tuple of root paths for all sites this page belongs to.
         """
+        site_root_paths = self._get_site_root_paths(cache_object)
+        if isinstance(site_root_paths, SiteRootPaths):
+            return site_root_paths.get_relevant(self.url_path)
+
         return tuple(
-            srp
-            for srp in self._get_site_root_paths(cache_object)
-            if self.url_path.startswith(srp.root_path)
+            srp for srp in site_root_paths if self.url_path.startswith(srp.root_path)
         )
 
     def get_url_parts(self, request=None):
@@ -2144,14 +2246,38 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         when calling ``super``.
         """
 
-        possible_sites = self._get_relevant_site_root_paths(request)
+        try:
+            (
+                cached_request,
+                cached_language,
+                url_parts,
+            ) = self._wagtail_cached_url_parts
+        except AttributeError:
+            pass
+        else:
+            # Populated by get_urls_for_pages()
+            if (
+                cached_request is request
+                and cached_language == translation.get_language()
+            ):
+                return url_parts
 
+        return self._get_url_parts(
+            self._get_relevant_site_root_paths(request),
+            Site.find_for_request(request),
+        )
+
+    def _get_url_parts(self, possible_sites, site, serve_path_builder=None):
+        """
+        Implements ``get_url_parts`` for the given relevant site root paths and
+        current site. If ``serve_path_builder`` is given, it is used in place of
+        reversing the ``wagtail_serve`` URL pattern.
+        """
         if not possible_sites:
             return None
 
         site_id, root_path, root_url, language_code = possible_sites[0]
 
-        site = Site.find_for_request(request)
         if site:
             for site_id, root_path, root_url, language_code in possible_sites:
                 if site_id == site.pk:
@@ -2176,18 +2302,22 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                 # page's language code unchanged
                 pass
 
+        if serve_path_builder is None:
+
+            def get_serve_path(path):
+                return reverse("wagtail_serve", args=(path,))
+
+        else:
+            get_serve_path = serve_path_builder.get_path
+
         # The page may not be routable because wagtail_serve is not registered
         # This may be the case if Wagtail is used headless
         try:
             if use_wagtail_i18n:
                 with translation.override(language_code):
-                    page_path = reverse(
-                        "wagtail_serve", args=(self.url_path[len(root_path) :],)
-                    )
+                    page_path = get_serve_path(self.url_path[len(root_path) :])
             else:
-                page_path = reverse(
-                    "wagtail_serve", args=(self.url_path[len(root_path) :],)
-                )
+                page_path = get_serve_path(self.url_path[len(root_path) :])
         except NoReverseMatch:
             return (site_id, None, None)
 
@@ -2257,6 +2387,50 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
     url = property(get_url)
 
+    @classmethod
+    def get_urls_for_pages(cls, pages, request=None):
+        """
+        Return a list of URLs for the given pages, as returned by ``get_url(request)``.
+
+        This is more efficient than calling ``get_url`` on each page when building
+        URLs for a long list of pages, as the site root paths, current site and
+        ``wagtail_serve`` URL prefix are only looked up once. The resulting URL
+        details are stored on each page, so subsequent calls to ``get_url``,
+        ``get_full_url`` and ``get_url_parts`` with the same ``request`` (including
+        via the ``url`` and ``full_url`` properties and the ``{% pageurl %}`` and
+        ``{% fullpageurl %}`` template tags) do not need to compute them again.
+
+        Pages that override ``get_url_parts`` have their URLs computed individually.
+        """
+        pages = list(pages)
+        if not pages:
+            return []
+
+        site_root_paths = pages[0]._get_site_root_paths(request)
+        site = Site.find_for_request(request)
+        language = translation.get_language()
+        serve_path_builder = ServePathBuilder()
+
+        for page in pages:
+            if request is None:
+                # Share the site root paths, as they would otherwise be cached on each page
+                page._wagtail_cached_site_root_paths = site_root_paths
+
+            if type(page).get_url_parts is not Page.get_url_parts:
+                continue
+
+            page._wagtail_cached_url_parts = (
+                request,
+                language,
+                page._get_url_parts(
+                    page._get_relevant_site_root_paths(request),
+                    site,
+                    serve_path_builder,
+                ),
+            )
+
+        return [page.get_url(request=request) for page in pages]
+
     def relative_url(self, current_site, request=None):
         """
         Return the 'most appropriate' URL for this page taking into account the site we're currently on;
@@ -2491,11 +2665,13 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         exclude_fields=None,
         log_action="wagtail.copy",
         reset_translation_key=True,
+        bulk=False,
     ):
         """
         Copies a given page
 
         :param log_action: flag for logging the action. Pass None to skip logging. Can be passed an action string. Defaults to ``'wagtail.copy'``.
+        :param bulk: when copying recursively, copy the descendants of the page in batches, with one query per model per batch. See :ref:`bulk_page_copy`.
         """
         return CopyPageAction(
             self,
@@ -2509,6 +2685,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             process_child_object=process_child_object,
             log_action=log_action,
             reset_translation_key=reset_translation_key,
+            bulk=bulk,
         ).execute(skip_permission_checks=True)
 
     copy.alters_data = True
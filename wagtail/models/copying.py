@@ -1,7 +1,9 @@
+from collections import defaultdict
+
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
+from django.db import connections, models, router
 from modelcluster.fields import ParentalKey, ParentalManyToManyField
-from modelcluster.models import ClusterableModel
+from modelcluster.models import ClusterableModel, get_all_child_relations
 
 
 def _extract_field_data(source, exclude_fields=None):
@@ -93,6 +95,32 @@ def _copy_m2m_relations(source, target, exclude_fields=None, update_attrs=None):
             getattr(target, field.name).set(value)
 
 
+def _get_m2m_fields_to_copy(model, exclude_fields=None):
+    """
+    Returns the many to many fields of ``model`` whose relations are copied along
+    with its instances, either by ``_copy`` (parental many to many fields) or by
+    ``_copy_m2m_relations``.
+    """
+    exclude_fields = exclude_fields or []
+    fields = []
+
+    for field in model._meta.many_to_many:
+        if field.name in exclude_fields or field.auto_created:
+            continue
+
+        # Do not copy m2m links with a through model that has a ParentalKey to the model being copied - these will be copied as child objects
+        if not isinstance(field, ParentalManyToManyField) and any(
+            isinstance(through_field, ParentalKey)
+            and issubclass(model, through_field.related_model)
+            for through_field in field.remote_field.through._meta.get_fields()
+        ):
+            continue
+
+        fields.append(field)
+
+    return fields
+
+
 def _copy(source, exclude_fields=None, update_attrs=None):
     data_dict = _extract_field_data(source, exclude_fields=exclude_fields)
     target = source.__class__(**data_dict)
@@ -111,3 +139,128 @@ def _copy(source, exclude_fields=None, update_attrs=None):
         child_object_map = {}
 
     return target, child_object_map
+
+
+def _get_m2m_through_objects(field, instance_pk, values):
+    """
+    Returns unsaved instances of the through model of the many to many ``field``,
+    linking the object with ``instance_pk`` to each of ``values``.
+    """
+    through = field.remote_field.through
+    source_attname = through._meta.get_field(field.m2m_field_name()).attname
+    target_attname = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    return [
+        through(**{source_attname: instance_pk, target_attname: value.pk})
+        for value in values
+    ]
+
+
+def _bulk_create_multi_table(base_model, objects, batch_size=None):
+    """
+    Inserts the given unsaved instances of ``base_model`` and its subclasses, in
+    the same way as ``bulk_create``, but with support for multi-table inheritance:
+    each table in the inheritance chain gets one INSERT per batch of objects.
+
+    This must only be used on databases that can return rows from bulk inserts, as
+    the primary keys of the base table are needed to insert the other rows.
+    """
+    if not objects:
+        return
+
+    using = router.db_for_write(base_model)
+    connection = connections[using]
+    opts = base_model._meta
+
+    def get_batches(fields, objects):
+        max_batch_size = max(connection.ops.bulk_batch_size(fields, objects), 1)
+        size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+        return [objects[i : i + size] for i in range(0, len(objects), size)]
+
+    # Insert the rows of the base table, and set the primary keys returned
+    fields = [
+        field
+        for field in opts.concrete_fields
+        if not isinstance(field, models.AutoField)
+        and not getattr(field, "generated", False)
+    ]
+    for batch in get_batches(fields, objects):
+        rows = base_model._base_manager._insert(
+            batch,
+            fields=fields,
+            returning_fields=opts.db_returning_fields,
+            using=using,
+        )
+        for obj, row in zip(batch, rows):
+            for value, field in zip(row, opts.db_returning_fields):
+                setattr(obj, field.attname, value)
+
+    # Insert the rows of the tables of subclasses, starting with those nearest to
+    # the base model
+    objects_by_model = defaultdict(list)
+    for obj in objects:
+        pk = getattr(obj, opts.pk.attname)
+        concrete_model = obj._meta.concrete_model
+        for model in [concrete_model] + concrete_model._meta.get_parent_list():
+            if model is base_model:
+                continue
+            for parent_link in model._meta.parents.values():
+                if parent_link:
+                    setattr(obj, parent_link.attname, pk)
+            objects_by_model[model].append(obj)
+
+    for model in sorted(
+        objects_by_model, key=lambda model: len(model._meta.get_parent_list())
+    ):
+        fields = model._meta.local_concrete_fields
+        for batch in get_batches(fields, objects_by_model[model]):
+            model._base_manager._insert(batch, fields=fields, using=using)
+
+    for obj in objects:
+        obj._state.adding = False
+        obj._state.db = using
+
+
+def _bulk_create_child_objects(objects, batch_size=None):
+    """
+    Inserts the given unsaved child objects, as copied by ``_copy``, with one
+    ``bulk_create`` per model. The child objects and parental many to many
+    relations of any child objects that are themselves clusters are inserted too.
+    """
+    objects_by_model = defaultdict(list)
+    for obj in objects:
+        objects_by_model[type(obj)].append(obj)
+
+    nested_objects = []
+    through_objects = defaultdict(list)
+
+    for model, model_objects in objects_by_model.items():
+        if model._meta.parents:
+            _bulk_create_multi_table(
+                model._meta.get_parent_list()[-1], model_objects, batch_size
+            )
+        else:
+            model._default_manager.bulk_create(model_objects, batch_size=batch_size)
+
+        if not issubclass(model, ClusterableModel):
+            continue
+
+        for obj in model_objects:
+            for child_relation in get_all_child_relations(model):
+                nested_objects.extend(
+                    getattr(obj, child_relation.get_accessor_name()).all()
+                )
+            for field in model._meta.many_to_many:
+                if isinstance(field, ParentalManyToManyField):
+                    through_objects[field.remote_field.through].extend(
+                        _get_m2m_through_objects(
+                            field, obj.pk, getattr(obj, field.name).all()
+                        )
+                    )
+
+    for through, through_model_objects in through_objects.items():
+        through._default_manager.bulk_create(
+            through_model_objects, batch_size=batch_size
+        )
+
+    if nested_objects:
+        _bulk_create_child_objects(nested_objects, batch_size=batch_size)
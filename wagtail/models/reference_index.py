@@ -1,8 +1,10 @@
 import uuid
+from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
 from django.contrib.contenttypes.models import ContentType
-from django.db import connection, models
+from django.db import connection, models, transaction
 from django.utils.functional import cached_property
 from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy as _
@@ -20,6 +22,9 @@ class ReferenceGroups:
 
     Args:
         qs: (QuerySet[ReferenceIndex]) A QuerySet on the ReferenceIndex model
+        pending_references: (PendingReferences) Optionally, the references from
+            objects whose updates to the index have not been processed yet, which
+            replace the records of those objects in the queryset
 
     Yields:
         A tuple (source_object, references) for each source object that appears
@@ -28,13 +33,30 @@ class ReferenceGroups:
         that source object.
     """
 
-    def __init__(self, qs):
+    def __init__(self, qs, pending_references=None):
         self.qs = qs.order_by("base_content_type", "object_id")
+        self.pending_references = pending_references
+
+    @cached_property
+    def references(self):
+        if not self.pending_references:
+            return self.qs
+
+        return sorted(
+            [
+                reference
+                for reference in self.qs
+                if (reference.base_content_type_id, reference.object_id)
+                not in self.pending_references.sources
+            ]
+            + self.pending_references.references,
+            key=lambda reference: (reference.base_content_type_id, reference.object_id),
+        )
 
     def __iter__(self):
         reference_fk = None
         references = []
-        for reference in self.qs:
+        for reference in self.references:
             if reference_fk != (reference.base_content_type_id, reference.object_id):
                 if reference_fk is not None:
                     content_type = ContentType.objects.get_for_id(reference_fk[0])
@@ -56,11 +78,20 @@ class ReferenceGroups:
 
     @cached_property
     def _count(self):
+        if self.pending_references:
+            return len(
+                {
+                    (reference.base_content_type_id, reference.object_id)
+                    for reference in self.references
+                }
+            )
         return self.qs.values("base_content_type", "object_id").distinct().count()
 
     @cached_property
     def is_protected(self):
-        return any(reference.on_delete == models.PROTECT for reference in self.qs)
+        return any(
+            reference.on_delete == models.PROTECT for reference in self.references
+        )
 
     def count(self):
         """
@@ -76,6 +107,28 @@ class ReferenceGroups:
         return list(self)[key]
 
 
+class PendingReferences:
+    """
+    The references to an object from the objects whose updates to the reference
+    index have not been processed yet (with ``WAGTAIL_REFERENCE_INDEX_DEFERRED``),
+    as extracted from them in memory.
+
+    Attributes:
+        sources: A set of ``(base_content_type_id, object_id)`` tuples identifying
+            the objects with pending updates, whose records in the index may be
+            out of date
+        references: A list of unsaved ReferenceIndex instances, one for each
+            reference from those objects to the object
+    """
+
+    def __init__(self, sources=None, references=None):
+        self.sources = sources or set()
+        self.references = references or []
+
+    def __bool__(self):
+        return bool(self.sources)
+
+
 class ReferenceIndexQuerySet(models.QuerySet):
     def group_by_source_object(self):
         """
@@ -409,6 +462,81 @@ class ReferenceIndex(models.Model):
             uuid.UUID("bdc70d8b-e7a2-4c2a-bf43-2a3e3fcbbe86"), content_path
         )
 
+    @classmethod
+    def _get_content_types_for_object(cls, object):
+        """
+        Returns the ContentType records for the model of the given object and all
+        of its ancestor classes, ordered from most to least specific.
+        """
+        return [
+            ContentType.objects.get_for_model(model_or_object, for_concrete_model=False)
+            for model_or_object in ([object] + object._meta.get_parent_list())
+        ]
+
+    @classmethod
+    def _get_records_for_objects(cls, objects):
+        """
+        Extracts the references from the given objects, without comparing them
+        to the references already in the database.
+
+        Returns:
+            A list of tuples (content_type_id, base_content_type_id, object_id,
+            to_content_type_id, to_object_id, model_path, content_path), one for
+            each reference found.
+        """
+        records = []
+        for object in objects:
+            content_types = cls._get_content_types_for_object(object)
+            records.extend(
+                (
+                    content_types[0].id,
+                    content_types[-1].id,
+                    str(object.pk),
+                    to_content_type_id,
+                    to_object_id,
+                    model_path,
+                    content_path,
+                )
+                for to_content_type_id, to_object_id, model_path, content_path in set(
+                    cls._extract_references_from_object(object)
+                )
+            )
+        return records
+
+    @classmethod
+    def _bulk_create_records(cls, records, batch_size=None):
+        """
+        Inserts ReferenceIndex records for the given tuples, as returned by
+        ``_get_records_for_objects``. References that are already in the index
+        are skipped, so this must only be used on databases that support
+        ``ignore_conflicts``.
+        """
+        cls.objects.bulk_create(
+            [
+                cls(
+                    content_type_id=content_type_id,
+                    base_content_type_id=base_content_type_id,
+                    object_id=object_id,
+                    to_content_type_id=to_content_type_id,
+                    to_object_id=to_object_id,
+                    model_path=model_path,
+                    content_path=content_path,
+                    content_path_hash=cls._get_content_path_hash(content_path),
+                )
+                for (
+                    content_type_id,
+                    base_content_type_id,
+                    object_id,
+                    to_content_type_id,
+                    to_object_id,
+                    model_path,
+                    content_path,
+                ) in records
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
     @classmethod
     def create_or_update_for_object(cls, object):
         """
@@ -429,12 +557,7 @@ class ReferenceIndex(models.Model):
         # Extract new references and construct a set of reference records
         references = set(cls._extract_references_from_object(object))
 
-        # Find content types for this model and all of its ancestor classes,
-        # ordered from most to least specific
-        content_types = [
-            ContentType.objects.get_for_model(model_or_object, for_concrete_model=False)
-            for model_or_object in ([object] + object._meta.get_parent_list())
-        ]
+        content_types = cls._get_content_types_for_object(object)
         content_type = content_types[0]
         base_content_type = content_types[-1]
         known_content_type_ids = [ct.id for ct in content_types]
@@ -509,6 +632,24 @@ class ReferenceIndex(models.Model):
         # Perform the deletion
         cls.objects.filter(id__in=deleted_reference_ids).delete()
 
+    @classmethod
+    def create_for_new_objects(cls, objects, batch_size=None):
+        """
+        Creates ReferenceIndex records for the given objects, which must have been
+        created since the index was last updated, so that there are no existing
+        records for them to compare against.
+
+        On databases that support ``ignore_conflicts``, the records for all of the
+        objects are inserted in bulk.
+        """
+        if connection.features.supports_ignore_conflicts:
+            cls._bulk_create_records(
+                cls._get_records_for_objects(objects), batch_size=batch_size
+            )
+        else:
+            for object in objects:
+                cls.create_or_update_for_object(object)
+
     @classmethod
     def remove_for_object(cls, object):
         """
@@ -545,6 +686,10 @@ class ReferenceIndex(models.Model):
         """
         Returns all inbound references for the given object.
 
+        If ``WAGTAIL_REFERENCE_INDEX_DEFERRED`` is set, references from objects
+        whose updates have not been processed yet are not included; see
+        ``get_pending_references_to``.
+
         Args:
             object (Model): The model instance to fetch ReferenceIndex records for
 
@@ -556,19 +701,90 @@ class ReferenceIndex(models.Model):
             to_object_id=object.pk,
         )
 
+    @classmethod
+    def get_pending_references_to(cls, object):
+        """
+        Returns the inbound references for the given object from the objects whose
+        updates have not been processed yet, if ``WAGTAIL_REFERENCE_INDEX_DEFERRED``
+        is set. These are extracted from the objects in memory, without writing to
+        the index.
+
+        Args:
+            object (Model): The model instance to find references to
+
+        Returns:
+            A PendingReferences object
+        """
+        if not getattr(settings, "WAGTAIL_REFERENCE_INDEX_DEFERRED", False):
+            return PendingReferences()
+
+        to_content_type_id = cls._get_base_content_type(object).id
+        to_object_id = str(object.pk)
+
+        sources = set()
+        references = []
+        for source_object in PendingReferenceIndexUpdate.get_pending_objects():
+            records = cls._get_records_for_objects([source_object])
+            sources.add(
+                (cls._get_base_content_type(source_object).id, str(source_object.pk))
+            )
+            references.extend(
+                cls(
+                    content_type_id=content_type_id,
+                    base_content_type_id=base_content_type_id,
+                    object_id=object_id,
+                    to_content_type_id=record_to_content_type_id,
+                    to_object_id=record_to_object_id,
+                    model_path=model_path,
+                    content_path=content_path,
+                    content_path_hash=cls._get_content_path_hash(content_path),
+                )
+                for (
+                    content_type_id,
+                    base_content_type_id,
+                    object_id,
+                    record_to_content_type_id,
+                    record_to_object_id,
+                    model_path,
+                    content_path,
+                ) in records
+                if record_to_content_type_id == to_content_type_id
+                and record_to_object_id == to_object_id
+            )
+
+        return PendingReferences(sources, references)
+
+    @classmethod
+    def has_pending_updates(cls):
+        """
+        Returns whether ``WAGTAIL_REFERENCE_INDEX_DEFERRED`` is set and there are
+        saved objects whose references have not been indexed yet.
+        """
+        return (
+            getattr(settings, "WAGTAIL_REFERENCE_INDEX_DEFERRED", False)
+            and PendingReferenceIndexUpdate.objects.exists()
+        )
+
     @classmethod
     def get_grouped_references_to(cls, object):
         """
         Returns all inbound references for the given object, grouped by the object
         they are found on.
 
+        If ``WAGTAIL_REFERENCE_INDEX_DEFERRED`` is set, the references from objects
+        whose updates have not been processed yet are extracted from them in
+        memory, and replace the records of those objects in the index.
+
         Args:
             object (Model): The model instance to fetch ReferenceIndex records for
 
         Returns:
             A ReferenceGroups object
         """
-        return cls.get_references_to(object).group_by_source_object()
+        return ReferenceGroups(
+            cls.get_references_to(object),
+            pending_references=cls.get_pending_references_to(object),
+        )
 
     @property
     def _content_type(self):
@@ -712,6 +928,120 @@ class ReferenceIndex(models.Model):
         return _("will unset the reference")
 
 
+class PendingReferenceIndexUpdate(models.Model):
+    """
+    An object that has been saved while ``WAGTAIL_REFERENCE_INDEX_DEFERRED`` is
+    set, and whose references have not been indexed yet. Saving an object several
+    times before it is processed only records a single entry.
+
+    Entries are processed, and removed, by the ``process_references_index_queue``
+    management command.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        unique_together = [("content_type", "object_id")]
+
+    def __str__(self):
+        return (
+            f"Pending reference index update for {self.content_type} {self.object_id}"
+        )
+
+    @classmethod
+    def enqueue(cls, object):
+        """
+        Record that the references of ``object`` need to be indexed.
+        """
+        cls.enqueue_objects([object])
+
+    @classmethod
+    def enqueue_objects(cls, objects):
+        """
+        Record that the references of each of ``objects`` need to be indexed.
+        """
+        cls.objects.bulk_create(
+            [
+                cls(
+                    content_type=ContentType.objects.get_for_model(
+                        object, for_concrete_model=False
+                    ),
+                    object_id=str(object.pk),
+                )
+                for object in objects
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def get_pending_objects(cls, entries=None):
+        """
+        Yields the objects of the given entries (or of all pending entries) that
+        still exist, with the child relations that references are extracted from
+        prefetched.
+        """
+        if entries is None:
+            entries = cls.objects.select_related("content_type")
+
+        object_ids_by_content_type = defaultdict(list)
+        for entry in entries:
+            object_ids_by_content_type[entry.content_type].append(entry.object_id)
+
+        for content_type, object_ids in object_ids_by_content_type.items():
+            model = content_type.model_class()
+            if model is None or not ReferenceIndex.is_indexed(model):
+                continue
+
+            queryset = model._default_manager.filter(pk__in=object_ids)
+            if issubclass(model, ClusterableModel):
+                queryset = queryset.prefetch_related(
+                    *(
+                        child_relation.get_accessor_name()
+                        for child_relation in get_all_child_relations(model)
+                    )
+                )
+            yield from queryset
+
+    @classmethod
+    def process_pending(cls, limit=None):
+        """
+        Index the references of the objects with pending updates, oldest first,
+        processing at most ``limit`` entries if given.
+
+        Entries claimed by another process at the same time are skipped, on
+        databases that support ``SELECT ... FOR UPDATE SKIP LOCKED``.
+
+        Returns:
+            The number of entries processed
+        """
+        with transaction.atomic():
+            entries = (
+                cls.objects.select_for_update(skip_locked=True)
+                .select_related("content_type")
+                .order_by("created_at", "pk")
+            )
+            if limit is not None:
+                entries = entries[:limit]
+            entries = list(entries)
+            if not entries:
+                return 0
+
+            # Objects that have been deleted since they were saved are skipped, as
+            # their references were removed on deletion
+            for object in cls.get_pending_objects(entries):
+                ReferenceIndex.create_or_update_for_object(object)
+
+            cls.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+
+        return len(entries)
+
+
 # Ignore relations formed by any django-taggit 'through' model, as this causes any tag attached to
 # a tagged object to appear as a reference to that object. Ideally we would follow the reference to
 # the Tag model so that we can use the references index to find uses of a tag, but doing that
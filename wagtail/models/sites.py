@@ -1,10 +1,12 @@
-from collections import namedtuple
+import copy
+import time
+from collections import defaultdict, namedtuple
 
 from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Case, IntegerField, Q, When
 from django.db.models.functions import Lower
 from django.http.request import split_domain_port
@@ -61,6 +63,139 @@ def get_site_for_hostname(hostname, port):
     raise Site.DoesNotExist()
 
 
+class SiteMatcher:
+    """
+    An in-memory table of all sites, used to find the site for a request without
+    querying the database. Follows the same rules as ``get_site_for_hostname``.
+
+    Each site's root page (with its locale and specific instance) is loaded with
+    the table, so that routing a request can start from the root page without
+    querying the database either. Instances are shared between requests, so
+    ``match()`` returns a copy of the site.
+    """
+
+    def __init__(self, sites):
+        self.sites_by_hostname = {}
+        self.default_site = None
+        for site in sites:
+            self.sites_by_hostname.setdefault(site.hostname, {})[site.port] = site
+            if site.is_default_site and self.default_site is None:
+                self.default_site = site
+
+    @classmethod
+    def load(cls):
+        sites = list(
+            Site.objects.select_related("root_page", "root_page__locale").order_by("pk")
+        )
+
+        # Fetch the specific root pages, with one query per page type
+        root_pages_by_class = defaultdict(list)
+        for site in sites:
+            specific_class = site.root_page.specific_class
+            if specific_class is not None and not isinstance(
+                site.root_page, specific_class
+            ):
+                root_pages_by_class[specific_class].append(site.root_page)
+
+        for specific_class, root_pages in root_pages_by_class.items():
+            specific_root_pages = specific_class._default_manager.in_bulk(
+                {root_page.pk for root_page in root_pages}
+            )
+            for root_page in root_pages:
+                specific_root_page = specific_root_pages.get(root_page.pk)
+                if specific_root_page is not None:
+                    specific_root_page._state.fields_cache["locale"] = root_page.locale
+                    root_page.__dict__["specific"] = specific_root_page
+
+        return cls(sites)
+
+    def match(self, hostname, port):
+        """
+        Return a copy of the site for the given hostname and port, or ``None`` if
+        there isn't one.
+        """
+        try:
+            # Ports taken from a request are strings
+            port = int(port)
+        except (TypeError, ValueError):
+            pass
+
+        sites = self.sites_by_hostname.get(hostname, {})
+        default_site = self.default_site
+
+        if port in sites:
+            site = sites[port]
+        elif default_site is not None and default_site.hostname == hostname:
+            site = default_site
+        elif len(sites) == 1:
+            # A unique hostname match is preferred to the default site
+            site = next(iter(sites.values()))
+        else:
+            # Several sites with this hostname but none with this port fall
+            # back to the default site, as do unknown hostnames
+            site = default_site
+
+        if site is not None:
+            return self.copy_site(site)
+
+    @staticmethod
+    def copy_site(site):
+        root_page = copy.copy(site.root_page)
+        root_page._state.fields_cache["locale"] = copy.copy(site.root_page.locale)
+        if "specific" in site.root_page.__dict__:
+            root_page.__dict__["specific"] = copy.copy(site.root_page.specific)
+
+        site = copy.copy(site)
+        site._state.fields_cache["root_page"] = root_page
+        return site
+
+
+# The (version, SiteMatcher) pair most recently loaded by this process. Shares
+# its version stamp with the site root paths, as both are invalidated together.
+_local_site_matcher = (None, None)
+
+
+def get_site_matcher():
+    """
+    Return the ``SiteMatcher`` for the current sites, loading it if the sites have
+    changed since this process last loaded it.
+    """
+    global _local_site_matcher
+
+    version = cache.get(
+        SITE_ROOT_PATHS_VERSION_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+    )
+    local_version, matcher = _local_site_matcher
+    if local_version is not None and local_version == version:
+        return matcher
+
+    matcher = SiteMatcher.load()
+
+    if version is None:
+        version = _start_site_root_paths_version()
+    if version is not None:
+        _local_site_matcher = (version, matcher)
+
+    return matcher
+
+
+def _start_site_root_paths_version():
+    """
+    Start a new version stamp for the site root paths, if there isn't one yet (or
+    it has been evicted), from a timestamp to make sure an old version is never
+    reused. Returns ``None`` if another process got there first, in which case its
+    version is picked up on the next call instead.
+    """
+    version = time.time_ns()
+    if cache.add(
+        SITE_ROOT_PATHS_VERSION_CACHE_KEY,
+        version,
+        None,
+        version=SITE_ROOT_PATHS_CACHE_VERSION,
+    ):
+        return version
+
+
 class SiteManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().order_by(Lower("hostname"))
@@ -75,6 +210,54 @@ SITE_ROOT_PATHS_CACHE_KEY = "wagtail_site_root_paths"
 # Increase the cache version whenever the structure SiteRootPath tuple changes
 SITE_ROOT_PATHS_CACHE_VERSION = 2
 
+# A cheap version stamp, bumped whenever the site root paths are invalidated.
+# Each process keeps its own copy of the site root paths (and the index built
+# over them) for as long as this stamp is unchanged.
+SITE_ROOT_PATHS_VERSION_CACHE_KEY = "wagtail_site_root_paths_version"
+
+# The (version, SiteRootPaths) pair most recently loaded by this process
+_local_site_root_paths = (None, None)
+
+
+class SiteRootPaths(list):
+    """
+    A list of ``SiteRootPath`` instances, most specific path first, which can
+    also efficiently find the root paths that apply to a given page ``url_path``.
+
+    Instances are shared between requests, so must not be modified.
+    """
+
+    _index = None
+
+    def get_index(self):
+        if self._index is None:
+            index = {}
+            for position, srp in enumerate(self):
+                index.setdefault(srp.root_path, []).append((position, srp))
+            self._index = index
+        return self._index
+
+    def get_relevant(self, url_path):
+        """
+        Return a tuple of the root paths that ``url_path`` falls under, in the
+        same order as they appear in this list.
+
+        Root paths always end in a slash, so only the slash-terminated prefixes
+        of ``url_path`` need to be looked up. This makes the lookup proportional
+        to the depth of the page, rather than the number of sites.
+        """
+        index = self.get_index()
+        matches = []
+        end = url_path.find("/")
+        while end != -1:
+            matches.extend(index.get(url_path[: end + 1], ()))
+            end = url_path.find("/", end + 1)
+
+        if len(matches) > 1:
+            matches.sort(key=lambda match: match[0])
+
+        return tuple(srp for position, srp in matches)
+
 
 class Site(models.Model):
     hostname = models.CharField(
@@ -163,13 +346,7 @@ class Site(models.Model):
         # Use `_get_raw_host` to avoid ALLOWED_HOSTS checks
         hostname = split_domain_port(request._get_raw_host())[0]
         port = request.get_port()
-        site = None
-        try:
-            site = get_site_for_hostname(hostname, port)
-        except Site.DoesNotExist:
-            pass
-            # copy old SiteMiddleware behaviour
-        return site
+        return get_site_matcher().match(hostname, port)
 
     @property
     def root_url(self):
@@ -216,10 +393,25 @@ class Site(models.Model):
         - ``root_path`` - The internal URL path of the site's home page (for example '/home/')
         - ``root_url`` - The scheme/domain name of the site (for example 'https://www.example.com/')
         - ``language_code`` - The language code of the site (for example 'en')
+
+        The returned list is a ``SiteRootPaths`` instance, which is shared with
+        other requests served by this process until the site root paths are
+        invalidated, so it must not be modified.
         """
-        result = cache.get(
-            SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+        global _local_site_root_paths
+
+        local_version, local_result = _local_site_root_paths
+        if local_version is not None and local_version == cache.get(
+            SITE_ROOT_PATHS_VERSION_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+        ):
+            return local_result
+
+        cached = cache.get_many(
+            [SITE_ROOT_PATHS_VERSION_CACHE_KEY, SITE_ROOT_PATHS_CACHE_KEY],
+            version=SITE_ROOT_PATHS_CACHE_VERSION,
         )
+        version = cached.get(SITE_ROOT_PATHS_VERSION_CACHE_KEY)
+        result = cached.get(SITE_ROOT_PATHS_CACHE_KEY)
 
         if result is None:
             result = []
@@ -258,13 +450,50 @@ class Site(models.Model):
                 version=SITE_ROOT_PATHS_CACHE_VERSION,
             )
 
+            result = SiteRootPaths(result)
+
         else:
             # Convert the cache result to a list of SiteRootPath tuples, as some
             # cache backends (e.g. Redis) don't support named tuples.
-            result = [SiteRootPath(*result) for result in result]
+            result = SiteRootPaths(SiteRootPath(*result) for result in result)
+
+        if version is None:
+            version = _start_site_root_paths_version()
+
+        if version is not None:
+            _local_site_root_paths = (version, result)
 
         return result
 
     @staticmethod
-    def clear_site_root_paths_cache():
+    def _bump_site_root_paths_version():
+        try:
+            cache.incr(
+                SITE_ROOT_PATHS_VERSION_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+            )
+        except ValueError:
+            cache.set(
+                SITE_ROOT_PATHS_VERSION_CACHE_KEY,
+                time.time_ns(),
+                None,
+                version=SITE_ROOT_PATHS_CACHE_VERSION,
+            )
+
+    @staticmethod
+    def _invalidate_site_root_paths():
         cache.delete(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+
+        # Bump the version stamp so that other processes discard their copies
+        Site._bump_site_root_paths_version()
+
+    @staticmethod
+    def clear_site_root_paths_cache():
+        global _local_site_root_paths, _local_site_matcher
+
+        # Invalidate the site root paths again once the transaction commits, in
+        # case another process reloaded and cached them before the changes became
+        # visible to it
+        Site._invalidate_site_root_paths()
+        transaction.on_commit(Site._invalidate_site_root_paths)
+        _local_site_root_paths = (None, None)
+        _local_site_matcher = (None, None)
@@ -6,7 +6,7 @@ from typing import Any
 
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import CharField, Prefetch, Q
+from django.db.models import CharField, Prefetch, Q, QuerySet
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Cast, Length, Substr
 from django.db.models.query import ModelIterable
@@ -141,6 +141,68 @@ class TreeQuerySet(MP_NodeQuerySet):
         return self.exclude(self.sibling_of_q(other, inclusive))
 
 
+class StreamFieldQuerySetMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # set by prefetch_stream_blocks()
+        self._prefetch_stream_blocks_fields = ()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_stream_blocks_fields = self._prefetch_stream_blocks_fields
+        return clone
+
+    def prefetch_stream_blocks(self, *field_names):
+        """
+        Performance optimisation for listing objects with StreamFields.
+        Converts the values of the named StreamFields of all results when the
+        queryset is evaluated, fetching the objects selected by chooser blocks
+        (such as images and pages) across all of the results with a single query
+        per model. Without this, each result makes its own queries when its
+        StreamField is accessed.
+
+        Passing ``None`` clears any previously given field names. For example:
+
+        .. code-block:: python
+
+            pages = BlogPage.objects.live().prefetch_stream_blocks("body")
+        """
+        clone = self._chain()
+        if field_names == (None,):
+            clone._prefetch_stream_blocks_fields = ()
+        else:
+            clone._prefetch_stream_blocks_fields = (
+                self._prefetch_stream_blocks_fields + field_names
+            )
+        return clone
+
+    def _fetch_all(self):
+        prefetch_stream_blocks = (
+            self._prefetch_stream_blocks_fields and self._result_cache is None
+        )
+        super()._fetch_all()
+        if prefetch_stream_blocks:
+            from wagtail.fields import prefetch_stream_blocks
+
+            prefetch_stream_blocks(
+                self._result_cache, *self._prefetch_stream_blocks_fields
+            )
+
+
+class StreamFieldQuerySet(StreamFieldQuerySetMixin, QuerySet):
+    """
+    A QuerySet providing ``prefetch_stream_blocks()``, for use as the manager of
+    models with StreamFields. For example:
+
+    .. code-block:: python
+
+        class Event(models.Model):
+            body = StreamField([...])
+
+            objects = StreamFieldQuerySet.as_manager()
+    """
+
+
 class SpecificQuerySetMixin:
     def __init__(self, *args, **kwargs):
         """Set custom instance attributes"""
@@ -149,11 +211,16 @@ class SpecificQuerySetMixin:
         self._defer_streamfields = False
         self._specific_select_related_fields = ()
         self._specific_prefetch_related_lookups = ()
+        # set by PageQuerySet.with_urls()
+        self._with_urls = False
+        self._with_urls_request = None
 
     def _clone(self):
         """Ensure clones inherit custom attribute values."""
         clone = super()._clone()
         clone._defer_streamfields = self._defer_streamfields
+        clone._with_urls = self._with_urls
+        clone._with_urls_request = self._with_urls_request
         clone._specific_select_related_fields = self._specific_select_related_fields
         clone._specific_prefetch_related_lookups = (
             self._specific_prefetch_related_lookups
@@ -317,7 +384,12 @@ class SpecificQuerySetMixin:
         return clone
 
 
-class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet):
+class PageQuerySet(
+    SearchableQuerySetMixin,
+    SpecificQuerySetMixin,
+    StreamFieldQuerySetMixin,
+    TreeQuerySet,
+):
     def live_q(self):
         return Q(live=True)
 
@@ -559,6 +631,31 @@ class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet)
             return clone
         return clone.defer(*streamfield_names)
 
+    def with_urls(self, request=None):
+        """
+        Performance optimisation for listing pages.
+        Resolves the URLs of all pages in this queryset in a single pass when it is
+        evaluated, using ``Page.get_urls_for_pages()``. Subsequent calls to ``get_url``
+        and ``get_full_url`` for the same ``request`` (including via the ``url`` and
+        ``full_url`` properties and the ``{% pageurl %}`` and ``{% fullpageurl %}``
+        template tags) do not need to resolve them again.
+        """
+        clone = self._clone()
+        clone._with_urls = True
+        clone._with_urls_request = request
+        return clone
+
+    def _fetch_all(self):
+        populate_urls = self._with_urls and self._result_cache is None
+        super()._fetch_all()
+        if populate_urls:
+            from .models import Page
+
+            Page.get_urls_for_pages(
+                [obj for obj in self._result_cache if isinstance(obj, Page)],
+                request=self._with_urls_request,
+            )
+
     def in_site(self, site):
         """
         This filters the QuerySet to only contain pages within the specified site.
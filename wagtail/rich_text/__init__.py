@@ -8,6 +8,7 @@ from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.utils.safestring import mark_safe
 
+from wagtail.rich_text.cache import get_expanded_html
 from wagtail.rich_text.feature_registry import FeatureRegistry
 from wagtail.rich_text.rewriters import EmbedRewriter, LinkRewriter, MultiRuleRewriter
 
@@ -54,7 +55,7 @@ def expand_db_html(html):
     Expand database-representation HTML into proper HTML usable on front-end templates
     """
     rewriter = get_rewriter()
-    return rewriter(html)
+    return get_expanded_html(html, rewriter)
 
 
 def extract_references_from_rich_text(html):
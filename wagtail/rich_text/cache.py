@@ -0,0 +1,261 @@
+"""
+A cache of the front-end HTML that ``expand_db_html`` produces from rich text, with
+a bounded in-process tier and an optional shared tier, enabled by the
+``WAGTAIL_RICH_TEXT_CACHE_SIZE`` and ``WAGTAIL_RICH_TEXT_SHARED_CACHE`` settings.
+
+Entries are keyed by a hash of the source HTML, the active language and a generation
+counter, which is bumped whenever an object that is referenced from content (and so
+possibly linked or embedded in rich text) changes in a way that affects its HTML.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import translation
+
+from wagtail.coreutils import safe_md5
+
+RICH_TEXT_CACHE_KEY_PREFIX = "wagtail_rich_text"
+RICH_TEXT_CACHE_GENERATION_KEY = "wagtail_rich_text_generation"
+
+# The number of seconds for which each process reuses the generation it last read
+# from the cache, so that a cache hit in the in-process tier doesn't involve a round
+# trip to the shared cache. Changes made by other processes are picked up within
+# this time.
+GENERATION_CHECK_INTERVAL = 1
+
+
+class LocalRichTextCache:
+    """
+    A bounded, thread-safe LRU cache of expanded rich text HTML. Entries for earlier
+    generations are never looked up again, and are left to be evicted.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                html = self._entries[key]
+            except KeyError:
+                return None
+            self._entries.move_to_end(key)
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+# The generation last read from the cache, and when it was read
+_generation = None
+_generation_read_at = 0
+
+
+def get_local_rich_text_cache():
+    """
+    Return the in-process rich text cache, or ``None`` if it is disabled because
+    ``WAGTAIL_RICH_TEXT_CACHE_SIZE`` is not set.
+    """
+    global _local_cache
+
+    if _local_cache is None:
+        max_size = getattr(settings, "WAGTAIL_RICH_TEXT_CACHE_SIZE", 0)
+        if not max_size:
+            return None
+
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LocalRichTextCache(max_size)
+
+    return _local_cache
+
+
+def get_shared_rich_text_cache():
+    """
+    Return the shared rich text cache, or ``None`` if it is disabled because
+    ``WAGTAIL_RICH_TEXT_SHARED_CACHE`` is not set.
+    """
+    alias = getattr(settings, "WAGTAIL_RICH_TEXT_SHARED_CACHE", None)
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def is_enabled():
+    return bool(
+        getattr(settings, "WAGTAIL_RICH_TEXT_CACHE_SIZE", 0)
+        or getattr(settings, "WAGTAIL_RICH_TEXT_SHARED_CACHE", None)
+    )
+
+
+def get_rich_text_cache_generation():
+    global _generation, _generation_read_at
+
+    now = time.monotonic()
+    if (
+        _generation is not None
+        and now - _generation_read_at < GENERATION_CHECK_INTERVAL
+    ):
+        return _generation
+
+    generation = cache.get(RICH_TEXT_CACHE_GENERATION_KEY)
+    if generation is None:
+        # Start from a time-based value rather than 1, so that a generation key
+        # lost from the cache can never resurrect HTML cached before it expired
+        generation = time.time_ns()
+        cache.add(RICH_TEXT_CACHE_GENERATION_KEY, generation, None)
+        generation = cache.get(RICH_TEXT_CACHE_GENERATION_KEY, generation)
+
+    _generation = generation
+    _generation_read_at = now
+    return generation
+
+
+def clear_rich_text_cache():
+    """
+    Invalidate all cached rich text HTML, in every process, by bumping the
+    generation.
+    """
+    global _generation, _generation_read_at
+
+    try:
+        _generation = cache.incr(RICH_TEXT_CACHE_GENERATION_KEY)
+        _generation_read_at = time.monotonic()
+    except ValueError:
+        # The generation key is not set (or has been evicted); a fresh time-based
+        # generation will be picked up on the next lookup
+        _generation = None
+
+
+def get_cache_key(html):
+    html_hash = safe_md5(html.encode(), usedforsecurity=False).hexdigest()
+    return "%s:%s:%s:%s" % (
+        RICH_TEXT_CACHE_KEY_PREFIX,
+        get_rich_text_cache_generation(),
+        translation.get_language() or "",
+        html_hash,
+    )
+
+
+def get_expanded_html(html, expand):
+    """
+    Return the result of ``expand(html)``, from the rich text cache if it is
+    enabled and has an entry for ``html``.
+    """
+    local_cache = get_local_rich_text_cache()
+    shared_cache = get_shared_rich_text_cache()
+    if not html or (local_cache is None and shared_cache is None):
+        return expand(html)
+
+    # The key is worked out before expanding, so that HTML expanded from objects
+    # changed in the meantime is stored under the generation before the change
+    key = get_cache_key(html)
+
+    if local_cache is not None:
+        expanded = local_cache.get(key)
+        if expanded is not None:
+            return expanded
+
+    if shared_cache is not None:
+        expanded = shared_cache.get(key)
+        if expanded is not None:
+            if local_cache is not None:
+                local_cache.set(key, expanded)
+            return expanded
+
+    expanded, cacheable = _expand(html, expand)
+    if not cacheable:
+        return expanded
+
+    if local_cache is not None:
+        local_cache.set(key, expanded)
+    if shared_cache is not None:
+        shared_cache.set(key, expanded)
+
+    return expanded
+
+
+# Whether the HTML being expanded in this thread can be cached
+_expansion = Local()
+
+
+def _expand(html, expand):
+    outer_cacheable = getattr(_expansion, "cacheable", None)
+    _expansion.cacheable = True
+    try:
+        expanded = expand(html)
+        cacheable = _expansion.cacheable
+    finally:
+        _expansion.cacheable = outer_cacheable
+
+    if not cacheable and outer_cacheable is not None:
+        # Rich text containing this rich text can't be cached either
+        _expansion.cacheable = False
+    return expanded, cacheable
+
+
+def skip_rich_text_cache():
+    """
+    Prevent the rich text HTML currently being expanded, if any, from being
+    cached, because it includes something that will soon be out of date (such
+    as the URL of a placeholder for an image rendition that is still queued).
+    """
+    if getattr(_expansion, "cacheable", None) is not None:
+        _expansion.cacheable = False
+
+
+def clear_rich_text_cache_on_commit():
+    if is_enabled():
+        transaction.on_commit(clear_rich_text_cache)
+
+
+def clear_rich_text_cache_for_object(instance):
+    """
+    Invalidate the cached rich text HTML once the current transaction is committed,
+    if ``instance`` is referenced from any content, as found in the reference index
+    and in the objects whose updates to it have not been processed yet.
+    """
+    from wagtail.models import ReferenceIndex
+
+    if is_enabled() and (
+        ReferenceIndex.get_references_to(instance).exists()
+        # References from objects saved recently may not be indexed yet
+        or ReferenceIndex.get_pending_references_to(instance).references
+    ):
+        transaction.on_commit(clear_rich_text_cache)
+
+
+@receiver(setting_changed)
+def reset_rich_text_cache(**kwargs):
+    global _local_cache, _generation
+
+    if kwargs["setting"] in (
+        "WAGTAIL_RICH_TEXT_CACHE_SIZE",
+        "WAGTAIL_RICH_TEXT_SHARED_CACHE",
+    ):
+        _local_cache = None
+        _generation = None
@@ -1,4 +1,6 @@
+import base64
 import datetime
+import json
 from warnings import warn
 
 from django.db.models.functions.datetime import Extract as ExtractDate
@@ -266,9 +268,69 @@ class BaseSearchQueryCompiler:
         list(self._get_order_by())
 
 
+def encode_search_cursor(position):
+    """
+    Encode the position of a page of search results, as given by
+    ``BaseSearchResults._get_next_position``, into an opaque string that can be
+    passed back to ``BaseSearchResults.after``.
+    """
+    data = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor):
+    """
+    Decode a string returned by ``encode_search_cursor``. Raises ``ValueError``
+    if the cursor is invalid.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(data)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid search cursor: %r" % cursor)
+
+    if not isinstance(position, dict):
+        raise ValueError("Invalid search cursor: %r" % cursor)
+
+    return position
+
+
+class SearchHit:
+    """
+    A lightweight search result, returned by ``BaseSearchResults.hits()`` in place
+    of a model instance. Holds the primary key and score of the matching object,
+    and the values of the requested fields, which can be read as attributes.
+    """
+
+    def __init__(self, pk, score=None, fields=None):
+        self.pk = pk
+        self.score = score
+        self.fields = fields or {}
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["fields"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SearchHit)
+            and self.pk == other.pk
+            and self.score == other.score
+            and self.fields == other.fields
+        )
+
+    def __repr__(self):
+        return f"<SearchHit pk={self.pk!r} score={self.score!r} fields={self.fields!r}>"
+
+
 class BaseSearchResults:
     supports_facet = False
 
+    # The name of the annotation used to fetch the score of each hit from a queryset
+    HIT_SCORE_FIELD = "_search_hit_score"
+
     def __init__(self, backend, query_compiler, prefetch_related=None):
         self.backend = backend
         self.query_compiler = query_compiler
@@ -278,6 +340,9 @@ class BaseSearchResults:
         self._results_cache = None
         self._count_cache = None
         self._score_field = None
+        self._paginate_by_cursor = False
+        self._next_cursor = None
+        self._hit_fields = None
 
     def _set_limits(self, start=None, stop=None):
         if stop is not None:
@@ -300,6 +365,8 @@ class BaseSearchResults:
         new.start = self.start
         new.stop = self.stop
         new._score_field = self._score_field
+        new._paginate_by_cursor = self._paginate_by_cursor
+        new._hit_fields = self._hit_fields
         return new
 
     def _do_search(self):
@@ -308,11 +375,87 @@ class BaseSearchResults:
     def _do_count(self):
         raise NotImplementedError
 
+    def _get_hits_from_queryset(self, queryset, score_field=None):
+        """
+        Yields ``SearchHit`` objects for the rows of a queryset of search results,
+        fetching only the primary key, score and requested fields of each object
+        rather than building model instances.
+        """
+        # Queries that match everything or nothing aren't annotated with a score
+        if score_field not in queryset.query.annotations:
+            score_field = None
+
+        values = ["pk", *self._hit_fields]
+        if score_field is not None:
+            values.append(score_field)
+
+        for row in queryset.values(*values):
+            pk = row.pop("pk")
+            score = row.pop(score_field) if score_field is not None else None
+            yield SearchHit(pk, score, row)
+
+    def _set_cursor_position(self, position):
+        """
+        Move the start of the results to just after the position decoded from a
+        cursor. By default, cursors record the offset of the next result.
+        """
+        offset = position.get("offset")
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("Invalid search cursor position: %r" % position)
+
+        self._set_limits(start=offset)
+
+    def _get_next_position(self):
+        """
+        Return the position to encode in the cursor for the page following these
+        results, or None if there are no more results.
+        """
+        if self.stop is None or self.stop == self.start:
+            return None
+
+        if len(self._results_cache) < self.stop - self.start:
+            return None
+
+        return {"offset": self.stop}
+
     def results(self):
         if self._results_cache is None:
             self._results_cache = list(self._do_search())
+
+            if self._paginate_by_cursor:
+                position = self._get_next_position()
+                if position is not None:
+                    self._next_cursor = encode_search_cursor(position)
+
         return self._results_cache
 
+    def after(self, cursor=None):
+        """
+        Return the results following the position recorded in ``cursor``, a value
+        taken from the ``next_cursor`` of an earlier page of the same search, or
+        from the beginning if ``cursor`` is None. Slice the returned results to
+        get a page, then read its ``next_cursor`` to fetch the page after it::
+
+            page = results.after(cursor)[:20]
+
+        Raises ``ValueError`` if the cursor is invalid.
+        """
+        clone = self._clone()
+        clone._paginate_by_cursor = True
+        if cursor is not None:
+            clone._set_cursor_position(decode_search_cursor(cursor))
+        return clone
+
+    @property
+    def next_cursor(self):
+        """
+        A cursor for fetching the page following these results with ``after()``,
+        or None if this is the last page. Only available on results returned by
+        ``after()``.
+        """
+        self.results()
+        return self._next_cursor
+
     def count(self):
         if self._count_cache is None:
             if self._results_cache is not None:
@@ -355,6 +498,18 @@ class BaseSearchResults:
             data[-1] = "...(remaining elements truncated)..."
         return "<SearchResults %r>" % data
 
+    def hits(self, *field_names):
+        """
+        Return the results as ``SearchHit`` objects holding the primary key and
+        score of each result, and the values of the given fields, rather than as
+        model instances. Backends that store the field values in their index return
+        them without querying the database; otherwise they are fetched in a single
+        query, with no model instances or prefetching.
+        """
+        clone = self._clone()
+        clone._hit_fields = tuple(field_names)
+        return clone
+
     def annotate_score(self, field_name):
         clone = self._clone()
         clone._score_field = field_name
@@ -440,6 +595,10 @@ class BaseSearchBackend:
     def delete(self, obj):
         self.get_index_for_model(type(obj)).delete_item(obj)
 
+    def delete_bulk(self, model, obj_list):
+        for obj in obj_list:
+            self.delete(obj)
+
     def _search(self, query_compiler_class, query, model_or_queryset, **kwargs):
         # Find model/queryset
         if isinstance(model_or_queryset, QuerySet):
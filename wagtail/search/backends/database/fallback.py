@@ -184,6 +184,9 @@ class DatabaseSearchResults(BaseSearchResults):
     def _do_search(self):
         queryset = self.get_queryset()
 
+        if self._hit_fields is not None:
+            return self._get_hits_from_queryset(queryset)
+
         if self._score_field:
             queryset = queryset.annotate(
                 **{self._score_field: Value(None, output_field=models.FloatField())}
@@ -545,7 +545,7 @@ class MySQLAutocompleteQueryCompiler(MySQLSearchQueryCompiler):
 
 
 class MySQLSearchResults(BaseSearchResults):
-    def get_queryset(self, for_count=False):
+    def get_queryset(self, for_count=False, score_field=None):
         if for_count:
             start = None
             stop = None
@@ -557,10 +557,18 @@ class MySQLSearchResults(BaseSearchResults):
             self.query_compiler.get_config(self.backend),
             start,
             stop,
-            score_field=self._score_field,
+            score_field=score_field or self._score_field,
         )
 
     def _do_search(self):
+        if self._hit_fields is not None:
+            return list(
+                self._get_hits_from_queryset(
+                    self.get_queryset(score_field=self.HIT_SCORE_FIELD),
+                    self.HIT_SCORE_FIELD,
+                )
+            )
+
         return list(self.get_queryset())
 
     def _do_count(self):
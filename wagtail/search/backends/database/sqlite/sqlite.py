@@ -620,6 +620,10 @@ class SQLiteSearchResults(BaseSearchResults):
         )
 
     def _do_search(self):
+        if self._hit_fields is not None:
+            # The SQLite backend doesn't support score annotations
+            return list(self._get_hits_from_queryset(self.get_queryset()))
+
         return list(self.get_queryset())
 
     def _do_count(self):
@@ -3,19 +3,21 @@ from collections import OrderedDict
 from copy import deepcopy
 from urllib.parse import urlparse
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db import DEFAULT_DB_ALIAS, models
 from django.db.models.sql import Query
 from django.db.models.sql.constants import MULTI
 from django.utils.crypto import get_random_string
 from elasticsearch import VERSION as ELASTICSEARCH_VERSION
 from elasticsearch import Elasticsearch, NotFoundError
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import BulkIndexError, bulk
 
 from wagtail.search.backends.base import (
     BaseSearchBackend,
     BaseSearchQueryCompiler,
     BaseSearchResults,
     FilterFieldError,
+    SearchHit,
     get_model_root,
 )
 from wagtail.search.index import (
@@ -417,6 +419,14 @@ class Elasticsearch7Index:
         if not class_is_indexed(model):
             return
 
+        self.add_prepared_items(model, self.prepare_items(model, items))
+
+    def prepare_items(self, model, items):
+        """
+        Build the bulk actions for adding ``items`` to the index, to be passed to
+        ``add_prepared_items``. This doesn't communicate with Elasticsearch, so it
+        can be run in a separate process from the one sending the actions.
+        """
         # Get mapping
         mapping = self.mapping_class(model)
 
@@ -428,6 +438,9 @@ class Elasticsearch7Index:
             action.update(mapping.get_document(item))
             actions.append(action)
 
+        return actions
+
+    def add_prepared_items(self, model, actions):
         # Run the actions
         bulk(self.es, actions, index=self.name)
 
@@ -445,6 +458,27 @@ class Elasticsearch7Index:
         except NotFoundError:
             pass  # Document doesn't exist, ignore this exception
 
+    def delete_items(self, model, items):
+        if not class_is_indexed(model):
+            return
+
+        # Get mapping
+        mapping = self.mapping_class(model)
+
+        # Create list of actions
+        actions = [
+            {"_op_type": "delete", "_id": mapping.get_document_id(item)}
+            for item in items
+        ]
+
+        # Run the actions, ignoring documents that don't exist
+        _, errors = bulk(self.es, actions, index=self.name, raise_on_error=False)
+        errors = [
+            error for error in errors if error.get("delete", {}).get("status") != 404
+        ]
+        if errors:
+            raise BulkIndexError(f"{len(errors)} document(s) failed to delete.", errors)
+
     def reset(self):
         # Delete old index
         self.delete()
@@ -808,6 +842,22 @@ class Elasticsearch7SearchResults(BaseSearchResults):
     fields_param_name = "stored_fields"
     supports_facet = True
 
+    # The number of hits to fetch per request when paging through results
+    PAGE_SIZE = 100
+
+    # The default value of Elasticsearch's index.max_result_window setting, the
+    # maximum offset plus size that can be fetched with from/size
+    MAX_RESULT_WINDOW = 10000
+
+    # The maximum number of hits to fetch the objects of in a single query
+    DATABASE_BATCH_SIZE = 1000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search_after = None
+        self._next_search_after = None
+        self._hit_columns = None
+
     def facet(self, field_name):
         # Get field
         field = self.query_compiler._get_filterable_field(field_name)
@@ -867,26 +917,139 @@ class Elasticsearch7SearchResults(BaseSearchResults):
         """
         Yields Django model instances from a page of hits returned by Elasticsearch
         """
-        # Get pks from results
-        pks = [hit["fields"]["pk"][0] for hit in hits]
-        scores = {str(hit["fields"]["pk"][0]): hit["_score"] for hit in hits}
+        if self._hit_fields is not None:
+            yield from self._get_search_hits_from_hits(hits)
+            return
 
-        # Initialise results dictionary
-        results = {str(pk): None for pk in pks}
+        # Get pks from results, converted once to the type of the model's primary key
+        to_python = self.query_compiler.queryset.model._meta.pk.to_python
+        pks = [to_python(hit["fields"]["pk"][0]) for hit in hits]
 
-        # Find objects in database and add them to dict
-        for obj in self.query_compiler.queryset.filter(pk__in=pks):
-            results[str(obj.pk)] = obj
+        # Find objects in database
+        results = {
+            obj.pk: obj for obj in self.query_compiler.queryset.filter(pk__in=pks)
+        }
 
-            if self._score_field:
-                setattr(obj, self._score_field, scores.get(str(obj.pk)))
+        if self._score_field:
+            for pk, hit in zip(pks, hits):
+                if pk in results:
+                    setattr(results[pk], self._score_field, hit["_score"])
 
         # Yield results in order given by Elasticsearch
         for pk in pks:
-            result = results[str(pk)]
+            result = results.get(pk)
             if result:
                 yield result
 
+    def _get_hit_columns(self):
+        """
+        Return a dict mapping the fields requested with ``hits()`` to the columns
+        of the index that hold their values as they are in the database, or None if
+        any of them isn't indexed in that form. The values of filter fields are
+        stored as-is, and so are those of search fields on text columns, unless the
+        model field indexes its searchable content instead (as ``RichTextField``
+        does, with its HTML stripped).
+        """
+        model = self.query_compiler.queryset.model
+        mapping = self.query_compiler.mapping
+
+        columns = {}
+        for field_name in self._hit_fields:
+            indexed_fields = [
+                field
+                for field in model.get_search_fields()
+                if field.field_name == field_name
+            ]
+
+            for field in indexed_fields:
+                if isinstance(field, FilterField) and self._is_indexed_as_stored(
+                    model, field
+                ):
+                    break
+            else:
+                for field in indexed_fields:
+                    if isinstance(field, SearchField) and self._is_text_field(
+                        model, field
+                    ):
+                        break
+                else:
+                    return None
+
+            columns[field_name] = mapping.get_field_column_name(field)
+
+        return columns
+
+    def _is_indexed_as_stored(self, model, field):
+        try:
+            model_field = field.get_field(model)
+        except FieldDoesNotExist:
+            return True
+
+        return not hasattr(model_field, "get_searchable_content")
+
+    def _is_text_field(self, model, field):
+        try:
+            model_field = field.get_field(model)
+        except FieldDoesNotExist:
+            return False
+
+        return isinstance(
+            model_field, (models.CharField, models.TextField)
+        ) and self._is_indexed_as_stored(model, field)
+
+    def _get_search_hits_from_hits(self, hits):
+        """
+        Yields ``SearchHit`` objects from a page of hits returned by Elasticsearch,
+        taking the field values from the source documents if they are all indexed,
+        and otherwise from a single database query.
+        """
+        model = self.query_compiler.queryset.model
+        to_python = model._meta.pk.to_python
+        pks = [to_python(hit["fields"]["pk"][0]) for hit in hits]
+
+        if self._hit_columns is not None:
+            for pk, hit in zip(pks, hits):
+                source = hit.get("_source", {})
+                yield SearchHit(
+                    pk,
+                    hit["_score"],
+                    {
+                        field_name: self._get_hit_value(
+                            model, field_name, source.get(column)
+                        )
+                        for field_name, column in self._hit_columns.items()
+                    },
+                )
+
+        else:
+            rows = {
+                row.pop("pk"): row
+                for row in self.query_compiler.queryset.filter(pk__in=pks).values(
+                    "pk", *self._hit_fields
+                )
+            }
+
+            # Yield hits in order given by Elasticsearch
+            for pk, hit in zip(pks, hits):
+                if pk in rows:
+                    yield SearchHit(pk, hit["_score"], dict(rows[pk]))
+
+    def _get_hit_value(self, model, field_name, value):
+        # Convert values that were serialised to JSON, such as dates, back into
+        # the type of the model field
+        if value is None or isinstance(value, list):
+            return value
+
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return value
+
+        if not field.concrete or field.is_relation:
+            return value
+
+        return field.to_python(value)
+
     if use_new_elasticsearch_api:
 
         def _backend_do_search(self, body, **kwargs):
@@ -900,15 +1063,56 @@ class Elasticsearch7SearchResults(BaseSearchResults):
             # Send the search query to the backend.
             return self.backend.es.search(body=body, **kwargs)
 
-    def _do_search(self):
-        PAGE_SIZE = 100
+    def _clone(self):
+        new = super()._clone()
+        new._search_after = self._search_after
+        return new
+
+    def _set_cursor_position(self, position):
+        search_after = position.get("search_after")
+        if not isinstance(search_after, list):
+            raise ValueError("Invalid search cursor position: %r" % position)
+
+        # The cursor replaces any offset, as search_after can't be combined with one
+        self._search_after = search_after
+        self.start = 0
+        self.stop = None
+
+    def _get_next_position(self):
+        if self._next_search_after is None:
+            return None
+
+        return {"search_after": self._next_search_after}
 
+    def _get_search_after_sort(self, sort):
+        """
+        Add a tiebreak on the primary key to the sort order, so that each hit has a
+        unique position for search_after to continue from.
+        """
+        if sort is None:
+            return ["_score", {"pk": "asc"}]
+
+        if "pk" in sort or {"pk": "asc"} in sort or {"pk": "desc"} in sort:
+            return sort
+
+        return sort + [{"pk": "asc"}]
+
+    def _do_search(self):
         if self.stop is not None:
             limit = self.stop - self.start
         else:
             limit = None
 
-        use_scroll = limit is None or limit > PAGE_SIZE
+        # Paging with from/size beyond the first PAGE_SIZE results would require
+        # Elasticsearch to collect and sort all of the preceding hits on every page,
+        # and is refused beyond its max_result_window setting, so page through larger
+        # slices using search_after instead
+        use_search_after = (
+            self._paginate_by_cursor
+            or limit is None
+            or limit > self.PAGE_SIZE
+            or self.start + limit > self.MAX_RESULT_WINDOW
+        )
 
         body = self._get_es_body()
         params = {
@@ -919,69 +1123,89 @@ class Elasticsearch7SearchResults(BaseSearchResults):
             self.fields_param_name: "pk",
         }
 
-        if use_scroll:
+        self._hit_columns = None
+        if self._hit_fields is not None:
+            self._hit_columns = self._get_hit_columns()
+            if self._hit_columns is not None:
+                # Take the values of the fields from the source documents
+                params["_source"] = list(self._hit_columns.values())
+
+        if use_search_after:
+            yield from self._do_search_after(body, params, limit)
+        else:
             params.update(
                 {
-                    "scroll": "2m",
-                    "size": PAGE_SIZE,
+                    "from_": self.start,
+                    "size": limit,
                 }
             )
 
-            # The scroll API doesn't support offset, manually skip the first results
-            skip = self.start
-
             # Send to Elasticsearch
-            page = self._backend_do_search(body, **params)
-
-            while True:
-                hits = page["hits"]["hits"]
-
-                if len(hits) == 0:
-                    break
+            hits = self._backend_do_search(body, **params)["hits"]["hits"]
 
-                # Get results
-                if skip < len(hits):
-                    for result in self._get_results_from_hits(hits):
-                        if limit is not None and limit == 0:
-                            break
+            # Get results
+            for result in self._get_results_from_hits(hits):
+                yield result
 
-                        if skip == 0:
-                            yield result
+    def _do_search_after(self, body, params, limit):
+        """
+        Yields results a page at a time, by asking Elasticsearch for the hits after
+        the last one of the previous page. Unlike the scroll API, this doesn't keep
+        a search context open on the server between pages.
+        """
+        body["sort"] = self._get_search_after_sort(body.get("sort"))
+        search_after = self._search_after
+        self._next_search_after = None
+
+        # search_after can't be combined with an offset, so skip the first hits by
+        # fetching only their positions, in as few requests as possible
+        skip = self.start
+
+        # Hits are collected across pages so that their objects can be fetched
+        # from the database in as few queries as possible
+        pending_hits = []
+
+        while limit is None or limit > 0:
+            if skip:
+                size = min(skip, self.MAX_RESULT_WINDOW)
+            elif limit is None:
+                size = self.PAGE_SIZE
+            else:
+                size = min(limit, self.PAGE_SIZE)
 
-                            if limit is not None:
-                                limit -= 1
-                        else:
-                            skip -= 1
+            page_body = dict(body)
+            if search_after is not None:
+                page_body["search_after"] = search_after
 
-                    if limit is not None and limit == 0:
-                        break
-                else:
-                    # Skip whole page
-                    skip -= len(hits)
+            # Send to Elasticsearch
+            hits = self._backend_do_search(page_body, size=size, **params)["hits"][
+                "hits"
+            ]
+            if not hits:
+                break
 
-                # Fetch next page of results
-                if "_scroll_id" not in page:
-                    break
+            search_after = hits[-1]["sort"]
 
-                page = self.backend.es.scroll(scroll_id=page["_scroll_id"], scroll="2m")
+            if skip:
+                skip -= len(hits)
+            else:
+                pending_hits.extend(hits)
+                if len(pending_hits) >= self.DATABASE_BATCH_SIZE:
+                    yield from self._get_results_from_hits(pending_hits)
+                    pending_hits = []
 
-            # Clear the scroll
-            if "_scroll_id" in page:
-                self.backend.es.clear_scroll(scroll_id=page["_scroll_id"])
-        else:
-            params.update(
-                {
-                    "from_": self.start,
-                    "size": limit or PAGE_SIZE,
-                }
-            )
+                if limit is not None:
+                    limit -= len(hits)
+                    if limit == 0:
+                        # There may be more hits after this page
+                        self._next_search_after = search_after
 
-            # Send to Elasticsearch
-            hits = self._backend_do_search(body, **params)["hits"]["hits"]
+            if len(hits) < size:
+                break
 
-            # Get results
-            for result in self._get_results_from_hits(hits):
-                yield result
+        # Get results
+        if pending_hits:
+            yield from self._get_results_from_hits(pending_hits)
 
     def _do_count(self):
         # Get count
@@ -1060,6 +1284,13 @@ class ElasticsearchIndexRebuilder:
 
         return self.index
 
+    def resume(self, index_name):
+        """
+        Continue an interrupted rebuild into the index named ``index_name`` (the
+        index returned by ``start()`` for that rebuild), without resetting it.
+        """
+        return self.index
+
     def finish(self):
         self.index.refresh()
 
@@ -1088,6 +1319,11 @@ class ElasticsearchAtomicIndexRebuilder(ElasticsearchIndexRebuilder):
 
         return self.index
 
+    def resume(self, index_name):
+        # Continue with the new index created for the interrupted rebuild
+        self.index = self.alias.backend.index_class(self.alias.backend, index_name)
+        return self.index
+
     def finish(self):
         self.index.refresh()
 
@@ -1256,5 +1492,8 @@ class Elasticsearch7SearchBackend(BaseSearchBackend):
         # Use the rebuilder to reset the index
         self.get_rebuilder().reset_index()
 
+    def delete_bulk(self, model, obj_list):
+        self.get_index_for_model(model).delete_items(model, obj_list)
+
 
 SearchBackend = Elasticsearch7SearchBackend
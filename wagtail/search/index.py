@@ -1,5 +1,6 @@
 import inspect
 import logging
+from collections import defaultdict
 
 from django.apps import apps
 from django.core import checks
@@ -189,6 +190,42 @@ def insert_or_update_object(instance):
                     raise
 
 
+def insert_or_update_objects(instances):
+    """
+    Adds or updates the given objects in all search backends that are kept up to
+    date automatically, with a single bulk request per model and backend.
+    """
+    object_ids_by_model = defaultdict(list)
+    for instance in instances:
+        indexed_instance = instance.get_indexed_instance()
+        if indexed_instance is not None:
+            object_ids_by_model[type(indexed_instance)].append(indexed_instance.pk)
+
+    for model, object_ids in object_ids_by_model.items():
+        # Objects are fetched again to make sure that they are in their class's
+        # indexed objects, and to apply any optimisations made there
+        objects = list(model.get_indexed_objects().filter(pk__in=object_ids))
+        if not objects:
+            continue
+
+        for backend_name, backend in get_search_backends_with_name(
+            with_auto_update=True
+        ):
+            try:
+                backend.add_bulk(model, objects)
+            except Exception:
+                logger.exception(
+                    "Exception raised while adding %s objects into the '%s' search backend",
+                    model._meta.label,
+                    backend_name,
+                )
+
+                # Only catch the exception if the backend requires this
+                # See the comments in insert_or_update_object for an explanation
+                if not backend.catch_indexing_errors:
+                    raise
+
+
 def remove_object(instance):
     indexed_instance = get_indexed_instance(instance, check_exists=False)
 
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.search.models import PendingIndexUpdate
+
+
+class Command(BaseCommand):
+    """Command to update the search index for objects saved while WAGTAILSEARCH_INDEX_QUEUE_ENABLED is set."""
+
+    help = (
+        "Applies pending search index updates in batches, optionally polling the "
+        "queue until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of queued updates to claim at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue for new updates instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Number of seconds to wait between polls of the queue when using --loop, if fewer than --batch-size updates were pending (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--lag",
+            action="store_true",
+            help="Show the number of pending updates and the age of the oldest one, without processing them",
+        )
+
+    def handle(self, *args, **options):
+        if options["lag"]:
+            self.write_lag()
+            return
+
+        num_processed = 0
+
+        while True:
+            try:
+                processed = PendingIndexUpdate.process_pending(
+                    limit=options["batch_size"]
+                )
+            except Exception:  # noqa: BLE001
+                if not options["loop"]:
+                    raise
+                # The error has been logged, and the updates that failed have been
+                # queued to be retried later, so carry on with the rest
+                processed = 0
+            num_processed += processed
+
+            if processed and options["verbosity"] > 1:
+                self.stdout.write(f"Processed {processed} update(s)")
+                self.write_lag()
+
+            if processed < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                # Wait for more updates to build up, so that they're sent to
+                # the search backends in larger batches
+                time.sleep(options["interval"])
+
+        if options["verbosity"] > 0:
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully processed {num_processed} update(s)")
+            )
+
+    def write_lag(self):
+        count, lag = PendingIndexUpdate.get_lag()
+        if lag is None:
+            self.stdout.write("No pending updates")
+        else:
+            self.stdout.write(
+                f"{count} pending update(s), oldest queued {lag.total_seconds():.1f}s ago"
+            )
@@ -1,9 +1,12 @@
 import collections
+import json
+import os
 
+from django.apps import apps
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
 
+from wagtail.management.utils import get_process_pool, map_chunks, queryset_chunks
 from wagtail.search.backends import get_search_backend
 from wagtail.search.index import get_indexed_models
 
@@ -53,6 +56,18 @@ def group_models_by_index(backend, models):
     )
 
 
+def prepare_items(backend_name, model_label, pks):
+    """
+    Return the bulk actions for indexing the instances of the given model with the
+    given primary keys. Runs in a worker process when ``--processes`` is used.
+    """
+    model = apps.get_model(model_label)
+    index = get_search_backend(backend_name).get_index_for_model(model)
+    return index.prepare_items(
+        model, model.get_indexed_objects().filter(pk__in=pks).order_by("pk")
+    )
+
+
 class Command(BaseCommand):
     def write(self, *args, **kwargs):
         """Helper function that respects verbosity when printing."""
@@ -60,7 +75,11 @@ class Command(BaseCommand):
             self.stdout.write(*args, **kwargs)
 
     def update_backend(
-        self, backend_name, schema_only=False, chunk_size=DEFAULT_CHUNK_SIZE
+        self,
+        backend_name,
+        schema_only=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        executor=None,
     ):
         self.write("Updating backend: " + backend_name)
 
@@ -77,11 +96,30 @@ class Command(BaseCommand):
             self.write(backend_name + ": No indices to rebuild")
 
         for index, models in models_grouped_by_index:
-            self.write(backend_name + ": Rebuilding index %s" % index.name)
-
-            # Start rebuild
+            index_name = index.name
+            state = self.checkpoint.get(backend_name, {}).get(index_name)
+            if state is not None and state["finished"]:
+                self.write(
+                    backend_name + ": Index %s already rebuilt, skipping" % index_name
+                )
+                continue
+
+            # Start rebuild, or resume the interrupted one
             rebuilder = backend.rebuilder_class(index)
-            index = rebuilder.start()
+            if state is not None and hasattr(rebuilder, "resume"):
+                self.write(backend_name + ": Resuming rebuild of index %s" % index_name)
+                index = rebuilder.resume(state["target"])
+            else:
+                self.write(backend_name + ": Rebuilding index %s" % index_name)
+                index = rebuilder.start()
+                state = {
+                    "target": index.name,
+                    "completed_models": [],
+                    "model": None,
+                    "last_pk": None,
+                    "finished": False,
+                }
+            self.save_checkpoint(backend_name, index_name, state)
 
             # Add models
             for model in models:
@@ -91,6 +129,9 @@ class Command(BaseCommand):
             object_count = 0
             if not schema_only:
                 for model in models:
+                    if model._meta.label in state["completed_models"]:
+                        continue
+
                     self.write(
                         "{}: {}.{} ".format(
                             backend_name, model._meta.app_label, model.__name__
@@ -98,23 +139,100 @@ class Command(BaseCommand):
                         ending="",
                     )
 
+                    after_pk = None
+                    if state["model"] == model._meta.label:
+                        after_pk = model._meta.pk.to_python(state["last_pk"])
+
                     # Add items (chunk_size at a time)
-                    for chunk in self.print_iter_progress(
-                        self.queryset_chunks(
-                            model.get_indexed_objects().order_by("pk"), chunk_size
+                    for chunk_object_count, last_pk in self.print_iter_progress(
+                        self.index_model(
+                            backend_name, index, model, chunk_size, after_pk, executor
                         )
                     ):
-                        index.add_items(model, chunk)
-                        object_count += len(chunk)
+                        object_count += chunk_object_count
+                        state["model"] = model._meta.label
+                        state["last_pk"] = str(last_pk)
+                        self.save_checkpoint(backend_name, index_name, state)
+
+                    state["completed_models"].append(model._meta.label)
+                    state["model"] = None
+                    state["last_pk"] = None
+                    self.save_checkpoint(backend_name, index_name, state)
 
                     self.print_newline()
 
             # Finish rebuild
             rebuilder.finish()
 
+            state["finished"] = True
+            self.save_checkpoint(backend_name, index_name, state)
+
             self.write(backend_name + ": indexed %d objects" % object_count)
             self.print_newline()
 
+    def index_model(
+        self, backend_name, index, model, chunk_size, after_pk=None, executor=None
+    ):
+        """
+        Add all indexed instances of ``model`` to ``index``, a chunk at a time.
+        Yields a tuple of ``(object_count, last_pk)`` for each chunk.
+        """
+        if executor is None or not hasattr(index, "prepare_items"):
+            for chunk in queryset_chunks(
+                model.get_indexed_objects().order_by("pk"), chunk_size, after_pk
+            ):
+                index.add_items(model, chunk)
+                yield len(chunk), chunk[-1].pk
+
+        else:
+            pk_chunks = queryset_chunks(
+                model.get_indexed_objects()
+                .order_by("pk")
+                .prefetch_related(None)
+                .values_list("pk", flat=True),
+                chunk_size,
+                after_pk,
+            )
+
+            # Keep a bounded number of chunks in flight, so that documents are
+            # sent to the index as they are built rather than held in memory
+            for pks, items in map_chunks(
+                executor,
+                prepare_items,
+                pk_chunks,
+                backend_name,
+                model._meta.label,
+                max_pending=self.processes * 2,
+            ):
+                index.add_prepared_items(model, items)
+                yield len(pks), pks[-1]
+
+    def load_checkpoint(self, path):
+        if path is None or not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except ValueError:
+            raise CommandError("Invalid checkpoint file: %s" % path)
+
+    def save_checkpoint(self, backend_name, index_name, state):
+        """
+        Record the progress of the rebuild of an index, so that it can be resumed
+        from the last completed chunk if interrupted.
+        """
+        self.checkpoint.setdefault(backend_name, {})[index_name] = state
+        if self.checkpoint_path is None:
+            return
+
+        # Write to a temporary file first so that an interruption doesn't leave a
+        # partially written checkpoint behind
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--backend",
@@ -138,6 +256,25 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--processes",
+            action="store",
+            dest="processes",
+            default=1,
+            type=int,
+            help="Set the number of worker processes used to build the documents to index",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            action="store",
+            dest="checkpoint",
+            default=None,
+            metavar="PATH",
+            help=(
+                "Record progress to the given file, and resume from it if it exists. "
+                "The file is removed once the rebuild is complete"
+            ),
+        )
 
     def handle(self, **options):
         self.verbosity = options["verbosity"]
@@ -153,13 +290,29 @@ class Command(BaseCommand):
             # index the 'default' backend only
             backend_names = ["default"]
 
+        self.checkpoint_path = options.get("checkpoint")
+        self.checkpoint = self.load_checkpoint(self.checkpoint_path)
+
+        processes = options.get("processes")
+        executor = get_process_pool(processes)
+        self.processes = processes
+
         # Update backends
-        for backend_name in backend_names:
-            self.update_backend(
-                backend_name,
-                schema_only=options.get("schema_only", False),
-                chunk_size=options.get("chunk_size"),
-            )
+        try:
+            for backend_name in backend_names:
+                self.update_backend(
+                    backend_name,
+                    schema_only=options.get("schema_only", False),
+                    chunk_size=options.get("chunk_size"),
+                    executor=executor,
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        # The rebuild is complete, so there is nothing left to resume
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
 
     def print_newline(self):
         self.write("")
@@ -186,20 +339,3 @@ class Command(BaseCommand):
                 self.write(" ", ending="")
 
             self.stdout.flush()
-
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
-    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
-        """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
-        """
-        i = 0
-        while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
-            if not items:
-                break
-            yield items
-            i += 1
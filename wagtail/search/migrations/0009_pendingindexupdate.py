@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-19 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailsearch', '0008_remove_query_and_querydailyhits_models'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingIndexUpdate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255)),
+                ('action', models.CharField(choices=[('update', 'update'), ('delete', 'delete')], max_length=6)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'pending index update',
+                'verbose_name_plural': 'pending index updates',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailsearch', '0009_pendingindexupdate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingindexupdate',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pendingindexupdate',
+            name='backend_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='pendingindexupdate',
+            name='next_attempt_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
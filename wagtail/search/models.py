@@ -1,16 +1,25 @@
+import datetime
+import logging
+from collections import defaultdict
+
 from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.db import connection, models
+from django.db import connection, models, transaction
 from django.db.models.fields import TextField
 from django.db.models.fields.related import OneToOneField
 from django.db.models.functions import Cast
 from django.db.models.sql.where import WhereNode
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .index import class_is_indexed
+from .backends import get_search_backends_with_name
+from .index import class_is_indexed, get_indexed_instance
 from .utils import get_descendants_content_types_pks
 
+logger = logging.getLogger("wagtail.search")
+
 
 class TextIDGenericRelation(GenericRelation):
     auto_created = True
@@ -173,3 +182,295 @@ class IndexEntry(AbstractIndexEntry):
         """
 
         abstract = False
+
+
+class PendingIndexUpdate(models.Model):
+    """
+    An object that has been saved or deleted while ``WAGTAILSEARCH_INDEX_QUEUE_ENABLED``
+    is set, and that has not been updated in the search backends yet.
+
+    Entries are processed, and removed, by the ``process_search_index_queue``
+    management command. Several entries for the same object are coalesced into a
+    single update (or deletion) when they are processed together. Updates that a
+    backend fails to apply are retried in that backend alone, after a delay that
+    doubles with each attempt, until ``WAGTAILSEARCH_INDEX_QUEUE_MAX_ATTEMPTS`` is
+    reached.
+    """
+
+    UPDATE = "update"
+    DELETE = "delete"
+    ACTION_CHOICES = [
+        (UPDATE, _("update")),
+        (DELETE, _("delete")),
+    ]
+
+    # The delay before the first retry of a failed update, in seconds
+    RETRY_DELAY = 60
+
+    # The maximum delay between retries, in seconds
+    MAX_RETRY_DELAY = 60 * 60
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(max_length=255)
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    # The search backend to retry a failed update in, or blank for all of the
+    # backends that are kept up to date automatically
+    backend_name = models.CharField(max_length=255, blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        verbose_name = _("pending index update")
+        verbose_name_plural = _("pending index updates")
+
+    def __str__(self):
+        return f"Pending index {self.action} for {self.content_type} {self.object_id}"
+
+    @classmethod
+    def get_retry_delay(cls, attempts):
+        return datetime.timedelta(
+            seconds=min(cls.RETRY_DELAY * 2 ** (attempts - 1), cls.MAX_RETRY_DELAY)
+        )
+
+    @classmethod
+    def enqueue(cls, instance, action):
+        """
+        Record that ``instance`` needs to be updated in (or, if ``action`` is
+        ``DELETE``, removed from) the search backends.
+        """
+        indexed_instance = get_indexed_instance(instance, check_exists=False)
+        if indexed_instance is None:
+            return
+
+        cls.objects.create(
+            content_type=ContentType.objects.get_for_model(indexed_instance),
+            object_id=str(indexed_instance.pk),
+            action=action,
+        )
+
+    @classmethod
+    def enqueue_objects(cls, instances, action):
+        """
+        Record that each of ``instances`` needs to be updated in (or, if ``action``
+        is ``DELETE``, removed from) the search backends, with a single query.
+        """
+        entries = []
+        for instance in instances:
+            indexed_instance = get_indexed_instance(instance, check_exists=False)
+            if indexed_instance is not None:
+                entries.append(
+                    cls(
+                        content_type=ContentType.objects.get_for_model(
+                            indexed_instance
+                        ),
+                        object_id=str(indexed_instance.pk),
+                        action=action,
+                    )
+                )
+
+        cls.objects.bulk_create(entries)
+
+    @classmethod
+    def process_pending(cls, limit=None):
+        """
+        Apply the pending updates that are due to the search backends that are
+        kept up to date automatically, processing at most ``limit`` entries if
+        given. Objects are added to each backend with a single bulk request per
+        model, and removed with a single bulk deletion per model.
+
+        Entries claimed by another process at the same time are skipped, on
+        databases that support ``SELECT ... FOR UPDATE SKIP LOCKED``. If a bulk
+        request fails, its objects are sent to the backend one at a time, and the
+        updates of the objects that still fail are kept to be retried later in that
+        backend alone. Once the batch is processed, the first of these errors is
+        raised if its backend doesn't set ``catch_indexing_errors``.
+
+        Returns:
+            The number of entries processed
+        """
+        max_attempts = getattr(settings, "WAGTAILSEARCH_INDEX_QUEUE_MAX_ATTEMPTS", 5)
+        now = timezone.now()
+        errors = []
+
+        with transaction.atomic():
+            entries = (
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "pk")
+            )
+            if limit is not None:
+                entries = entries[:limit]
+            entries = list(entries)
+            if not entries:
+                return 0
+
+            backends = dict(get_search_backends_with_name(with_auto_update=True))
+
+            # The latest entry for each object wins, in each backend it is for
+            latest_entries = defaultdict(dict)
+            for entry in sorted(entries, key=lambda entry: entry.pk):
+                if entry.backend_name and entry.backend_name not in backends:
+                    logger.warning(
+                        "Discarding pending index %s of %s %s for unknown search backend '%s'",
+                        entry.action,
+                        entry.content_type,
+                        entry.object_id,
+                        entry.backend_name,
+                    )
+                    continue
+
+                key = (entry.content_type_id, entry.object_id)
+                for backend_name in (
+                    [entry.backend_name] if entry.backend_name else backends
+                ):
+                    latest_entries[backend_name][key] = entry
+
+            # Objects are fetched from the database when the updates are processed,
+            # so objects that have since been deleted (or excluded from the index)
+            # are skipped
+            updated_ids = defaultdict(set)
+            for backend_entries in latest_entries.values():
+                for entry in backend_entries.values():
+                    if entry.action == cls.UPDATE:
+                        updated_ids[entry.content_type_id].add(entry.object_id)
+
+            updated_objects = {}
+            for content_type_id, object_ids in updated_ids.items():
+                model = ContentType.objects.get_for_id(content_type_id).model_class()
+                if model is not None and class_is_indexed(model):
+                    for obj in model.get_indexed_objects().filter(pk__in=object_ids):
+                        updated_objects[(content_type_id, str(obj.pk))] = obj
+
+            failed = []
+            for backend_name, backend_entries in latest_entries.items():
+                entries_by_model = defaultdict(list)
+                for (content_type_id, object_id), entry in backend_entries.items():
+                    model = ContentType.objects.get_for_id(
+                        content_type_id
+                    ).model_class()
+                    if model is None or not class_is_indexed(model):
+                        continue
+
+                    if entry.action == cls.DELETE:
+                        obj = model(pk=model._meta.pk.to_python(object_id))
+                    else:
+                        obj = updated_objects.get((content_type_id, object_id))
+                        if obj is None:
+                            continue
+
+                    entries_by_model[(model, entry.action)].append((obj, entry))
+
+                for (model, action), model_entries in entries_by_model.items():
+                    failed.extend(
+                        (backend_name, entry)
+                        for entry in cls._apply_updates(
+                            backend_name,
+                            backends[backend_name],
+                            model,
+                            action,
+                            model_entries,
+                            errors,
+                        )
+                    )
+
+            retry = []
+            for backend_name, entry in failed:
+                attempts = entry.attempts + 1
+                if attempts >= max_attempts:
+                    logger.error(
+                        "Giving up index %s of %s %s in search backend '%s' after %d attempts",
+                        entry.action,
+                        entry.content_type,
+                        entry.object_id,
+                        backend_name,
+                        attempts,
+                    )
+                else:
+                    retry.append(
+                        cls(
+                            content_type_id=entry.content_type_id,
+                            object_id=entry.object_id,
+                            action=entry.action,
+                            backend_name=backend_name,
+                            attempts=attempts,
+                            next_attempt_at=now + cls.get_retry_delay(attempts),
+                        )
+                    )
+
+            cls.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+            cls.objects.bulk_create(retry)
+
+        if errors:
+            raise errors[0]
+
+        return len(entries)
+
+    @classmethod
+    def _apply_updates(
+        cls, backend_name, backend, model, action, model_entries, errors
+    ):
+        """
+        Add (or remove) the objects of ``model_entries``, a list of
+        ``(object, entry)`` tuples, to ``backend`` with a single bulk request, or
+        one at a time if that fails. Returns the entries whose objects failed, and
+        adds the errors that the backend doesn't catch to ``errors``.
+
+        Each request is made in a savepoint, so that a database error doesn't break
+        the transaction that the entries are claimed in.
+        """
+        if action == cls.DELETE:
+            bulk_method, method = backend.delete_bulk, backend.delete
+            message = "Exception raised while deleting %r from the '%s' search backend"
+        else:
+            bulk_method, method = backend.add_bulk, backend.add
+            message = "Exception raised while adding %r into the '%s' search backend"
+
+        try:
+            with transaction.atomic():
+                bulk_method(model, [obj for obj, entry in model_entries])
+        except Exception:  # noqa: BLE001
+            # The objects that fail are logged below
+            logger.warning(
+                "Bulk index %s of %d %s objects failed in the '%s' search backend, retrying them one at a time",
+                action,
+                len(model_entries),
+                model._meta.label,
+                backend_name,
+            )
+        else:
+            return []
+
+        failed = []
+        for obj, entry in model_entries:
+            try:
+                with transaction.atomic():
+                    method(obj)
+            except Exception as e:
+                logger.exception(message, obj, backend_name)
+                failed.append(entry)
+
+                # Only catch the exception if the backend requires this, as
+                # insert_or_update_object does
+                if not backend.catch_indexing_errors:
+                    errors.append(e)
+
+        return failed
+
+    @classmethod
+    def get_lag(cls):
+        """
+        Return a ``(count, lag)`` tuple of the number of pending updates, and the
+        ``timedelta`` since the oldest of them was queued (or ``None`` if there
+        are none), for monitoring how far the search backends are behind.
+        """
+        stats = cls.objects.aggregate(
+            count=models.Count("pk"), oldest=models.Min("created_at")
+        )
+        if stats["oldest"] is None:
+            return stats["count"], None
+        return stats["count"], timezone.now() - stats["oldest"]
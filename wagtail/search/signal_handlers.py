@@ -1,9 +1,67 @@
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
 from django.db.models.signals import post_delete, post_save
 
 from wagtail.search import index
 
 
+def index_queue_enabled():
+    return getattr(settings, "WAGTAILSEARCH_INDEX_QUEUE_ENABLED", False)
+
+
+# Maps (model, pk) tuples to the objects saved in a batch_search_index_updates block
+_batched_updates = Local()
+
+
+@contextmanager
+def batch_search_index_updates():
+    """
+    A context manager that collects the objects saved within it, and updates them
+    in the search backends once the block has completed, with one bulk request
+    per model and backend rather than one request per object. Deleted objects are
+    still removed from the search backends straight away.
+
+    For example:
+
+    with batch_search_index_updates():
+        for revision in revisions:
+            revision.publish()  # Pages are indexed together at the end of the block
+
+    Nothing is updated if the block raises an exception.
+    """
+    if getattr(_batched_updates, "value", None) is not None:
+        # The updates are made by the outermost block
+        yield
+        return
+
+    updates = _batched_updates.value = {}
+    try:
+        yield
+    finally:
+        del _batched_updates.value
+
+    if updates:
+        # The objects are fetched again, so unsaved changes and fields missing
+        # from update_fields are not indexed
+        index.insert_or_update_objects(updates.values())
+
+
 def post_save_signal_handler(instance, update_fields=None, **kwargs):
+    if index_queue_enabled():
+        from wagtail.search.models import PendingIndexUpdate
+
+        # The object is fetched again when the queue is processed, so there's
+        # no need to fetch a fresh copy when update_fields is given
+        PendingIndexUpdate.enqueue(instance, PendingIndexUpdate.UPDATE)
+        return
+
+    updates = getattr(_batched_updates, "value", None)
+    if updates is not None:
+        updates[(type(instance), instance.pk)] = instance
+        return
+
     if update_fields is not None:
         # fetch a fresh copy of instance from the database to ensure
         # that we're not indexing any of the unsaved data contained in
@@ -14,6 +72,16 @@ def post_save_signal_handler(instance, update_fields=None, **kwargs):
 
 
 def post_delete_signal_handler(instance, **kwargs):
+    if index_queue_enabled():
+        from wagtail.search.models import PendingIndexUpdate
+
+        PendingIndexUpdate.enqueue(instance, PendingIndexUpdate.DELETE)
+        return
+
+    updates = getattr(_batched_updates, "value", None)
+    if updates is not None:
+        updates.pop((type(instance), instance.pk), None)
+
     index.remove_object(instance)
 
 
@@ -143,7 +143,7 @@ class ElasticsearchCommonSearchBackendTests(BackendTests):
         self.assertEqual(len(results), 14)
 
     def test_more_than_one_hundred_results(self):
-        # Tests that fetching more than 100 results uses the scroll API
+        # Tests that fetching more than 100 results pages through them with search_after
         books = []
         for i in range(150):
             books.append(
@@ -180,8 +180,8 @@ class ElasticsearchCommonSearchBackendTests(BackendTests):
         self.assertEqual(len(results), 110)
 
     def test_slice_to_next_page(self):
-        # ES scroll API doesn't support offset. The implementation has an optimisation
-        # which will skip the first page if the first result is on the second page
+        # search_after doesn't support offset, so the first results are skipped by
+        # fetching only their positions
         books = []
         for i in range(150):
             books.append(
@@ -199,6 +199,36 @@ class ElasticsearchCommonSearchBackendTests(BackendTests):
         results = self.backend.search(MATCH_ALL, models.Book)[110:]
         self.assertEqual(len(results), 54)
 
+    def test_paginate_by_cursor(self):
+        books = []
+        for i in range(150):
+            books.append(
+                models.Book.objects.create(
+                    title=f"Book {i}",
+                    publication_date=date(2017, 10, 21),
+                    number_of_pages=i,
+                )
+            )
+
+        index = self.backend.get_index_for_model(models.Book)
+        index.add_items(models.Book, books)
+        index.refresh()
+
+        results = self.backend.search(MATCH_ALL, models.Book)
+        seen = []
+        cursor = None
+        while True:
+            page = results.after(cursor)[:50]
+            seen.extend(book.pk for book in page)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 164)
+        self.assertEqual(
+            set(seen), set(models.Book.objects.values_list("pk", flat=True))
+        )
+
     def test_cannot_filter_on_date_parts_other_than_year(self):
         # Filtering by date not supported, should throw a FilterError
         from wagtail.search.backends.base import FilterError
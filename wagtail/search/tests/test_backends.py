@@ -1,5 +1,10 @@
+import json
+import operator
+import os
+import tempfile
 import unittest
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from io import StringIO
 from unittest import mock
@@ -11,14 +16,22 @@ from django.test import TestCase
 from django.test.utils import override_settings
 from taggit.models import Tag
 
+from wagtail.management.utils import map_chunks, queryset_chunks
 from wagtail.search.backends import (
     InvalidSearchBackendError,
     get_search_backend,
     get_search_backends,
 )
-from wagtail.search.backends.base import BaseSearchBackend, FieldError, FilterFieldError
+from wagtail.search.backends.base import (
+    BaseSearchBackend,
+    FieldError,
+    FilterFieldError,
+    SearchHit,
+)
 from wagtail.search.backends.database.fallback import DatabaseSearchBackend
 from wagtail.search.backends.database.sqlite.utils import fts5_available
+from wagtail.search.index import get_indexed_models
+from wagtail.search.management.commands import update_index as command_module
 from wagtail.search.models import IndexEntry
 from wagtail.search.query import (
     MATCH_ALL,
@@ -748,6 +761,33 @@ class BackendTests(WagtailTestUtils):
             ],
         )
 
+    def test_delete_bulk(self):
+        novels = list(
+            models.Novel.objects.filter(title__in=["Foundation", "The Hobbit"])
+        )
+
+        # Delete from the search index, including an object that isn't indexed
+        self.backend.delete_bulk(
+            models.Novel, novels + [models.Novel(pk=models.Novel.objects.count() + 100)]
+        )
+        self.backend.refresh_index()
+
+        # Delete from the database
+        for novel in novels:
+            novel.delete()
+
+        # As in test_delete, objects that are still in the index but not in the
+        # database would reduce the number of results
+        results = self.backend.search(
+            MATCH_ALL,
+            models.Novel.objects.order_by("number_of_pages"),
+            order_by_relevance=False,
+        )
+        self.assertEqual(
+            [r.title for r in results[:2]],
+            ["The Two Towers", "The Fellowship of the Ring"],
+        )
+
     def test_plain_text_single_word(self):
         results = self.backend.search(
             PlainText("JavaScript"), models.Book.objects.all()
@@ -950,6 +990,52 @@ class BackendTests(WagtailTestUtils):
         )
         self.assertSetEqual({r.title for r in results}, {"Programming Rust"})
 
+    def test_hits(self):
+        results = self.backend.search("JavaScript", models.Book)
+
+        hits = list(results.hits("title", "publication_date"))
+        self.assertIsInstance(hits[0], SearchHit)
+        self.assertUnsortedListEqual(
+            [hit.title for hit in hits],
+            ["JavaScript: The good parts", "JavaScript: The Definitive Guide"],
+        )
+
+        for hit in hits:
+            book = models.Book.objects.get(pk=hit.pk)
+            self.assertEqual(hit.fields["title"], book.title)
+            self.assertEqual(hit.publication_date, book.publication_date)
+
+    def test_hits_order(self):
+        results = self.backend.search(
+            MATCH_ALL, models.Book.objects.order_by("-number_of_pages")
+        )
+
+        self.assertEqual(
+            [hit.pk for hit in results.hits("number_of_pages")[:5]],
+            [book.pk for book in results[:5]],
+        )
+
+    def test_paginate_by_cursor(self):
+        results = self.backend.search(MATCH_ALL, models.Book.objects.order_by("pk"))
+        expected = [book.pk for book in results]
+
+        seen = []
+        cursor = None
+        while True:
+            page = results.after(cursor)[:5]
+            seen.extend(book.pk for book in page)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, expected)
+
+    def test_paginate_by_invalid_cursor(self):
+        results = self.backend.search(MATCH_ALL, models.Book)
+
+        with self.assertRaises(ValueError):
+            results.after("invalid")
+
     def test_update_index_no_verbosity(self):
         stdout = StringIO()
         management.call_command(
@@ -957,6 +1043,93 @@ class BackendTests(WagtailTestUtils):
         )
         self.assertFalse(stdout.getvalue())
 
+    def test_update_index_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checkpoint_path = os.path.join(tmpdir, "checkpoint.json")
+            management.call_command(
+                "update_index",
+                backend_name=self.backend_name,
+                checkpoint=checkpoint_path,
+                chunk_size=2,
+                stdout=StringIO(),
+            )
+
+            # The checkpoint is removed once the rebuild is complete
+            self.assertFalse(os.path.exists(checkpoint_path))
+
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertUnsortedListEqual(
+            [r.title for r in results],
+            ["JavaScript: The good parts", "JavaScript: The Definitive Guide"],
+        )
+
+    def test_update_index_skips_finished_indexes_in_checkpoint(self):
+        if not self.backend.rebuilder_class:
+            self.skipTest("Backend doesn't require rebuilding")
+
+        index_names = [
+            index.name
+            for index in command_module.group_models_by_index(
+                self.backend, get_indexed_models()
+            )
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checkpoint_path = os.path.join(tmpdir, "checkpoint.json")
+            with open(checkpoint_path, "w") as f:
+                json.dump(
+                    {
+                        self.backend_name: {
+                            index_name: {
+                                "target": index_name,
+                                "completed_models": [],
+                                "model": None,
+                                "last_pk": None,
+                                "finished": True,
+                            }
+                            for index_name in index_names
+                        }
+                    },
+                    f,
+                )
+
+            stdout = StringIO()
+            management.call_command(
+                "update_index",
+                backend_name=self.backend_name,
+                checkpoint=checkpoint_path,
+                stdout=stdout,
+            )
+
+        self.assertIn("already rebuilt, skipping", stdout.getvalue())
+        self.assertNotIn("Rebuilding index", stdout.getvalue())
+
+    def test_queryset_chunks(self):
+        qs = models.Book.objects.order_by("pk")
+        pks = list(qs.values_list("pk", flat=True))
+
+        chunks = list(queryset_chunks(qs, chunk_size=3))
+        self.assertEqual([book.pk for chunk in chunks for book in chunk], pks)
+        self.assertTrue(all(len(chunk) <= 3 for chunk in chunks))
+
+        chunks = list(
+            queryset_chunks(
+                qs.values_list("pk", flat=True), chunk_size=3, after_pk=pks[2]
+            )
+        )
+        self.assertEqual([pk for chunk in chunks for pk in chunk], pks[3:])
+
+    def test_map_chunks(self):
+        with ThreadPoolExecutor(2) as executor:
+            results = list(
+                map_chunks(executor, operator.mul, [[1], [2, 3], [4]], 2, max_pending=2)
+            )
+
+        # The results are yielded in the order of the chunks
+        self.assertEqual(
+            results, [([1], [1, 1]), ([2, 3], [2, 3, 2, 3]), ([4], [4, 4])]
+        )
+
 
 @override_settings(
     WAGTAILSEARCH_BACKENDS={"default": {"BACKEND": "wagtail.search.backends.database"}}
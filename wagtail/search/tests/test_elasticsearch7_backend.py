@@ -15,6 +15,7 @@ try:
     from elasticsearch import VERSION as ELASTICSEARCH_VERSION
     from elasticsearch.serializer import JSONSerializer
 
+    from wagtail.search.backends.base import SearchHit
     from wagtail.search.backends.elasticsearch7 import Elasticsearch7SearchBackend
 except ImportError:
     ELASTICSEARCH_VERSION = (0, 0, 0)
@@ -30,6 +31,16 @@ else:
     search_query_kwargs = {"body": {"query": "QUERY"}}
 
 
+def search_after_kwargs(search_after=None):
+    body = {"query": "QUERY", "sort": ["_score", {"pk": "asc"}]}
+    if search_after is not None:
+        body["search_after"] = search_after
+
+    if use_new_elasticsearch_api:
+        return body
+    return {"body": body}
+
+
 @unittest.skipIf(ELASTICSEARCH_VERSION[0] != 7, "Elasticsearch 7 required")
 class TestElasticsearch7SearchBackend(ElasticsearchCommonSearchBackendTests, TestCase):
     backend_path = "wagtail.search.backends.elasticsearch7"
@@ -881,6 +892,7 @@ class TestElasticsearch7SearchResults(TestCase):
         query.queryset = models.Book.objects.all()
         query.get_query.return_value = "QUERY"
         query.get_sort.return_value = None
+        query.mapping = backend.mapping_class(models.Book)
         return backend.results_class(backend, query)
 
     def construct_search_response(self, results):
@@ -896,6 +908,7 @@ class TestElasticsearch7SearchResults(TestCase):
                         "fields": {
                             "pk": [str(result)],
                         },
+                        "sort": [1, str(result)],
                     }
                     for result in results
                 ],
@@ -917,9 +930,8 @@ class TestElasticsearch7SearchResults(TestCase):
             _source=False,
             stored_fields="pk",
             index="wagtail__searchtests_book",
-            scroll="2m",
             size=100,
-            **search_query_kwargs,
+            **search_after_kwargs(),
         )
 
     @mock.patch("elasticsearch.Elasticsearch.search")
@@ -988,6 +1000,149 @@ class TestElasticsearch7SearchResults(TestCase):
             **search_query_kwargs,
         )
 
+    @mock.patch("elasticsearch.Elasticsearch.search")
+    def test_slice_deep_results(self, search):
+        search.side_effect = [
+            self.construct_search_response(range(1, 10001)),
+            self.construct_search_response(range(10001, 10011)),
+        ]
+        results = self.get_results()[10000:10010]
+
+        list(results)  # Performs search
+
+        # The first results are skipped with search_after rather than an offset
+        search.assert_any_call(
+            _source=False,
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=10000,
+            **search_after_kwargs(),
+        )
+        search.assert_called_with(
+            _source=False,
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=10,
+            **search_after_kwargs([1, "10000"]),
+        )
+
+    @mock.patch("elasticsearch.Elasticsearch.search")
+    def test_paginate_by_cursor(self, search):
+        search.return_value = self.construct_search_response([1, 2])
+        page = self.get_results().after()[:2]
+
+        self.assertEqual([book.pk for book in page], [1, 2])
+        search.assert_called_with(
+            _source=False,
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=2,
+            **search_after_kwargs(),
+        )
+
+        search.return_value = self.construct_search_response([3])
+        next_page = self.get_results().after(page.next_cursor)[:2]
+
+        self.assertEqual([book.pk for book in next_page], [3])
+        search.assert_called_with(
+            _source=False,
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=2,
+            **search_after_kwargs([1, "2"]),
+        )
+
+        # The last page has no cursor
+        self.assertIsNone(next_page.next_cursor)
+
+    def test_paginate_by_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.get_results().after("invalid")
+
+    @mock.patch("elasticsearch.Elasticsearch.search")
+    def test_hits_from_source(self, search):
+        response = self.construct_search_response([1, 2])
+        for hit in response["hits"]["hits"]:
+            hit["_source"] = {
+                "title_filter": "Book " + hit["fields"]["pk"][0],
+                "publication_date_filter": "2017-10-21",
+                "summary": "Summary " + hit["fields"]["pk"][0],
+            }
+        search.return_value = response
+
+        with self.assertNumQueries(0):
+            hits = list(
+                self.get_results().hits("title", "publication_date", "summary")[:2]
+            )
+
+        self.assertEqual(
+            hits,
+            [
+                SearchHit(
+                    1,
+                    1,
+                    {
+                        "title": "Book 1",
+                        "publication_date": datetime.date(2017, 10, 21),
+                        "summary": "Summary 1",
+                    },
+                ),
+                SearchHit(
+                    2,
+                    1,
+                    {
+                        "title": "Book 2",
+                        "publication_date": datetime.date(2017, 10, 21),
+                        "summary": "Summary 2",
+                    },
+                ),
+            ],
+        )
+        search.assert_any_call(
+            from_=0,
+            _source=["title_filter", "publication_date_filter", "summary"],
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=2,
+            **search_query_kwargs,
+        )
+
+    @mock.patch("elasticsearch.Elasticsearch.search")
+    def test_hits_from_database(self, search):
+        search.return_value = self.construct_search_response([2, 1])
+
+        # A field that indexes its searchable content (as RichTextField does) isn't
+        # indexed as it's stored, so is fetched from the database in a single query
+        summary_field = models.Book._meta.get_field("summary")
+        with mock.patch.object(
+            summary_field, "get_searchable_content", create=True
+        ), self.assertNumQueries(1):
+            hits = list(self.get_results().hits("title", "summary")[:2])
+
+        self.assertEqual([hit.pk for hit in hits], [2, 1])
+        self.assertEqual(hits[0].summary, models.Book.objects.get(pk=2).summary)
+        search.assert_any_call(
+            from_=0,
+            _source=False,
+            stored_fields="pk",
+            index="wagtail__searchtests_book",
+            size=2,
+            **search_query_kwargs,
+        )
+
+    @mock.patch("elasticsearch.Elasticsearch.search")
+    def test_results_fetched_in_one_query(self, search):
+        search.side_effect = [
+            self.construct_search_response(range(1, 101)),
+            self.construct_search_response(range(101, 151)),
+        ]
+
+        # Both pages of hits are fetched from the database together
+        with self.assertNumQueries(1):
+            list(self.get_results()[:150])
+
+        self.assertEqual(search.call_count, 2)
+
     @mock.patch("elasticsearch.Elasticsearch.search")
     def test_result_returned(self, search):
         search.return_value = self.construct_search_response([1])
@@ -1333,6 +1488,44 @@ class TestElasticsearch7MappingInheritance(TestCase):
         self.assertDictEqual(document, expected_result)
 
 
+@unittest.skipIf(ELASTICSEARCH_VERSION[0] != 7, "Elasticsearch 7 required")
+class TestElasticsearch7IndexRebuild(TestCase):
+    fixtures = ["search"]
+
+    def setUp(self):
+        self.backend = Elasticsearch7SearchBackend({})
+        self.index = self.backend.get_index_for_model(models.Book)
+
+    def test_prepare_items(self):
+        books = models.Book.objects.order_by("pk")
+        actions = self.index.prepare_items(models.Book, books)
+
+        mapping = self.backend.mapping_class(models.Book)
+        self.assertEqual(
+            [action["_id"] for action in actions],
+            [mapping.get_document_id(book) for book in books],
+        )
+        self.assertEqual(actions[0]["title"], books[0].title)
+
+    @mock.patch("wagtail.search.backends.elasticsearch7.bulk")
+    def test_add_items(self, bulk):
+        books = list(models.Book.objects.order_by("pk"))
+        self.index.add_items(models.Book, books)
+
+        bulk.assert_called_once_with(
+            self.backend.es,
+            self.index.prepare_items(models.Book, books),
+            index=self.index.name,
+        )
+
+    def test_atomic_rebuilder_resume(self):
+        rebuilder = self.backend.atomic_rebuilder_class(self.index)
+        index = rebuilder.resume("wagtail_interrupted")
+
+        self.assertEqual(index.name, "wagtail_interrupted")
+        self.assertIs(rebuilder.index, index)
+
+
 @unittest.skipIf(ELASTICSEARCH_VERSION[0] != 7, "Elasticsearch 7 required")
 @mock.patch("wagtail.search.backends.elasticsearch7.Elasticsearch")
 class TestBackendConfiguration(TestCase):
@@ -1,10 +1,15 @@
 from datetime import date
+from io import StringIO
 from unittest import mock
 
+from django.core import management
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from wagtail.models import Page
 from wagtail.search import index
+from wagtail.search.models import PendingIndexUpdate
+from wagtail.search.signal_handlers import batch_search_index_updates
 from wagtail.test.search import models
 from wagtail.test.testapp.models import SimplePage
 from wagtail.test.utils import WagtailTestUtils
@@ -202,6 +207,56 @@ class TestSignalHandlers(WagtailTestUtils, TestCase):
         self.assertEqual(indexed_object.title, "Updated test")
         self.assertEqual(indexed_object.publication_date, date(2017, 10, 18))
 
+    def test_batch_updates(self, backend):
+        backend().reset_mock()
+        with batch_search_index_updates():
+            books = [
+                models.Book.objects.create(
+                    title=f"Test {i}",
+                    publication_date=date(2017, 10, 18),
+                    number_of_pages=100,
+                )
+                for i in range(3)
+            ]
+            books[0].title = "Updated test"
+            books[0].save(update_fields=["title"])
+
+            backend().add.assert_not_called()
+            backend().add_bulk.assert_not_called()
+
+        backend().add.assert_not_called()
+        self.assertEqual(backend().add_bulk.call_count, 1)
+        model, indexed_objects = backend().add_bulk.call_args[0]
+        self.assertIs(model, models.Book)
+        self.assertEqual(
+            sorted(obj.title for obj in indexed_objects),
+            ["Test 1", "Test 2", "Updated test"],
+        )
+
+    def test_batch_updates_skips_deleted_objects(self, backend):
+        with batch_search_index_updates():
+            obj = models.Book.objects.create(
+                title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+            )
+            obj.delete()
+            backend().delete.assert_called_with(obj)
+
+        backend().add_bulk.assert_not_called()
+
+    def test_batch_updates_not_made_after_exception(self, backend):
+        backend().reset_mock()
+        with self.assertRaises(ValueError):
+            with batch_search_index_updates():
+                models.Book.objects.create(
+                    title="Test",
+                    publication_date=date(2017, 10, 18),
+                    number_of_pages=100,
+                )
+                raise ValueError
+
+        backend().add.assert_not_called()
+        backend().add_bulk.assert_not_called()
+
 
 @mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
 @override_settings(
@@ -224,3 +279,245 @@ class TestSignalHandlersSearchDisabled(TestCase, WagtailTestUtils):
 
         self.assertEqual(backend().add.call_count, 0)
         self.assertIsNone(backend().add.call_args)
+
+
+@mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {"BACKEND": "wagtail.search.tests.DummySearchBackend"}
+    },
+    WAGTAILSEARCH_INDEX_QUEUE_ENABLED=True,
+)
+class TestIndexQueue(WagtailTestUtils, TestCase):
+    def create_book(self, title="Test"):
+        return models.Book.objects.create(
+            title=title, publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+
+    def test_save_is_queued(self, backend):
+        backend().reset_mock()
+        obj = self.create_book()
+
+        self.assertFalse(backend().add.mock_calls)
+        entry = PendingIndexUpdate.objects.get()
+        self.assertEqual(entry.content_type.model_class(), models.Book)
+        self.assertEqual(entry.object_id, str(obj.pk))
+        self.assertEqual(entry.action, PendingIndexUpdate.UPDATE)
+
+    def test_queues_specific_instance(self, backend):
+        novel = models.Novel.objects.create(
+            title="Test",
+            publication_date=date(2017, 10, 18),
+            number_of_pages=100,
+            setting="Somewhere",
+        )
+        PendingIndexUpdate.objects.all().delete()
+
+        novel.book_ptr.save()
+
+        entry = PendingIndexUpdate.objects.get()
+        self.assertEqual(entry.content_type.model_class(), models.Novel)
+
+    def test_process_pending(self, backend):
+        first = self.create_book("First")
+        second = self.create_book("Second")
+        first.title = "First updated"
+        first.save()
+        backend().reset_mock()
+
+        self.assertEqual(PendingIndexUpdate.process_pending(), 3)
+
+        # Both books are added with a single call
+        backend().add_bulk.assert_called_once()
+        model, objects = backend().add_bulk.call_args.args
+        self.assertEqual(model, models.Book)
+        self.assertEqual({obj.pk for obj in objects}, {first.pk, second.pk})
+        self.assertIn("First updated", {obj.title for obj in objects})
+        self.assertFalse(backend().add.mock_calls)
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_delete_replaces_update(self, backend):
+        obj = self.create_book()
+        pk = obj.pk
+        obj.delete()
+        backend().reset_mock()
+
+        PendingIndexUpdate.process_pending()
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        backend().delete_bulk.assert_called_once()
+        model, objects = backend().delete_bulk.call_args.args
+        self.assertEqual(model, models.Book)
+        self.assertEqual([obj.pk for obj in objects], [pk])
+
+    def test_skips_objects_excluded_from_index(self, backend):
+        models.Novel.objects.create(
+            title="Don't index me!",
+            publication_date=date(2017, 10, 18),
+            number_of_pages=100,
+        )
+        backend().reset_mock()
+
+        PendingIndexUpdate.process_pending()
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_limit(self, backend):
+        self.create_book("First")
+        self.create_book("Second")
+
+        self.assertEqual(PendingIndexUpdate.process_pending(limit=1), 1)
+        self.assertEqual(PendingIndexUpdate.objects.count(), 1)
+
+    def make_due(self):
+        PendingIndexUpdate.objects.update(next_attempt_at=timezone.now())
+
+    def test_failed_objects_retried_later(self, backend):
+        first = self.create_book("First")
+        second = self.create_book("Second")
+        backend().add_bulk.side_effect = ValueError("Test")
+        backend().add.side_effect = lambda obj: obj == first and 1 / 0
+        backend().reset_mock()
+
+        with self.assertLogs("wagtail.search", level="WARNING") as cm:
+            self.assertEqual(PendingIndexUpdate.process_pending(), 2)
+
+        # The objects are sent one at a time after the bulk request fails, and only
+        # the one that still fails is kept to be retried
+        self.assertEqual(
+            [call.args[0].pk for call in backend().add.call_args_list],
+            [first.pk, second.pk],
+        )
+        self.assertIn("ZeroDivisionError", cm.output[-1])
+        entry = PendingIndexUpdate.objects.get()
+        self.assertEqual(entry.object_id, str(first.pk))
+        self.assertEqual(entry.backend_name, "default")
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+        # The retry isn't due yet
+        self.assertEqual(PendingIndexUpdate.process_pending(), 0)
+
+    @override_settings(WAGTAILSEARCH_INDEX_QUEUE_MAX_ATTEMPTS=2)
+    def test_gives_up_after_max_attempts(self, backend):
+        self.create_book()
+        backend().add_bulk.side_effect = ValueError("Test")
+        backend().add.side_effect = ValueError("Test")
+
+        with self.assertLogs("wagtail.search", level="WARNING"):
+            PendingIndexUpdate.process_pending()
+        self.assertEqual(PendingIndexUpdate.objects.get().attempts, 1)
+
+        self.make_due()
+        with self.assertLogs("wagtail.search", level="ERROR") as cm:
+            PendingIndexUpdate.process_pending()
+
+        self.assertIn(
+            "Giving up index update of Wagtail search tests | book", cm.output[-1]
+        )
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_later_batches_not_blocked_by_failed_objects(self, backend):
+        self.create_book("First")
+        backend().add_bulk.side_effect = ValueError("Test")
+        backend().add.side_effect = ValueError("Test")
+
+        with self.assertLogs("wagtail.search", level="WARNING"):
+            PendingIndexUpdate.process_pending(limit=1)
+
+        second = self.create_book("Second")
+        backend().add_bulk.side_effect = None
+        backend().reset_mock()
+
+        self.assertEqual(PendingIndexUpdate.process_pending(limit=1), 1)
+        model, objects = backend().add_bulk.call_args.args
+        self.assertEqual([obj.pk for obj in objects], [second.pk])
+
+    def test_errors_raised_if_backend_doesnt_catch_them(self, backend):
+        self.create_book()
+        backend().catch_indexing_errors = False
+        backend().add_bulk.side_effect = ValueError("Test")
+        backend().add.side_effect = ValueError("Test")
+
+        with self.assertLogs("wagtail.search", level="WARNING"), self.assertRaises(
+            ValueError
+        ):
+            PendingIndexUpdate.process_pending()
+
+        # The failure is still recorded
+        self.assertEqual(PendingIndexUpdate.objects.get().attempts, 1)
+
+    @mock.patch("wagtail.search.tests.OtherSearchBackend", create=True)
+    def test_failures_retried_in_their_backend_only(self, other_backend, backend):
+        obj = self.create_book()
+        other_backend().add_bulk.side_effect = ValueError("Test")
+        other_backend().add.side_effect = ValueError("Test")
+        backend().reset_mock()
+
+        with override_settings(
+            WAGTAILSEARCH_BACKENDS={
+                "default": {"BACKEND": "wagtail.search.tests.DummySearchBackend"},
+                "other": {"BACKEND": "wagtail.search.tests.OtherSearchBackend"},
+            }
+        ):
+            with self.assertLogs("wagtail.search", level="WARNING"):
+                PendingIndexUpdate.process_pending()
+
+            backend().add_bulk.assert_called_once()
+            entry = PendingIndexUpdate.objects.get()
+            self.assertEqual(entry.backend_name, "other")
+
+            other_backend().add_bulk.side_effect = None
+            backend().reset_mock()
+            self.make_due()
+            PendingIndexUpdate.process_pending()
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        model, objects = other_backend().add_bulk.call_args.args
+        self.assertEqual([book.pk for book in objects], [obj.pk])
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_unknown_backend_discarded(self, backend):
+        obj = self.create_book()
+        PendingIndexUpdate.objects.update(backend_name="removed")
+        backend().reset_mock()
+
+        with self.assertLogs("wagtail.search", level="WARNING") as cm:
+            PendingIndexUpdate.process_pending()
+
+        self.assertIn(
+            f"Discarding pending index update of Wagtail search tests | book {obj.pk} "
+            "for unknown search backend 'removed'",
+            cm.output[0],
+        )
+        self.assertFalse(backend().add_bulk.mock_calls)
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_get_lag(self, backend):
+        self.assertEqual(PendingIndexUpdate.get_lag(), (0, None))
+
+        self.create_book()
+        count, lag = PendingIndexUpdate.get_lag()
+        self.assertEqual(count, 1)
+        self.assertGreaterEqual(lag.total_seconds(), 0)
+
+    def test_management_command(self, backend):
+        self.create_book()
+        backend().reset_mock()
+
+        stdout = StringIO()
+        management.call_command("process_search_index_queue", stdout=stdout)
+
+        self.assertIn("Successfully processed 1 update(s)", stdout.getvalue())
+        backend().add_bulk.assert_called_once()
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_management_command_lag(self, backend):
+        self.create_book()
+
+        stdout = StringIO()
+        management.call_command("process_search_index_queue", lag=True, stdout=stdout)
+
+        self.assertIn("1 pending update(s), oldest queued", stdout.getvalue())
+        self.assertEqual(PendingIndexUpdate.objects.count(), 1)
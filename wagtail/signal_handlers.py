@@ -2,6 +2,7 @@ import logging
 from contextlib import contextmanager
 
 from asgiref.local import Local
+from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import (
@@ -13,7 +14,19 @@ from django.db.models.signals import (
 )
 from modelcluster.fields import ParentalKey
 
-from wagtail.models import Locale, Page, ReferenceIndex, Site
+from wagtail.models import (
+    Locale,
+    Page,
+    PendingReferenceIndexUpdate,
+    ReferenceIndex,
+    Site,
+)
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
 
 logger = logging.getLogger("wagtail")
 
@@ -27,6 +40,25 @@ def post_delete_site_signal_handler(instance, **kwargs):
     Site.clear_site_root_paths_cache()
 
 
+# Invalidate cached routes whenever the set of routable pages or their URL paths change.
+def clear_route_cache_signal_handler(**kwargs):
+    if getattr(settings, "WAGTAIL_ROUTE_CACHE_ENABLED", False):
+        transaction.on_commit(Page.clear_route_cache)
+
+
+# Invalidate cached rich text HTML whenever pages linked from it may have changed URL.
+def clear_rich_text_cache_signal_handler(**kwargs):
+    from wagtail.rich_text.cache import clear_rich_text_cache_on_commit
+
+    clear_rich_text_cache_on_commit()
+
+
+def clear_rich_text_cache_for_page_signal_handler(instance, **kwargs):
+    from wagtail.rich_text.cache import clear_rich_text_cache_for_object
+
+    clear_rich_text_cache_for_object(instance)
+
+
 def pre_delete_page_unpublish(sender, instance, **kwargs):
     # Make sure pages are unpublished before deleting
     if instance.live:
@@ -87,6 +119,11 @@ def update_reference_index_on_save(instance, **kwargs):
             return
 
     if ReferenceIndex.is_indexed(instance._meta.model):
+        if getattr(settings, "WAGTAIL_REFERENCE_INDEX_DEFERRED", False):
+            # Leave the references to be indexed by process_references_index_queue
+            PendingReferenceIndexUpdate.enqueue(instance)
+            return
+
         with transaction.atomic():
             ReferenceIndex.create_or_update_for_object(instance)
 
@@ -123,6 +160,24 @@ def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
 
+    post_save.connect(clear_route_cache_signal_handler, sender=Site)
+    post_delete.connect(clear_route_cache_signal_handler, sender=Site)
+    page_published.connect(clear_route_cache_signal_handler)
+    page_unpublished.connect(clear_route_cache_signal_handler)
+    page_slug_changed.connect(clear_route_cache_signal_handler)
+    post_page_move.connect(clear_route_cache_signal_handler)
+    post_delete.connect(clear_route_cache_signal_handler, sender=Page)
+
+    # The URLs of all pages change with their site, and the URLs of all pages
+    # below a moved or renamed page change with it
+    post_save.connect(clear_rich_text_cache_signal_handler, sender=Site)
+    post_delete.connect(clear_rich_text_cache_signal_handler, sender=Site)
+    page_slug_changed.connect(clear_rich_text_cache_signal_handler)
+    post_page_move.connect(clear_rich_text_cache_signal_handler)
+    page_published.connect(clear_rich_text_cache_for_page_signal_handler)
+    page_unpublished.connect(clear_rich_text_cache_for_page_signal_handler)
+    post_delete.connect(clear_rich_text_cache_for_page_signal_handler, sender=Page)
+
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
 
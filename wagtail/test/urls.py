@@ -44,6 +44,12 @@ urlpatterns = [
         },
     ),
     path("sitemap-<str:section>.xml", sitemaps_views.sitemap, name="sitemap"),
+    path("pregenerated/sitemap.xml", sitemaps_views.pregenerated_sitemap),
+    path(
+        "pregenerated/sitemap-<int:shard>-<int:part>.xml",
+        sitemaps_views.pregenerated_sitemap,
+        name="wagtailsitemaps_pregenerated",
+    ),
     path("testapp/", include(testapp_urls)),
     path("fallback/", lambda: HttpResponse("ok"), name="fallback"),
 ]
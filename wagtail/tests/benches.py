@@ -0,0 +1,177 @@
+from django.test import TestCase
+
+from wagtail import blocks
+from wagtail.blocks.list_block import ListValue
+from wagtail.images import get_image_model
+from wagtail.images.blocks import ImageChooserBlock
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page
+from wagtail.test.benchmark import Benchmark
+
+
+class StreamDecodeBenchmark(Benchmark):
+    """
+    Measures the time taken to convert the raw JSON data of a stream into native
+    values, and access every block, as happens when a StreamField is rendered.
+    """
+
+    def setUp(self):
+        Image = get_image_model()
+        self.images = [
+            Image.objects.create(title=f"Image {i}", file=get_test_image_file())
+            for i in range(10)
+        ]
+        self.page = Page.objects.get(depth=1)
+
+    def get_image_id(self, i):
+        return self.images[i % len(self.images)].pk
+
+    def visit(self, value):
+        if isinstance(value, blocks.StreamValue):
+            for child in value:
+                self.visit(child.value)
+        elif isinstance(value, ListValue):
+            for child_value in value:
+                self.visit(child_value)
+        elif isinstance(value, blocks.StructValue):
+            for child_value in value.values():
+                self.visit(child_value)
+
+    def bench(self):
+        value = self.block.to_python(self.raw_data)
+        with self.assertNumQueries(self.expected_queries):
+            self.visit(value)
+
+
+class BenchStreamDecodeWide(StreamDecodeBenchmark, TestCase):
+    """
+    A stream of 600 top-level blocks of various types, most of them with chooser blocks.
+    """
+
+    expected_queries = 2
+
+    def setUp(self):
+        super().setUp()
+        self.block = blocks.StreamBlock(
+            [
+                ("heading", blocks.CharBlock()),
+                ("paragraph", blocks.RichTextBlock()),
+                ("image", ImageChooserBlock()),
+                ("link", blocks.PageChooserBlock()),
+                (
+                    "card",
+                    blocks.StructBlock(
+                        [
+                            ("title", blocks.CharBlock()),
+                            ("image", ImageChooserBlock()),
+                            ("page", blocks.PageChooserBlock()),
+                        ]
+                    ),
+                ),
+                ("gallery", blocks.ListBlock(ImageChooserBlock())),
+            ]
+        )
+
+        self.raw_data = []
+        for i in range(100):
+            self.raw_data.extend(
+                [
+                    {"type": "heading", "value": f"Heading {i}", "id": f"{i}-1"},
+                    {"type": "paragraph", "value": "<p>Text</p>", "id": f"{i}-2"},
+                    {"type": "image", "value": self.get_image_id(i), "id": f"{i}-3"},
+                    {"type": "link", "value": self.page.pk, "id": f"{i}-4"},
+                    {
+                        "type": "card",
+                        "value": {
+                            "title": f"Card {i}",
+                            "image": self.get_image_id(i + 1),
+                            "page": self.page.pk,
+                        },
+                        "id": f"{i}-5",
+                    },
+                    {
+                        "type": "gallery",
+                        "value": [
+                            {
+                                "type": "item",
+                                "value": self.get_image_id(i + j),
+                                "id": f"{i}-6-{j}",
+                            }
+                            for j in range(5)
+                        ],
+                        "id": f"{i}-6",
+                    },
+                ]
+            )
+
+
+class BenchStreamDecodeDeep(StreamDecodeBenchmark, TestCase):
+    """
+    A stream of 50 sections, each nesting lists, structs and streams four levels deep,
+    with chooser blocks at every level.
+    """
+
+    expected_queries = 1
+
+    def setUp(self):
+        super().setUp()
+        figure_block = blocks.StructBlock(
+            [
+                ("image", ImageChooserBlock()),
+                ("caption", blocks.CharBlock()),
+            ]
+        )
+        column_block = blocks.StreamBlock(
+            [
+                ("figure", figure_block),
+                ("image", ImageChooserBlock()),
+                ("text", blocks.CharBlock()),
+            ]
+        )
+        self.block = blocks.StreamBlock(
+            [
+                (
+                    "section",
+                    blocks.StructBlock(
+                        [
+                            ("image", ImageChooserBlock()),
+                            ("columns", blocks.ListBlock(column_block)),
+                        ]
+                    ),
+                ),
+            ]
+        )
+
+        self.raw_data = [
+            {
+                "type": "section",
+                "value": {
+                    "image": self.get_image_id(i),
+                    "columns": [
+                        {
+                            "type": "item",
+                            "value": [
+                                {
+                                    "type": "figure",
+                                    "value": {
+                                        "image": self.get_image_id(i + j),
+                                        "caption": "Caption",
+                                    },
+                                    "id": f"{i}-{j}-1",
+                                },
+                                {
+                                    "type": "image",
+                                    "value": self.get_image_id(i + j + 1),
+                                    "id": f"{i}-{j}-2",
+                                },
+                                {"type": "text", "value": "Text", "id": f"{i}-{j}-3"},
+                            ],
+                            "id": f"{i}-{j}",
+                        }
+                        for j in range(4)
+                    ],
+                },
+                "id": str(i),
+            }
+            for i in range(50)
+        ]
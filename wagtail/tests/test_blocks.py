@@ -11,12 +11,13 @@ from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.utils import ErrorList
 from django.template.loader import render_to_string
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils.safestring import SafeData, mark_safe
 from django.utils.translation import gettext_lazy as _
 
 from wagtail import blocks
-from wagtail.blocks.base import get_error_json_data
+from wagtail.blocks.base import BlockWidget, get_error_json_data
+from wagtail.blocks.definition_cache import clear_block_definition_cache
 from wagtail.blocks.definition_lookup import BlockDefinitionLookup
 from wagtail.blocks.field_block import FieldBlockAdapter
 from wagtail.blocks.list_block import ListBlockAdapter, ListBlockValidationError
@@ -6000,3 +6001,64 @@ class TestBlockDefinitionLookup(TestCase):
         self.assertIsInstance(list_block, blocks.ListBlock)
         list_item_block = list_block.child_block
         self.assertIsInstance(list_item_block, blocks.CharBlock)
+
+
+class TestBlockDefinitionCache(TestCase):
+    def setUp(self):
+        clear_block_definition_cache()
+
+    def get_stream_block(self, **kwargs):
+        return blocks.StreamBlock(
+            [
+                ("heading", blocks.CharBlock()),
+                ("paragraph", blocks.RichTextBlock()),
+            ],
+            **kwargs,
+        )
+
+    def test_definition_packed_once(self):
+        first_widget = BlockWidget(self.get_stream_block())
+        second_widget = BlockWidget(self.get_stream_block())
+
+        self.assertEqual(first_widget.block_json, second_widget.block_json)
+        self.assertIs(first_widget.js_context, second_widget.js_context)
+
+    def test_meta_options_change_definition(self):
+        first_widget = BlockWidget(self.get_stream_block())
+        second_widget = BlockWidget(self.get_stream_block(collapsed=True))
+
+        self.assertNotEqual(first_widget.block_json, second_widget.block_json)
+        self.assertNotEqual(first_widget.block_hash, second_widget.block_hash)
+
+    def test_definition_with_callable_choices_not_cached(self):
+        choices = [("tea", "Tea")]
+
+        def get_choices():
+            return choices
+
+        block = blocks.StreamBlock([("drink", blocks.ChoiceBlock(choices=get_choices))])
+        first_widget = BlockWidget(block)
+        self.assertIn("Tea", first_widget.block_json)
+
+        choices = [("coffee", "Coffee")]
+        second_widget = BlockWidget(block)
+        self.assertIn("Coffee", second_widget.block_json)
+        self.assertIsNot(first_widget.js_context, second_widget.js_context)
+
+    def test_render_with_definition(self):
+        widget = BlockWidget(self.get_stream_block())
+        html = widget.render("body", [])
+
+        self.assertIn("data-w-block-data-value=", html)
+        self.assertNotIn("data-w-block-url-value=", html)
+
+    @override_settings(WAGTAILADMIN_BLOCK_DEFINITION_URLS=True)
+    def test_render_with_definition_url(self):
+        widget = BlockWidget(self.get_stream_block())
+        html = widget.render("body", [])
+
+        self.assertIn(
+            f'data-w-block-url-value="/admin/block-definitions/en/{widget.block_hash}.json"',
+            html,
+        )
+        self.assertNotIn("data-w-block-data-value=", html)
@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core import management
 from django.core.cache import cache
+from django.core.management.base import CommandError
 from django.db import models
 from django.test import TestCase, override_settings
 from django.utils import timezone
@@ -13,6 +14,7 @@ from django.utils import timezone
 from wagtail.embeds.models import Embed
 from wagtail.models import (
     Collection,
+    Comment,
     Page,
     PageLogEntry,
     Revision,
@@ -225,7 +227,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
                 .exclude(approved_go_live_at__isnull=True)
                 .exists()
             )
-            with self.assertNumQueries(44):
+            with self.assertNumQueries(58):
                 management.call_command("publish_scheduled_pages")
 
             p = Page.objects.get(slug="hello-world")
@@ -282,7 +284,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(44):
+            with self.assertNumQueries(58):
                 management.call_command("publish_scheduled_pages")
 
             p = Page.objects.get(slug="hello-world")
@@ -318,7 +320,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
         page.title = "Goodbye world!"
         page.save_revision()
 
-        with self.assertNumQueries(44):
+        with self.assertNumQueries(58):
             management.call_command("publish_scheduled_pages")
 
         p = Page.objects.get(slug="hello-world")
@@ -346,7 +348,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
             .exists()
         )
 
-        with self.assertNumQueries(42):
+        with self.assertNumQueries(56):
             management.call_command("publish_scheduled_pages")
 
         p = Page.objects.get(slug="hello-world")
@@ -382,7 +384,7 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
             p = Page.objects.get(slug="hello-world")
             self.assertTrue(p.live)
 
-            with self.assertNumQueries(26):
+            with self.assertNumQueries(40):
                 management.call_command("publish_scheduled_pages")
 
             p = Page.objects.get(slug="hello-world")
@@ -410,13 +412,102 @@ class TestPublishScheduledPagesCommand(WagtailTestUtils, TestCase):
         p = Page.objects.get(slug="hello-world")
         self.assertTrue(p.live)
 
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(18):
             management.call_command("publish_scheduled_pages")
 
         p = Page.objects.get(slug="hello-world")
         self.assertTrue(p.live)
         self.assertFalse(p.expired)
 
+    def create_scheduled_pages(self, count):
+        pages = []
+        for i in range(count):
+            page = SimplePage(
+                title=f"Page {i}",
+                slug=f"page-{i}",
+                content="hello",
+                live=False,
+                has_unpublished_changes=True,
+            )
+            self.root_page.add_child(instance=page)
+            # Schedule the pages in the reverse order of their creation
+            page.save_revision(
+                approved_go_live_at=timezone.now() - timedelta(minutes=count - i)
+            )
+            pages.append(page)
+        return pages
+
+    def test_go_live_pages_published_in_batches(self):
+        pages = self.create_scheduled_pages(5)
+        published_pages = []
+
+        def page_published_handler(sender, instance, **kwargs):
+            published_pages.append(instance.pk)
+
+        page_published.connect(page_published_handler)
+        stdout = StringIO()
+        try:
+            with mock.patch(
+                "wagtail.search.index.insert_or_update_objects"
+            ) as insert_or_update_objects:
+                management.call_command(
+                    "publish_scheduled", batch_size=2, verbosity=2, stdout=stdout
+                )
+        finally:
+            page_published.disconnect(page_published_handler)
+
+        # Pages are published in the order they were scheduled for
+        self.assertEqual(published_pages, [page.pk for page in pages])
+        self.assertEqual(
+            Page.objects.filter(pk__in=published_pages, live=True).count(), 5
+        )
+
+        # The search index is updated once per batch
+        self.assertEqual(insert_or_update_objects.call_count, 3)
+
+        output = stdout.getvalue()
+        self.assertIn(
+            "Unpublished 0 expired object(s) and published 5 revision(s)", output
+        )
+        self.assertIn("delay after the scheduled time: median ", output)
+
+    def test_failure_doesnt_stop_other_pages_being_published(self):
+        pages = self.create_scheduled_pages(3)
+        failing_revision = pages[1].latest_revision
+        original_publish = Revision.publish
+
+        def publish(revision, *args, **kwargs):
+            if revision.pk == failing_revision.pk:
+                raise ValueError("Test")
+            return original_publish(revision, *args, **kwargs)
+
+        with mock.patch.object(Revision, "publish", publish), self.assertLogs(
+            "wagtail", level="ERROR"
+        ) as logs:
+            with self.assertRaisesMessage(
+                CommandError, "1 scheduled object(s) could not be published"
+            ):
+                management.call_command("publish_scheduled", stdout=StringIO())
+
+        self.assertIn("ValueError: Test", logs.output[0])
+        self.assertTrue(Page.objects.get(pk=pages[0].pk).live)
+        self.assertFalse(Page.objects.get(pk=pages[1].pk).live)
+        self.assertTrue(Page.objects.get(pk=pages[2].pk).live)
+
+        # The revision that failed to be published is still scheduled
+        failing_revision.refresh_from_db()
+        self.assertIsNotNone(failing_revision.approved_go_live_at)
+
+    def test_no_summary_at_default_verbosity(self):
+        self.create_scheduled_pages(1)
+        stdout = StringIO()
+        with self.assertLogs("wagtail", level="INFO") as logs:
+            management.call_command("publish_scheduled", stdout=stdout)
+
+        # The summary is only logged, so that cron jobs don't send it as mail
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertTrue(any("published 1 revision(s)" in line for line in logs.output))
+
 
 @override_settings(
     CACHES={
@@ -458,7 +549,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(15):
+            with self.assertNumQueries(29):
                 management.call_command("publish_scheduled")
 
             self.snippet.refresh_from_db()
@@ -506,7 +597,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
                 .exists()
             )
 
-            with self.assertNumQueries(15):
+            with self.assertNumQueries(29):
                 management.call_command("publish_scheduled")
 
             self.snippet.refresh_from_db()
@@ -535,7 +626,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
         self.snippet.text = "Goodbye world!"
         self.snippet.save_revision()
 
-        with self.assertNumQueries(15):
+        with self.assertNumQueries(29):
             management.call_command("publish_scheduled")
 
         self.snippet.refresh_from_db()
@@ -559,7 +650,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
             .exists()
         )
 
-        with self.assertNumQueries(14):
+        with self.assertNumQueries(28):
             management.call_command("publish_scheduled")
 
         self.assertFalse(self.snippet.live)
@@ -587,7 +678,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
             self.snippet.refresh_from_db()
             self.assertTrue(self.snippet.live)
 
-            with self.assertNumQueries(10):
+            with self.assertNumQueries(24):
                 management.call_command("publish_scheduled")
 
             self.snippet.refresh_from_db()
@@ -608,7 +699,7 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
         self.snippet.refresh_from_db()
         self.assertTrue(self.snippet.live)
 
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(18):
             management.call_command("publish_scheduled")
 
         self.snippet.refresh_from_db()
@@ -724,6 +815,80 @@ class TestPurgeRevisionsCommandForPages(TestCase):
         # Any other revisions are deleted
         self.assertRevisionNotExists(revision_purged)
 
+    def test_live_revision_not_purged(self):
+        live_revision = self.object.save_revision()
+        live_revision.publish()
+        revision = self.object.save_revision()
+        self.object.save_revision()
+
+        self.run_command()
+
+        self.assertRevisionExists(live_revision)
+        self.assertRevisionNotExists(revision)
+
+    def test_purge_revisions_in_batches(self):
+        revisions = [self.object.save_revision() for i in range(5)]
+
+        self.run_command(batch_size=2)
+
+        for revision in revisions[:-1]:
+            self.assertRevisionNotExists(revision)
+        self.assertRevisionExists(revisions[-1])
+
+    def test_purge_revisions_with_max_runtime(self):
+        revision = self.object.save_revision()
+        self.object.save_revision()
+
+        output = StringIO()
+        management.call_command(
+            "purge_revisions", **self.base_options, max_runtime=0, stdout=output
+        )
+
+        self.assertRevisionExists(revision)
+        self.assertIn("Stopped after reaching the maximum runtime", output.getvalue())
+
+
+class TestPurgeRevisionsCommand(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="commenter", email="commenter@example.com", password="password"
+        )
+        self.page = Page.objects.get(id=2).add_child(
+            instance=SimplePage(title="Hello world!", slug="hello-world", content="hi")
+        )
+
+    def test_comments_moved_to_next_kept_revision(self):
+        revision_1 = self.page.save_revision()
+        revision_2 = self.page.save_revision()
+        revision_3 = self.page.save_revision()
+        comment = Comment.objects.create(
+            page=self.page,
+            user=self.user,
+            text="A comment",
+            contentpath="title",
+            revision_created=revision_1,
+        )
+
+        management.call_command("purge_revisions", stdout=StringIO())
+
+        self.assertFalse(
+            Revision.objects.filter(pk__in=[revision_1.pk, revision_2.pk]).exists()
+        )
+        comment.refresh_from_db()
+        self.assertEqual(comment.revision_created, revision_3)
+
+    def test_reports_rate(self):
+        self.page.save_revision()
+        self.page.save_revision()
+
+        output = StringIO()
+        management.call_command("purge_revisions", stdout=output)
+
+        self.assertRegex(
+            output.getvalue(),
+            r"Successfully deleted 1 revisions in [0-9.]+s \([0-9]+ revisions per second\)",
+        )
+
 
 class TestPurgeRevisionsCommandForSnippets(TestPurgeRevisionsCommandForPages):
     def get_object(self):
@@ -1,19 +1,25 @@
 import datetime
 import unittest
+from unittest import mock
 from unittest.mock import Mock
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.http import Http404
 from django.test import Client, TestCase, override_settings
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone, translation
 from freezegun import freeze_time
 
+from wagtail import url_routing
 from wagtail.actions.copy_for_translation import ParentNotTranslatedError
+from wagtail.actions.copy_page import CopyPageAction
 from wagtail.coreutils import get_dummy_request
 from wagtail.locks import BasicLock, ScheduledForPublishLock, WorkflowLock
 from wagtail.models import (
@@ -24,6 +30,7 @@ from wagtail.models import (
     PageLogEntry,
     PageManager,
     PageViewRestriction,
+    ReferenceIndex,
     Site,
     Workflow,
     WorkflowTask,
@@ -212,10 +219,15 @@ class TestSiteRouting(TestCase):
         self.unrecognised_port = "8000"
         self.unrecognised_hostname = "unknown.site.com"
 
+        # Load the sites into this process's site matcher, so that the query
+        # counts below reflect the queries made for each request
+        Site.find_for_request(get_dummy_request())
+
     def test_route_for_request_query_count(self):
         request = get_dummy_request(site=self.events_site)
-        with self.assertNumQueries(2):
-            # expect queries for site & page
+        with self.assertNumQueries(1):
+            # expect a query for the site version stamp only, as the site's root
+            # page is loaded with the site matcher
             Page.route_for_request(request, request.path)
         with self.assertNumQueries(0):
             # subsequent lookups should be cached on the request
@@ -568,6 +580,264 @@ class TestRouting(TestCase):
             self.assertEqual(parent, events_page)
 
 
+@override_settings(
+    WAGTAIL_ROUTE_CACHE_ENABLED=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestRouteCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.site = Site.objects.select_related("root_page").get(is_default_site=True)
+        self.event_page = EventPage.objects.get(
+            url_path="/home/secret-plans/steal-underpants/"
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def route(self, path):
+        request = get_dummy_request(path=path, site=self.site)
+        # Avoid counting the site lookup
+        request._wagtail_site = self.site
+        return Page.route_for_request(request, path)
+
+    def test_route_to_page(self):
+        with self.assertNumQueries(2):
+            # One query for the pages along the path, one for the specific page
+            page, args, kwargs = self.route("/secret-plans/steal-underpants/")
+        self.assertEqual(page, self.event_page)
+        self.assertIsInstance(page, EventPage)
+        self.assertEqual((args, kwargs), ([], {}))
+
+    def test_route_to_site_root(self):
+        page, args, kwargs = self.route("/")
+        self.assertEqual(page, self.site.root_page)
+
+    def test_route_is_cached(self):
+        self.route("/secret-plans/steal-underpants/")
+
+        with self.assertNumQueries(0):
+            page, args, kwargs = self.route("/secret-plans/steal-underpants/")
+        self.assertEqual(page, self.event_page)
+        self.assertIsInstance(page, EventPage)
+
+    def test_parent_is_cached(self):
+        page, args, kwargs = self.route("/secret-plans/steal-underpants/")
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                page.get_parent(update=False).url_path, "/home/secret-plans/"
+            )
+
+    def test_route_to_unknown_page(self):
+        self.assertIsNone(self.route("/secret-plans/quinquagesima/"))
+        self.assertIsNone(self.route("/does-not-exist/steal-underpants/"))
+
+    def test_route_to_unpublished_page(self):
+        self.assertIsNone(self.route("/events/tentative-unpublished-event/"))
+
+    def test_falls_back_to_custom_route_method(self):
+        # PageWithOldStyleRouteMethod overrides route() to return a response
+        response = self.route("/old-style-route/")
+        self.assertEqual(response.status_code, 200)
+
+        # Routes below a page with a custom route() method are handed to that method
+        response = self.route("/old-style-route/child/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_custom_route_results_are_not_cached(self):
+        self.route("/old-style-route/")
+        with self.assertNumQueries(2):
+            self.route("/old-style-route/")
+
+    def test_cache_cleared_on_unpublish(self):
+        self.route("/secret-plans/steal-underpants/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.unpublish()
+        self.assertIsNone(self.route("/secret-plans/steal-underpants/"))
+
+    def test_cache_cleared_on_slug_change(self):
+        self.route("/secret-plans/steal-underpants/")
+        self.event_page.slug = "borrow-underpants"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.save_revision().publish()
+
+        self.assertIsNone(self.route("/secret-plans/steal-underpants/"))
+        page, args, kwargs = self.route("/secret-plans/borrow-underpants/")
+        self.assertEqual(page, self.event_page)
+
+    def test_cache_cleared_on_move(self):
+        self.route("/secret-plans/steal-underpants/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event_page.move(self.site.root_page, pos="last-child")
+
+        self.assertIsNone(self.route("/secret-plans/steal-underpants/"))
+        page, args, kwargs = self.route("/steal-underpants/")
+        self.assertEqual(page, self.event_page)
+
+    @override_settings(WAGTAIL_ROUTE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        with self.assertNumQueries(4):
+            # One query per path component, plus one per specific page
+            page, args, kwargs = self.route("/secret-plans/steal-underpants/")
+        self.assertEqual(page, self.event_page)
+
+
+class TestGetUrlsForPages(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        from django.urls import clear_url_caches
+
+        clear_url_caches()
+        self.request = get_dummy_request()
+
+    def tearDown(self):
+        from django.urls import clear_url_caches
+
+        clear_url_caches()
+
+    def get_expected_urls(self, request=None):
+        # Fetch fresh instances so that nothing is shared with the bulk lookup
+        return [page.get_url(request=request) for page in Page.objects.specific()]
+
+    def test_urls_match_get_url(self):
+        pages = list(Page.objects.specific())
+        self.assertEqual(
+            Page.get_urls_for_pages(pages, self.request),
+            self.get_expected_urls(self.request),
+        )
+
+    def test_urls_match_get_url_without_request(self):
+        pages = list(Page.objects.specific())
+        self.assertEqual(Page.get_urls_for_pages(pages), self.get_expected_urls())
+
+    @override_settings(ALLOWED_HOSTS=["localhost", "testserver", "events.example.com"])
+    def test_urls_match_get_url_with_multiple_sites(self):
+        Site.objects.create(
+            hostname="events.example.com",
+            root_page=Page.objects.get(url_path="/home/events/"),
+        )
+        pages = list(Page.objects.specific())
+        self.assertEqual(
+            Page.get_urls_for_pages(pages, self.request),
+            self.get_expected_urls(self.request),
+        )
+
+    def test_empty(self):
+        self.assertEqual(Page.get_urls_for_pages([], self.request), [])
+
+    def test_urls_are_stored_on_pages(self):
+        pages = list(Page.objects.live().specific())
+        Page.get_urls_for_pages(pages, self.request)
+
+        with self.assertNumQueries(0), mock.patch(
+            "wagtail.models.reverse"
+        ) as reverse, mock.patch("wagtail.url_routing.reverse") as builder_reverse:
+            for page in pages:
+                if type(page).get_url_parts is Page.get_url_parts:
+                    page.get_url(self.request)
+                    page.get_full_url(self.request)
+
+        reverse.assert_not_called()
+        builder_reverse.assert_not_called()
+
+    def test_serve_pattern_reversed_once(self):
+        pages = list(Page.objects.live())
+        with mock.patch(
+            "wagtail.url_routing.reverse", wraps=url_routing.reverse
+        ) as reverse:
+            Page.get_urls_for_pages(pages, self.request)
+
+        # Once for the prefix, once to check it against a page path
+        self.assertEqual(reverse.call_count, 2)
+
+    def test_stored_urls_only_used_for_same_request(self):
+        page = Page.objects.get(url_path="/home/events/christmas/")
+        Page.get_urls_for_pages([page], self.request)
+        page._wagtail_cached_url_parts = (self.request, "en", (1, "http://x", "/x/"))
+
+        self.assertEqual(page.get_url(self.request), "/x/")
+        self.assertEqual(page.get_url(get_dummy_request()), "/events/christmas/")
+
+    def test_stored_urls_discarded_on_url_path_change(self):
+        page = Page.objects.get(url_path="/home/events/christmas/")
+        Page.get_urls_for_pages([page], self.request)
+
+        page.slug = "xmas"
+        page.set_url_path(page.get_parent())
+        self.assertEqual(page.get_url(self.request), "/events/xmas/")
+
+    def test_custom_get_url_parts(self):
+        page = SingleEventPage.objects.get(url_path="/home/events/saint-patrick/")
+        self.assertEqual(
+            Page.get_urls_for_pages([page], self.request),
+            ["/events/saint-patrick/pointless-suffix/"],
+        )
+        self.assertFalse(hasattr(page, "_wagtail_cached_url_parts"))
+
+    def test_with_urls(self):
+        pages = list(Page.objects.live().with_urls(self.request))
+
+        with self.assertNumQueries(0), mock.patch("wagtail.models.reverse") as reverse:
+            urls = [page.get_url(self.request) for page in pages]
+        reverse.assert_not_called()
+
+        self.assertEqual(
+            urls, [page.get_url(self.request) for page in Page.objects.live()]
+        )
+
+    def test_with_urls_specific(self):
+        pages = list(Page.objects.live().specific().with_urls())
+        self.assertEqual(
+            [page.url for page in pages],
+            [page.url for page in Page.objects.live().specific()],
+        )
+
+        with mock.patch("wagtail.models.reverse") as reverse:
+            for page in pages:
+                if type(page).get_url_parts is Page.get_url_parts:
+                    page.url
+        reverse.assert_not_called()
+
+    def test_with_urls_values(self):
+        self.assertEqual(
+            list(
+                Page.objects.filter(url_path="/home/").with_urls().values_list("slug")
+            ),
+            [("home",)],
+        )
+
+    @override_settings(
+        ROOT_URLCONF="wagtail.test.urls_multilang",
+        LANGUAGE_CODE="en",
+        WAGTAIL_I18N_ENABLED=True,
+        LANGUAGES=[
+            ("en", "English"),
+            ("en-us", "English (United States)"),
+            ("fr", "French"),
+        ],
+        WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French")],
+    )
+    def test_urls_match_get_url_with_i18n(self):
+        fr_locale = Locale.objects.create(language_code="fr")
+        homepage = Page.objects.get(url_path="/home/")
+        homepage.copy_for_translation(fr_locale, copy_parents=True, alias=True)
+        Page.objects.get(url_path="/home/events/christmas/").copy_for_translation(
+            fr_locale, copy_parents=True, alias=True
+        )
+
+        pages = list(Page.objects.specific())
+        expected_urls = self.get_expected_urls(self.request)
+        self.assertIn("/fr/events/christmas/", expected_urls)
+        self.assertEqual(Page.get_urls_for_pages(pages, self.request), expected_urls)
+
+        # URLs depend on the active language, so stored URLs aren't used for
+        # another language
+        with translation.override("en-us"):
+            self.assertEqual(pages[1].get_url(self.request), "/en-us/")
+
+
 @override_settings(
     ROOT_URLCONF="wagtail.test.urls_multilang",
     LANGUAGE_CODE="en",
@@ -2262,6 +2532,232 @@ class TestCopyPage(TestCase):
         self.assertFalse(PageViewRestriction.objects.filter(page=child_page_2).exists())
 
 
+class TestBulkCopyPage(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.events_index = EventIndex.objects.get(url_path="/home/events/")
+
+        christmas_event = EventPage.objects.get(url_path="/home/events/christmas/")
+        christmas_event.categories.add(EventCategory.objects.create(name="Festive"))
+        christmas_event.save_revision().publish()
+        christmas_event.add_child(
+            instance=SimplePage(title="Gift guide", slug="gift-guide", content="Socks")
+        )
+        self.events_index.add_child(
+            instance=MTIChildPage(title="MTI child", slug="mti-child")
+        )
+
+        blog_page = ManyToManyBlogPage(title="Event blog", slug="event-blog")
+        self.events_index.add_child(instance=blog_page)
+        blog_page.adverts.add(Advert.objects.create(text="Tickets on sale"))
+        BlogCategoryBlogPage.objects.create(
+            category=BlogCategory.objects.create(name="News"), page=blog_page
+        )
+
+    def get_tree(self, page):
+        """
+        Describe the descendants of ``page``, relative to ``page``, so that the
+        descendants of different copies can be compared.
+        """
+        tree = []
+        for descendant in page.get_descendants().order_by("path").specific():
+            description = {
+                "path": descendant.path[len(page.path) :],
+                "depth": descendant.depth - page.depth,
+                "numchild": descendant.numchild,
+                "url_path": descendant.url_path[len(page.url_path) :],
+                "class": type(descendant),
+                "title": descendant.title,
+                "draft_title": descendant.draft_title,
+                "live": descendant.live,
+                "has_unpublished_changes": descendant.has_unpublished_changes,
+                "revisions": descendant.revisions.count(),
+                "latest_revision": descendant.latest_revision
+                and descendant.latest_revision.content["title"],
+                "logs": sorted(
+                    PageLogEntry.objects.filter(page=descendant).values_list(
+                        "action", flat=True
+                    )
+                ),
+            }
+            if isinstance(descendant, EventPage):
+                description["speakers"] = [
+                    speaker.first_name for speaker in descendant.speakers.all()
+                ]
+                description["categories"] = [
+                    category.name for category in descendant.categories.all()
+                ]
+            if isinstance(descendant, ManyToManyBlogPage):
+                description["adverts"] = [
+                    advert.text for advert in descendant.adverts.all()
+                ]
+                description["blog_categories"] = [
+                    category.name for category in descendant.blog_categories.all()
+                ]
+            tree.append(description)
+        return tree
+
+    def assertTreeConsistent(self):
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+    def test_bulk_copy_matches_recursive_copy(self):
+        recursive_copy = self.events_index.copy(
+            recursive=True, update_attrs={"title": "Recursive", "slug": "recursive"}
+        )
+        bulk_copy = self.events_index.copy(
+            recursive=True, bulk=True, update_attrs={"title": "Bulk", "slug": "bulk"}
+        )
+
+        tree = self.get_tree(bulk_copy)
+        self.assertEqual(tree, self.get_tree(recursive_copy))
+        self.assertEqual(len(tree), len(self.get_tree(self.events_index)))
+        self.assertEqual(bulk_copy.numchild, self.events_index.numchild)
+        self.assertEqual(
+            bulk_copy.get_descendants().get(slug="gift-guide").url_path,
+            "/home/bulk/christmas/gift-guide/",
+        )
+        self.assertTreeConsistent()
+
+    def test_bulk_copy_without_keeping_live(self):
+        recursive_copy = self.events_index.copy(
+            recursive=True,
+            keep_live=False,
+            update_attrs={"title": "Recursive", "slug": "recursive"},
+        )
+        bulk_copy = self.events_index.copy(
+            recursive=True,
+            keep_live=False,
+            bulk=True,
+            update_attrs={"title": "Bulk", "slug": "bulk"},
+        )
+
+        self.assertEqual(self.get_tree(bulk_copy), self.get_tree(recursive_copy))
+        self.assertFalse(bulk_copy.get_descendants().live().exists())
+
+    def test_bulk_copy_in_batches(self):
+        recursive_copy = self.events_index.copy(
+            recursive=True, update_attrs={"title": "Recursive", "slug": "recursive"}
+        )
+        bulk_copy = CopyPageAction(
+            self.events_index,
+            recursive=True,
+            bulk=True,
+            batch_size=2,
+            update_attrs={"title": "Bulk", "slug": "bulk"},
+        ).execute()
+
+        self.assertEqual(self.get_tree(bulk_copy), self.get_tree(recursive_copy))
+        self.assertTreeConsistent()
+
+    def test_bulk_copy_updates_indexes(self):
+        christmas_event = EventPage.objects.get(url_path="/home/events/christmas/")
+        christmas_event.body = '<p><a linktype="page" id="7">About us</a></p>'
+        christmas_event.save()
+
+        with mock.patch(
+            "wagtail.search.backends.database.fallback.DatabaseSearchBackend.add_bulk"
+        ) as add_bulk:
+            bulk_copy = self.events_index.copy(
+                recursive=True,
+                bulk=True,
+                update_attrs={"title": "Bulk", "slug": "bulk"},
+            )
+        new_christmas_event = bulk_copy.get_descendants().get(slug="christmas").specific
+
+        self.assertTrue(
+            ReferenceIndex.get_references_for_object(new_christmas_event).exists()
+        )
+
+        # Each batch of copies is indexed with one call per model
+        indexed_ids = [
+            obj.pk for call in add_bulk.call_args_list for obj in call.args[1]
+        ]
+        self.assertIn(new_christmas_event.pk, indexed_ids)
+        self.assertCountEqual(
+            indexed_ids,
+            bulk_copy.get_descendants().values_list("pk", flat=True),
+        )
+
+    def test_bulk_copy_sends_page_published(self):
+        published_ids = []
+
+        def page_published_handler(instance, revision, **kwargs):
+            self.assertEqual(instance.live_revision, revision)
+            published_ids.append(instance.pk)
+
+        page_published.connect(page_published_handler)
+        try:
+            bulk_copy = self.events_index.copy(
+                recursive=True,
+                bulk=True,
+                update_attrs={"title": "Bulk", "slug": "bulk"},
+            )
+        finally:
+            page_published.disconnect(page_published_handler)
+
+        self.assertCountEqual(
+            published_ids,
+            bulk_copy.get_descendants(inclusive=True)
+            .live()
+            .values_list("pk", flat=True),
+        )
+
+    def test_number_of_queries_doesnt_grow_with_number_of_pages(self):
+        homepage = Page.objects.get(url_path="/home/")
+        sections = []
+        for child_count in (2, 10):
+            section = homepage.add_child(
+                instance=SimplePage(
+                    title=f"Section {child_count}",
+                    slug=f"section-{child_count}",
+                    content="Section",
+                )
+            )
+            for i in range(child_count):
+                section.add_child(
+                    instance=SimplePage(
+                        title=f"Page {i}", slug=f"page-{i}", content="Page"
+                    )
+                )
+            sections.append(section)
+
+        query_counts = []
+        for section in sections:
+            with CaptureQueriesContext(connection) as queries:
+                section.copy(
+                    recursive=True,
+                    bulk=True,
+                    keep_live=False,
+                    update_attrs={"slug": f"{section.slug}-copy"},
+                )
+            # Copying child relations opens an (empty) savepoint per page, which
+            # doesn't count as a query
+            query_counts.append(
+                len(
+                    [
+                        query
+                        for query in queries.captured_queries
+                        if "SAVEPOINT" not in query["sql"]
+                    ]
+                )
+            )
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertTreeConsistent()
+
+    def test_falls_back_to_recursive_copy(self):
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            action = CopyPageAction(self.events_index, recursive=True, bulk=True)
+
+        self.assertFalse(action.bulk)
+
+
 class TestCreateAlias(TestCase):
     fixtures = ["test.json"]
 
@@ -3369,6 +3865,8 @@ class TestMakePreviewRequest(TestCase):
 
     def test_make_preview_request_for_accessible_page_https(self):
         Site.objects.update(port=443)
+        # QuerySet.update() bypasses the signal handlers that clear the site root paths
+        Site.clear_site_root_paths_cache()
 
         event_index = Page.objects.get(url_path="/home/events/")
         response = event_index.make_preview_request()
@@ -3396,6 +3894,8 @@ class TestMakePreviewRequest(TestCase):
 
     def test_make_preview_request_for_accessible_page_non_standard_port(self):
         Site.objects.update(port=8888)
+        # QuerySet.update() bypasses the signal handlers that clear the site root paths
+        Site.clear_site_root_paths_cache()
 
         event_index = Page.objects.get(url_path="/home/events/")
         response = event_index.make_preview_request()
@@ -1,8 +1,12 @@
+import multiprocessing
 from io import StringIO
+from unittest import mock
 
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
-from django.test import TestCase
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.utils.functional import SimpleLazyObject
 
 from wagtail.blocks import StreamValue, StructValue
@@ -10,8 +14,11 @@ from wagtail.documents import get_document_model
 from wagtail.documents.tests.utils import get_test_document_file
 from wagtail.images import get_image_model
 from wagtail.images.tests.utils import get_test_image_file
-from wagtail.models import Page, ReferenceIndex
+from wagtail.management.commands.rebuild_references_index import extract_references
+from wagtail.management.utils import get_process_pool, map_chunks
+from wagtail.models import Page, PendingReferenceIndexUpdate, ReferenceIndex
 from wagtail.rich_text import RichText
+from wagtail.signal_handlers import disable_reference_index_auto_update
 from wagtail.test.testapp.models import (
     Advert,
     AdvertWithCustomUUIDPrimaryKey,
@@ -261,6 +268,413 @@ class TestCreateOrUpdateForObject(TestCase):
         self.assertIn(" 4  wagtail.test.testapp.models.EventPage", stdout.getvalue())
 
 
+class RebuildReferencesIndexTestMixin:
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        image_model = get_image_model()
+        self.image = image_model.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.first_event_page = EventPage.objects.order_by("pk").first()
+        self.first_event_page.feed_image = self.image
+        self.first_event_page.save()
+
+        self.event_page = EventPage.objects.order_by("pk").last()
+        self.event_page.feed_image = self.image
+        self.event_page.carousel_items = [
+            EventPageCarouselItem(caption="1234567", image=self.image, sort_order=1),
+        ]
+        self.event_page.save()
+
+    def get_index(self):
+        return set(
+            ReferenceIndex.objects.values_list(
+                "content_type",
+                "base_content_type",
+                "object_id",
+                "to_content_type",
+                "to_object_id",
+                "model_path",
+                "content_path",
+                "content_path_hash",
+            )
+        )
+
+    def call_command(self, *args, **kwargs):
+        stdout = StringIO()
+        management.call_command(
+            "rebuild_references_index", *args, stdout=stdout, **kwargs
+        )
+        return stdout.getvalue()
+
+
+class TestRebuildReferencesIndex(RebuildReferencesIndexTestMixin, TestCase):
+    def test_rebuild_matches_create_or_update_for_object(self):
+        # Build the expected index one object at a time
+        ReferenceIndex.objects.all().delete()
+        for model in apps.get_models():
+            if ReferenceIndex.is_indexed(model):
+                for instance in model.objects.order_by("pk"):
+                    ReferenceIndex.create_or_update_for_object(instance)
+        expected = self.get_index()
+        self.assertTrue(expected)
+
+        ReferenceIndex.objects.all().delete()
+        self.call_command(chunk_size=2, batch_size=3)
+        self.assertEqual(self.get_index(), expected)
+
+        # Rebuilding again gives the same result
+        self.call_command()
+        self.assertEqual(self.get_index(), expected)
+
+    def test_rebuild_removes_stale_references(self):
+        ReferenceIndex.objects.create(
+            content_type=ContentType.objects.get_for_model(EventPage),
+            base_content_type=ContentType.objects.get_for_model(Page),
+            object_id=str(self.event_page.pk),
+            to_content_type=ContentType.objects.get_for_model(Page),
+            to_object_id="12345",
+            model_path="stale",
+            content_path="stale",
+            content_path_hash=ReferenceIndex._get_content_path_hash("stale"),
+        )
+        self.call_command()
+        self.assertFalse(ReferenceIndex.objects.filter(model_path="stale").exists())
+
+    def test_rebuild_removes_deleted_objects(self):
+        self.call_command()
+        stale = ReferenceIndex.objects.filter(
+            content_type=ContentType.objects.get_for_model(EventPage),
+            object_id=str(self.event_page.pk),
+        )
+        self.assertTrue(stale.exists())
+
+        with disable_reference_index_auto_update():
+            self.event_page.delete()
+        self.assertTrue(stale.exists())
+
+        self.call_command(model=["tests.EventPage"])
+        self.assertFalse(stale.exists())
+
+    def test_rebuild_removes_unindexed_models(self):
+        self.call_command()
+        ReferenceIndex.objects.create(
+            content_type=ContentType.objects.get_for_model(ReferenceIndex),
+            base_content_type=ContentType.objects.get_for_model(ReferenceIndex),
+            object_id="1",
+            to_content_type=ContentType.objects.get_for_model(Page),
+            to_object_id="1",
+            model_path="stale",
+            content_path="stale",
+            content_path_hash=ReferenceIndex._get_content_path_hash("stale"),
+        )
+
+        self.call_command(model=["tests.EventPage"])
+        self.assertTrue(ReferenceIndex.objects.filter(model_path="stale").exists())
+
+        self.call_command()
+        self.assertFalse(ReferenceIndex.objects.filter(model_path="stale").exists())
+
+    def test_interrupted_rebuild_keeps_references(self):
+        self.call_command()
+        expected = self.get_index()
+
+        # Stop the rebuild after the first chunk
+        first_chunk_records = ReferenceIndex._get_records_for_objects(
+            [self.first_event_page]
+        )
+        with mock.patch.object(
+            ReferenceIndex,
+            "_get_records_for_objects",
+            side_effect=[first_chunk_records, RuntimeError("Interrupted")],
+        ):
+            with self.assertRaises(RuntimeError):
+                self.call_command(model=["tests.EventPage"], chunk_size=1)
+
+        # The references of objects not rebuilt yet are still in the index
+        self.assertEqual(self.get_index(), expected)
+
+    def test_model(self):
+        self.call_command()
+        expected = self.get_index()
+        page_references = ReferenceIndex.objects.filter(
+            content_type=ContentType.objects.get_for_model(EventPage)
+        )
+        other_references = ReferenceIndex.objects.exclude(
+            content_type=ContentType.objects.get_for_model(EventPage)
+        )
+        other_references.filter(model_path="collection").delete()
+        page_references.filter(model_path="feed_image").delete()
+
+        output = self.call_command(model=["tests.EventPage"])
+
+        # References of the given model are rebuilt, others are left alone
+        self.assertEqual(page_references.filter(model_path="feed_image").count(), 2)
+        self.assertFalse(other_references.filter(model_path="collection").exists())
+        self.assertIn("EventPage", output)
+        self.assertNotIn("wagtail.models.Page", output)
+        self.assertLess(self.get_index(), expected)
+
+    def test_unknown_model(self):
+        with self.assertRaisesMessage(CommandError, "Unknown model: tests.Nope"):
+            self.call_command(model=["tests.Nope"])
+
+    def test_model_not_indexed(self):
+        with self.assertRaisesMessage(
+            CommandError, "Model wagtailcore.ReferenceIndex is not indexed"
+        ):
+            self.call_command(model=["wagtailcore.ReferenceIndex"])
+
+    def test_resume_from(self):
+        self.call_command()
+        expected = self.get_index()
+        references = ReferenceIndex.objects.filter(
+            content_type=ContentType.objects.get_for_model(EventPage)
+        )
+        references.delete()
+        ReferenceIndex.objects.filter(model_path="collection").delete()
+
+        self.call_command(
+            model=["tests.EventPage"],
+            resume_from=f"tests.EventPage:{self.first_event_page.pk}",
+        )
+
+        # The index is not cleared, and only objects after the given one are indexed
+        self.assertFalse(
+            ReferenceIndex.objects.filter(model_path="collection").exists()
+        )
+        self.assertFalse(
+            references.filter(object_id=str(self.first_event_page.pk)).exists()
+        )
+        self.assertTrue(references.filter(object_id=str(self.event_page.pk)).exists())
+        self.assertLess(self.get_index(), expected)
+
+    def test_resume_from_invalid(self):
+        with self.assertRaisesMessage(CommandError, "must be in the format"):
+            self.call_command(resume_from="tests.EventPage")
+        with self.assertRaisesMessage(CommandError, "is not being rebuilt"):
+            self.call_command(
+                model=["tests.EventPage"], resume_from="wagtailcore.Page:1"
+            )
+        with self.assertRaisesMessage(CommandError, "Invalid primary key"):
+            self.call_command(resume_from="tests.EventPage:abc")
+
+    def test_progress(self):
+        output = self.call_command(model=["tests.EventPage"], chunk_size=1, verbosity=2)
+        self.assertIn(
+            f"resume with --resume-from tests.EventPage:{self.event_page.pk}", output
+        )
+        self.assertRegex(output, r"Indexed \d+ objects\n\d+ objects, \d+ references in")
+
+    def test_extract_references(self):
+        self.assertEqual(
+            extract_references("tests.EventPage", [self.event_page.pk]),
+            ReferenceIndex._get_records_for_objects([self.event_page]),
+        )
+
+
+# Worker processes need their own connections to the database, so the test data
+# must be committed
+class TestRebuildReferencesIndexWithProcesses(
+    RebuildReferencesIndexTestMixin, TransactionTestCase
+):
+    def setUp(self):
+        # The processes of the parallel test runner can't start worker processes
+        if multiprocessing.current_process().daemon:
+            self.skipTest("worker processes can't be started from a daemonic process")
+        super().setUp()
+
+    def test_extract_references_in_worker_processes(self):
+        pk_chunks = [[page.pk] for page in EventPage.objects.order_by("pk").only("pk")]
+        self.assertGreater(len(pk_chunks), 2)
+        expected = [
+            (pks, extract_references("tests.EventPage", pks)) for pks in pk_chunks
+        ]
+
+        executor = get_process_pool(2)
+        try:
+            results = list(
+                map_chunks(
+                    executor,
+                    extract_references,
+                    pk_chunks,
+                    "tests.EventPage",
+                    max_pending=2,
+                )
+            )
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(results, expected)
+
+    def test_rebuild_with_processes(self):
+        self.call_command()
+        expected = self.get_index()
+
+        ReferenceIndex.objects.all().delete()
+        self.call_command(chunk_size=2, processes=2)
+        self.assertEqual(self.get_index(), expected)
+
+
+@override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=True)
+class TestDeferredReferenceIndex(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        image_model = get_image_model()
+        self.image = image_model.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.event_page = EventPage.objects.order_by("pk").last()
+        self.event_page.feed_image = self.image
+        self.event_page.carousel_items = [
+            EventPageCarouselItem(caption="1234567", image=self.image, sort_order=1),
+        ]
+        # Discard the update queued for the new image
+        PendingReferenceIndexUpdate.objects.all().delete()
+
+    def get_references(self):
+        return set(
+            ReferenceIndex.objects.filter(
+                to_content_type=ContentType.objects.get_for_model(self.image),
+                to_object_id=self.image.pk,
+            ).values_list("object_id", "model_path")
+        )
+
+    def test_save_enqueues_update(self):
+        self.event_page.save()
+        self.event_page.save()
+
+        self.assertEqual(self.get_references(), set())
+        entry = PendingReferenceIndexUpdate.objects.get()
+        self.assertEqual(
+            entry.content_type, ContentType.objects.get_for_model(EventPage)
+        )
+        self.assertEqual(entry.object_id, str(self.event_page.pk))
+
+    def test_process_pending(self):
+        self.event_page.save()
+
+        self.assertEqual(PendingReferenceIndexUpdate.process_pending(), 1)
+
+        self.assertEqual(
+            self.get_references(),
+            {
+                (str(self.event_page.pk), "feed_image"),
+                (str(self.event_page.pk), "carousel_items.item.image"),
+            },
+        )
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+
+    def test_process_pending_with_limit(self):
+        other_page = EventPage.objects.order_by("pk").first()
+        other_page.feed_image = self.image
+        other_page.save()
+        self.event_page.save()
+
+        self.assertEqual(PendingReferenceIndexUpdate.process_pending(limit=1), 1)
+        self.assertEqual(self.get_references(), {(str(other_page.pk), "feed_image")})
+        self.assertEqual(PendingReferenceIndexUpdate.objects.count(), 1)
+
+    def test_process_pending_deleted_object(self):
+        self.event_page.save()
+        EventPage.objects.filter(pk=self.event_page.pk).delete()
+
+        PendingReferenceIndexUpdate.process_pending()
+        self.assertEqual(self.get_references(), set())
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+
+    def get_grouped_references(self):
+        return {
+            (object.pk, reference.model_path)
+            for object, references in ReferenceIndex.get_grouped_references_to(
+                self.image
+            )
+            for reference in references
+        }
+
+    def test_grouped_references_include_pending_updates(self):
+        self.event_page.save()
+
+        # The references of the saved page are read from the page itself
+        self.assertEqual(
+            self.get_grouped_references(),
+            {
+                (self.event_page.pk, "feed_image"),
+                (self.event_page.pk, "carousel_items.item.image"),
+            },
+        )
+        self.assertEqual(len(ReferenceIndex.get_grouped_references_to(self.image)), 1)
+
+        # Without writing to the index
+        self.assertEqual(self.get_references(), set())
+        self.assertTrue(PendingReferenceIndexUpdate.objects.exists())
+        self.assertTrue(ReferenceIndex.has_pending_updates())
+
+    def test_pending_updates_replace_indexed_references(self):
+        self.event_page.save()
+        PendingReferenceIndexUpdate.process_pending()
+
+        self.event_page.feed_image = None
+        self.event_page.save()
+
+        # The records of the saved page in the index are out of date
+        self.assertEqual(len(self.get_references()), 2)
+        self.assertEqual(
+            self.get_grouped_references(),
+            {(self.event_page.pk, "carousel_items.item.image")},
+        )
+
+    def test_get_pending_references_to(self):
+        self.event_page.save()
+
+        pending_references = ReferenceIndex.get_pending_references_to(self.image)
+
+        self.assertIn(
+            (
+                ContentType.objects.get_for_model(Page).id,
+                str(self.event_page.pk),
+            ),
+            pending_references.sources,
+        )
+        self.assertEqual(
+            {reference.model_path for reference in pending_references.references},
+            {"feed_image", "carousel_items.item.image"},
+        )
+        self.assertTrue(
+            all(reference.pk is None for reference in pending_references.references)
+        )
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=False)
+    def test_not_deferred_by_default(self):
+        self.event_page.save()
+
+        self.assertEqual(len(self.get_references()), 2)
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+        self.assertFalse(ReferenceIndex.get_pending_references_to(self.image))
+
+    def test_command(self):
+        self.event_page.save()
+
+        stdout = StringIO()
+        management.call_command(
+            "process_references_index_queue", batch_size=1, stdout=stdout
+        )
+
+        self.assertIn("Successfully processed 1 object(s)", stdout.getvalue())
+        self.assertEqual(len(self.get_references()), 2)
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=False)
+    def test_has_pending_updates_when_not_deferred(self):
+        PendingReferenceIndexUpdate.enqueue(self.event_page)
+        with self.assertNumQueries(0):
+            self.assertFalse(ReferenceIndex.has_pending_updates())
+
+
 class TestDescribeOnDelete(TestCase):
     fixtures = ["test.json"]
 
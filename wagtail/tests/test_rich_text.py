@@ -1,12 +1,17 @@
 from unittest.mock import patch
 
+from django.core.cache import cache, caches
 from django.forms.models import modelform_factory
 from django.test import TestCase, override_settings
 from django.utils import translation
 
+from wagtail.documents.models import Document
 from wagtail.fields import RichTextField
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Locale, Page, Site
 from wagtail.rich_text import RichText, RichTextMaxLengthValidator, expand_db_html
+from wagtail.rich_text import cache as rich_text_cache
 from wagtail.rich_text.feature_registry import FeatureRegistry
 from wagtail.rich_text.pages import PageLinkHandler
 from wagtail.rich_text.rewriters import LinkRewriter, extract_attrs
@@ -214,6 +219,187 @@ This is another image: <embed embedtype="image" id="2" format="left" />
         )
 
 
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "rich_text": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    WAGTAIL_RICH_TEXT_CACHE_SIZE=100,
+)
+class TestRichTextCache(TestCase):
+    fixtures = ["test.json"]
+
+    html = '<p><a linktype="page" id="7">About</a> <a linktype="document" id="1">Doc</a></p>'
+
+    def setUp(self):
+        cache.clear()
+        caches["rich_text"].clear()
+        rich_text_cache.get_local_rich_text_cache().clear()
+        # Forget the generation read from the cache by earlier tests, as the
+        # cache has been cleared
+        rich_text_cache._generation = None
+
+        # Link to the page and the document from the body of a page, so that they
+        # are recorded as referenced in the reference index
+        self.christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        self.christmas_page.body = self.html
+        self.christmas_page.save()
+
+        self.expected_html = (
+            '<p><a href="/about-us/">About</a> '
+            '<a href="/documents/1/test.pdf">Doc</a></p>'
+        )
+
+    def test_expand_db_html_is_cached(self):
+        self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+        self.assertEqual(len(rich_text_cache.get_local_rich_text_cache()), 1)
+
+    @override_settings(WAGTAIL_RICH_TEXT_CACHE_SIZE=0)
+    def test_disabled(self):
+        self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+        with self.assertNumQueries(3):
+            self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+    @override_settings(
+        WAGTAIL_RICH_TEXT_CACHE_SIZE=0, WAGTAIL_RICH_TEXT_SHARED_CACHE="rich_text"
+    )
+    def test_shared_cache(self):
+        self.assertIsNone(rich_text_cache.get_local_rich_text_cache())
+        self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(expand_db_html(self.html), self.expected_html)
+
+        self.assertEqual(
+            caches["rich_text"].get(rich_text_cache.get_cache_key(self.html)),
+            self.expected_html,
+        )
+
+    @override_settings(WAGTAIL_RICH_TEXT_SHARED_CACHE="rich_text")
+    def test_local_cache_filled_from_shared_cache(self):
+        expand_db_html(self.html)
+        rich_text_cache.get_local_rich_text_cache().clear()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(expand_db_html(self.html), self.expected_html)
+        self.assertEqual(len(rich_text_cache.get_local_rich_text_cache()), 1)
+
+    def test_local_cache_is_bounded(self):
+        for i in range(150):
+            expand_db_html(f"<p>{i}</p>")
+
+        self.assertEqual(len(rich_text_cache.get_local_rich_text_cache()), 100)
+
+    def test_key_includes_language(self):
+        with translation.override("en"):
+            english_key = rich_text_cache.get_cache_key(self.html)
+        with translation.override("fr"):
+            french_key = rich_text_cache.get_cache_key(self.html)
+
+        self.assertNotEqual(english_key, french_key)
+
+    def test_invalidated_when_linked_page_moves(self):
+        expand_db_html(self.html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(id=7).move(Page.objects.get(id=3), pos="last-child")
+
+        self.assertEqual(
+            expand_db_html(self.html),
+            '<p><a href="/events/about-us/">About</a> '
+            '<a href="/documents/1/test.pdf">Doc</a></p>',
+        )
+
+    def test_invalidated_when_linked_page_unpublished(self):
+        key = rich_text_cache.get_cache_key(self.html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(id=7).specific.unpublish()
+
+        self.assertNotEqual(rich_text_cache.get_cache_key(self.html), key)
+
+    def test_not_invalidated_when_unreferenced_page_unpublished(self):
+        key = rich_text_cache.get_cache_key(self.html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.objects.get(id=8).specific.unpublish()
+
+        self.assertEqual(rich_text_cache.get_cache_key(self.html), key)
+
+    def test_invalidated_when_linked_document_changes(self):
+        expand_db_html(self.html)
+
+        document = Document.objects.get(id=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            document.file.name = "documents/renamed.pdf"
+            document.save()
+
+        self.assertEqual(
+            expand_db_html(self.html),
+            '<p><a href="/about-us/">About</a> '
+            '<a href="/documents/1/renamed.pdf">Doc</a></p>',
+        )
+
+    def test_not_invalidated_when_unreferenced_document_changes(self):
+        key = rich_text_cache.get_cache_key(self.html)
+        document = Document.objects.create(title="Unreferenced")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.title = "Still unreferenced"
+            document.save()
+
+        self.assertEqual(rich_text_cache.get_cache_key(self.html), key)
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=True)
+    def test_invalidated_when_document_linked_from_pending_update_changes(self):
+        document = Document.objects.create(title="Linked")
+        self.christmas_page.body = (
+            f'<p><a linktype="document" id="{document.id}">Doc</a></p>'
+        )
+        self.christmas_page.save()
+        key = rich_text_cache.get_cache_key(self.html)
+
+        # The reference isn't indexed yet, but is found on the page itself
+        with self.captureOnCommitCallbacks(execute=True):
+            document.title = "Renamed"
+            document.save()
+
+        self.assertNotEqual(rich_text_cache.get_cache_key(self.html), key)
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_DEFERRED=True)
+    def test_not_invalidated_by_pending_updates_of_other_objects(self):
+        document = Document.objects.create(title="Unreferenced")
+        self.christmas_page.save()
+        key = rich_text_cache.get_cache_key(self.html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            document.title = "Still unreferenced"
+            document.save()
+
+        self.assertEqual(rich_text_cache.get_cache_key(self.html), key)
+
+    @override_settings(WAGTAILIMAGES_RENDITION_QUEUE_ENABLED=True)
+    def test_placeholder_renditions_not_cached(self):
+        image = Image.objects.create(title="Test image", file=get_test_image_file())
+        html = f'<p>Image:</p><embed embedtype="image" id="{image.id}" format="left" />'
+
+        # The rendition is queued, and a placeholder served in the meantime
+        self.assertIn(f"/{image.id}/width-500/", expand_db_html(html))
+        self.assertFalse(image.renditions.exists())
+        self.assertEqual(len(rich_text_cache.get_local_rich_text_cache()), 0)
+
+        rendition = image.get_rendition("width-500", defer=False)
+        expanded = expand_db_html(html)
+        self.assertIn(rendition.url, expanded)
+        self.assertNotIn(f"/{image.id}/width-500/", expanded)
+        self.assertEqual(len(rich_text_cache.get_local_rich_text_cache()), 1)
+
+
 class TestRichTextValue(TestCase):
     fixtures = ["test.json"]
 
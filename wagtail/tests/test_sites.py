@@ -3,6 +3,7 @@ from django.test import TestCase, override_settings
 
 from wagtail.coreutils import get_dummy_request
 from wagtail.models import Page, Site
+from wagtail.test.testapp.models import EventIndex
 
 
 class TestSiteNaturalKey(TestCase):
@@ -152,6 +153,88 @@ class TestFindSiteForRequest(TestCase):
         self.assertEqual(Site.find_for_request(request), self.default_site)
 
 
+@override_settings(ALLOWED_HOSTS=["example.com", "other.example.com", "localhost"])
+class TestSiteMatcher(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        self.default_site = Site.objects.get(is_default_site=True)
+        self.events_page = Page.objects.get(url_path="/home/events/")
+        self.site = Site.objects.create(
+            hostname="example.com", port=80, root_page=self.events_page
+        )
+
+    def get_request(self, hostname="example.com"):
+        request = get_dummy_request()
+        request.META.update({"HTTP_HOST": hostname, "SERVER_PORT": 80})
+        return request
+
+    def test_sites_are_loaded_once(self):
+        Site.find_for_request(self.get_request())
+        events_page = self.events_page.specific
+
+        with self.assertNumQueries(1):
+            # Only the version stamp is checked
+            site = Site.find_for_request(self.get_request())
+            self.assertEqual(site, self.site)
+            self.assertEqual(site.root_page.url_path, "/home/events/")
+            self.assertEqual(site.root_page.locale.language_code, "en")
+            self.assertEqual(site.root_page.specific, events_page)
+            self.assertIsInstance(site.root_page.specific, EventIndex)
+
+    def test_sites_are_copied(self):
+        site = Site.find_for_request(self.get_request())
+        site.site_name = "Changed"
+        site.root_page.title = "Changed"
+        site.root_page.specific.title = "Changed"
+
+        site = Site.find_for_request(self.get_request())
+        self.assertEqual(site.site_name, "")
+        self.assertEqual(site.root_page.title, "Events")
+        self.assertEqual(site.root_page.specific.title, "Events")
+
+    def test_reloaded_after_site_saved(self):
+        self.assertEqual(
+            Site.find_for_request(self.get_request("other.example.com")),
+            self.default_site,
+        )
+
+        other_site = Site.objects.create(
+            hostname="other.example.com", root_page=self.events_page
+        )
+        self.assertEqual(
+            Site.find_for_request(self.get_request("other.example.com")), other_site
+        )
+
+        other_site.hostname = "changed.example.com"
+        other_site.save()
+        self.assertEqual(
+            Site.find_for_request(self.get_request("other.example.com")),
+            self.default_site,
+        )
+
+    def test_reloaded_after_site_deleted(self):
+        self.assertEqual(Site.find_for_request(self.get_request()), self.site)
+
+        self.site.delete()
+        self.assertEqual(Site.find_for_request(self.get_request()), self.default_site)
+
+    def test_reloaded_after_root_page_changed(self):
+        Site.find_for_request(self.get_request())
+
+        self.events_page.slug = "changed"
+        self.events_page.save()
+
+        site = Site.find_for_request(self.get_request())
+        self.assertEqual(site.root_page.url_path, "/home/changed/")
+        self.assertEqual(site.root_page.specific.slug, "changed")
+
+    def test_no_default_site(self):
+        self.default_site.delete()
+
+        self.assertIsNone(Site.find_for_request(self.get_request("localhost")))
+
+
 class TestDefaultSite(TestCase):
     def test_create_default_site(self):
         Site.objects.all().delete()
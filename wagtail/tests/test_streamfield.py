@@ -9,10 +9,12 @@ from django.utils.safestring import SafeString
 
 from wagtail import blocks
 from wagtail.blocks import StreamBlockValidationError, StreamValue
-from wagtail.fields import StreamField
+from wagtail.fields import StreamField, prefetch_stream_blocks
+from wagtail.images.blocks import ImageChooserBlock
 from wagtail.images.models import Image
 from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Page
+from wagtail.query import StreamFieldQuerySet
 from wagtail.rich_text import RichText
 from wagtail.signal_handlers import disable_reference_index_auto_update
 from wagtail.test.testapp.models import (
@@ -181,6 +183,226 @@ class TestLazyStreamField(TestCase):
                 instance.save()
 
 
+class TestStreamValueChooserPrefetch(TestCase):
+    def setUp(self):
+        self.image_1 = Image.objects.create(
+            title="Test image 1", file=get_test_image_file()
+        )
+        self.image_2 = Image.objects.create(
+            title="Test image 2", file=get_test_image_file()
+        )
+        self.page = Page.objects.get(depth=1)
+
+        self.block = blocks.StreamBlock(
+            [
+                ("image", ImageChooserBlock()),
+                ("page", blocks.PageChooserBlock()),
+                ("text", blocks.CharBlock()),
+                (
+                    "card",
+                    blocks.StructBlock(
+                        [
+                            ("heading", blocks.CharBlock()),
+                            ("image", ImageChooserBlock()),
+                        ]
+                    ),
+                ),
+                ("gallery", blocks.ListBlock(ImageChooserBlock())),
+                (
+                    "section",
+                    blocks.StreamBlock(
+                        [
+                            ("image", ImageChooserBlock()),
+                            ("text", blocks.CharBlock()),
+                        ]
+                    ),
+                ),
+            ]
+        )
+        self.raw_data = [
+            {"type": "text", "value": "foo", "id": "1"},
+            {"type": "image", "value": self.image_1.pk, "id": "2"},
+            {"type": "page", "value": self.page.pk, "id": "3"},
+            {
+                "type": "card",
+                "value": {"heading": "Card", "image": self.image_2.pk},
+                "id": "4",
+            },
+            {
+                "type": "gallery",
+                "value": [
+                    {"type": "item", "value": self.image_1.pk, "id": "5"},
+                    {"type": "item", "value": None, "id": "6"},
+                ],
+                "id": "7",
+            },
+            {
+                "type": "section",
+                "value": [
+                    {"type": "image", "value": self.image_2.pk, "id": "8"},
+                    {"type": "text", "value": "bar", "id": "9"},
+                ],
+                "id": "10",
+            },
+        ]
+
+    def test_iterate_fetches_each_model_once(self):
+        value = self.block.to_python(self.raw_data)
+
+        # One query for all of the images, and one for the page
+        with self.assertNumQueries(2):
+            children = list(value)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [child.block_type for child in children],
+                ["text", "image", "page", "card", "gallery", "section"],
+            )
+            self.assertEqual(children[0].value, "foo")
+            self.assertEqual(children[1].value, self.image_1)
+            self.assertEqual(children[1].id, "2")
+            self.assertEqual(children[2].value, self.page)
+            self.assertEqual(children[3].value["image"], self.image_2)
+            self.assertEqual(list(children[4].value), [self.image_1, None])
+            self.assertEqual(children[5].value[0].value, self.image_2)
+            self.assertEqual(children[5].value[1].value, "bar")
+
+    def test_repeated_objects_are_distinct_instances(self):
+        children = list(self.block.to_python(self.raw_data))
+
+        self.assertEqual(children[1].value, children[4].value[0])
+        self.assertIsNot(children[1].value, children[4].value[0])
+        self.assertIsNot(children[3].value["image"], children[5].value[0].value)
+
+    def test_bulk_to_python_fetches_each_model_once(self):
+        with self.assertNumQueries(2):
+            values = self.block.bulk_to_python([self.raw_data, self.raw_data[1:2]])
+
+        self.assertEqual(values[0][3].value["image"], self.image_2)
+        self.assertEqual(values[1][0].value, self.image_1)
+        self.assertIsNot(values[0][1].value, values[1][0].value)
+
+    def test_get_item_fetches_nested_objects_once(self):
+        value = self.block.to_python(self.raw_data)
+
+        # Only the 'section' blocks are converted, but their images are fetched together
+        with self.assertNumQueries(1):
+            self.assertEqual(value[5].value[0].value, self.image_2)
+
+    def test_missing_objects(self):
+        self.image_2.delete()
+        children = list(self.block.to_python(self.raw_data))
+
+        self.assertIsNone(children[3].value["image"])
+        self.assertIsNone(children[5].value[0].value)
+
+    def test_no_chooser_blocks(self):
+        block = blocks.StreamBlock([("text", blocks.CharBlock())])
+        self.assertIsNone(block._chooser_id_collector)
+
+        value = block.to_python([{"type": "text", "value": "foo", "id": "1"}])
+        with self.assertNumQueries(0):
+            self.assertEqual([child.value for child in value], ["foo"])
+
+
+class TestPrefetchStreamBlocks(TestCase):
+    def setUp(self):
+        self.images = [
+            Image.objects.create(title=f"Test image {i}", file=get_test_image_file())
+            for i in range(3)
+        ]
+        root_page = Page.objects.get(depth=1)
+        for i, image in enumerate(self.images):
+            root_page.add_child(
+                instance=StreamPage(
+                    title=f"Stream page {i}",
+                    body=[
+                        {"type": "text", "value": "foo"},
+                        {"type": "image", "value": image.pk},
+                    ],
+                )
+            )
+            JSONStreamModel.objects.create(
+                body=json.dumps(
+                    [
+                        {"type": "image", "value": image.pk},
+                        {"type": "image", "value": self.images[0].pk},
+                    ]
+                )
+            )
+
+    def assertImagesLoaded(self, instances, index):
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [instance.body[index].value for instance in instances], self.images
+            )
+
+    def test_page_queryset(self):
+        with self.assertNumQueries(2):
+            pages = list(
+                StreamPage.objects.order_by("pk").prefetch_stream_blocks("body")
+            )
+
+        self.assertImagesLoaded(pages, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[0].body[0].value, "foo")
+
+    def test_specific_page_queryset(self):
+        # The page types, the specific pages of each type, and the images
+        with self.assertNumQueries(4):
+            pages = list(
+                Page.objects.order_by("pk").specific().prefetch_stream_blocks("body")
+            )
+
+        self.assertImagesLoaded(
+            [page for page in pages if isinstance(page, StreamPage)], 1
+        )
+
+    def test_clone(self):
+        queryset = StreamPage.objects.prefetch_stream_blocks("body")
+        self.assertEqual(queryset.live()._prefetch_stream_blocks_fields, ("body",))
+        self.assertEqual(
+            queryset.prefetch_stream_blocks(None)._prefetch_stream_blocks_fields, ()
+        )
+
+    def test_deferred_field(self):
+        with self.assertNumQueries(1):
+            pages = list(
+                StreamPage.objects.defer_streamfields().prefetch_stream_blocks("body")
+            )
+        self.assertEqual(len(pages), 3)
+
+    def test_values_queryset(self):
+        with self.assertNumQueries(1):
+            titles = list(
+                StreamPage.objects.order_by("pk")
+                .prefetch_stream_blocks("body")
+                .values_list("title", flat=True)
+            )
+        self.assertEqual(titles[0], "Stream page 0")
+
+    def test_stream_field_queryset(self):
+        queryset = StreamFieldQuerySet(JSONStreamModel).order_by("pk")
+        with self.assertNumQueries(2):
+            instances = list(queryset.prefetch_stream_blocks("body"))
+
+        self.assertImagesLoaded(instances, 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(instances[1].body[1].value, self.images[0])
+            self.assertIsNot(instances[0].body[0].value, instances[1].body[1].value)
+
+    def test_prefetch_stream_blocks(self):
+        instances = list(JSONStreamModel.objects.order_by("pk")) + list(
+            StreamPage.objects.order_by("pk")
+        )
+
+        with self.assertNumQueries(1):
+            prefetch_stream_blocks(instances, "body", "title")
+
+        self.assertImagesLoaded(instances[:3], 0)
+        self.assertImagesLoaded(instances[3:], 1)
+
+
 class TestSystemCheck(TestCase):
     def tearDown(self):
         # unregister InvalidStreamModel from the overall model registry
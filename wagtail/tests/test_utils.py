@@ -28,6 +28,7 @@ from wagtail.coreutils import (
 )
 from wagtail.models import Page, Site
 from wagtail.utils.file import hash_filelike
+from wagtail.utils.range_requests import MAX_RANGES, parse_range_header
 from wagtail.utils.utils import deep_update, flatten_choices
 from wagtail.utils.version import get_main_version
 
@@ -616,3 +617,49 @@ class TestFlattenChoices(SimpleTestCase):
                 "unknown": "Unknown",
             },
         )
+
+
+class TestParseRangeHeader(SimpleTestCase):
+    def test_ranges(self):
+        for header, expected in [
+            ("bytes=0-9", [(0, 9)]),
+            ("bytes=10-", [(10, 99)]),
+            ("bytes=-10", [(90, 99)]),
+            ("bytes=-1000", [(0, 99)]),
+            ("bytes=90-1000", [(90, 99)]),
+            ("bytes=0-0,-1", [(0, 0), (99, 99)]),
+            ("bytes= 50-59 , 0-9", [(0, 9), (50, 59)]),
+            ("BYTES=0-9", [(0, 9)]),
+        ]:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range_header(header, 100), expected)
+
+    def test_overlapping_and_adjacent_ranges_are_merged(self):
+        self.assertEqual(parse_range_header("bytes=0-9,5-14", 100), [(0, 14)])
+        self.assertEqual(parse_range_header("bytes=10-19,0-9", 100), [(0, 19)])
+        self.assertEqual(
+            parse_range_header("bytes=0-9,40-49,-20", 100), [(0, 9), (40, 49), (80, 99)]
+        )
+
+    def test_unsatisfiable_ranges(self):
+        for header in ["bytes=100-", "bytes=100-200", "bytes=-0"]:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range_header(header, 100), [])
+
+        self.assertEqual(parse_range_header("bytes=-10", 0), [])
+        self.assertEqual(parse_range_header("bytes=100-,0-9", 100), [(0, 9)])
+
+    def test_invalid_headers(self):
+        for header in [
+            "bytes",
+            "bytes=",
+            "bytes=,",
+            "bytes=-",
+            "bytes=9-0",
+            "bytes=a-b",
+            "bytes=0-9;10-19",
+            "items=0-9",
+            "bytes=" + ",".join(["0-0"] * (MAX_RANGES + 1)),
+        ]:
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range_header(header, 100))
@@ -73,6 +73,9 @@ class TestServeView(TestCase):
         page = site.root_page.add_child(
             instance=SimplePage(title="Simple page", slug="simple", content="Simple")
         )
+        # Load the sites into this process's site matcher, so that it's not counted
+        # towards the query count
+        Site.find_for_request(get_dummy_request())
         with mock.patch.object(
             Page, "route_for_request", wraps=Page.route_for_request
         ) as m:
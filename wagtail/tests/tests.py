@@ -20,6 +20,8 @@ from wagtail.models import Locale, Page, Site, SiteRootPath
 from wagtail.models.sites import (
     SITE_ROOT_PATHS_CACHE_KEY,
     SITE_ROOT_PATHS_CACHE_VERSION,
+    SITE_ROOT_PATHS_VERSION_CACHE_KEY,
+    SiteRootPaths,
 )
 from wagtail.templatetags.wagtail_cache import WagtailPageCacheNode
 from wagtail.templatetags.wagtailcore_tags import richtext, slugurl
@@ -32,8 +34,9 @@ class TestPageUrlTags(TestCase):
     def setUp(self):
         super().setUp()
 
-        # Clear caches
+        # Clear caches, including the site root paths held by this process
         cache.clear()
+        Site.clear_site_root_paths_cache()
 
     def test_pageurl_tag(self):
         response = self.client.get("/events/")
@@ -120,7 +123,7 @@ class TestPageUrlTags(TestCase):
 
         request = get_dummy_request()
 
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(9):
             result = tpl.render(template.Context({"page": page, "request": request}))
         self.assertIn('<a href="/events/">Events</a>', result)
 
@@ -138,7 +141,7 @@ class TestPageUrlTags(TestCase):
         # 'request' object in context, but site is None
         request = get_dummy_request()
         request.META["HTTP_HOST"] = "unknown.example.com"
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(9):
             result = tpl.render(template.Context({"page": page, "request": request}))
         self.assertIn('<a href="/events/">Events</a>', result)
 
@@ -202,7 +205,7 @@ class TestPageUrlTags(TestCase):
         self.assertEqual(result, "/events/")
 
         # 'request' object in context, but no 'site' attribute
-        with self.assertNumQueries(3):
+        with self.assertNumQueries(4):
             result = slugurl(
                 template.Context({"request": get_dummy_request()}), "events"
             )
@@ -282,6 +285,13 @@ class TestWagtailSiteTag(TestCase):
 class TestSiteRootPathsCache(TestCase):
     fixtures = ["test.json"]
 
+    def setUp(self):
+        super().setUp()
+
+        # Clear caches, including the site root paths held by this process
+        cache.clear()
+        Site.clear_site_root_paths_cache()
+
     def get_cached_site_root_paths(self):
         return cache.get(
             SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
@@ -484,6 +494,118 @@ class TestSiteRootPathsCache(TestCase):
         # Check url
         self.assertEqual(translated_homepage.url, "/")
 
+    def test_site_root_paths_shared_within_process(self):
+        result = Site.get_site_root_paths()
+        self.assertIsInstance(result, SiteRootPaths)
+
+        # While the version stamp is unchanged, the same instance is returned
+        # after only fetching the version stamp from the cache
+        with self.assertNumQueries(1):
+            self.assertIs(Site.get_site_root_paths(), result)
+
+    def test_site_root_paths_reloaded_when_version_changes(self):
+        result = Site.get_site_root_paths()
+
+        # Simulate another process invalidating the site root paths
+        cache.incr(
+            SITE_ROOT_PATHS_VERSION_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+        )
+
+        new_result = Site.get_site_root_paths()
+        self.assertIsNot(new_result, result)
+        self.assertEqual(new_result, result)
+
+    def test_site_root_paths_reloaded_when_site_saved(self):
+        result = Site.get_site_root_paths()
+
+        site = Site.objects.get(is_default_site=True)
+        site.hostname = "example.com"
+        site.save()
+
+        new_result = Site.get_site_root_paths()
+        self.assertIsNot(new_result, result)
+        self.assertEqual(new_result[0].root_url, "http://example.com")
+
+    def test_site_root_paths_reloaded_after_commit(self):
+        site = Site.objects.get(is_default_site=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            site.hostname = "example.com"
+            site.save()
+
+            # Simulate another process caching the site root paths before the
+            # change is committed
+            cache.set(
+                SITE_ROOT_PATHS_CACHE_KEY,
+                [(site.root_page_id, "/home/", "http://localhost", "en")],
+                3600,
+                version=SITE_ROOT_PATHS_CACHE_VERSION,
+            )
+
+        self.assertIsNone(
+            cache.get(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+        )
+        self.assertEqual(Site.get_site_root_paths()[0].root_url, "http://example.com")
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_site_root_paths_not_shared_without_cache(self):
+        # Without a cache to hold the version stamp, there is no way to know
+        # when the site root paths are stale, so they are reloaded every time
+        self.assertIsNot(Site.get_site_root_paths(), Site.get_site_root_paths())
+
+
+class TestSiteRootPaths(TestCase):
+    def setUp(self):
+        self.site_root_paths = SiteRootPaths(
+            [
+                SiteRootPath(3, "/home/events/", "http://events.example.com", "en"),
+                SiteRootPath(1, "/home/", "http://localhost", "en"),
+                SiteRootPath(2, "/home/", "http://other.example.com", "en"),
+                SiteRootPath(4, "/homepage/", "http://homepage.example.com", "en"),
+            ]
+        )
+
+    def test_get_relevant(self):
+        self.assertEqual(
+            [
+                srp.site_id
+                for srp in self.site_root_paths.get_relevant("/home/events/party/")
+            ],
+            [3, 1, 2],
+        )
+
+    def test_get_relevant_matches_whole_segments_only(self):
+        self.assertEqual(
+            [
+                srp.site_id
+                for srp in self.site_root_paths.get_relevant("/homepage/about/")
+            ],
+            [4],
+        )
+
+    def test_get_relevant_for_root_path(self):
+        self.assertEqual(
+            [srp.site_id for srp in self.site_root_paths.get_relevant("/home/")],
+            [1, 2],
+        )
+
+    def test_get_relevant_no_match(self):
+        self.assertEqual(self.site_root_paths.get_relevant("/other/"), ())
+        self.assertEqual(self.site_root_paths.get_relevant("/"), ())
+
+    def test_matches_linear_scan(self):
+        for url_path in ["/", "/home/", "/home/events/", "/homepage/", "/h/"]:
+            with self.subTest(url_path=url_path):
+                self.assertEqual(
+                    self.site_root_paths.get_relevant(url_path),
+                    tuple(
+                        srp
+                        for srp in self.site_root_paths
+                        if url_path.startswith(srp.root_path)
+                    ),
+                )
+
 
 class TestResolveModelString(TestCase):
     def test_resolve_from_string(self):
@@ -1,3 +1,15 @@
+import re
+import time
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import translation
+from django.utils.http import RFC3986_SUBDELIMS
+
+from wagtail.coreutils import safe_md5
+
+
 class RouteResult:
     """
     An object to be returned from Page.route, which encapsulates
@@ -14,3 +26,91 @@ class RouteResult:
 
     def __getitem__(self, index):
         return (self.page, self.args, self.kwargs)[index]
+
+
+ROUTE_CACHE_KEY_PREFIX = "wagtail_route"
+ROUTE_CACHE_GENERATION_KEY = "wagtail_route_generation"
+
+
+def get_route_cache_generation():
+    """
+    Return the current generation of the route cache. Route cache keys include
+    the generation, so bumping it with ``clear_route_cache`` invalidates every
+    cached route at once without having to know which keys exist.
+    """
+    generation = cache.get(ROUTE_CACHE_GENERATION_KEY)
+    if generation is None:
+        # Start from a time-based value rather than 1, so that a generation key
+        # lost from the cache can never resurrect routes cached before it expired
+        generation = time.time_ns()
+        cache.add(ROUTE_CACHE_GENERATION_KEY, generation, None)
+        generation = cache.get(ROUTE_CACHE_GENERATION_KEY, generation)
+    return generation
+
+
+def get_route_cache_key(site_id, language_code, path_components):
+    path_hash = safe_md5(
+        "/".join(path_components).encode(), usedforsecurity=False
+    ).hexdigest()
+    return "%s:%s:%s:%s:%s" % (
+        ROUTE_CACHE_KEY_PREFIX,
+        get_route_cache_generation(),
+        site_id,
+        language_code or "",
+        path_hash,
+    )
+
+
+def clear_route_cache():
+    try:
+        cache.incr(ROUTE_CACHE_GENERATION_KEY)
+    except ValueError:
+        # The generation key is not set (or has been evicted); a fresh
+        # time-based generation will be picked up on the next lookup
+        pass
+
+
+# Page paths (relative to the site root) that every ``wagtail_serve`` URL pattern accepts
+SERVE_PATH_RE = re.compile(r"^(?:[\w\-]+/)*\Z")
+
+
+class ServePathBuilder:
+    """
+    Builds the paths that ``reverse("wagtail_serve", args=(path,))`` would return,
+    for use when generating URLs for many pages at once.
+
+    The ``wagtail_serve`` URL pattern is only reversed once per active language to
+    find the prefix that page paths are appended to. The prefix is only used after
+    checking that it gives the same result as ``reverse`` for a real page path;
+    otherwise (for example, if a project registers its own ``wagtail_serve``
+    pattern), every path is reversed as normal.
+    """
+
+    def __init__(self):
+        self._prefixes = {}
+
+    def get_path(self, path):
+        if not SERVE_PATH_RE.match(path):
+            return reverse("wagtail_serve", args=(path,))
+
+        language = translation.get_language()
+        try:
+            prefix = self._prefixes[language]
+        except KeyError:
+            prefix = self._prefixes[language] = self._get_prefix(path)
+
+        if prefix is None:
+            return reverse("wagtail_serve", args=(path,))
+
+        return prefix + self._quote(path)
+
+    def _get_prefix(self, path):
+        prefix = reverse("wagtail_serve", args=("",))
+        if reverse("wagtail_serve", args=(path,)) != prefix + self._quote(path):
+            return None
+        return prefix
+
+    @staticmethod
+    def _quote(path):
+        # Match the escaping applied by ``reverse``
+        return quote(path, safe=RFC3986_SUBDELIMS + "/~:@")
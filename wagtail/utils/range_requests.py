@@ -0,0 +1,190 @@
+"""
+Support for HTTP range requests (RFC 9110, section 14), so that clients can resume
+downloads of files and seek within them without fetching the whole file again.
+"""
+
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.crypto import get_random_string
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_SPEC_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+# Requests for more ranges than this are served the whole file, to guard against
+# requests for many small ranges costing far more to serve than the file itself
+MAX_RANGES = 100
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range_header(header, size):
+    """
+    Parse the value of a ``Range`` header for a file of ``size`` bytes, and return
+    a sorted list of the ``(start, end)`` byte ranges it requests (with ``end``
+    inclusive), merging any that overlap or are adjacent.
+
+    Returns an empty list if none of the ranges can be satisfied, or ``None`` if
+    the header is invalid (or requests too many ranges) and should be ignored.
+    """
+    unit, has_ranges, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not has_ranges:
+        return None
+
+    specs = [spec for spec in specs.split(",") if spec.strip()]
+    if not specs or len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        match = RANGE_SPEC_RE.match(spec)
+        if match is None:
+            return None
+
+        start, end = match.groups()
+        if start:
+            start = int(start)
+            if end and int(end) < start:
+                return None
+            if start < size:
+                end = min(int(end), size - 1) if end else size - 1
+                ranges.append((start, end))
+        elif end:
+            # A suffix range, for the last ``end`` bytes of the file
+            length = int(end)
+            if length and size:
+                ranges.append((max(size - length, 0), size - 1))
+        else:
+            return None
+
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def is_if_range_fresh(request, etag=None, last_modified=None):
+    """
+    Return whether the ``If-Range`` header of ``request``, if any, matches the
+    current version of the file, given its (quoted) ``etag`` and ``last_modified``
+    timestamp. Only strong ETags and exact dates match, as required by the spec.
+    """
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return etag is not None and if_range == etag
+    if if_range.startswith("W/"):
+        return False
+
+    if_range_date = parse_http_date_safe(if_range)
+    return (
+        if_range_date is not None
+        and last_modified is not None
+        and int(last_modified) == if_range_date
+    )
+
+
+def _read_range(file, start, end):
+    file.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = file.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _stream_range(file, start, end):
+    try:
+        yield from _read_range(file, start, end)
+    finally:
+        file.close()
+
+
+def _stream_multipart(file, parts, end_delimiter):
+    try:
+        for part_headers, (start, end) in parts:
+            yield part_headers
+            yield from _read_range(file, start, end)
+            yield b"\r\n"
+        yield end_delimiter
+    finally:
+        file.close()
+
+
+def get_range_response(
+    request, file, size, content_type, etag=None, last_modified=None
+):
+    """
+    If ``request`` is a range request that applies to ``file`` (an open file of
+    ``size`` bytes), return a ``206 Partial Content`` response serving the
+    requested ranges, or a ``416 Range Not Satisfiable`` response if none of them
+    can be satisfied. In both cases, ``file`` is closed once the response is done
+    with it.
+
+    Otherwise, return ``None``, and the whole file should be served as usual.
+    """
+    header = request.headers.get("range")
+    if header is None or request.method not in ("GET", "HEAD"):
+        return None
+
+    if not is_if_range_fresh(request, etag, last_modified):
+        # The client's copy of the file is out of date, so it needs all of it
+        return None
+
+    ranges = parse_range_header(header, size)
+    if ranges is None:
+        return None
+
+    if not ranges:
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            _stream_range(file, start, end), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    else:
+        boundary = get_random_string(32)
+        parts = [
+            (
+                (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode(),
+                (start, end),
+            )
+            for start, end in ranges
+        ]
+        end_delimiter = f"--{boundary}--\r\n".encode()
+
+        response = StreamingHttpResponse(
+            _stream_multipart(file, parts, end_delimiter),
+            status=206,
+            content_type=f"multipart/byteranges; boundary={boundary}",
+        )
+        response["Content-Length"] = len(end_delimiter) + sum(
+            len(part_headers) + end - start + 1 + 2
+            for part_headers, (start, end) in parts
+        )
+
+    response["Accept-Ranges"] = "bytes"
+    if etag:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
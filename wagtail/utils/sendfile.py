@@ -46,6 +46,7 @@ def sendfile(
     mimetype=None,
     encoding=None,
     backend=None,
+    etag=None,
 ):
     """
     create a response to send file using backend configured in SENDFILE_BACKEND
@@ -61,6 +62,9 @@ def sendfile(
 
     If no mimetype or encoding are specified, then they will be guessed via the
     filename (using the standard python mimetypes module)
+
+    If etag is given, it is passed on to the backend, for backends that support
+    conditional range requests
     """
     _sendfile = backend or _get_sendfile()
 
@@ -76,7 +80,10 @@ def sendfile(
         else:
             mimetype = "application/octet-stream"
 
-    response = _sendfile(request, filename, mimetype=mimetype)
+    backend_kwargs = {"mimetype": mimetype}
+    if etag is not None:
+        backend_kwargs["etag"] = etag
+    response = _sendfile(request, filename, **backend_kwargs)
     if attachment:
         parts = ["attachment"]
     else:
@@ -99,8 +106,10 @@ def sendfile(
             parts.append("filename*=UTF-8''%s" % quoted_filename)
 
     response["Content-Disposition"] = "; ".join(parts)
-    response["Content-length"] = os.path.getsize(filename)
-    response["Content-Type"] = mimetype
+    if response.status_code not in (206, 416):
+        # The backend sets these on responses to range requests
+        response["Content-length"] = os.path.getsize(filename)
+        response["Content-Type"] = mimetype
     response["Content-Encoding"] = encoding or guessed_encoding
 
     return response
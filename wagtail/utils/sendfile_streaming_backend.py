@@ -8,8 +8,10 @@ from email.utils import mktime_tz, parsedate_tz
 from django.http import FileResponse, HttpResponseNotModified
 from django.utils.http import http_date
 
+from wagtail.utils.range_requests import get_range_response
 
-def sendfile(request, filename, **kwargs):
+
+def sendfile(request, filename, mimetype=None, etag=None, **kwargs):
     # Respect the If-Modified-Since header.
     statobj = os.stat(filename)
 
@@ -19,9 +21,24 @@ def sendfile(request, filename, **kwargs):
     ):
         return HttpResponseNotModified()
 
-    response = FileResponse(open(filename, "rb"))
+    file = open(filename, "rb")
+
+    # Serve the requested parts of the file to range requests
+    response = get_range_response(
+        request,
+        file,
+        statobj[stat.ST_SIZE],
+        mimetype or "application/octet-stream",
+        etag=etag,
+        last_modified=statobj[stat.ST_MTIME],
+    )
+    if response is not None:
+        return response
+
+    response = FileResponse(file)
 
     response["Last-Modified"] = http_date(statobj[stat.ST_MTIME])
+    response["Accept-Ranges"] = "bytes"
     return response
 
 